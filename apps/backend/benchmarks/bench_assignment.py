@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Load assignment optimizer benchmark
+
+Times ``OptimizadorAsignacion.optimizar`` on seeded random loads and
+vehicles spread over the Iberian peninsula, one case per
+``loads x vehicles x loads per vehicle`` size, and reports the best and
+median time of ``--repeat`` runs with the method the optimizer chose.
+
+Results are written as JSON next to the CMR benchmark results.
+
+Usage (from apps/backend, with the same import roots as the tests):
+    PYTHONPATH=src:. python -m benchmarks.bench_assignment --repeat 5
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.domain.entities.carga import Carga, TipoCarga
+from src.domain.entities.vehiculo import TipoVehiculo, Vehiculo
+from src.domain.services.assignment_optimizer import OptimizadorAsignacion
+
+# (loads, vehicles, loads per vehicle)
+CASES: List[Tuple[int, int, int]] = [(300, 300, 1), (800, 600, 1), (800, 200, 5)]
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+def build_case(n: int, m: int, seed: int) -> Tuple[List[Carga], List[Tuple[Vehiculo, Tuple[float, float]]]]:
+    """Seeded loads and positioned vehicles"""
+    rnd = random.Random(seed)
+    cargas = [
+        Carga(id=f"C{i}", descripcion="Palets", tipo=TipoCarga.GENERAL, peso=rnd.uniform(500, 5000),
+              origen=f"{rnd.uniform(36, 43)},{rnd.uniform(-9, 3)}", destino="Destino")
+        for i in range(n)
+    ]
+    vehiculos = [
+        (Vehiculo(id=f"V{j}", matricula=f"V{j}", marca="Mercedes", modelo="Actros", tipo=TipoVehiculo.CAMION,
+                  capacidad_carga=25000.0, fecha_matriculacion=datetime(2020, 1, 15)),
+         (rnd.uniform(36, 43), rnd.uniform(-9, 3)))
+        for j in range(m)
+    ]
+    return cargas, vehiculos
+
+def bench_case(n: int, m: int, max_cargas: int, repeat: int, seed: int) -> Dict[str, Any]:
+    """Best and median optimizer time for one problem size"""
+    cargas, vehiculos = build_case(n, m, seed + n + m)
+    optimizador = OptimizadorAsignacion(max_cargas_por_vehiculo=max_cargas)
+    tiempos = []
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        plan = optimizador.optimizar(cargas, vehiculos)
+        tiempos.append(time.perf_counter() - inicio)
+    return {
+        "cargas": n,
+        "vehiculos": m,
+        "max_cargas_por_vehiculo": max_cargas,
+        "metodo": plan.metodo,
+        "asignadas": len(plan.asignaciones),
+        "best_s": round(min(tiempos), 4),
+        "median_s": round(statistics.median(tiempos), 4),
+    }
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed of the random cases")
+    parser.add_argument("--output", type=Path, help="Result file (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    report: Dict[str, Any] = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": [],
+    }
+    for n, m, max_cargas in CASES:
+        result = bench_case(n, m, max_cargas, args.repeat, args.seed)
+        report["results"].append(result)
+        print(f"{n:5} cargas x {m:4} vehiculos x {max_cargas}  {result['metodo']:22} "
+              f"best {result['best_s']:.3f} s  median {result['median_s']:.3f} s")
+
+    output = args.output or RESULTS_DIR / f"assignment_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"Results written to {output}")
+    return report
+
+if __name__ == "__main__":
+    main()
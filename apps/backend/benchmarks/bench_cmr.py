@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+CMR processing throughput benchmark
+
+Runs a synthetic corpus through the CMR pipeline and reports docs/sec and
+p50/p99 latency per mode:
+
+- ``single``: ``CMRNormalizer.normalize_document`` in a loop on one thread
+- ``process``: the batch worker function on a ``ProcessPoolExecutor``
+- ``batch``: ``POST /documents/cmr/extract/batch`` on a local uvicorn server
+  (or ``--url``), latency measured from the request start to each NDJSON line
+
+Results are written as JSON; pass ``--compare`` with an earlier result file
+to print the change per mode.
+
+Usage (from apps/backend, with the same import roots as the tests):
+    PYTHONPATH=src:. python -m benchmarks.bench_cmr --docs 2000 --modes single,process,batch
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import socket
+import statistics
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.cmr_corpus import build_text_pdf, generate_corpus
+from src.application.use_cases.cmr_use_cases import procesar_documento_cmr
+from src.domain.services.cmr_normalizer import CMRNormalizer
+
+MODES = ("single", "process", "batch")
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+def summarize(latencies: List[float], elapsed: float, **extra: Any) -> Dict[str, Any]:
+    """Throughput and latency percentiles (milliseconds) for one mode"""
+    ordered = sorted(latencies)
+    if len(ordered) >= 2:
+        cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+        p50, p99 = cuts[49], cuts[98]
+    else:
+        p50 = p99 = ordered[0] if ordered else 0.0
+    return {
+        "docs": len(latencies),
+        "seconds": round(elapsed, 4),
+        "docs_per_sec": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "p50_ms": round(p50 * 1000, 3),
+        "p99_ms": round(p99 * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        **extra
+    }
+
+def bench_single(documents: List[Tuple[str, bytes]], normalizer: CMRNormalizer) -> Dict[str, Any]:
+    """Normalize every document sequentially on the calling thread"""
+    latencies = []
+    start = time.perf_counter()
+    for _, data in documents:
+        began = time.perf_counter()
+        normalizer.normalize_document(data)
+        latencies.append(time.perf_counter() - began)
+    return summarize(latencies, time.perf_counter() - start)
+
+def _timed_worker(filename: str, data: bytes) -> float:
+    """Process one document in a worker and return its service time"""
+    began = time.perf_counter()
+    procesar_documento_cmr(filename, data)
+    return time.perf_counter() - began
+
+def bench_process(documents: List[Tuple[str, bytes]], workers: int) -> Dict[str, Any]:
+    """Fan the corpus out to a process pool, as the batch endpoint does"""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        # Start the workers before timing so spawn cost is not measured
+        list(executor.map(_timed_worker, *zip(*documents[:workers])))
+        start = time.perf_counter()
+        latencies = list(executor.map(_timed_worker, *zip(*documents), chunksize=8))
+        elapsed = time.perf_counter() - start
+    return summarize(latencies, elapsed, workers=workers, latency="worker service time")
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _start_server() -> Tuple[Any, threading.Thread, str]:
+    """Run the API on a local uvicorn server in a background thread"""
+    import uvicorn
+    from src.presentation.api.main import app
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+def bench_batch(documents: List[Tuple[str, bytes]], url: Optional[str]) -> Dict[str, Any]:
+    """Upload the corpus as one zip to the batch endpoint and time each result line"""
+    import httpx
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_STORED) as zf:
+        for filename, data in documents:
+            zf.writestr(filename, data)
+
+    server = thread = None
+    if url is None:
+        server, thread, url = _start_server()
+    try:
+        files = {"files": ("corpus.zip", archive.getvalue(), "application/zip")}
+        latencies = []
+        statuses: Dict[str, int] = {}
+        start = time.perf_counter()
+        with httpx.stream("POST", f"{url}/documents/cmr/extract/batch", files=files, timeout=None) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                latencies.append(time.perf_counter() - start)
+                status = json.loads(line)["status"]
+                statuses[status] = statuses.get(status, 0) + 1
+        elapsed = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.should_exit = True
+            thread.join()
+    return summarize(latencies, elapsed, statuses=statuses, latency="time to result line")
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Human-readable change per mode against a previous result file"""
+    lines = []
+    for mode, result in current["results"].items():
+        before = baseline.get("results", {}).get(mode)
+        if not before or not before.get("docs_per_sec"):
+            continue
+        change = (result["docs_per_sec"] - before["docs_per_sec"]) / before["docs_per_sec"] * 100
+        lines.append(
+            f"{mode:8} {before['docs_per_sec']:>10.1f} -> {result['docs_per_sec']:>10.1f} docs/s "
+            f"({change:+.1f}%)  p99 {before['p99_ms']:.2f} -> {result['p99_ms']:.2f} ms"
+        )
+    return lines
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--docs", type=int, default=500, help="Documents in the corpus")
+    parser.add_argument("--seed", type=int, default=2024, help="Corpus seed")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated modes to run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Process pool size")
+    parser.add_argument("--extractor", default="pdf", choices=("pdf", "mock"), help="CMR extractor to benchmark")
+    parser.add_argument("--extra-pages", type=int, default=1, help="Non-CMR pages appended to each PDF")
+    parser.add_argument("--url", help="Base URL of a running API for the batch mode")
+    parser.add_argument("--output", type=Path, help="Result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier result file to compare against")
+    args = parser.parse_args(argv)
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"Unknown modes: {', '.join(sorted(unknown))}")
+
+    # Worker processes and the API pick the extractor from the environment
+    os.environ["CMR_EXTRACTOR"] = args.extractor
+    from src.application.use_cases.cmr_use_cases import build_worker_normalizer
+
+    extra_pages = ["Albarán de entrega\nReferencia interna\nFirma"] * args.extra_pages
+    corpus = generate_corpus(args.docs, seed=args.seed)
+    documents = [
+        (f"cmr_{index:06d}.pdf", build_text_pdf(text, extra_pages))
+        for index, (text, _) in enumerate(corpus)
+    ]
+
+    report: Dict[str, Any] = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "corpus": {
+            "docs": len(documents),
+            "seed": args.seed,
+            "extractor": args.extractor,
+            "extra_pages": args.extra_pages,
+            "total_bytes": sum(len(data) for _, data in documents),
+        },
+        "results": {},
+    }
+
+    for mode in modes:
+        if mode == "single":
+            result = bench_single(documents, build_worker_normalizer())
+        elif mode == "process":
+            result = bench_process(documents, args.workers)
+        else:
+            result = bench_batch(documents, args.url)
+        report["results"][mode] = result
+        print(f"{mode:8} {result['docs_per_sec']:>10.1f} docs/s  p50 {result['p50_ms']:.2f} ms  p99 {result['p99_ms']:.2f} ms")
+
+    output = args.output or RESULTS_DIR / f"cmr_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"Results written to {output}")
+
+    if args.compare:
+        for line in compare(report, json.loads(args.compare.read_text())):
+            print(line)
+
+    return report
+
+if __name__ == "__main__":
+    main()
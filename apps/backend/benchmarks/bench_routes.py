@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Route sequencing benchmark
+
+Times ``SecuenciadorRutas.planificar`` on a seeded fleet: each vehicle
+picks up and delivers ``--loads`` pending loads around its position in
+the Iberian peninsula. Reports the best and median time of ``--repeat``
+runs and whether every route was improved within the time budget.
+
+Results are written as JSON next to the CMR benchmark results.
+
+Usage (from apps/backend, with the same import roots as the tests):
+    PYTHONPATH=src:. python -m benchmarks.bench_routes --vehicles 500 --loads 10
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.domain.entities.carga import Carga, EstadoCarga, TipoCarga
+from src.domain.entities.vehiculo import TipoVehiculo, Vehiculo
+from src.domain.services.route_sequencer import SecuenciadorRutas
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+SALIDA = datetime(2024, 3, 1, 8, 0)
+
+def build_fleet(vehicles: int, loads: int, seed: int) -> List[Tuple[Vehiculo, Tuple[float, float], Sequence[Carga]]]:
+    """Seeded vehicles, each with pending loads within half a degree of it"""
+    rnd = random.Random(seed)
+    flota = []
+    for v in range(vehicles):
+        lat, lon = rnd.uniform(37, 42), rnd.uniform(-7, 1)
+        cargas = [
+            Carga(id=f"C{v}_{c}", descripcion="Palets", tipo=TipoCarga.GENERAL, peso=rnd.uniform(200, 3000),
+                  estado=EstadoCarga.PENDIENTE,
+                  origen=f"{lat + rnd.uniform(-.5, .5)},{lon + rnd.uniform(-.5, .5)}",
+                  destino=f"{lat + rnd.uniform(-.5, .5)},{lon + rnd.uniform(-.5, .5)}")
+            for c in range(loads)
+        ]
+        vehiculo = Vehiculo(id=f"V{v}", matricula=f"V{v}", marca="Mercedes", modelo="Actros",
+                            tipo=TipoVehiculo.CAMION, capacidad_carga=10000.0,
+                            fecha_matriculacion=datetime(2020, 1, 15))
+        flota.append((vehiculo, (lat, lon), cargas))
+    return flota
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--vehicles", type=int, default=500, help="Vehicles in the fleet")
+    parser.add_argument("--loads", type=int, default=10, help="Pending loads per vehicle (two stops each)")
+    parser.add_argument("--budget", type=float, default=20.0, help="Improvement time budget in seconds")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs")
+    parser.add_argument("--seed", type=int, default=1, help="Fleet seed")
+    parser.add_argument("--output", type=Path, help="Result file (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    flota = build_fleet(args.vehicles, args.loads, args.seed)
+    secuenciador = SecuenciadorRutas(presupuesto_segundos=args.budget)
+    tiempos = []
+    for _ in range(args.repeat):
+        inicio = time.perf_counter()
+        plan = secuenciador.planificar(flota, SALIDA)
+        tiempos.append(time.perf_counter() - inicio)
+
+    report: Dict[str, Any] = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "vehicles": args.vehicles,
+        "loads_per_vehicle": args.loads,
+        "budget_s": args.budget,
+        "seed": args.seed,
+        "stops": sum(len(ruta.paradas) for ruta in plan.rutas),
+        "completo": plan.completo,
+        "best_s": round(min(tiempos), 4),
+        "median_s": round(statistics.median(tiempos), 4),
+    }
+    print(f"{args.vehicles} vehiculos x {2 * args.loads} paradas  best {report['best_s']:.3f} s  "
+          f"median {report['median_s']:.3f} s  completo {plan.completo}")
+
+    output = args.output or RESULTS_DIR / f"routes_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"Results written to {output}")
+    return report
+
+if __name__ == "__main__":
+    main()
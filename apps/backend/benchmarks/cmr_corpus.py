@@ -0,0 +1,211 @@
+"""
+Synthetic CMR corpus for benchmarks
+
+Generates varied CMR documents: Spanish, French and English labels, missing
+sections, long special instructions and free-text noise. Generation is
+seeded, so the same arguments always produce the same corpus and benchmark
+runs stay comparable.
+"""
+import random
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+LABELS = {
+    "es": {
+        "title": "CMR - Carta de Porte Internacional",
+        "numero": "N° CMR",
+        "remitente": "REMITENTE / EXPEDITEUR / SENDER",
+        "destinatario": "DESTINATARIO / DESTINATAIRE / RECIPIENT",
+        "fechas": "FECHAS / DATES",
+        "emision": "Fecha de emisión",
+        "carga_fecha": "Fecha de carga",
+        "entrega": "Fecha de entrega",
+        "vehiculo": "VEHÍCULO / VEHICLE",
+        "matricula": "Matrícula",
+        "conductor": "Conductor",
+        "carga": "CARGA / CHARGE / LOAD",
+        "descripcion": "Descripción",
+        "peso": "Peso bruto",
+        "volumen": "Volumen",
+        "unidades": "Unidades",
+        "valor": "Valor mercancía",
+        "contacto": "Contacto",
+        "instrucciones": "INSTRUCCIONES ESPECIALES",
+    },
+    "fr": {
+        "title": "CMR - Lettre de voiture internationale",
+        "numero": "No CMR",
+        "remitente": "EXPÉDITEUR",
+        "destinatario": "DESTINATAIRE",
+        "fechas": "DATES",
+        "emision": "Date d'émission",
+        "carga_fecha": "Date de chargement",
+        "entrega": "Date de livraison",
+        "vehiculo": "VÉHICULE",
+        "matricula": "Immatriculation",
+        "conductor": "Chauffeur",
+        "carga": "CHARGE",
+        "descripcion": "Description",
+        "peso": "Poids brut",
+        "volumen": "Volume",
+        "unidades": "Unités",
+        "valor": "Valeur marchandise",
+        "contacto": "Contact",
+        "instrucciones": "INSTRUCTIONS",
+    },
+    "en": {
+        "title": "CMR - International Consignment Note",
+        "numero": "CMR",
+        "remitente": "SENDER",
+        "destinatario": "RECIPIENT",
+        "fechas": "DATES",
+        "emision": "Date of issue",
+        "carga_fecha": "Loading date",
+        "entrega": "Delivery date",
+        "vehiculo": "VEHICLE",
+        "matricula": "License plate",
+        "conductor": "Driver",
+        "carga": "LOAD",
+        "descripcion": "Description",
+        "peso": "Gross weight",
+        "volumen": "Volume",
+        "unidades": "Units",
+        "valor": "Goods value",
+        "contacto": "Contact",
+        "instrucciones": "INSTRUCTIONS",
+    },
+}
+
+COMPANIES = [
+    "Transportes Ibéricos S.A.", "Logística del Norte S.L.", "Frigoríficos Levante S.A.",
+    "Transports Dubois SARL", "Messageries Lyonnaises SA", "Northern Freight Ltd.",
+    "Atlantic Haulage Ltd.", "Spedition Weber GmbH", "Cargas Galicia S.L.",
+]
+STREETS = ["Calle Mayor", "Avenida Industrial", "Rue de la Gare", "High Street", "Polígono Sur", "Quai Est"]
+CITIES = [
+    ("Madrid", "España"), ("Barcelona", "España"), ("Valencia", "España"), ("Lyon", "France"),
+    ("Paris", "France"), ("Lisboa", "Portugal"), ("Manchester", "United Kingdom"), ("Milano", "Italia"),
+]
+PEOPLE = ["Juan Pérez", "María García", "Carlos Rodríguez", "Anne Martin", "Luc Bernard", "John Smith"]
+GOODS = [
+    "Mercancía general - electrodomésticos", "Palettes de produits frais", "Spare parts",
+    "Material de construcción", "Textiles", "Productos químicos envasados",
+]
+INSTRUCTION_LINES = [
+    "Manejar con cuidado.", "Temperatura controlada 2-8°C.", "No apilar más de dos palets.",
+    "Livraison sur rendez-vous uniquement.", "Call the consignee one hour before arrival.",
+    "Documentación aduanera adjunta.", "Mantener seco.", "Ne pas exposer au soleil.",
+]
+
+# Probability that each optional section is left out of a document
+MISSING_SECTION_RATE = 0.15
+# Share of documents with very long special instructions
+LONG_INSTRUCTIONS_RATE = 0.1
+
+def generate_document(rng: random.Random, index: int) -> Tuple[str, Dict[str, Any]]:
+    """
+    Generate one CMR text and the values the normalizer should find in it
+
+    Returns:
+        (text, expected) where ``expected`` holds the ground-truth fields
+    """
+    language = rng.choice(sorted(LABELS))
+    labels = LABELS[language]
+    numero = f"CMR-{rng.randint(2020, 2025)}-{index:06d}"
+    plate = f"{rng.randint(1000, 9999)}-{''.join(rng.choice('BCDFGHJKLMNPRSTVWXYZ') for _ in range(3))}"
+    weight = float(rng.randint(50, 24000))
+    day, month, year = rng.randint(1, 25), rng.randint(1, 12), rng.randint(2020, 2025)
+    expected = {"numero_cmr": numero, "matricula_vehiculo": plate, "peso_bruto": weight}
+
+    lines = [labels["title"], f"{labels['numero']}: {numero}", ""]
+
+    for section in ("remitente", "destinatario"):
+        if rng.random() < MISSING_SECTION_RATE:
+            continue
+        city, country = rng.choice(CITIES)
+        lines += [
+            labels[section],
+            rng.choice(COMPANIES),
+            f"{rng.choice(STREETS)} {rng.randint(1, 300)}",
+            f"{city}, {country}",
+            f"{labels['contacto']}: {rng.choice(PEOPLE)}",
+            "",
+        ]
+
+    if rng.random() >= MISSING_SECTION_RATE:
+        lines += [
+            labels["fechas"],
+            f"{labels['emision']}: {day:02d}/{month:02d}/{year}",
+            f"{labels['carga_fecha']}: {day + 1:02d}/{month:02d}/{year}",
+            f"{labels['entrega']}: {day + 3:02d}/{month:02d}/{year}",
+            "",
+        ]
+
+    lines += [labels["vehiculo"], f"{labels['matricula']}: {plate}"]
+    if rng.random() >= MISSING_SECTION_RATE:
+        lines.append(f"{labels['conductor']}: {rng.choice(PEOPLE)}")
+    lines.append("")
+
+    lines += [
+        labels["carga"],
+        f"{labels['descripcion']}: {rng.choice(GOODS)}",
+        f"{labels['peso']}: {weight:.0f} kg",
+    ]
+    if rng.random() >= MISSING_SECTION_RATE:
+        lines += [
+            f"{labels['volumen']}: {rng.randint(1, 90)} m³",
+            f"{labels['unidades']}: {rng.randint(1, 400)} paquetes",
+            f"{labels['valor']}: {rng.randint(100, 90000)} €",
+        ]
+    lines.append("")
+
+    if rng.random() < LONG_INSTRUCTIONS_RATE:
+        instruction_count = rng.randint(50, 200)
+    else:
+        instruction_count = rng.randint(0, 3)
+    if instruction_count:
+        lines.append(labels["instrucciones"])
+        lines += [rng.choice(INSTRUCTION_LINES) for _ in range(instruction_count)]
+
+    return "\n".join(lines), expected
+
+def generate_corpus(count: int, seed: int = 2024) -> List[Tuple[str, Dict[str, Any]]]:
+    """Generate ``count`` documents with their expected fields"""
+    rng = random.Random(seed)
+    return [generate_document(rng, index) for index in range(count)]
+
+def _pdf_string(line: str) -> bytes:
+    """Encode a line as a PDF literal string in WinAnsi encoding"""
+    data = line.encode("cp1252", errors="replace")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+def build_text_pdf(text: str, extra_pages: Optional[List[str]] = None) -> bytes:
+    """
+    Wrap text in a minimal text-layer PDF, one line per text row
+
+    ``extra_pages`` adds non-CMR pages after the CMR page, like the delivery
+    notes and invoices found in real bundles.
+    """
+    page_texts = [text] + (extra_pages or [])
+    objects: List[bytes] = [
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+    ]
+    pages_ref = 1 + 2 * len(page_texts) + 1
+    page_refs = []
+    for page in page_texts:
+        rows = [b"BT /F1 9 Tf 40 800 Td 11 TL"]
+        rows += [_pdf_string(line) + b" '" for line in page.split("\n")]
+        rows.append(b"ET")
+        content = zlib.compress(b"\n".join(rows))
+        objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(content), content))
+        objects.append(b"<< /Type /Page /Parent %d 0 R /Contents %d 0 R >>" % (pages_ref, len(objects)))
+        page_refs.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % ref for ref in page_refs)
+    objects.append(b"<< /Type /Pages /Kids [%s] /Count %d /Resources << /Font << /F1 1 0 R >> >> >>" % (kids, len(page_refs)))
+    objects.append(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_ref)
+
+    out = bytearray(b"%PDF-1.4\n")
+    for number, body in enumerate(objects, start=1):
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\n%%%%EOF\n" % (len(objects) + 1, len(objects))
+    return bytes(out)
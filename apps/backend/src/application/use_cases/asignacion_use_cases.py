@@ -0,0 +1,66 @@
+"""
+Use cases for assigning pending loads to vehicles
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.domain.entities.asignacion import PlanAsignacion
+from src.domain.entities.carga import Carga, EstadoCarga
+from src.domain.entities.posicion import TipoSeguimiento
+from src.domain.entities.vehiculo import Vehiculo
+from src.domain.repositories.interfaces import CargaRepository, PosicionRepository, VehiculoRepository
+from src.domain.services.assignment_optimizer import OptimizadorAsignacion
+
+class AsignarCargasUseCase:
+    """Use case for proposing which available vehicle picks up each pending load"""
+
+    def __init__(self, carga_repository: CargaRepository, vehiculo_repository: VehiculoRepository,
+                 position_history: PosicionRepository, optimizador: OptimizadorAsignacion):
+        self.carga_repository = carga_repository
+        self.vehiculo_repository = vehiculo_repository
+        self.position_history = position_history
+        self.optimizador = optimizador
+
+    def execute(self, carga_ids: Optional[Sequence[str]] = None) -> PlanAsignacion:
+        """
+        Plan the assignment of the stored pending loads without a vehicle
+
+        With ``carga_ids`` only those loads are planned; ids that are
+        unknown, not pending or already assigned are reported in the plan's
+        ``sin_asignar``, like every other load left out. Without them, every
+        pending load is considered and pending loads that already have a
+        vehicle are reported.
+
+        Candidates are the vehicles that are available for use and have a
+        tracked position; the plan is returned without changing any load.
+        """
+        sin_asignar: Dict[str, str] = {}
+        if carga_ids is None:
+            cargas: List[Carga] = self.carga_repository.find_by_estado(EstadoCarga.PENDIENTE)
+        else:
+            cargas = []
+            for carga_id in dict.fromkeys(carga_ids):
+                carga = self.carga_repository.find_by_id(carga_id)
+                if carga is None:
+                    sin_asignar[carga_id] = "carga no encontrada"
+                elif carga.estado != EstadoCarga.PENDIENTE:
+                    sin_asignar[carga_id] = "carga no pendiente"
+                else:
+                    cargas.append(carga)
+
+        pendientes = []
+        for carga in cargas:
+            if carga.vehiculo_id is not None:
+                sin_asignar[carga.id] = "ya asignada a un vehiculo"
+            else:
+                pendientes.append(carga)
+
+        vehiculos: List[Tuple[Vehiculo, Tuple[float, float]]] = []
+        for vehiculo in self.vehiculo_repository.find_disponibles():
+            if not vehiculo.esta_disponible():
+                continue
+            posicion = self.position_history.latest(TipoSeguimiento.VEHICULO.value, vehiculo.id)
+            if posicion is not None:
+                vehiculos.append((vehiculo, (posicion[1], posicion[2])))
+
+        plan = self.optimizador.optimizar(pendientes, vehiculos)
+        plan.sin_asignar.update(sin_asignar)
+        return plan
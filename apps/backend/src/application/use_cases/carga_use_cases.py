@@ -0,0 +1,118 @@
+"""
+Use cases for load management
+"""
+from datetime import datetime
+from typing import List, Optional
+from src.domain.entities.carga import Carga, EstadoCarga, TipoCarga
+from src.domain.repositories.interfaces import CargaRepository
+from src.domain.services.id_generator import IdGenerator, default_id_generator
+
+class CrearCargaUseCase:
+    """Use case for registering a new load"""
+
+    def __init__(self, carga_repository: CargaRepository,
+                 id_generator: Optional[IdGenerator] = None):
+        self.carga_repository = carga_repository
+        self.id_generator = id_generator or default_id_generator
+
+    def execute(self, descripcion: str, tipo: TipoCarga, peso: float, origen: str, destino: str,
+                volumen: Optional[float] = None, valor_declarado: Optional[float] = None,
+                entrega_desde: Optional[datetime] = None,
+                entrega_hasta: Optional[datetime] = None) -> Carga:
+        """Create a pending load"""
+        if entrega_desde is not None and entrega_hasta is not None and entrega_hasta < entrega_desde:
+            raise ValueError("'entrega_hasta' must not be earlier than 'entrega_desde'")
+
+        carga = Carga(
+            id=self.id_generator.next_id("CRG"),
+            descripcion=descripcion,
+            tipo=tipo,
+            peso=peso,
+            volumen=volumen,
+            valor_declarado=valor_declarado,
+            origen=origen,
+            destino=destino,
+            entrega_desde=entrega_desde,
+            entrega_hasta=entrega_hasta
+        )
+        self.carga_repository.save(carga)
+        return carga
+
+class ObtenerCargaUseCase:
+    """Use case for getting a load by ID"""
+
+    def __init__(self, carga_repository: CargaRepository):
+        self.carga_repository = carga_repository
+
+    def execute(self, carga_id: str) -> Optional[Carga]:
+        """Get a load by ID"""
+        return self.carga_repository.find_by_id(carga_id)
+
+class ListarCargasUseCase:
+    """Use case for listing loads"""
+
+    def __init__(self, carga_repository: CargaRepository):
+        self.carga_repository = carga_repository
+
+    def execute(self, estado: Optional[EstadoCarga] = None, vehiculo_id: Optional[str] = None,
+                flota_id: Optional[str] = None) -> List[Carga]:
+        """List loads, narrowed by the first filter given: status, vehicle or fleet"""
+        if estado is not None:
+            cargas = self.carga_repository.find_by_estado(estado)
+        elif vehiculo_id is not None:
+            cargas = self.carga_repository.find_by_vehiculo(vehiculo_id)
+        elif flota_id is not None:
+            cargas = self.carga_repository.find_by_flota(flota_id)
+        else:
+            cargas = self.carga_repository.find_all()
+        return [
+            carga for carga in cargas
+            if (vehiculo_id is None or carga.vehiculo_id == vehiculo_id)
+            and (flota_id is None or carga.flota_id == flota_id)
+        ]
+
+class CambiarEstadoCargaUseCase:
+    """Use case for changing load status"""
+
+    def __init__(self, carga_repository: CargaRepository):
+        self.carga_repository = carga_repository
+
+    def execute(self, carga_id: str, nuevo_estado: EstadoCarga) -> Optional[Carga]:
+        """Change load status"""
+        carga = self.carga_repository.find_by_id(carga_id)
+        if not carga:
+            return None
+
+        carga.cambiar_estado(nuevo_estado)
+        self.carga_repository.save(carga)
+        return carga
+
+class AsignarVehiculoCargaUseCase:
+    """Use case for assigning a load to a vehicle"""
+
+    def __init__(self, carga_repository: CargaRepository):
+        self.carga_repository = carga_repository
+
+    def execute(self, carga_id: str, vehiculo_id: str) -> Optional[Carga]:
+        """Assign a load to a vehicle"""
+        carga = self.carga_repository.find_by_id(carga_id)
+        if not carga:
+            return None
+
+        carga.asignar_vehiculo(vehiculo_id)
+        self.carga_repository.save(carga)
+        return carga
+
+class EliminarCargaUseCase:
+    """Use case for deleting a load"""
+
+    def __init__(self, carga_repository: CargaRepository):
+        self.carga_repository = carga_repository
+
+    def execute(self, carga_id: str) -> bool:
+        """Delete a load"""
+        if not self.carga_repository.find_by_id(carga_id):
+            return False
+
+        self.carga_repository.delete(carga_id)
+        return True
@@ -1,39 +1,281 @@
 """
 CMR document processing use cases
 """
-from typing import Optional
-from domain.entities.cmr_document import CMRDocument
-from domain.services.cmr_normalizer import CMRNormalizer
+import asyncio
+import io
+import mmap
+import os
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+from src.domain.entities.cmr_document import CMRDocument, CMRExtractionResult, EstadoCMR
+from src.domain.repositories.interfaces import CMRRepository
+from src.domain.services.cmr_cache import CMRResultCache
+from src.domain.services.cmr_normalizer import (
+    DEFAULT_MIN_CONFIDENCE,
+    CMRExtractor,
+    CMRNormalizer,
+    DocumentData,
+    MockCMRExtractor
+)
+from src.domain.services.matricula_resolver import MatriculaResolver
+from src.domain.services.pdf_text_extractor import PDFTextCMRExtractor
+from src.domain.value_objects.fecha import a_utc
+
+# Extractors selectable with the CMR_EXTRACTOR environment variable
+CMR_EXTRACTORS = {
+    "mock": MockCMRExtractor,
+    "pdf": PDFTextCMRExtractor
+}
+
+# Largest document accepted for processing (10MB)
+MAX_DOCUMENT_SIZE = 10 * 1024 * 1024
+
+# Largest batch upload accepted, all files and archives together (200MB)
+MAX_BATCH_SIZE = 20 * MAX_DOCUMENT_SIZE
+
+# Documents above this size are memory-mapped instead of read; uploads this
+# large have already been spooled to disk (1MB, as in Starlette)
+MAP_THRESHOLD = 1024 * 1024
+
+# Normalizer built once per worker process by ``procesar_documento_cmr``
+_worker_normalizer: Optional[CMRNormalizer] = None
+
+def procesar_documento_cmr(filename: str, document_bytes: bytes) -> Dict[str, Any]:
+    """
+    Extract, normalize and validate one CMR document in a worker process
+
+    Module-level so it can be pickled and sent to a ``ProcessPoolExecutor``.
+
+    Returns:
+        JSON-ready result with ``status`` "ok", "invalid" or "error"
+    """
+    global _worker_normalizer
+    if _worker_normalizer is None:
+        _worker_normalizer = build_worker_normalizer()
+
+    try:
+        document = ProcesarCMRUseCase(_worker_normalizer).execute(document_bytes)
+    except ValueError as e:
+        return {"filename": filename, "status": "error", "error": str(e)}
+
+    return _result(filename, document)
+
+@contextmanager
+def _map_document(document_file: BinaryIO, size: int) -> Iterator[DocumentData]:
+    """
+    Expose an open file's contents as a read-only buffer
+
+    In-memory buffers are shared without copying and large files are
+    memory-mapped. Small files, which an upload spool still holds in
+    memory, are read: asking a spool for its descriptor would write it to
+    disk first.
+    """
+    if isinstance(document_file, io.BytesIO):
+        view = document_file.getbuffer()
+        try:
+            yield view
+        finally:
+            view.release()
+        return
+
+    if size > MAP_THRESHOLD:
+        try:
+            fileno = document_file.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            pass
+        else:
+            with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+            return
+
+    document_file.seek(0)
+    yield document_file.read()
+
+def create_cmr_extractor(name: Optional[str] = None) -> CMRExtractor:
+    """Create the configured extractor (``CMR_EXTRACTOR``, "mock" by default)"""
+    name = name or os.getenv("CMR_EXTRACTOR", "mock")
+    try:
+        return CMR_EXTRACTORS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown CMR extractor: {name}")
+
+def build_worker_normalizer() -> CMRNormalizer:
+    """Normalizer used by worker processes"""
+    return CMRNormalizer(create_cmr_extractor())
+
+def _result(filename: str, document: CMRDocument) -> Dict[str, Any]:
+    """Batch result line for a processed document"""
+    status = "ok" if ValidarCMRUseCase().execute(document) else "invalid"
+    return {"filename": filename, "status": status, "document": document.model_dump(mode="json")}
+
+class CMRIncompleteError(Exception):
+    """A document was rejected because its mandatory fields could not be trusted"""
+
+    def __init__(self, result: CMRExtractionResult):
+        self.result = result
+        super().__init__("; ".join(result.errors) or "Incomplete CMR document")
 
 class ProcesarCMRUseCase:
     """Use case for processing CMR documents"""
 
-    def __init__(self, cmr_normalizer: CMRNormalizer):
+    def __init__(
+        self,
+        cmr_normalizer: CMRNormalizer,
+        cache: Optional[CMRResultCache] = None,
+        early_exit: bool = False,
+        min_confidence: float = DEFAULT_MIN_CONFIDENCE
+    ):
         self.cmr_normalizer = cmr_normalizer
+        self.cache = cache
+        # Reject documents with missing or low-confidence mandatory fields before full parsing
+        self.early_exit = early_exit
+        self.min_confidence = min_confidence
 
-    def execute(self, document_bytes: bytes) -> CMRDocument:
+    def execute(self, document_bytes: DocumentData) -> CMRDocument:
         """
         Process CMR document and return normalized data
 
         Args:
-            document_bytes: Raw PDF document bytes
+            document_bytes: Raw PDF document bytes (or a bytes-like view)
 
         Returns:
             Normalized CMR document
+
+        Raises:
+            CMRIncompleteError: With ``early_exit``, if a mandatory field is
+                missing or below ``min_confidence``
         """
         if not document_bytes:
             raise ValueError("Document bytes cannot be empty")
 
         # Validate document size (max 10MB)
-        max_size = 10 * 1024 * 1024  # 10MB
-        if len(document_bytes) > max_size:
-            raise ValueError(f"Document size exceeds maximum allowed size of {max_size} bytes")
+        if len(document_bytes) > MAX_DOCUMENT_SIZE:
+            raise ValueError(f"Document size exceeds maximum allowed size of {MAX_DOCUMENT_SIZE} bytes")
+
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(document_bytes, self.cmr_normalizer.version)
+            cached = self.cache.get(key)
+            if cached is not None:
+                document = CMRDocument.model_validate(cached)
+                if self.early_exit:
+                    self._require_complete(self.cmr_normalizer.check_document(document, self.min_confidence))
+                return document
 
         # Process document using domain service
-        normalized_document = self.cmr_normalizer.normalize_document(document_bytes)
+        if self.early_exit:
+            result = self.cmr_normalizer.normalize_with_early_exit(document_bytes, self.min_confidence)
+            self._require_complete(result)
+            normalized_document = result.document
+        else:
+            normalized_document = self.cmr_normalizer.normalize_document(document_bytes)
+
+        # Failed extractions are not cached so that a retry runs again
+        if key is not None and normalized_document.estado_procesamiento == EstadoCMR.PROCESADO:
+            self.cache.put(key, normalized_document.model_dump(mode="json"))
 
         return normalized_document
 
+    def execute_file(self, document_file: BinaryIO) -> CMRDocument:
+        """
+        Process a CMR document from an open binary file
+
+        The size is checked before anything is read. Files larger than
+        ``MAP_THRESHOLD`` reach the extractor as a memory-mapped view instead
+        of a copy of their contents.
+
+        Args:
+            document_file: Seekable file with the raw PDF document
+
+        Returns:
+            Normalized CMR document
+        """
+        document_file.seek(0, os.SEEK_END)
+        size = document_file.tell()
+        document_file.seek(0)
+
+        if size == 0:
+            raise ValueError("Document bytes cannot be empty")
+        if size > MAX_DOCUMENT_SIZE:
+            raise ValueError(f"Document size exceeds maximum allowed size of {MAX_DOCUMENT_SIZE} bytes")
+
+        with _map_document(document_file, size) as document:
+            return self.execute(document)
+
+    @staticmethod
+    def _require_complete(result: CMRExtractionResult) -> None:
+        if not result.complete:
+            raise CMRIncompleteError(result)
+
+class ObtenerCMRUseCase:
+    """Use case for getting a stored CMR document by number"""
+
+    def __init__(self, cmr_repository: CMRRepository):
+        self.cmr_repository = cmr_repository
+
+    def execute(self, numero_cmr: str) -> Optional[CMRDocument]:
+        """Get a CMR document by number"""
+        return self.cmr_repository.find_by_numero(numero_cmr)
+
+class ListarCMRUseCase:
+    """Use case for listing stored CMR documents"""
+
+    def __init__(self, cmr_repository: CMRRepository):
+        self.cmr_repository = cmr_repository
+
+    def execute(self, matricula: Optional[str] = None, desde: Optional[datetime] = None,
+                hasta: Optional[datetime] = None, offset: int = 0,
+                limit: Optional[int] = None) -> Tuple[List[CMRDocument], int]:
+        """
+        List CMR documents by plate and issue date range, oldest first
+
+        Returns:
+            The requested page and the total number of matching documents
+        """
+        desde, hasta = a_utc(desde), a_utc(hasta)
+        if desde is not None and hasta is not None and hasta < desde:
+            raise ValueError("'hasta' must not be earlier than 'desde'")
+        documentos = self.cmr_repository.search(matricula, desde, hasta, offset=offset, limit=limit)
+        return documentos, self.cmr_repository.count(matricula, desde, hasta)
+
+class ConciliarCMRUseCase:
+    """Use case for linking stored CMR documents to fleet vehicles by plate"""
+
+    def __init__(self, cmr_repository: CMRRepository, resolver: MatriculaResolver):
+        self.cmr_repository = cmr_repository
+        self.resolver = resolver
+
+    def execute(self, matricula: Optional[str] = None, desde: Optional[datetime] = None,
+                hasta: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Resolve the plates of the selected CMRs in one pass and store the links
+
+        Returns:
+            Number of documents checked and linked, and the plates without a vehicle
+        """
+        documentos = self.cmr_repository.search(matricula, desde, hasta)
+        vehiculos = self.resolver.resolve(documento.matricula_vehiculo for documento in documentos)
+
+        vinculados = 0
+        sin_vehiculo = set()
+        for documento in documentos:
+            vehiculo_id = vehiculos[documento.matricula_vehiculo]
+            if vehiculo_id is None:
+                sin_vehiculo.add(documento.matricula_vehiculo)
+            else:
+                vinculados += 1
+            # Only write documents whose link changed
+            if documento.vehiculo_id != vehiculo_id:
+                self.cmr_repository.save(documento.model_copy(update={"vehiculo_id": vehiculo_id}))
+
+        return {
+            "total": len(documentos),
+            "vinculados": vinculados,
+            "sin_vehiculo": sorted(sin_vehiculo)
+        }
+
 class ValidarCMRUseCase:
     """Use case for validating CMR document data"""
 
@@ -47,8 +289,9 @@ class ValidarCMRUseCase:
         Returns:
             True if valid, False otherwise
         """
-        # Basic validation rules
-        if not cmr_document.numero_cmr or cmr_document.numero_cmr == "ERROR":
+        # Basic validation rules; documents are stored by number, so the
+        # placeholder of an unnumbered document must not pass
+        if not cmr_document.numero_cmr or cmr_document.numero_cmr in ("ERROR", "CMR-UNKNOWN"):
             return False
 
         if not cmr_document.remitente.nombre or cmr_document.remitente.nombre == "Error":
@@ -69,3 +312,80 @@ class ValidarCMRUseCase:
                 return False
 
         return True
+
+class ProcesarLoteCMRUseCase:
+    """Use case for processing a batch of CMR documents in parallel"""
+
+    def __init__(self, executor: Executor, max_pending: int = 8,
+                 cache: Optional[CMRResultCache] = None, version: Optional[str] = None):
+        # Cached results are keyed by the workers' normalizer version
+        if cache is not None and version is None:
+            raise ValueError("A normalizer version is required to use the result cache")
+        self.executor = executor
+        self.max_pending = max_pending
+        self.cache = cache
+        self.version = version
+
+    def _next(self, documents: Iterator[Tuple[int, Tuple[str, bytes]]]) -> Optional[Tuple[int, str, bytes, Optional[str]]]:
+        """Read the next document and its cache key, or None at the end"""
+        for index, (filename, document_bytes) in documents:
+            key = self.cache.key(document_bytes, self.version) if self.cache is not None and document_bytes else None
+            return index, filename, document_bytes, key
+        return None
+
+    async def execute(self, documents: Iterable[Tuple[str, bytes]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process documents on the executor and yield results as they finish
+
+        At most ``max_pending`` documents are in flight at once, so a large
+        batch (or a lazily read archive) is not loaded into the workers at once.
+        Documents are read and hashed in a thread, off the event loop, and
+        those already in the cache are answered without being dispatched.
+
+        Args:
+            documents: (filename, document bytes) pairs
+
+        Yields:
+            One result per document, in completion order, tagged with its
+            position in the batch as ``index``
+        """
+        loop = asyncio.get_running_loop()
+        pending: Dict[asyncio.Future, Tuple[int, str, Optional[str]]] = {}
+        documents = iter(enumerate(documents))
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(pending) < self.max_pending:
+                    siguiente = await loop.run_in_executor(None, self._next, documents)
+                    if siguiente is None:
+                        exhausted = True
+                        break
+                    index, filename, document_bytes, key = siguiente
+                    if key is not None:
+                        cached = self.cache.get(key)
+                        if cached is not None:
+                            yield {"index": index, **_result(filename, CMRDocument.model_validate(cached))}
+                            continue
+
+                    future = loop.run_in_executor(self.executor, procesar_documento_cmr, filename, document_bytes)
+                    pending[future] = (index, filename, key)
+
+                if not pending:
+                    return
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    index, filename, key = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {"filename": filename, "status": "error",
+                                  "error": f"Error processing document: {str(e)}"}
+                    document = result.get("document")
+                    if key is not None and document and document["estado_procesamiento"] == EstadoCMR.PROCESADO.value:
+                        self.cache.put(key, document)
+                    yield {"index": index, **result}
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,25 @@
+"""
+Use cases for reading changes to vehicles, loads and fleets
+"""
+from typing import Iterable, List, Optional
+from src.domain.entities.evento_cambio import EventoCambio, TipoEntidad
+from src.domain.services.change_events import ChangeEventBus
+
+class ConsultarEventosCambioUseCase:
+    """Use case for reading change events after a known offset"""
+
+    def __init__(self, bus: ChangeEventBus):
+        self.bus = bus
+
+    def execute(self, despues: int = 0, limit: Optional[int] = None,
+                entidades: Optional[Iterable[TipoEntidad]] = None) -> List[EventoCambio]:
+        """
+        Events after sequence number ``despues``, oldest first
+
+        Raises:
+            LookupError: If events after ``despues`` were already dropped
+                from the log, so the caller must reload the collections
+        """
+        if self.bus.perdidos(despues):
+            raise LookupError(f"Events after {despues} are no longer available")
+        return self.bus.eventos(despues, limit, entidades)
@@ -4,17 +4,19 @@ Use cases for fleet management
 from typing import List, Optional
 from src.domain.entities.flota import Flota
 from src.domain.repositories.interfaces import FlotaRepository
+from src.domain.services.id_generator import IdGenerator, default_id_generator
 
 class CrearFlotaUseCase:
     """Use case for creating a new fleet"""
 
-    def __init__(self, flota_repository: FlotaRepository):
+    def __init__(self, flota_repository: FlotaRepository,
+                 id_generator: Optional[IdGenerator] = None):
         self.flota_repository = flota_repository
+        self.id_generator = id_generator or default_id_generator
 
     def execute(self, nombre: str, descripcion: Optional[str] = None) -> Flota:
         """Create a new fleet"""
-        # Generate a simple ID (in production, use UUID or similar)
-        flota_id = f"FLT{len(self.flota_repository.find_all()) + 1:03d}"
+        flota_id = self.id_generator.next_id("FLT")
 
         flota = Flota(
             id=flota_id,
@@ -0,0 +1,99 @@
+"""
+Use cases for geofences around depots and customer sites
+"""
+from typing import List, Optional, Tuple
+from src.domain.entities.geocerca import EventoGeocerca, Geocerca, TipoGeocerca
+from src.domain.services.distance_cache import DistanceCache
+from src.domain.services.geofence_engine import GeofenceEngine
+
+class RegistrarGeocercaUseCase:
+    """Use case for adding or replacing a geofence"""
+
+    def __init__(self, engine: GeofenceEngine):
+        self.engine = engine
+
+    def execute(self, geocerca: Geocerca) -> Geocerca:
+        """Register a geofence; raises ValueError for an invalid shape"""
+        return self.engine.registrar(geocerca)
+
+class ObtenerGeocercaUseCase:
+    """Use case for getting a geofence by ID"""
+
+    def __init__(self, engine: GeofenceEngine):
+        self.engine = engine
+
+    def execute(self, geocerca_id: str) -> Optional[Geocerca]:
+        """Get a geofence by ID"""
+        return self.engine.obtener(geocerca_id)
+
+class ListarGeocercasUseCase:
+    """Use case for listing geofences"""
+
+    def __init__(self, engine: GeofenceEngine):
+        self.engine = engine
+
+    def execute(self, propietario_id: Optional[str] = None) -> List[Geocerca]:
+        """List geofences, optionally only those of one depot or customer"""
+        geocercas = self.engine.geocercas()
+        if propietario_id is not None:
+            geocercas = [g for g in geocercas if g.propietario_id == propietario_id]
+        return geocercas
+
+class EliminarGeocercaUseCase:
+    """Use case for removing a geofence"""
+
+    def __init__(self, engine: GeofenceEngine):
+        self.engine = engine
+
+    def execute(self, geocerca_id: str) -> bool:
+        """Remove a geofence"""
+        return self.engine.eliminar(geocerca_id)
+
+class ConsultarEventosGeocercaUseCase:
+    """Use case for reading entry and exit events"""
+
+    def __init__(self, engine: GeofenceEngine):
+        self.engine = engine
+
+    def execute(self, despues: int = 0, limit: Optional[int] = None) -> List[EventoGeocerca]:
+        """
+        Events after sequence number ``despues``, oldest first
+
+        Raises:
+            LookupError: If events after ``despues`` were already dropped
+                from the log, so the caller must re-read the tracks' states
+        """
+        if self.engine.perdidos(despues):
+            raise LookupError(f"Events after {despues} are no longer available")
+        return self.engine.eventos(despues, limit)
+
+class PrecalentarDistanciasDepositosUseCase:
+    """Use case for precomputing the distances between all depots"""
+
+    def __init__(self, engine: GeofenceEngine, cache: DistanceCache):
+        self.engine = engine
+        self.cache = cache
+
+    def execute(self, adicionales: Optional[List[Tuple[float, float]]] = None) -> int:
+        """
+        Fill the distance cache with every pair of depot geofences
+
+        A depot is located at its circle centre or at the mean of its
+        polygon vertices. ``adicionales`` are extra ``(latitud, longitud)``
+        points, e.g. frequent customer sites, included in the pairs.
+
+        Returns:
+            Number of pairs computed
+        """
+        puntos = []
+        for geocerca in self.engine.geocercas():
+            if geocerca.tipo != TipoGeocerca.DEPOSITO:
+                continue
+            if geocerca.centro is not None:
+                puntos.append((geocerca.centro.latitud, geocerca.centro.longitud))
+            elif geocerca.poligono:
+                puntos.append((
+                    sum(v.latitud for v in geocerca.poligono) / len(geocerca.poligono),
+                    sum(v.longitud for v in geocerca.poligono) / len(geocerca.poligono)
+                ))
+        return self.cache.precalentar(puntos + list(adicionales or []))
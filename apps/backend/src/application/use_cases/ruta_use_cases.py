@@ -0,0 +1,50 @@
+"""
+Use cases for sequencing the stops of vehicle routes
+"""
+from datetime import datetime
+from typing import Dict, List, Sequence, Tuple
+from src.domain.entities.carga import Carga
+from src.domain.entities.posicion import TipoSeguimiento
+from src.domain.entities.ruta_reparto import PlanRutas
+from src.domain.entities.vehiculo import Vehiculo
+from src.domain.repositories.interfaces import PosicionRepository, VehiculoRepository
+from src.domain.services.route_sequencer import SecuenciadorRutas
+
+class SecuenciarRutasUseCase:
+    """Use case for ordering the pickups and deliveries of each vehicle's loads"""
+
+    def __init__(self, vehiculo_repository: VehiculoRepository, position_history: PosicionRepository,
+                 secuenciador: SecuenciadorRutas):
+        self.vehiculo_repository = vehiculo_repository
+        self.position_history = position_history
+        self.secuenciador = secuenciador
+
+    def execute(self, cargas: Sequence[Carga], salida: datetime) -> PlanRutas:
+        """
+        Plan one route per vehicle the loads are assigned to
+
+        Each route starts at the vehicle's latest tracked position; loads
+        without a vehicle, or whose vehicle is unknown or has no position,
+        are reported in the plan's ``sin_secuenciar``.
+        """
+        sin_secuenciar: Dict[str, str] = {}
+        por_vehiculo: Dict[str, List[Carga]] = {}
+        for carga in cargas:
+            if carga.vehiculo_id is None:
+                sin_secuenciar[carga.id] = "sin vehiculo asignado"
+            else:
+                por_vehiculo.setdefault(carga.vehiculo_id, []).append(carga)
+
+        flota: List[Tuple[Vehiculo, Tuple[float, float], List[Carga]]] = []
+        for vehiculo_id, asignadas in por_vehiculo.items():
+            vehiculo = self.vehiculo_repository.find_by_id(vehiculo_id)
+            posicion = self.position_history.latest(TipoSeguimiento.VEHICULO.value, vehiculo_id)
+            if vehiculo is None or posicion is None:
+                motivo = "vehiculo no encontrado" if vehiculo is None else "vehiculo sin posicion"
+                sin_secuenciar.update((carga.id, motivo) for carga in asignadas)
+            else:
+                flota.append((vehiculo, (posicion[1], posicion[2]), asignadas))
+
+        plan = self.secuenciador.planificar(flota, salida)
+        plan.sin_secuenciar.update(sin_secuenciar)
+        return plan
@@ -0,0 +1,134 @@
+"""
+Use cases for GPS position tracking
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.domain.entities.posicion import PosicionGPS, ResumenRecorrido, TipoSeguimiento
+from src.domain.repositories.interfaces import PosicionRepository, VehiculoRepository
+from src.domain.services.geofence_engine import GeofenceEngine
+from src.domain.services.track_distance import AnalizadorRecorrido
+from src.domain.value_objects.fecha import a_utc
+
+def _epoch(fecha: Optional[datetime]) -> Optional[float]:
+    """Seconds since the epoch; naive timestamps are taken as UTC"""
+    return a_utc(fecha).timestamp() if fecha is not None else None
+
+def _validar_rango(desde: Optional[datetime], hasta: Optional[datetime]) -> None:
+    if desde is not None and hasta is not None and a_utc(hasta) < a_utc(desde):
+        raise ValueError("'hasta' must not be earlier than 'desde'")
+
+def _a_posicion(posicion: Tuple[float, float, float]) -> PosicionGPS:
+    t, lat, lon = posicion
+    return PosicionGPS(timestamp=datetime.fromtimestamp(t, tz=timezone.utc), latitud=lat, longitud=lon)
+
+class RegistrarPosicionesUseCase:
+    """Use case for ingesting a batch of GPS pings"""
+
+    def __init__(self, position_history: PosicionRepository, geocercas: Optional[GeofenceEngine] = None):
+        self.position_history = position_history
+        self.geocercas = geocercas
+
+    def execute(self, pings: Iterable[Tuple[TipoSeguimiento, str, PosicionGPS]]) -> int:
+        """
+        Store pings for loads and vehicles and return how many were added
+
+        With a geofence engine, the batch is evaluated against the
+        geofences as well; the events end up in the engine's event log.
+        """
+        rows = [
+            (tipo.value, track_id, _epoch(posicion.timestamp), posicion.latitud, posicion.longitud)
+            for tipo, track_id, posicion in pings
+        ]
+        registradas = self.position_history.ingest(rows)
+        if self.geocercas is not None:
+            self.geocercas.evaluar(rows)
+        return registradas
+
+class ConsultarPosicionesUseCase:
+    """Use case for reading the position history of a load or vehicle"""
+
+    def __init__(self, position_history: PosicionRepository):
+        self.position_history = position_history
+
+    def execute(self, tipo: TipoSeguimiento, track_id: str, desde: Optional[datetime] = None,
+                hasta: Optional[datetime] = None, limit: Optional[int] = None,
+                crudo: bool = False) -> List[PosicionGPS]:
+        """Positions with desde <= timestamp < hasta, oldest first"""
+        _validar_rango(desde, hasta)
+        posiciones = self.position_history.window(tipo.value, track_id, _epoch(desde), _epoch(hasta), limit, crudo)
+        return [_a_posicion(posicion) for posicion in posiciones]
+
+    def ultima(self, tipo: TipoSeguimiento, track_id: str) -> Optional[PosicionGPS]:
+        """Most recent position"""
+        posicion = self.position_history.latest(tipo.value, track_id)
+        return _a_posicion(posicion) if posicion is not None else None
+
+class AnalizarRecorridoUseCase:
+    """Use case for computing distance, speed segments and stops of a track"""
+
+    def __init__(self, position_history: PosicionRepository, analizador: Optional[AnalizadorRecorrido] = None):
+        self.position_history = position_history
+        self.analizador = analizador or AnalizadorRecorrido()
+
+    def execute(self, tipo: TipoSeguimiento, track_id: str, desde: Optional[datetime] = None,
+                hasta: Optional[datetime] = None) -> ResumenRecorrido:
+        """Analyse the positions with desde <= timestamp < hasta"""
+        _validar_rango(desde, hasta)
+        posiciones = self.position_history.window(tipo.value, track_id, _epoch(desde), _epoch(hasta))
+        return self.analizador.analizar(posiciones)
+
+class ContrastarKilometrajeUseCase:
+    """Use case for checking odometer readings against GPS distance for the whole fleet"""
+
+    def __init__(self, position_history: PosicionRepository, vehiculo_repository: VehiculoRepository,
+                 analizador: Optional[AnalizadorRecorrido] = None):
+        self.position_history = position_history
+        self.vehiculo_repository = vehiculo_repository
+        self.analizador = analizador or AnalizadorRecorrido()
+
+    def execute(self, desde: datetime, hasta: datetime, kilometraje_inicial: Dict[str, float],
+                tolerancia: float = 0.05) -> List[Dict[str, Any]]:
+        """
+        Compare the odometer advance of each vehicle with its GPS distance
+
+        Args:
+            desde, hasta: Window of the GPS history to measure
+            kilometraje_inicial: Odometer reading per vehicle ID at ``desde``
+            tolerancia: Relative difference still considered a match
+
+        Returns:
+            One entry per vehicle with both distances; vehicles without an
+            initial reading only get the GPS distance
+        """
+        _validar_rango(desde, hasta)
+        vehiculos = self.vehiculo_repository.find_all()
+        recorridos = {
+            vehiculo.id: self.position_history.window(
+                TipoSeguimiento.VEHICULO.value, vehiculo.id, _epoch(desde), _epoch(hasta)
+            )
+            for vehiculo in vehiculos
+        }
+        # One Haversine pass over every vehicle's legs
+        distancias = self.analizador.distancias(recorridos)
+
+        resultado = []
+        for vehiculo in vehiculos:
+            distancia_gps = distancias[vehiculo.id]
+            entrada: Dict[str, Any] = {
+                "vehiculo_id": vehiculo.id,
+                "matricula": vehiculo.matricula,
+                "distancia_gps_km": round(distancia_gps, 3),
+                "kilometraje": vehiculo.kilometraje,
+                "recorrido_odometro_km": None,
+                "diferencia_km": None,
+                "coincide": None
+            }
+            inicial = kilometraje_inicial.get(vehiculo.id)
+            if inicial is not None:
+                odometro = vehiculo.kilometraje - inicial
+                diferencia = odometro - distancia_gps
+                entrada["recorrido_odometro_km"] = odometro
+                entrada["diferencia_km"] = round(diferencia, 3)
+                entrada["coincide"] = abs(diferencia) <= tolerancia * max(odometro, distancia_gps, 1.0)
+            resultado.append(entrada)
+        return resultado
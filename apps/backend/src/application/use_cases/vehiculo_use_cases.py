@@ -5,20 +5,22 @@ from typing import List, Optional
 from datetime import datetime
 from src.domain.entities.vehiculo import Vehiculo, TipoVehiculo, EstadoVehiculo
 from src.domain.repositories.interfaces import VehiculoRepository
+from src.domain.services.id_generator import IdGenerator, default_id_generator
 
 class CrearVehiculoUseCase:
     """Use case for creating a new vehicle"""
 
-    def __init__(self, vehiculo_repository: VehiculoRepository):
+    def __init__(self, vehiculo_repository: VehiculoRepository,
+                 id_generator: Optional[IdGenerator] = None):
         self.vehiculo_repository = vehiculo_repository
+        self.id_generator = id_generator or default_id_generator
 
     def execute(self, matricula: str, marca: str, modelo: str, tipo: TipoVehiculo,
                 capacidad_carga: float, fecha_matriculacion: datetime,
                 fecha_ultimo_mantenimiento: Optional[datetime] = None,
                 kilometraje: int = 0) -> Vehiculo:
         """Create a new vehicle"""
-        # Generate a simple ID (in production, use UUID or similar)
-        vehiculo_id = f"VHC{len(self.vehiculo_repository.find_all()) + 1:03d}"
+        vehiculo_id = self.id_generator.next_id("VHC")
 
         vehiculo = Vehiculo(
             id=vehiculo_id,
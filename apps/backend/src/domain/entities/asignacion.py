@@ -0,0 +1,18 @@
+"""
+Load assignment entities
+"""
+from typing import Dict, List
+from pydantic import BaseModel, Field
+
+class Asignacion(BaseModel):
+    """A load assigned to a vehicle"""
+    carga_id: str = Field(..., description="Load ID")
+    vehiculo_id: str = Field(..., description="Vehicle ID")
+    distancia_km: float = Field(..., description="Distance from the vehicle to the load's origin in km")
+
+class PlanAsignacion(BaseModel):
+    """Result of assigning pending loads to available vehicles"""
+    asignaciones: List[Asignacion] = Field(default_factory=list, description="Chosen assignments")
+    sin_asignar: Dict[str, str] = Field(default_factory=dict, description="Reason per load left unassigned")
+    distancia_total_km: float = Field(..., description="Sum of the assignment distances")
+    metodo: str = Field(..., description="Algorithm used: hungaro, subasta, voraz_busqueda_local or ninguno")
@@ -1,10 +1,21 @@
 """
 Carga entity
 """
-from typing import Optional, List
+import inspect
+import weakref
+from typing import Any, Callable, Dict, Optional, List, Union
 from datetime import datetime
 from enum import Enum
 from pydantic import BaseModel, Field
+from src.domain.value_objects.direccion import Coordenadas
+
+# Called as (carga, campo, valor_anterior) after estado or an assignment changes
+Observador = Callable[["Carga", str, Any], None]
+
+# Observers of each load by id(carga), dropped with the load. They live
+# outside the model, so comparing, copying or pickling a load never involves
+# them, and are held weakly, so an observed load keeps no repository alive
+_OBSERVADORES: Dict[int, List[weakref.ref]] = {}
 
 class TipoCarga(Enum):
     """Load type enumeration"""
@@ -41,6 +52,8 @@ class Carga(BaseModel):
     fecha_creacion: datetime = Field(default_factory=datetime.now, description="Creation date")
     fecha_salida: Optional[datetime] = Field(None, description="Departure date")
     fecha_entrega: Optional[datetime] = Field(None, description="Delivery date")
+    entrega_desde: Optional[datetime] = Field(None, description="Start of the delivery window")
+    entrega_hasta: Optional[datetime] = Field(None, description="End of the delivery window")
 
     # Asignaciones
     vehiculo_id: Optional[str] = Field(None, description="Assigned vehicle ID")
@@ -49,33 +62,73 @@ class Carga(BaseModel):
 
     # Seguimiento
     coordenadas_actuales: Optional[str] = Field(None, description="Current GPS coordinates")
+    posicion_actual: Optional[Coordenadas] = Field(None, description="Current GPS position, parsed")
     ultima_actualizacion: Optional[datetime] = Field(None, description="Last status update")
 
+    def observar(self, observador: Observador) -> None:
+        """
+        Be notified when ``cambiar_estado`` or an ``asignar_*`` method changes the load
+
+        Meant for repositories keeping indexes on those fields; setting the
+        fields directly does not notify. Observers are held weakly: a bound
+        method is dropped with its object, a function must be kept alive by
+        the caller. Copies of the load are not observed.
+        """
+        referencias = _OBSERVADORES.get(id(self))
+        if referencias is None:
+            referencias = _OBSERVADORES[id(self)] = []
+            weakref.finalize(self, _OBSERVADORES.pop, id(self), None)
+        if all(referencia() != observador for referencia in referencias):
+            referencias.append(
+                weakref.WeakMethod(observador) if inspect.ismethod(observador) else weakref.ref(observador)
+            )
+
+    def dejar_de_observar(self, observador: Observador) -> None:
+        """Stop notifying an observer"""
+        referencias = _OBSERVADORES.get(id(self))
+        if referencias:
+            referencias[:] = [r for r in referencias if r() is not None and r() != observador]
+
+    def _notificar(self, campo: str, anterior: Any) -> None:
+        for referencia in list(_OBSERVADORES.get(id(self), ())):
+            observador = referencia()
+            if observador is not None:
+                observador(self, campo, anterior)
+
     def asignar_vehiculo(self, vehiculo_id: str) -> None:
         """Assign load to a vehicle"""
-        self.vehiculo_id = vehiculo_id
+        anterior, self.vehiculo_id = self.vehiculo_id, vehiculo_id
+        self._notificar("vehiculo_id", anterior)
 
     def asignar_transportista(self, transportista_id: str) -> None:
         """Assign load to a transporter"""
-        self.transportista_id = transportista_id
+        anterior, self.transportista_id = self.transportista_id, transportista_id
+        self._notificar("transportista_id", anterior)
 
     def asignar_flota(self, flota_id: str) -> None:
         """Assign load to a fleet"""
-        self.flota_id = flota_id
+        anterior, self.flota_id = self.flota_id, flota_id
+        self._notificar("flota_id", anterior)
 
     def cambiar_estado(self, nuevo_estado: EstadoCarga) -> None:
         """Change load status"""
-        self.estado = nuevo_estado
+        anterior, self.estado = self.estado, nuevo_estado
         self.ultima_actualizacion = datetime.now()
 
         if nuevo_estado == EstadoCarga.EN_TRANSITO and not self.fecha_salida:
             self.fecha_salida = datetime.now()
         elif nuevo_estado == EstadoCarga.ENTREGADA and not self.fecha_entrega:
             self.fecha_entrega = datetime.now()
-
-    def actualizar_ubicacion(self, coordenadas: str) -> None:
-        """Update current location"""
-        self.coordenadas_actuales = coordenadas
+        self._notificar("estado", anterior)
+
+    def actualizar_ubicacion(self, coordenadas: Union[str, Coordenadas]) -> None:
+        """Update current location from a Coordenadas or "lat,lng" text"""
+        if isinstance(coordenadas, Coordenadas):
+            self.posicion_actual = coordenadas
+            self.coordenadas_actuales = str(coordenadas)
+        else:
+            self.posicion_actual = Coordenadas.desde_texto(coordenadas)
+            self.coordenadas_actuales = coordenadas
         self.ultima_actualizacion = datetime.now()
 
     def calcular_tiempo_transito(self) -> Optional[int]:
@@ -1,7 +1,7 @@
 """
 CMR (Carta de Porte) domain entities and services
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from pydantic import BaseModel, Field
 from enum import Enum
@@ -58,6 +58,7 @@ class CMRDocument(BaseModel):
     destinatario: Destinatario = Field(..., description="Recipient information")
 
     matricula_vehiculo: str = Field(..., description="Vehicle license plate")
+    vehiculo_id: Optional[str] = Field(None, description="Fleet vehicle matched by plate, once reconciled")
     conductor: Optional[str] = Field(None, description="Driver name")
 
     carga: Carga = Field(..., description="Load information")
@@ -69,9 +70,30 @@ class CMRDocument(BaseModel):
     estado_procesamiento: EstadoCMR = Field(default=EstadoCMR.PENDIENTE, description="Processing status")
     fecha_procesamiento: Optional[datetime] = Field(None, description="Processing timestamp")
     errores_procesamiento: Optional[str] = Field(None, description="Processing errors")
+    confianza_campos: Dict[str, float] = Field(default_factory=dict, description="Extractor confidence per field")
+
+class RawCMRPage(BaseModel):
+    """Extraction result for one page of a document"""
+    page_number: int = Field(..., description="1-based page number")
+    text: Optional[str] = Field(None, description="Page text, or None if the page was not decoded")
+    is_cmr: bool = Field(False, description="Whether the page carries a CMR heading")
 
 class RawCMRData(BaseModel):
     """Raw extracted data from CMR document"""
     raw_text: str = Field(..., description="Raw extracted text")
+    pages: List[RawCMRPage] = Field(default_factory=list, description="Per-page results, when the extractor has a page concept")
     confidence_scores: Dict[str, float] = Field(default_factory=dict, description="Confidence scores for extracted fields")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
+
+class FieldConfidence(BaseModel):
+    """Value of a mandatory field with the extractor's confidence in it"""
+    value: Optional[Any] = Field(None, description="Extracted value, if found")
+    confidence: Optional[float] = Field(None, description="Extractor confidence (None if not reported)")
+    accepted: bool = Field(False, description="Found and at or above the confidence threshold")
+
+class CMRExtractionResult(BaseModel):
+    """Outcome of an extraction that checks mandatory fields first"""
+    complete: bool = Field(..., description="Whether the mandatory fields passed and the document was fully parsed")
+    document: Optional[CMRDocument] = Field(None, description="Normalized document, only when complete")
+    fields: Dict[str, FieldConfidence] = Field(default_factory=dict, description="Mandatory fields with confidence")
+    errors: List[str] = Field(default_factory=list, description="Reasons the document was rejected")
@@ -0,0 +1,27 @@
+"""
+Change event entities
+"""
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field
+
+class TipoEntidad(Enum):
+    """Kind of entity a change event is about"""
+    VEHICULO = "vehiculo"
+    CARGA = "carga"
+    FLOTA = "flota"
+
+class OperacionCambio(Enum):
+    """What happened to the entity"""
+    GUARDADO = "guardado"
+    ELIMINADO = "eliminado"
+
+class EventoCambio(BaseModel):
+    """A vehicle, load or fleet saved or deleted through its repository"""
+    secuencia: int = Field(..., description="Position in the event log, increasing")
+    entidad: TipoEntidad = Field(..., description="Entity kind")
+    entidad_id: str = Field(..., description="Entity ID")
+    operacion: OperacionCambio = Field(..., description="Saved or deleted")
+    timestamp: datetime = Field(..., description="When the change was published")
+    datos: Optional[Dict[str, Any]] = Field(None, description="Entity as saved; None when deleted")
@@ -0,0 +1,45 @@
+"""
+Geofence entities
+"""
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from src.domain.entities.posicion import TipoSeguimiento
+from src.domain.value_objects.direccion import Coordenadas
+
+class TipoGeocerca(Enum):
+    """Kind of place a geofence belongs to"""
+    DEPOSITO = "deposito"
+    CLIENTE = "cliente"
+
+class Geocerca(BaseModel):
+    """
+    A zone around a depot or customer site.
+
+    Either ``poligono`` (at least three vertices, implicitly closed) or
+    ``centro`` together with ``radio_m`` describes the zone.
+    """
+    id: str = Field(..., min_length=1, description="Geofence ID")
+    nombre: str = Field(..., description="Display name")
+    tipo: TipoGeocerca = Field(..., description="Depot or customer zone")
+    propietario_id: Optional[str] = Field(None, description="ID of the depot or customer")
+    poligono: Optional[List[Coordenadas]] = Field(None, description="Polygon vertices")
+    centro: Optional[Coordenadas] = Field(None, description="Circle centre")
+    radio_m: Optional[float] = Field(None, gt=0, description="Circle radius in metres")
+
+class TipoEventoGeocerca(Enum):
+    """Geofence transition"""
+    ENTRADA = "entrada"
+    SALIDA = "salida"
+
+class EventoGeocerca(BaseModel):
+    """A load or vehicle entering or leaving a geofence"""
+    secuencia: int = Field(..., description="Position in the event log, increasing")
+    tipo: TipoEventoGeocerca = Field(..., description="Entry or exit")
+    geocerca_id: str = Field(..., description="Geofence ID")
+    tipo_seguimiento: TipoSeguimiento = Field(..., description="Tracked object kind")
+    track_id: str = Field(..., description="Load or vehicle ID")
+    timestamp: datetime = Field(..., description="Time of the first ping on the new side")
+    latitud: float = Field(..., description="Latitude of that ping")
+    longitud: float = Field(..., description="Longitude of that ping")
@@ -0,0 +1,46 @@
+"""
+GPS position entities
+"""
+from datetime import datetime
+from enum import Enum
+from typing import List
+from pydantic import BaseModel, Field
+
+class TipoSeguimiento(Enum):
+    """Kind of tracked object"""
+    CARGA = "carga"
+    VEHICULO = "vehiculo"
+
+class PosicionGPS(BaseModel):
+    """A GPS position at a point in time"""
+    timestamp: datetime = Field(..., description="Time of the fix (naive values are UTC)")
+    latitud: float = Field(..., ge=-90, le=90, description="Latitude")
+    longitud: float = Field(..., ge=-180, le=180, description="Longitude")
+
+class Parada(BaseModel):
+    """A period in which the tracked object did not move"""
+    inicio: datetime = Field(..., description="Stop start")
+    fin: datetime = Field(..., description="Stop end")
+    duracion_segundos: float = Field(..., description="Stop duration in seconds")
+    latitud: float = Field(..., description="Mean latitude while stopped")
+    longitud: float = Field(..., description="Mean longitude while stopped")
+
+class SegmentoRecorrido(BaseModel):
+    """A stretch of driving between two stops"""
+    inicio: datetime = Field(..., description="Segment start")
+    fin: datetime = Field(..., description="Segment end")
+    distancia_km: float = Field(..., description="Distance driven in km")
+    velocidad_media_kmh: float = Field(..., description="Average speed in km/h")
+    velocidad_max_kmh: float = Field(..., description="Highest speed between two fixes in km/h")
+
+class ResumenRecorrido(BaseModel):
+    """Distance, speed and stops computed from a position history"""
+    puntos: int = Field(..., description="Positions analysed")
+    distancia_km: float = Field(..., description="Cumulative distance in km")
+    duracion_segundos: float = Field(..., description="Time between the first and last position")
+    velocidad_media_kmh: float = Field(..., description="Distance over total time in km/h")
+    velocidad_max_kmh: float = Field(..., description="Highest speed between two fixes in km/h")
+    tiempo_parado_segundos: float = Field(..., description="Total time in stops")
+    saltos_descartados: int = Field(0, description="Legs ignored for implying an impossible speed")
+    segmentos: List[SegmentoRecorrido] = Field(default_factory=list, description="Driving segments")
+    paradas: List[Parada] = Field(default_factory=list, description="Detected stops")
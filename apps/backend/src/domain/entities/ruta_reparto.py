@@ -0,0 +1,39 @@
+"""
+Multi-stop vehicle route entities
+"""
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List
+from pydantic import BaseModel, Field
+
+class TipoParada(Enum):
+    """Stop type enumeration"""
+    RECOGIDA = "recogida"
+    ENTREGA = "entrega"
+
+class ParadaRuta(BaseModel):
+    """A pickup or delivery stop of a vehicle route"""
+    carga_id: str = Field(..., description="Load picked up or delivered")
+    tipo: TipoParada = Field(..., description="Stop type")
+    latitud: float = Field(..., description="Stop latitude")
+    longitud: float = Field(..., description="Stop longitude")
+    llegada: datetime = Field(..., description="Estimated arrival, or the window start when arriving earlier")
+    distancia_km: float = Field(..., description="Distance from the previous stop in km")
+    carga_a_bordo_kg: float = Field(..., description="Weight on board when leaving the stop")
+    retraso_min: float = Field(0.0, description="Minutes past the end of the delivery window")
+
+class RutaVehiculo(BaseModel):
+    """Sequenced stops of one vehicle"""
+    vehiculo_id: str = Field(..., description="Vehicle ID")
+    paradas: List[ParadaRuta] = Field(default_factory=list, description="Stops in visiting order")
+    distancia_km: float = Field(..., description="Total driven distance in km")
+    retraso_total_min: float = Field(0.0, description="Sum of the delivery delays in minutes")
+    factible: bool = Field(..., description="Whether capacity and delivery windows are respected")
+    sin_secuenciar: Dict[str, str] = Field(default_factory=dict, description="Reason per load left out")
+
+class PlanRutas(BaseModel):
+    """Routes of several vehicles"""
+    rutas: List[RutaVehiculo] = Field(default_factory=list, description="One route per vehicle")
+    sin_secuenciar: Dict[str, str] = Field(default_factory=dict, description="Reason per load without a route")
+    distancia_total_km: float = Field(..., description="Sum of the route distances")
+    completo: bool = Field(..., description="Whether every route was improved before the time budget ran out")
@@ -2,11 +2,13 @@
 Repository interfaces for domain entities
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 from src.domain.entities.flota import Flota
 from src.domain.entities.transportista import Transportista
 from src.domain.entities.vehiculo import Vehiculo
 from src.domain.entities.carga import Carga
+from src.domain.entities.cmr_document import CMRDocument
 
 class FlotaRepository(ABC):
     """Repository interface for Flota entity"""
@@ -102,6 +104,16 @@ class VehiculoRepository(ABC):
         """Find available vehicles"""
         pass
 
+    @abstractmethod
+    def find_by_matriculas(self, matriculas: Iterable[str]) -> Dict[str, Vehiculo]:
+        """
+        Find the vehicles for many normalized plates in one lookup
+
+        Plates are compared in the form returned by ``normalizar_matricula``;
+        the result is keyed by that form and omits plates without a vehicle.
+        """
+        pass
+
     @abstractmethod
     def delete(self, vehiculo_id: str) -> None:
         """Delete a vehicle by ID"""
@@ -140,6 +152,11 @@ class CargaRepository(ABC):
         """Find loads by transporter ID"""
         pass
 
+    @abstractmethod
+    def find_by_vehiculo(self, vehiculo_id: str) -> List[Carga]:
+        """Find loads by vehicle ID"""
+        pass
+
     @abstractmethod
     def find_en_transito(self) -> List[Carga]:
         """Find loads currently in transit"""
@@ -148,4 +165,89 @@ class CargaRepository(ABC):
     @abstractmethod
     def delete(self, carga_id: str) -> None:
         """Delete a load by ID"""
-        pass
\ No newline at end of file
+        pass
+
+class CMRRepository(ABC):
+    """Repository interface for normalized CMR documents"""
+
+    @abstractmethod
+    def save(self, documento: CMRDocument) -> None:
+        """Save a CMR document, replacing any stored one with the same number"""
+        pass
+
+    @abstractmethod
+    def find_by_numero(self, numero_cmr: str) -> Optional[CMRDocument]:
+        """Find a CMR document by its number"""
+        pass
+
+    @abstractmethod
+    def find_all(self) -> List[CMRDocument]:
+        """Find all CMR documents"""
+        pass
+
+    @abstractmethod
+    def find_by_matricula(self, matricula: str) -> List[CMRDocument]:
+        """Find CMR documents by vehicle plate, oldest first"""
+        pass
+
+    @abstractmethod
+    def search(
+        self,
+        matricula: Optional[str] = None,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> List[CMRDocument]:
+        """
+        Find CMR documents by plate and issue date range, oldest first
+
+        ``desde`` is inclusive and ``hasta`` exclusive, so consecutive
+        ranges such as calendar months do not overlap.
+        """
+        pass
+
+    @abstractmethod
+    def count(
+        self,
+        matricula: Optional[str] = None,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None
+    ) -> int:
+        """Count the CMR documents a search with the same filters would return"""
+        pass
+
+    @abstractmethod
+    def delete(self, numero_cmr: str) -> None:
+        """Delete a CMR document by number"""
+        pass
+
+class PosicionRepository(ABC):
+    """
+    Repository interface for GPS position histories
+
+    Tracks are keyed by ``(tipo, id)``; positions are
+    ``(timestamp in epoch seconds, latitud, longitud)`` tuples.
+    """
+
+    @abstractmethod
+    def ingest(self, pings: Iterable[Tuple[str, str, float, float, float]]) -> int:
+        """Add ``(tipo, id, timestamp, latitud, longitud)`` pings and return how many were added"""
+        pass
+
+    @abstractmethod
+    def window(self, tipo: str, track_id: str, desde: Optional[float] = None,
+               hasta: Optional[float] = None, limit: Optional[int] = None,
+               crudo: bool = False) -> List[Tuple[float, float, float]]:
+        """
+        Positions of a track with ``desde <= t < hasta``, oldest first
+
+        With ``crudo``, the recently received pings as they arrived instead
+        of the stored (possibly compressed) trace.
+        """
+        pass
+
+    @abstractmethod
+    def latest(self, tipo: str, track_id: str) -> Optional[Tuple[float, float, float]]:
+        """Most recent position of a track"""
+        pass
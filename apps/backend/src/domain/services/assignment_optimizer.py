@@ -0,0 +1,410 @@
+"""
+Assignment of pending loads to available vehicles
+"""
+import heapq
+import math
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.domain.entities.asignacion import Asignacion, PlanAsignacion
+from src.domain.entities.carga import Carga
+from src.domain.entities.vehiculo import Vehiculo
+from src.domain.services.geodesy import Punto, distance_matrix_km
+from src.domain.value_objects.direccion import Coordenadas
+
+INFEASIBLE = math.inf
+
+def hungarian(cost: List[List[float]]) -> List[Optional[int]]:
+    """
+    Minimum-cost assignment of rows to distinct columns
+
+    Shortest augmenting path version of the Hungarian algorithm
+    (Jonker-Volgenant style potentials), O(n^2 m) for n rows and m columns.
+    Infeasible cells are ``INFEASIBLE``; rows that cannot be given a
+    feasible column are left as None, and the number of assigned rows is
+    maximized before the cost is minimized.
+
+    Returns:
+        Column per row, or None
+    """
+    n = len(cost)
+    m = len(cost[0]) if n else 0
+    if n == 0 or m == 0:
+        return [None] * n
+    if n > m:
+        transposed = hungarian([[cost[i][j] for i in range(n)] for j in range(m)])
+        result: List[Optional[int]] = [None] * n
+        for j, i in enumerate(transposed):
+            if i is not None:
+                result[i] = j
+        return result
+
+    # Infeasible cells cost more than any complete feasible assignment
+    finite = [c for row in cost for c in row if c != INFEASIBLE]
+    big = (max(finite) if finite else 0.0) * n + 1.0
+    a = [[c if c != INFEASIBLE else big for c in row] for row in cost]
+
+    # 1-based arrays as in the classic formulation; column 0 is virtual
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [math.inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = a[i0 - 1]
+            ui0 = u[i0]
+            delta = math.inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - ui0 - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    result = [None] * n
+    for j in range(1, m + 1):
+        if p[j] and cost[p[j] - 1][j - 1] != INFEASIBLE:
+            result[p[j] - 1] = j - 1
+    return result
+
+def auction(cost: List[List[float]], candidatos: int = 30,
+            deadline: Optional[float] = None) -> List[Optional[int]]:
+    """
+    Near-optimal assignment of rows to distinct columns for large instances
+
+    Forward auction with epsilon scaling over each row's ``candidatos``
+    cheapest feasible columns: unassigned rows bid for their best column
+    by how much it beats their second best, and epsilon shrinks until the
+    total cost is within ``n * epsilon`` (a tenth of the largest cost) of
+    the optimum over the candidate lists. The auction needs as many
+    bidders as columns, so the smaller side bids and is padded with
+    bidders that value every column at zero. Staying unassigned is worth
+    twice the largest cost, which bounds the prices when rows compete for
+    too few candidate columns; rows left out that way are placed along an
+    augmenting path over all their feasible columns where one exists.
+
+    Returns:
+        Column per row, or None
+    """
+    n = len(cost)
+    m = len(cost[0]) if n else 0
+    if n > m:
+        transpuesta = [[cost[i][j] for i in range(n)] for j in range(m)]
+        por_columna = auction(transpuesta, candidatos, deadline)
+        result: List[Optional[int]] = [None] * n
+        for j, i in enumerate(por_columna):
+            if i is not None:
+                result[i] = j
+        return result
+
+    opciones: List[List[int]] = []
+    for i in range(n):
+        columnas = [j for j, c in enumerate(cost[i]) if c != INFEASIBLE]
+        columnas.sort(key=cost[i].__getitem__)
+        opciones.append(columnas)
+    finite = [cost[i][ops[-1]] for i, ops in enumerate(opciones) if ops]
+    if not finite:
+        return [None] * n
+    max_cost = max(max(finite), 1e-9)
+    sin_columna = -2.0 * max_cost
+    eps_min = max_cost / (10.0 * m)
+    eps = max_cost / 4.0
+
+    prices = [0.0] * m
+    owner: List[Optional[int]] = [None] * m
+    asignado: List[Optional[int]] = [None] * m
+    while True:
+        owner = [None] * m
+        asignado = [None] * m
+        pendientes = deque(i for i in range(m) if i >= n or opciones[i])
+        baratas = [(precio, j) for j, precio in enumerate(prices)]
+        heapq.heapify(baratas)
+        while pendientes:
+            i = pendientes.popleft()
+            best_j: Optional[int] = None
+            best = second = sin_columna
+            if i < n:
+                row = cost[i]
+                for j in opciones[i][:candidatos]:
+                    value = -row[j] - prices[j]
+                    if value > best:
+                        second = best
+                        best, best_j = value, j
+                    elif value > second:
+                        second = value
+            else:
+                # Padding bidders take the cheapest column; prices only rise,
+                # so stale heap entries are dropped as they surface
+                while baratas[0][0] != prices[baratas[0][1]]:
+                    heapq.heappop(baratas)
+                precio, best_j = heapq.heappop(baratas)
+                while baratas and baratas[0][0] != prices[baratas[0][1]]:
+                    heapq.heappop(baratas)
+                best = -precio
+                second = -baratas[0][0] if baratas else sin_columna
+            if best_j is None:
+                continue
+            prices[best_j] += best - second + eps
+            if len(baratas) < 4 * m:
+                heapq.heappush(baratas, (prices[best_j], best_j))
+            else:
+                baratas = [(precio, j) for j, precio in enumerate(prices)]
+                heapq.heapify(baratas)
+            anterior = owner[best_j]
+            owner[best_j] = i
+            asignado[i] = best_j
+            if anterior is not None:
+                asignado[anterior] = None
+                pendientes.append(anterior)
+        if eps <= eps_min or (deadline is not None and time.perf_counter() > deadline):
+            break
+        eps = max(eps / 5.0, eps_min)
+
+    for j in range(m):
+        if owner[j] is not None and owner[j] >= n:
+            owner[j] = None
+    for i in range(n):
+        if asignado[i] is None and opciones[i]:
+            _aumentar(i, opciones, owner, asignado)
+    return asignado[:n]
+
+def _aumentar(i: int, opciones: List[List[int]], owner: List[Optional[int]],
+              asignado: List[Optional[int]]) -> bool:
+    """Assign row i along an augmenting path of feasible columns, if there is one"""
+    anterior: Dict[int, Tuple[int, Optional[int]]] = {}
+    pendientes = deque([i])
+    while pendientes:
+        fila = pendientes.popleft()
+        for j in opciones[fila]:
+            if j in anterior:
+                continue
+            anterior[j] = (fila, asignado[fila])
+            if owner[j] is None:
+                # Walk back, moving each row on the path to its new column
+                while True:
+                    fila, columna_previa = anterior[j]
+                    owner[j] = fila
+                    asignado[fila] = j
+                    if columna_previa is None:
+                        return True
+                    j = columna_previa
+            pendientes.append(owner[j])
+    return False
+
+def greedy_local_search(cost: List[List[float]], pesos: Sequence[float], capacidades: Sequence[float],
+                        max_por_columna: int, candidatos: int = 20,
+                        deadline: Optional[float] = None) -> List[Optional[int]]:
+    """
+    Assignment of rows to columns where a column takes several rows
+
+    Each column takes at most ``max_por_columna`` rows whose ``pesos`` add
+    up to at most its capacity. Rows are placed in order of regret (how
+    much worse their second-best column is) into their cheapest column
+    with room. Passes of local search follow until nothing changes or the
+    deadline passes: unassigned rows may push a row out of a column if
+    that row can move elsewhere, and assigned rows relocate or swap with
+    a row of another column while that lowers the total cost. Only the
+    ``candidatos`` cheapest columns of each row are considered, except for
+    rows still unassigned at the end, which get a last try on every
+    feasible column.
+
+    Returns:
+        Column per row, or None
+    """
+    n = len(cost)
+    factibles: List[List[int]] = []
+    for i in range(n):
+        columnas = [j for j, c in enumerate(cost[i]) if c != INFEASIBLE and pesos[i] <= capacidades[j]]
+        columnas.sort(key=cost[i].__getitem__)
+        factibles.append(columnas)
+    opciones = [columnas[:candidatos] for columnas in factibles]
+
+    def regret(i: int) -> float:
+        row, ops = cost[i], opciones[i]
+        if len(ops) < 2:
+            return math.inf
+        return row[ops[1]] - row[ops[0]]
+
+    libre = list(capacidades)
+    cuenta = [0] * len(capacidades)
+    filas: List[List[int]] = [[] for _ in capacidades]
+    asignado: List[Optional[int]] = [None] * n
+
+    def cabe(i: int, j: int, sale: Optional[int] = None) -> bool:
+        """Whether row i fits in column j, after row ``sale`` leaves it"""
+        if sale is None:
+            return cuenta[j] < max_por_columna and pesos[i] <= libre[j] + 1e-9
+        return pesos[i] <= libre[j] + pesos[sale] + 1e-9
+
+    def mover(i: int, j: Optional[int]) -> None:
+        anterior = asignado[i]
+        if anterior is not None:
+            libre[anterior] += pesos[i]
+            cuenta[anterior] -= 1
+            filas[anterior].remove(i)
+        if j is not None:
+            libre[j] -= pesos[i]
+            cuenta[j] += 1
+            filas[j].append(i)
+        asignado[i] = j
+
+    for i in sorted(range(n), key=regret, reverse=True):
+        for j in opciones[i]:
+            if cabe(i, j):
+                mover(i, j)
+                break
+
+    def colocar(i: int) -> bool:
+        """Place an unassigned row, pushing another row to a column with room"""
+        for j in opciones[i]:
+            if cabe(i, j):
+                mover(i, j)
+                return True
+        for j in opciones[i]:
+            for k in list(filas[j]):
+                if not cabe(i, j, sale=k):
+                    continue
+                for destino in opciones[k]:
+                    if destino != j and cabe(k, destino):
+                        mover(k, destino)
+                        mover(i, j)
+                        return True
+        return False
+
+    def mejorar(i: int) -> bool:
+        """Relocate or swap an assigned row if that lowers the total cost"""
+        actual = asignado[i]
+        coste_actual = cost[i][actual]
+        for j in opciones[i]:
+            if j == actual:
+                continue
+            if cost[i][j] < coste_actual and cabe(i, j):
+                mover(i, j)
+                return True
+            for k in filas[j]:
+                if (cost[k][actual] != INFEASIBLE and pesos[k] <= capacidades[actual]
+                        and cost[i][j] + cost[k][actual] < coste_actual + cost[k][j]
+                        and cabe(i, j, sale=k) and cabe(k, actual, sale=i)):
+                    mover(i, None)
+                    mover(k, actual)
+                    mover(i, j)
+                    return True
+        return False
+
+    cambios = True
+    while cambios and (deadline is None or time.perf_counter() < deadline):
+        cambios = False
+        for i in range(n):
+            if asignado[i] is None:
+                cambios = colocar(i) or cambios
+            else:
+                cambios = mejorar(i) or cambios
+
+    for i in range(n):
+        if asignado[i] is None and len(factibles[i]) > len(opciones[i]):
+            opciones[i] = factibles[i]
+            colocar(i)
+    return asignado
+
+class OptimizadorAsignacion:
+    """
+    Chooses which available vehicle picks up each pending load.
+
+    The cost of a pair is the great-circle distance from the vehicle's
+    position to the load's origin; pairs where the load is heavier than
+    the vehicle's ``capacidad_carga``, or further than ``distancia_max_km``,
+    are not allowed. With one load per vehicle the problem is solved
+    exactly with the Hungarian algorithm up to ``limite_exacto`` cells in
+    the cost matrix and near-optimally with an auction beyond that.
+    Vehicles taking up to ``max_cargas_por_vehiculo`` loads within their
+    capacity use a greedy start improved by local search. Both heuristics
+    stop refining after ``presupuesto_segundos``.
+
+    Multi-load costs add up the pickup distances from the vehicle's
+    position; the order of pickups is the route sequencing's concern.
+    """
+
+    def __init__(self, max_cargas_por_vehiculo: int = 1, distancia_max_km: Optional[float] = None,
+                 limite_exacto: int = 90_000, presupuesto_segundos: float = 0.5):
+        self.max_cargas_por_vehiculo = max_cargas_por_vehiculo
+        self.distancia_max_km = distancia_max_km
+        self.limite_exacto = limite_exacto
+        self.presupuesto_segundos = presupuesto_segundos
+
+    def optimizar(self, cargas: Sequence[Carga], vehiculos: Sequence[Tuple[Vehiculo, Punto]]) -> PlanAsignacion:
+        """
+        Assign loads to vehicles given with their current ``(latitud, longitud)``
+
+        Loads whose origin is not a "lat,lng" position, and loads no
+        vehicle can take, are reported in ``sin_asignar`` with the reason.
+        """
+        inicio = time.perf_counter()
+        sin_asignar: Dict[str, str] = {}
+        ubicadas: List[Tuple[Carga, Punto]] = []
+        for carga in cargas:
+            origen = Coordenadas.desde_texto(carga.origen)
+            if origen is None:
+                sin_asignar[carga.id] = "origen sin coordenadas"
+            else:
+                ubicadas.append((carga, (origen.latitud, origen.longitud)))
+
+        if not ubicadas or not vehiculos:
+            for carga, _ in ubicadas:
+                sin_asignar[carga.id] = "sin vehiculos disponibles"
+            return PlanAsignacion(asignaciones=[], sin_asignar=sin_asignar, distancia_total_km=0.0, metodo="ninguno")
+
+        distancias = distance_matrix_km([punto for _, punto in ubicadas], [punto for _, punto in vehiculos])
+        pesos = [carga.peso for carga, _ in ubicadas]
+        capacidades = [vehiculo.capacidad_carga for vehiculo, _ in vehiculos]
+        cost = [
+            [d if pesos[i] <= capacidades[j] and (self.distancia_max_km is None or d <= self.distancia_max_km)
+             else INFEASIBLE for j, d in enumerate(fila)]
+            for i, fila in enumerate(distancias)
+        ]
+
+        deadline = inicio + self.presupuesto_segundos
+        if self.max_cargas_por_vehiculo == 1 and len(ubicadas) * len(vehiculos) <= self.limite_exacto:
+            metodo = "hungaro"
+            columnas = hungarian(cost)
+        elif self.max_cargas_por_vehiculo == 1:
+            metodo = "subasta"
+            columnas = auction(cost, deadline=deadline)
+        else:
+            metodo = "voraz_busqueda_local"
+            columnas = greedy_local_search(cost, pesos, capacidades, self.max_cargas_por_vehiculo,
+                                           deadline=deadline)
+
+        asignaciones = []
+        for i, ((carga, _), j) in enumerate(zip(ubicadas, columnas)):
+            if j is not None:
+                asignaciones.append(Asignacion(carga_id=carga.id, vehiculo_id=vehiculos[j][0].id,
+                                               distancia_km=distancias[i][j]))
+            elif all(c == INFEASIBLE for c in cost[i]):
+                sin_asignar[carga.id] = "ningun vehiculo con capacidad a distancia"
+            else:
+                sin_asignar[carga.id] = "vehiculos adecuados ya asignados"
+        return PlanAsignacion(asignaciones=asignaciones, sin_asignar=sin_asignar,
+                              distancia_total_km=sum(a.distancia_km for a in asignaciones), metodo=metodo)
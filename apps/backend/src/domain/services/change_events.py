@@ -0,0 +1,84 @@
+"""
+In-process bus of changes to vehicles, loads and fleets
+"""
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from pydantic import BaseModel
+from src.domain.entities.evento_cambio import EventoCambio, OperacionCambio, TipoEntidad
+from src.domain.services.event_log import EventLog
+
+class ChangeEventBus:
+    """
+    Log of repository saves and deletes, numbered for resumable reads.
+
+    Repositories publish after every change. Each event gets the next
+    ``secuencia`` in an ``EventLog`` of the last ``max_eventos``. A
+    consumer reads from the last sequence number it saw; ``perdidos``
+    tells it when events it has not seen were already dropped, so it must
+    reload the collections instead. Subscribers are called from the publishing
+    thread after each event and must not block; streaming endpoints use
+    them to wake up.
+    """
+
+    def __init__(self, max_eventos: int = 10000):
+        self._log: EventLog[EventoCambio] = EventLog(max_eventos)
+        self._suscriptores: List[Callable[[EventoCambio], None]] = []
+        self._lock = threading.Lock()
+
+    def guardado(self, entidad: TipoEntidad, objeto: BaseModel) -> EventoCambio:
+        """Publish that an entity was saved, with its state"""
+        return self.publicar(entidad, objeto.id, OperacionCambio.GUARDADO, objeto.model_dump(mode="json"))
+
+    def eliminado(self, entidad: TipoEntidad, entidad_id: str) -> EventoCambio:
+        """Publish that an entity was deleted"""
+        return self.publicar(entidad, entidad_id, OperacionCambio.ELIMINADO)
+
+    def publicar(self, entidad: TipoEntidad, entidad_id: str, operacion: OperacionCambio,
+                 datos: Optional[Dict[str, Any]] = None) -> EventoCambio:
+        """Append an event to the log and notify the subscribers"""
+        evento = self._log.append(lambda secuencia: EventoCambio(
+            secuencia=secuencia,
+            entidad=entidad,
+            entidad_id=entidad_id,
+            operacion=operacion,
+            timestamp=datetime.now(timezone.utc),
+            datos=datos
+        ))
+        with self._lock:
+            suscriptores = list(self._suscriptores)
+        for suscriptor in suscriptores:
+            suscriptor(evento)
+        return evento
+
+    def eventos(self, despues: int = 0, limit: Optional[int] = None,
+                entidades: Optional[Iterable[TipoEntidad]] = None) -> List[EventoCambio]:
+        """Logged events with ``secuencia > despues``, oldest first, optionally of some entity kinds"""
+        if entidades is None:
+            return self._log.eventos(despues, limit)
+        filtro = frozenset(entidades)
+        return self._log.eventos(despues, limit, lambda evento: evento.entidad in filtro)
+
+    @property
+    def ultima_secuencia(self) -> int:
+        """Sequence number of the latest event, 0 before the first"""
+        return self._log.ultima_secuencia
+
+    def perdidos(self, despues: int) -> bool:
+        """Whether events after ``despues`` are no longer in the log, see ``EventLog.perdidos``"""
+        return self._log.perdidos(despues)
+
+    def suscribir(self, suscriptor: Callable[[EventoCambio], None]) -> None:
+        """Call ``suscriptor`` with every event published from now on"""
+        with self._lock:
+            self._suscriptores.append(suscriptor)
+
+    def cancelar(self, suscriptor: Callable[[EventoCambio], None]) -> None:
+        """Stop calling a subscriber"""
+        with self._lock:
+            if suscriptor in self._suscriptores:
+                self._suscriptores.remove(suscriptor)
+
+    def clear(self) -> None:
+        """Drop the logged events; sequence numbers keep increasing"""
+        self._log.clear()
@@ -0,0 +1,88 @@
+"""
+Content-addressed cache of CMR extraction results
+"""
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+class CMRResultStore(ABC):
+    """Second cache tier, e.g. shared by every worker process or kept across restarts"""
+
+    @abstractmethod
+    def read(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored result for a key, or None; must not raise on a missing or unreadable entry"""
+        pass
+
+    @abstractmethod
+    def write(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a result; failures are the store's to swallow"""
+        pass
+
+class CMRResultCache:
+    """
+    Cache of normalized CMR documents keyed by document content.
+
+    Keys combine a SHA-256 of the document bytes with the extractor version,
+    so the same PDF uploaded several times is extracted once, and upgrading
+    the extractor invalidates old results. Values are the JSON-ready
+    documents (``CMRDocument.model_dump(mode="json")``).
+
+    The in-memory tier is an LRU bounded to ``max_entries``. If a ``store``
+    is given, entries are also written to it, and memory misses are read
+    from it.
+    """
+
+    def __init__(self, max_entries: int = 1024, store: Optional[CMRResultStore] = None):
+        self.max_entries = max_entries
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(document_bytes: bytes, version: str) -> str:
+        """Cache key for a document processed by a given extractor version"""
+        return f"{hashlib.sha256(document_bytes).hexdigest()}-{version}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached result, promoting store hits into memory"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = self.store.read(key) if self.store is not None else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a result in memory and, if configured, in the store"""
+        with self._lock:
+            self._remember(key, value)
+        if self.store is not None:
+            self.store.write(key, value)
+
+    def clear(self) -> None:
+        """Drop the in-memory tier (the store is kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: str, value: Dict[str, Any]) -> None:
+        """Insert into the LRU, evicting the least recently used entries"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
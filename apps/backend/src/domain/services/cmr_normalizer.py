@@ -1,33 +1,158 @@
 """
 CMR document processing domain services
 """
+import mmap
 import re
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 from datetime import datetime
 from abc import ABC, abstractmethod
 
-from domain.entities.cmr_document import (
+from src.domain.entities.cmr_document import (
     CMRDocument,
     Remitente,
     Destinatario,
     Carga,
     TipoCarga,
     EstadoCMR,
-    RawCMRData
+    RawCMRData,
+    RawCMRPage,
+    FieldConfidence,
+    CMRExtractionResult
 )
 
+# Section header keywords (accent-free, lower-case keys)
+_SECTION_KEYWORDS = {
+    "remitente": "remitente",
+    "expediteur": "remitente",
+    "sender": "remitente",
+    "destinatario": "destinatario",
+    "destinataire": "destinatario",
+    "recipient": "destinatario",
+    "fechas": "fechas",
+    "dates": "fechas",
+    "vehiculo": "vehiculo",
+    "vehicule": "vehiculo",
+    "vehicle": "vehiculo",
+    "carga": "carga",
+    "charge": "carga",
+    "load": "carga",
+    "instrucciones": "instrucciones",
+    "instrucciones especiales": "instrucciones",
+    "instructions": "instrucciones",
+}
+
+# "Label: value" labels (accent-free, lower-case) mapped to canonical fields
+_FIELD_LABELS = {
+    "n° cmr": "numero_cmr",
+    "no cmr": "numero_cmr",
+    "nº cmr": "numero_cmr",
+    "cmr": "numero_cmr",
+    "numero": "numero_cmr",
+    "numero cmr": "numero_cmr",
+    "fecha de emision": "fecha_emision",
+    "date of issue": "fecha_emision",
+    "date d'emission": "fecha_emision",
+    "fecha de carga": "fecha_carga",
+    "loading date": "fecha_carga",
+    "date de chargement": "fecha_carga",
+    "fecha de entrega": "fecha_entrega",
+    "delivery date": "fecha_entrega",
+    "date de livraison": "fecha_entrega",
+    "matricula": "matricula",
+    "license plate": "matricula",
+    "plate": "matricula",
+    "immatriculation": "matricula",
+    "conductor": "conductor",
+    "driver": "conductor",
+    "chauffeur": "conductor",
+    "contacto": "contacto",
+    "contact": "contacto",
+    "descripcion": "descripcion",
+    "description": "descripcion",
+    "peso bruto": "peso_bruto",
+    "gross weight": "peso_bruto",
+    "poids brut": "peso_bruto",
+    "volumen": "volumen",
+    "volume": "volumen",
+    "unidades": "unidades",
+    "units": "unidades",
+    "unites": "unidades",
+}
+
+_ACCENTS = str.maketrans("áéíóúÁÉÍÓÚàèìòùÀÈÌÒÙ", "aeiouAEIOUaeiouAEIOU")
+
+# Precompiled, anchored patterns applied to one line or one value at a time
+_SECTION_KEYWORD = (
+    r"(?:REMITENTE|EXPEDITEUR|SENDER|DESTINATARIO|DESTINATAIRE|RECIPIENT|FECHAS|DATES|"
+    r"VEHICULO|VEHICULE|VEHICLE|CARGA|CHARGE|LOAD|INSTRUCCIONES(?: ESPECIALES)?|INSTRUCTIONS)"
+)
+# A whole accent-free line: keywords separated by "/", then an optional box
+# number and colon, e.g. "REMITENTE / SENDER", "Carga 6:"
+_SECTION_HEADER_RE = re.compile(
+    r"(" + _SECTION_KEYWORD + r")(?:\s*/\s*" + _SECTION_KEYWORD + r")*(?:\s+\d+)?(?:\s*:)?",
+    re.IGNORECASE
+)
+_LABEL_RE = re.compile(r"([^:]{1,40}?)\s*:\s*(.*)")
+_CMR_NUMBER_RE = re.compile(r"[A-Z0-9\-]+", re.IGNORECASE)
+_PLATE_RE = re.compile(r"[A-Z0-9\-]+", re.IGNORECASE)
+_DATE_RE = re.compile(r"(\d{1,2})[/-](\d{1,2})[/-](\d{4})")
+_WEIGHT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*kg", re.IGNORECASE)
+_VOLUME_RE = re.compile(r"(\d+(?:\.\d+)?)\s*m(?:³|3)", re.IGNORECASE)
+_UNITS_RE = re.compile(r"(\d+)")
+_VALUE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*€")
+
+# Mandatory fields, with the confidence score keys extractors may report them under
+MANDATORY_FIELDS = {
+    "numero_cmr": ("numero_cmr",),
+    "matricula_vehiculo": ("matricula_vehiculo", "matricula"),
+    "peso_bruto": ("peso_bruto", "carga"),
+}
+DEFAULT_MIN_CONFIDENCE = 0.5
+
+# Finds only the mandatory "Label: value" lines, in one pass over accent-free
+# text; the labels are those of _FIELD_LABELS, longest first
+_MANDATORY_RE = re.compile(
+    r"^[ \t]*(?:"
+    r"(?P<numero_cmr>numero\s+cmr|n°\s+cmr|no\s+cmr|nº\s+cmr|numero|cmr)"
+    r"|(?P<matricula_vehiculo>immatriculation|license\s+plate|matricula|plate)"
+    r"|(?P<peso_bruto>gross\s+weight|peso\s+bruto|poids\s+brut)"
+    r")[ \t]*:[ \t]*(?P<value>[^\r\n]*)",
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Document contents as received by extractors: plain bytes, or a zero-copy
+# view (memoryview/mmap) over an uploaded file
+DocumentData = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+# Bump when parsing changes, so cached results from older parsers are not reused
+NORMALIZER_VERSION = "5"
+
 class CMRExtractor(ABC):
     """Abstract base class for CMR document extractors"""
 
+    # Identifies the extraction logic; part of the result cache key
+    version: str = "1"
+
     @abstractmethod
-    def extract_data(self, document_bytes: bytes) -> RawCMRData:
-        """Extract raw data from CMR document"""
+    def extract_data(self, document_bytes: DocumentData) -> RawCMRData:
+        """Extract raw data from CMR document (any bytes-like object)"""
+        pass
+
+    def extract_pages(self, document_bytes: DocumentData) -> List[RawCMRPage]:
+        """Per-page results; extractors without a page concept return a single page"""
+        raw_data = self.extract_data(document_bytes)
+        return raw_data.pages or [RawCMRPage(page_number=1, text=raw_data.raw_text, is_cmr=True)]
+
+    def close(self) -> None:
+        """Release resources such as worker threads; the extractor may still be used afterwards"""
         pass
 
 class MockCMRExtractor(CMRExtractor):
     """Mock CMR extractor for demonstration purposes"""
 
-    def extract_data(self, document_bytes: bytes) -> RawCMRData:
+    version = "mock-1"
+
+    def extract_data(self, document_bytes: DocumentData) -> RawCMRData:
         """Extract data from mock CMR document"""
         # Simulate OCR extraction with mock data
         mock_text = """
@@ -90,23 +215,18 @@ class CMRNormalizer:
     def __init__(self, extractor: CMRExtractor):
         self.extractor = extractor
 
-    def normalize_document(self, document_bytes: bytes) -> CMRDocument:
+    @property
+    def version(self) -> str:
+        """Combined extractor and normalizer version"""
+        return f"{self.extractor.version}.{NORMALIZER_VERSION}"
+
+    def normalize_document(self, document_bytes: DocumentData) -> CMRDocument:
         """Normalize CMR document from raw bytes"""
         try:
             # Extract raw data
             raw_data = self.extractor.extract_data(document_bytes)
 
-            # Parse and normalize fields
-            normalized_data = self._parse_raw_data(raw_data.raw_text)
-
-            # Create CMR document
-            cmr_doc = CMRDocument(
-                **normalized_data,
-                estado_procesamiento=EstadoCMR.PROCESADO,
-                fecha_procesamiento=datetime.now()
-            )
-
-            return cmr_doc
+            return self._build_document(raw_data)
 
         except Exception as e:
             # Return document with error status
@@ -136,205 +256,326 @@ class CMRNormalizer:
                 errores_procesamiento=str(e)
             )
 
-    def _parse_raw_data(self, raw_text: str) -> Dict[str, Any]:
-        """Parse raw text and extract normalized fields"""
-        # Extract CMR number
-        numero_cmr = self._extract_cmr_number(raw_text)
+    def normalize_with_early_exit(
+        self,
+        document_bytes: DocumentData,
+        min_confidence: float = DEFAULT_MIN_CONFIDENCE
+    ) -> CMRExtractionResult:
+        """
+        Normalize a document only if its mandatory fields can be trusted
 
-        # Extract dates
-        fechas = self._extract_dates(raw_text)
+        The CMR number, plate and gross weight are located with a single
+        regex pass over the raw text and checked against the extractor's
+        confidence scores. Documents failing the check are returned as a
+        partial result without parsing the rest of the text.
+        """
+        try:
+            raw_data = self.extractor.extract_data(document_bytes)
+        except Exception as e:
+            return CMRExtractionResult(complete=False, errors=[f"Extraction failed: {str(e)}"])
 
-        # Extract sender info
-        remitente = self._extract_remitente(raw_text)
+        fields, errors = _check_mandatory(
+            _scan_mandatory(raw_data.raw_text), raw_data.confidence_scores, min_confidence
+        )
+        if errors:
+            return CMRExtractionResult(complete=False, fields=fields, errors=errors)
 
-        # Extract recipient info
-        destinatario = self._extract_destinatario(raw_text)
+        try:
+            document = self._build_document(raw_data)
+        except Exception as e:
+            return CMRExtractionResult(complete=False, fields=fields, errors=[str(e)])
+        return CMRExtractionResult(complete=True, document=document, fields=fields)
+
+    def check_document(
+        self,
+        document: CMRDocument,
+        min_confidence: float = DEFAULT_MIN_CONFIDENCE
+    ) -> CMRExtractionResult:
+        """Apply the mandatory-field check to an already normalized document"""
+        values = {
+            "numero_cmr": document.numero_cmr if document.numero_cmr not in ("CMR-UNKNOWN", "ERROR") else None,
+            "matricula_vehiculo": document.matricula_vehiculo if document.matricula_vehiculo not in ("UNKNOWN", "ERROR") else None,
+            "peso_bruto": document.carga.peso_bruto if document.carga.peso_bruto > 0 else None,
+        }
+        fields, errors = _check_mandatory(values, document.confianza_campos, min_confidence)
+        if errors:
+            return CMRExtractionResult(complete=False, fields=fields, errors=errors)
+        return CMRExtractionResult(complete=True, document=document, fields=fields)
+
+    def _build_document(self, raw_data: RawCMRData) -> CMRDocument:
+        """Parse the raw text into a processed document"""
+        # Parse and normalize fields
+        normalized_data = self._parse_raw_data(raw_data.raw_text)
+
+        return CMRDocument(
+            **normalized_data,
+            estado_procesamiento=EstadoCMR.PROCESADO,
+            fecha_procesamiento=datetime.now(),
+            confianza_campos=dict(raw_data.confidence_scores)
+        )
 
-        # Extract vehicle info
-        matricula, conductor = self._extract_vehicle_info(raw_text)
+    def _parse_raw_data(self, raw_text: str) -> Dict[str, Any]:
+        """Parse raw text and extract normalized fields"""
+        # Single linear scan; every extractor below reads from the tokens
+        tokens = _tokenize(raw_text)
 
-        # Extract load info
-        carga = self._extract_carga(raw_text)
+        fechas = self._dates_from_tokens(tokens)
+        matricula, conductor = self._vehicle_from_tokens(tokens)
 
         return {
-            "numero_cmr": numero_cmr,
+            "numero_cmr": self._cmr_number_from_tokens(tokens),
             "fecha_emision": fechas.get("emision", datetime.now()),
             "fecha_carga": fechas.get("carga"),
             "fecha_entrega": fechas.get("entrega"),
-            "remitente": remitente,
-            "destinatario": destinatario,
+            "remitente": self._party_from_tokens(tokens, "remitente", Remitente),
+            "destinatario": self._party_from_tokens(tokens, "destinatario", Destinatario),
             "matricula_vehiculo": matricula,
             "conductor": conductor,
-            "carga": carga,
-            "instrucciones_especiales": self._extract_instructions(raw_text)
+            "carga": self._carga_from_tokens(tokens),
+            "instrucciones_especiales": self._instructions_from_tokens(tokens)
         }
 
     def _extract_cmr_number(self, text: str) -> str:
         """Extract CMR document number"""
-        patterns = [
-            r'N°\s*CMR[:\s]*([A-Z0-9\-]+)',
-            r'CMR[:\s]*([A-Z0-9\-]+)',
-            r'Número[:\s]*([A-Z0-9\-]+)'
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-
-        return "CMR-UNKNOWN"
+        return self._cmr_number_from_tokens(_tokenize(text))
 
     def _extract_dates(self, text: str) -> Dict[str, datetime]:
         """Extract dates from text"""
-        dates = {}
-
-        # Date patterns (DD/MM/YYYY or DD-MM-YYYY)
-        date_patterns = [
-            r'Fecha de emisión[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
-            r'Fecha de carga[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
-            r'Fecha de entrega[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{4})'
-        ]
-
-        field_names = ["emision", "carga", "entrega"]
-
-        for pattern, field in zip(date_patterns, field_names):
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                date_str = match.group(1)
-                try:
-                    # Parse date (assuming DD/MM/YYYY format)
-                    day, month, year = map(int, date_str.replace('-', '/').split('/'))
-                    dates[field] = datetime(year, month, day)
-                except ValueError:
-                    continue
-
-        return dates
+        return self._dates_from_tokens(_tokenize(text))
 
     def _extract_remitente(self, text: str) -> Remitente:
         """Extract sender information"""
-        # Find sender section
-        sender_pattern = r'REMITENTE.*?/.*?SENDER(.*?)(?=DESTINATARIO|$)'
-        match = re.search(sender_pattern, text, re.DOTALL | re.IGNORECASE)
-
-        if match:
-            sender_text = match.group(1)
-            lines = [line.strip() for line in sender_text.split('\n') if line.strip()]
-
-            return Remitente(
-                nombre=lines[0] if lines else "Unknown",
-                direccion=lines[1] if len(lines) > 1 else "",
-                ciudad=lines[2] if len(lines) > 2 else "",
-                pais=lines[3] if len(lines) > 3 else "",
-                contacto=self._extract_contact(sender_text)
-            )
-
-        return Remitente(
-            nombre="Unknown",
-            direccion="",
-            ciudad="",
-            pais=""
-        )
+        return self._party_from_tokens(_tokenize(text), "remitente", Remitente)
 
     def _extract_destinatario(self, text: str) -> Destinatario:
         """Extract recipient information"""
-        # Find recipient section
-        recipient_pattern = r'DESTINATARIO.*?/.*?RECIPIENT(.*?)(?=FECHAS|VEHÍCULO|$)'
-        match = re.search(recipient_pattern, text, re.DOTALL | re.IGNORECASE)
-
-        if match:
-            recipient_text = match.group(1)
-            lines = [line.strip() for line in recipient_text.split('\n') if line.strip()]
-
-            return Destinatario(
-                nombre=lines[0] if lines else "Unknown",
-                direccion=lines[1] if len(lines) > 1 else "",
-                ciudad=lines[2] if len(lines) > 2 else "",
-                pais=lines[3] if len(lines) > 3 else "",
-                contacto=self._extract_contact(recipient_text)
-            )
-
-        return Destinatario(
-            nombre="Unknown",
-            direccion="",
-            ciudad="",
-            pais=""
-        )
+        return self._party_from_tokens(_tokenize(text), "destinatario", Destinatario)
 
     def _extract_vehicle_info(self, text: str) -> tuple[str, Optional[str]]:
         """Extract vehicle license plate and driver"""
-        matricula = "UNKNOWN"
-        conductor = None
-
-        # Extract license plate
-        plate_match = re.search(r'Matrícula[:\s]*([A-Z0-9\-]+)', text, re.IGNORECASE)
-        if plate_match:
-            matricula = plate_match.group(1)
-
-        # Extract driver
-        driver_match = re.search(r'Conductor[:\s]*([^\n]+)', text, re.IGNORECASE)
-        if driver_match:
-            conductor = driver_match.group(1).strip()
-
-        return matricula, conductor
+        return self._vehicle_from_tokens(_tokenize(text))
 
     def _extract_carga(self, text: str) -> Carga:
         """Extract load information"""
-        # Find load section
-        load_pattern = r'CARGA.*?/.*?LOAD(.*?)(?=INSTRUCCIONES|$)'
-        match = re.search(load_pattern, text, re.DOTALL | re.IGNORECASE)
+        return self._carga_from_tokens(_tokenize(text))
+
+    def _extract_instructions(self, text: str) -> Optional[str]:
+        """Extract special instructions"""
+        return self._instructions_from_tokens(_tokenize(text))
 
-        carga_text = match.group(1) if match else text
+    def _cmr_number_from_tokens(self, tokens: "_CMRTokens") -> str:
+        """CMR number from the labelled fields"""
+        value = tokens.field("numero_cmr")
+        if value:
+            match = _CMR_NUMBER_RE.match(value)
+            if match:
+                return match.group(0)
+        return "CMR-UNKNOWN"
+
+    def _dates_from_tokens(self, tokens: "_CMRTokens") -> Dict[str, datetime]:
+        """Issue, loading and delivery dates (DD/MM/YYYY or DD-MM-YYYY)"""
+        dates = {}
+        for field in ("emision", "carga", "entrega"):
+            value = tokens.field(f"fecha_{field}")
+            match = _DATE_RE.match(value) if value else None
+            if match:
+                day, month, year = map(int, match.groups())
+                try:
+                    dates[field] = datetime(year, month, day)
+                except ValueError:
+                    continue
+        return dates
 
-        # Extract description
-        desc_match = re.search(r'Descripción[:\s]*([^\n]+)', carga_text, re.IGNORECASE)
-        descripcion = desc_match.group(1).strip() if desc_match else "Mercancía general"
+    def _party_from_tokens(self, tokens: "_CMRTokens", section: str, model):
+        """Sender or recipient block: name, address, city and country by line order"""
+        lines = tokens.free_lines.get(section)
+        if not lines:
+            return model(nombre="Unknown", direccion="", ciudad="", pais="")
+
+        ciudad = lines[2] if len(lines) > 2 else ""
+        pais = lines[3] if len(lines) > 3 else ""
+        if not pais and "," in ciudad:
+            # "Madrid, España" on a single line
+            ciudad, pais = (part.strip() for part in ciudad.rsplit(",", 1))
+
+        return model(
+            nombre=lines[0],
+            direccion=lines[1] if len(lines) > 1 else "",
+            ciudad=ciudad,
+            pais=pais,
+            contacto=tokens.section_field(section, "contacto")
+        )
 
-        # Extract weight
-        weight_match = re.search(r'Peso bruto[:\s]*(\d+(?:\.\d+)?)\s*kg', carga_text, re.IGNORECASE)
-        peso_bruto = float(weight_match.group(1)) if weight_match else 0.0
+    def _vehicle_from_tokens(self, tokens: "_CMRTokens") -> tuple[str, Optional[str]]:
+        """Vehicle license plate and driver"""
+        matricula = "UNKNOWN"
+        value = tokens.field("matricula")
+        match = _PLATE_RE.match(value) if value else None
+        if match:
+            matricula = match.group(0)
 
-        # Extract volume
-        volume_match = re.search(r'Volumen[:\s]*(\d+(?:\.\d+)?)\s*m³', carga_text, re.IGNORECASE)
-        volumen = float(volume_match.group(1)) if volume_match else None
+        conductor = tokens.field("conductor") or None
+        return matricula, conductor
 
-        # Extract units
-        units_match = re.search(r'Unidades[:\s]*(\d+)', carga_text, re.IGNORECASE)
-        unidades = int(units_match.group(1)) if units_match else None
+    def _carga_from_tokens(self, tokens: "_CMRTokens") -> Carga:
+        """Load information, preferring values inside the load section"""
+        def value(field: str) -> Optional[str]:
+            return tokens.section_field("carga", field) or tokens.field(field)
 
-        # Extract value
-        value_match = re.search(r'Valor.*?(\d+(?:\.\d+)?)\s*€', carga_text, re.IGNORECASE)
-        valor = float(value_match.group(1)) if value_match else None
+        descripcion = value("descripcion") or "Mercancía general"
+        peso_bruto = _match_number(_WEIGHT_RE, value("peso_bruto"))
+        volumen = _match_number(_VOLUME_RE, value("volumen"))
+        unidades = _match_number(_UNITS_RE, value("unidades"))
+        valor = _match_number(_VALUE_RE, value("valor"))
 
         # Determine load type
         tipo = TipoCarga.GENERAL
-        if "peligrosa" in descripcion.lower():
+        descripcion_lower = descripcion.lower()
+        if "peligrosa" in descripcion_lower:
             tipo = TipoCarga.PELIGROSA
-        elif "frágil" in descripcion.lower():
+        elif "frágil" in descripcion_lower:
             tipo = TipoCarga.FRAGIL
-        elif "refrigerada" in descripcion.lower():
+        elif "refrigerada" in descripcion_lower:
             tipo = TipoCarga.REFRIGERADA
 
         return Carga(
             descripcion=descripcion,
             tipo=tipo,
-            peso_bruto=peso_bruto,
+            peso_bruto=peso_bruto if peso_bruto is not None else 0.0,
             volumen=volumen,
-            unidades=unidades,
+            unidades=int(unidades) if unidades is not None else None,
             valor_mercancia=valor
         )
 
-    def _extract_instructions(self, text: str) -> Optional[str]:
-        """Extract special instructions"""
-        instructions_pattern = r'INSTRUCCIONES ESPECIALES(.*?)(?=$)'
-        match = re.search(instructions_pattern, text, re.DOTALL | re.IGNORECASE)
-
-        if match:
-            instructions = match.group(1).strip()
-            return instructions if instructions else None
-
+    def _instructions_from_tokens(self, tokens: "_CMRTokens") -> Optional[str]:
+        """Special instructions: every line of the instructions section"""
+        lines = tokens.raw_lines.get("instrucciones")
+        if not lines:
+            return None
+        return "\n".join(lines) or None
+
+class _CMRTokens:
+    """Result of one scan over a CMR text: lines and labelled values per section"""
+
+    __slots__ = ("raw_lines", "free_lines", "section_fields", "fields")
+
+    def __init__(self):
+        self.raw_lines: Dict[str, List[str]] = {}
+        self.free_lines: Dict[str, List[str]] = {}
+        self.section_fields: Dict[str, Dict[str, str]] = {}
+        self.fields: Dict[str, str] = {}
+
+    def field(self, name: str) -> Optional[str]:
+        """First value for a label anywhere in the document"""
+        return self.fields.get(name)
+
+    def section_field(self, section: str, name: str) -> Optional[str]:
+        """Value for a label inside a given section"""
+        return self.section_fields.get(section, {}).get(name)
+
+def _normalize_label(label: str) -> str:
+    """Lower-case, accent-free, single-spaced label"""
+    return " ".join(label.translate(_ACCENTS).lower().split())
+
+def _tokenize(text: str) -> _CMRTokens:
+    """
+    Split CMR text into labelled sections in a single pass.
+
+    A line opens a section when it consists only of section keywords
+    (REMITENTE, DESTINATARIO, FECHAS, VEHÍCULO, CARGA, INSTRUCCIONES or their
+    French/English equivalents, in any case) separated by "/", optionally
+    followed by a box number and a colon; "SENDER LOGISTICS SL" is a party
+    name, not a header. Lines before the first header belong to the
+    "cabecera" section. ``Label: value`` lines are mapped to canonical field
+    names; other lines are kept in order as free lines for positional blocks.
+    """
+    tokens = _CMRTokens()
+    section = "cabecera"
+    raw_lines = tokens.raw_lines.setdefault(section, [])
+    free_lines = tokens.free_lines.setdefault(section, [])
+    section_fields = tokens.section_fields.setdefault(section, {})
+
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        header = _SECTION_HEADER_RE.fullmatch(line.translate(_ACCENTS))
+        if header:
+            section = _SECTION_KEYWORDS[_normalize_label(header.group(1))]
+            raw_lines = tokens.raw_lines.setdefault(section, [])
+            free_lines = tokens.free_lines.setdefault(section, [])
+            section_fields = tokens.section_fields.setdefault(section, {})
+            continue
+
+        raw_lines.append(line)
+
+        labelled = _LABEL_RE.match(line)
+        if labelled:
+            field = _field_for_label(_normalize_label(labelled.group(1)))
+            if field:
+                value = labelled.group(2).strip()
+                section_fields.setdefault(field, value)
+                tokens.fields.setdefault(field, value)
+                continue
+
+        free_lines.append(line)
+
+    return tokens
+
+def _field_for_label(label: str) -> Optional[str]:
+    """Canonical field name for a normalized label"""
+    field = _FIELD_LABELS.get(label)
+    if field is None and label.startswith("valor"):
+        # "Valor mercancía", "Valor declarado", ...
+        field = "valor"
+    return field
+
+def _match_number(pattern: "re.Pattern[str]", value: Optional[str]) -> Optional[float]:
+    """First number captured by ``pattern`` in a field value"""
+    if not value:
         return None
-
-    def _extract_contact(self, text: str) -> Optional[str]:
-        """Extract contact person from text"""
-        contact_match = re.search(r'Contacto[:\s]*([^\n]+)', text, re.IGNORECASE)
-        return contact_match.group(1).strip() if contact_match else None
+    match = pattern.match(value)
+    return float(match.group(1)) if match else None
+
+def _scan_mandatory(text: str) -> Dict[str, Any]:
+    """First value of each mandatory field, or None when absent or unparsable"""
+    found: Dict[str, str] = {}
+    # Accent folding maps one character to one, so spans match the original
+    for match in _MANDATORY_RE.finditer(text.translate(_ACCENTS)):
+        field = next(name for name in MANDATORY_FIELDS if match.group(name) is not None)
+        if field not in found:
+            start, end = match.span("value")
+            found[field] = text[start:end].strip()
+            if len(found) == len(MANDATORY_FIELDS):
+                break
+
+    numero = _CMR_NUMBER_RE.match(found.get("numero_cmr", ""))
+    matricula = _PLATE_RE.match(found.get("matricula_vehiculo", ""))
+    peso = _match_number(_WEIGHT_RE, found.get("peso_bruto"))
+    return {
+        "numero_cmr": numero.group(0) if numero else None,
+        "matricula_vehiculo": matricula.group(0) if matricula else None,
+        "peso_bruto": peso if peso else None,
+    }
+
+def _check_mandatory(
+    values: Dict[str, Any],
+    scores: Dict[str, float],
+    min_confidence: float
+) -> "tuple[Dict[str, FieldConfidence], List[str]]":
+    """Per-field confidence results and the reasons for rejection, if any"""
+    fields: Dict[str, FieldConfidence] = {}
+    errors: List[str] = []
+    for field, score_keys in MANDATORY_FIELDS.items():
+        value = values.get(field)
+        confidence = next((scores[key] for key in score_keys if key in scores), None)
+        accepted = value is not None and confidence is not None and confidence >= min_confidence
+        fields[field] = FieldConfidence(value=value, confidence=confidence, accepted=accepted)
+        if value is None:
+            errors.append(f"Missing mandatory field: {field}")
+        elif confidence is None:
+            errors.append(f"No confidence reported for {field}")
+        elif not accepted:
+            errors.append(f"Confidence for {field} is {confidence}, below {min_confidence}")
+    return fields, errors
@@ -0,0 +1,122 @@
+"""
+Cache of great-circle distances between frequently used locations
+"""
+import math
+import threading
+from collections import OrderedDict
+from itertools import combinations
+from typing import Iterable, List, Optional, Sequence, Tuple
+from .geodesy import Punto, haversine_km, pairwise_distances_km
+from ..value_objects.direccion import Ruta
+
+_Clave = Tuple[Tuple[int, int], Tuple[int, int]]
+
+class DistanceCache:
+    """
+    Symmetric origin-destination distance cache with LRU eviction.
+
+    Coordinates are quantized to ``decimales`` decimal places before
+    lookup, so the same depot written as "40.41680,-3.70380" or
+    "40.4168,-3.7038" hits the same entry, and ``(a, b)`` shares its entry
+    with ``(b, a)``. Distances are computed between the quantized points:
+    at the default 4 decimals (about 11 m) a cached distance differs from
+    the exact one by at most ~16 m.
+    """
+
+    def __init__(self, decimales: int = 4, max_entries: int = 100_000):
+        self.decimales = decimales
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._scale = 10 ** decimales
+        self._entries: "OrderedDict[_Clave, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _punto(self, punto: Punto) -> Tuple[int, int]:
+        return round(punto[0] * self._scale), round(punto[1] * self._scale)
+
+    def key(self, origen: Punto, destino: Punto) -> _Clave:
+        """Order-independent key of a pair of points"""
+        a, b = self._punto(origen), self._punto(destino)
+        return (a, b) if a <= b else (b, a)
+
+    def _calcular(self, clave: _Clave) -> float:
+        (lat1, lon1), (lat2, lon2) = clave
+        return haversine_km(lat1 / self._scale, lon1 / self._scale, lat2 / self._scale, lon2 / self._scale)
+
+    def distancia(self, origen: Punto, destino: Punto) -> float:
+        """Distance in km between two ``(latitud, longitud)`` points"""
+        clave = self.key(origen, destino)
+        with self._lock:
+            value = self._entries.get(clave)
+            if value is not None:
+                self._entries.move_to_end(clave)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = self._calcular(clave)
+        with self._lock:
+            self._remember(clave, value)
+        return value
+
+    def matriz(self, puntos: Sequence[Punto]) -> List[List[float]]:
+        """Square matrix of cached distances between ``puntos``, zero on the diagonal"""
+        n = len(puntos)
+        matriz = [[0.0] * n for _ in range(n)]
+        for i in range(n):
+            for j in range(i + 1, n):
+                matriz[i][j] = matriz[j][i] = self.distancia(puntos[i], puntos[j])
+        return matriz
+
+    @property
+    def max_puntos_precalentar(self) -> int:
+        """Most distinct points whose pairs all fit in ``max_entries``"""
+        return (1 + math.isqrt(1 + 8 * self.max_entries)) // 2
+
+    def distancia_ruta(self, ruta: Ruta) -> Optional[float]:
+        """Cached distance between the origin and destination of a route, if both have coordinates"""
+        coord_origen = ruta.origen.obtener_coordenadas()
+        coord_destino = ruta.destino.obtener_coordenadas()
+        if coord_origen and coord_destino:
+            return self.distancia(coord_origen, coord_destino)
+        return None
+
+    def precalentar(self, puntos: Iterable[Punto]) -> int:
+        """
+        Compute the distances between every pair of the given points
+
+        Meant for known depots at startup. ``n`` points fill
+        ``n * (n - 1) / 2`` entries.
+
+        Returns:
+            Number of pairs computed
+
+        Raises:
+            ValueError: If there are more distinct points than
+                ``max_puntos_precalentar``, whose pairs would evict each other
+        """
+        unicos = list(dict.fromkeys(self._punto(punto) for punto in puntos))
+        if len(unicos) > self.max_puntos_precalentar:
+            raise ValueError(
+                f"Too many points to precompute: {len(unicos)} (at most {self.max_puntos_precalentar})"
+            )
+        distancias = pairwise_distances_km([(lat / self._scale, lon / self._scale) for lat, lon in unicos])
+        with self._lock:
+            for (a, b), value in zip(combinations(unicos, 2), distancias):
+                self._remember((a, b) if a <= b else (b, a), value)
+        return len(distancias)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, clave: _Clave, value: float) -> None:
+        """Insert into the LRU, evicting the least recently used entries"""
+        self._entries[clave] = value
+        self._entries.move_to_end(clave)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
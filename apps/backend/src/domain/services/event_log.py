@@ -0,0 +1,70 @@
+"""
+Bounded, numbered event log for resumable reads
+"""
+import threading
+from collections import deque
+from itertools import islice
+from typing import Callable, Deque, Generic, List, Optional, TypeVar
+
+E = TypeVar("E")
+
+class EventLog(Generic[E]):
+    """
+    The last ``max_eventos`` events, numbered by ``secuencia``.
+
+    A consumer reads from the last sequence number it saw; ``perdidos``
+    tells it when events it has not seen were already dropped, or were
+    numbered before a restart reset the sequence, so it must reload its
+    state instead of relying on the log.
+    """
+
+    def __init__(self, max_eventos: int = 10000):
+        self._eventos: Deque[E] = deque(maxlen=max_eventos)
+        self._secuencia = 0
+        self._lock = threading.Lock()
+
+    def append(self, crear: Callable[[int], E]) -> E:
+        """Log the event ``crear`` builds for the next sequence number"""
+        with self._lock:
+            self._secuencia += 1
+            evento = crear(self._secuencia)
+            self._eventos.append(evento)
+        return evento
+
+    def eventos(self, despues: int = 0, limit: Optional[int] = None,
+                filtro: Optional[Callable[[E], bool]] = None) -> List[E]:
+        """Logged events with ``secuencia > despues`` accepted by ``filtro``, oldest first"""
+        resultado: List[E] = []
+        with self._lock:
+            if not self._eventos:
+                return resultado
+            start = max(0, despues + 1 - self._eventos[0].secuencia)
+            for evento in islice(self._eventos, start, None):
+                if limit is not None and len(resultado) >= limit:
+                    break
+                if filtro is None or filtro(evento):
+                    resultado.append(evento)
+        return resultado
+
+    @property
+    def ultima_secuencia(self) -> int:
+        """Sequence number of the latest event, 0 before the first"""
+        return self._secuencia
+
+    def perdidos(self, despues: int) -> bool:
+        """
+        Whether events after ``despues`` are no longer in the log
+
+        Offsets past the latest event were handed out before a restart
+        reset the sequence, so everything after them is lost as well.
+        """
+        with self._lock:
+            if despues > self._secuencia:
+                return True
+            primera = self._eventos[0].secuencia if self._eventos else self._secuencia + 1
+            return despues < self._secuencia and despues + 1 < primera
+
+    def clear(self) -> None:
+        """Drop the logged events; sequence numbers keep increasing"""
+        with self._lock:
+            self._eventos.clear()
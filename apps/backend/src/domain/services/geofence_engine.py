@@ -0,0 +1,242 @@
+"""
+Geofence evaluation of GPS pings against depot and customer zones
+"""
+import math
+import threading
+from datetime import datetime, timezone
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from src.domain.entities.geocerca import EventoGeocerca, Geocerca, TipoEventoGeocerca
+from src.domain.entities.posicion import TipoSeguimiento
+from src.domain.services.event_log import EventLog
+from src.domain.services.geodesy import METRES_PER_DEGREE
+
+class _Zona:
+    """A geofence compiled for fast containment tests"""
+
+    __slots__ = ("id", "min_lat", "max_lat", "min_lon", "max_lon", "_lats", "_lons", "_centro", "_radio_m")
+
+    def __init__(self, geocerca: Geocerca):
+        self.id = geocerca.id
+        self._lats: Tuple[float, ...] = ()
+        self._lons: Tuple[float, ...] = ()
+        self._centro: Optional[Tuple[float, float]] = None
+        self._radio_m = 0.0
+
+        if geocerca.poligono is not None:
+            if len(geocerca.poligono) < 3 or geocerca.centro is not None:
+                raise ValueError("A polygon geofence needs at least three vertices and no centre")
+            self._lats = tuple(v.latitud for v in geocerca.poligono)
+            self._lons = tuple(v.longitud for v in geocerca.poligono)
+            self.min_lat, self.max_lat = min(self._lats), max(self._lats)
+            self.min_lon, self.max_lon = min(self._lons), max(self._lons)
+        elif geocerca.centro is not None and geocerca.radio_m is not None:
+            lat, lon = geocerca.centro.latitud, geocerca.centro.longitud
+            self._centro = (lat, lon)
+            self._radio_m = geocerca.radio_m
+            dlat = geocerca.radio_m / METRES_PER_DEGREE
+            dlon = dlat / max(math.cos(math.radians(lat)), 1e-6)
+            self.min_lat, self.max_lat = lat - dlat, lat + dlat
+            self.min_lon, self.max_lon = lon - dlon, lon + dlon
+        else:
+            raise ValueError("A geofence needs either a polygon or a centre and a radius")
+
+    def contains(self, lat: float, lon: float) -> bool:
+        if not (self.min_lat <= lat <= self.max_lat and self.min_lon <= lon <= self.max_lon):
+            return False
+        if self._centro is not None:
+            # Equirectangular distance, well within a metre at geofence radii
+            clat, clon = self._centro
+            dy = (lat - clat) * METRES_PER_DEGREE
+            dx = (lon - clon) * METRES_PER_DEGREE * math.cos(math.radians(clat))
+            return dx * dx + dy * dy <= self._radio_m * self._radio_m
+
+        # Ray casting along the latitude line through the point
+        inside = False
+        lats, lons = self._lats, self._lons
+        j = len(lats) - 1
+        for i in range(len(lats)):
+            if (lats[i] > lat) != (lats[j] > lat):
+                if lon < lons[i] + (lat - lats[i]) * (lons[j] - lons[i]) / (lats[j] - lats[i]):
+                    inside = not inside
+            j = i
+        return inside
+
+class GeofenceIndex:
+    """
+    Uniform grid over latitude/longitude with cells of ``cell_deg`` degrees.
+
+    Each zone is listed in every cell its bounding box overlaps, so the
+    candidates for a point are one dictionary lookup plus bounding-box
+    checks. Depot and customer zones have similar sizes, which suits a
+    grid better than a tree; zones that would span more than
+    ``max_cells`` cells are kept in a short list checked for every point.
+    """
+
+    def __init__(self, cell_deg: float = 0.1, max_cells: int = 4096):
+        self.cell_deg = cell_deg
+        self.max_cells = max_cells
+        self._cells: Dict[Tuple[int, int], List[_Zona]] = {}
+        self._grandes: List[_Zona] = []
+        self._zonas: Dict[str, _Zona] = {}
+
+    def __len__(self) -> int:
+        return len(self._zonas)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg)
+
+    def _covered(self, zona: _Zona) -> Optional[List[Tuple[int, int]]]:
+        lat0, lon0 = self._cell(zona.min_lat, zona.min_lon)
+        lat1, lon1 = self._cell(zona.max_lat, zona.max_lon)
+        if (lat1 - lat0 + 1) * (lon1 - lon0 + 1) > self.max_cells:
+            return None
+        return [(i, j) for i in range(lat0, lat1 + 1) for j in range(lon0, lon1 + 1)]
+
+    def add(self, zona: _Zona) -> None:
+        """Index a zone, replacing any zone with the same ID"""
+        self.remove(zona.id)
+        self._zonas[zona.id] = zona
+        cells = self._covered(zona)
+        if cells is None:
+            self._grandes.append(zona)
+            return
+        for cell in cells:
+            self._cells.setdefault(cell, []).append(zona)
+
+    def remove(self, zona_id: str) -> bool:
+        """Remove a zone and return whether it was indexed"""
+        zona = self._zonas.pop(zona_id, None)
+        if zona is None:
+            return False
+        cells = self._covered(zona)
+        if cells is None:
+            self._grandes.remove(zona)
+            return True
+        for cell in cells:
+            zonas = self._cells[cell]
+            zonas.remove(zona)
+            if not zonas:
+                del self._cells[cell]
+        return True
+
+    def containing(self, lat: float, lon: float) -> FrozenSet[str]:
+        """IDs of the zones containing a point"""
+        candidates = self._cells.get(self._cell(lat, lon), ())
+        inside = [zona.id for zona in candidates if zona.contains(lat, lon)]
+        if self._grandes:
+            inside.extend(zona.id for zona in self._grandes if zona.contains(lat, lon))
+        return frozenset(inside)
+
+class GeofenceEngine:
+    """
+    Registered geofences and which of them each load or vehicle is in.
+
+    ``evaluar`` takes a batch of ``(tipo, id, timestamp, latitud, longitud)``
+    pings, the same shape the position history ingests, and returns the
+    entry and exit events they cause. Events are also kept in an
+    ``EventLog`` of the last ``max_eventos`` events, numbered by
+    ``secuencia`` so consumers can poll for what they have not seen yet
+    and learn from ``perdidos`` when they fell behind. A ping older than
+    the last one evaluated for its track cannot change the current state
+    and is skipped.
+    """
+
+    def __init__(self, index: Optional[GeofenceIndex] = None, max_eventos: int = 10000):
+        self.index = index if index is not None else GeofenceIndex()
+        self._geocercas: Dict[str, Geocerca] = {}
+        self._estado: Dict[Tuple[str, str], Tuple[float, FrozenSet[str]]] = {}
+        self._eventos: EventLog[EventoGeocerca] = EventLog(max_eventos)
+        self._lock = threading.Lock()
+
+    def registrar(self, geocerca: Geocerca) -> Geocerca:
+        """Add or replace a geofence; raises ValueError for an invalid shape"""
+        zona = _Zona(geocerca)
+        with self._lock:
+            self.index.add(zona)
+            self._geocercas[geocerca.id] = geocerca
+        return geocerca
+
+    def eliminar(self, geocerca_id: str) -> bool:
+        """
+        Remove a geofence
+
+        Tracks inside it simply stop being inside; no exit events are
+        emitted for a zone that no longer exists.
+        """
+        with self._lock:
+            if not self.index.remove(geocerca_id):
+                return False
+            del self._geocercas[geocerca_id]
+            for key, (t, dentro) in self._estado.items():
+                if geocerca_id in dentro:
+                    self._estado[key] = (t, dentro - {geocerca_id})
+            return True
+
+    def obtener(self, geocerca_id: str) -> Optional[Geocerca]:
+        return self._geocercas.get(geocerca_id)
+
+    def geocercas(self) -> List[Geocerca]:
+        return list(self._geocercas.values())
+
+    def dentro(self, tipo: str, track_id: str) -> FrozenSet[str]:
+        """Geofences a load or vehicle is currently in"""
+        estado = self._estado.get((tipo, track_id))
+        return estado[1] if estado is not None else frozenset()
+
+    def evaluar(self, pings: Iterable[Tuple[str, str, float, float, float]]) -> List[EventoGeocerca]:
+        """Update track states from a batch of pings and return the resulting events"""
+        grouped: Dict[Tuple[str, str], List[Tuple[float, float, float]]] = {}
+        for tipo, track_id, t, lat, lon in pings:
+            grouped.setdefault((tipo, track_id), []).append((t, lat, lon))
+
+        eventos: List[EventoGeocerca] = []
+        with self._lock:
+            if not self._geocercas:
+                return eventos
+            for key, posiciones in grouped.items():
+                ultimo, anterior = self._estado.get(key, (-math.inf, frozenset()))
+                for t, lat, lon in sorted(posiciones):
+                    if t < ultimo:
+                        continue
+                    ultimo = t
+                    actual = self.index.containing(lat, lon)
+                    if actual != anterior:
+                        for geocerca_id in sorted(anterior - actual):
+                            eventos.append(self._evento(TipoEventoGeocerca.SALIDA, geocerca_id, key, t, lat, lon))
+                        for geocerca_id in sorted(actual - anterior):
+                            eventos.append(self._evento(TipoEventoGeocerca.ENTRADA, geocerca_id, key, t, lat, lon))
+                        anterior = actual
+                self._estado[key] = (ultimo, anterior)
+        return eventos
+
+    def _evento(self, tipo: TipoEventoGeocerca, geocerca_id: str, key: Tuple[str, str],
+                t: float, lat: float, lon: float) -> EventoGeocerca:
+        return self._eventos.append(lambda secuencia: EventoGeocerca(
+            secuencia=secuencia,
+            tipo=tipo,
+            geocerca_id=geocerca_id,
+            tipo_seguimiento=TipoSeguimiento(key[0]),
+            track_id=key[1],
+            timestamp=datetime.fromtimestamp(t, tz=timezone.utc),
+            latitud=lat,
+            longitud=lon
+        ))
+
+    def eventos(self, despues: int = 0, limit: Optional[int] = None) -> List[EventoGeocerca]:
+        """Logged events with ``secuencia > despues``, oldest first"""
+        return self._eventos.eventos(despues, limit)
+
+    @property
+    def ultima_secuencia(self) -> int:
+        """Sequence number of the latest event, 0 before the first"""
+        return self._eventos.ultima_secuencia
+
+    def perdidos(self, despues: int) -> bool:
+        """Whether events after ``despues`` are no longer in the log, see ``EventLog.perdidos``"""
+        return self._eventos.perdidos(despues)
+
+    def clear(self) -> None:
+        """Forget track states and logged events, keeping the geofences"""
+        with self._lock:
+            self._estado.clear()
+            self._eventos.clear()
@@ -0,0 +1,73 @@
+"""
+Identifier generation domain services
+"""
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+
+# Crockford's base32 alphabet (no I, L, O, U) keeps IDs URL-safe and sortable
+_CROCKFORD_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_RANDOM_BITS = 80
+_RANDOM_MAX = (1 << _RANDOM_BITS) - 1
+
+class IdGenerator(ABC):
+    """Abstract base class for entity identifier generators"""
+
+    @abstractmethod
+    def next_id(self, prefix: str = "") -> str:
+        """Return a new unique identifier, optionally prefixed"""
+        pass
+
+class TimeOrderedIdGenerator(IdGenerator):
+    """
+    ULID-style identifier generator.
+
+    Each ID is a 48-bit millisecond timestamp followed by 80 random bits,
+    encoded as 26 Crockford base32 characters. IDs generated within the same
+    millisecond increment the random part, so the sequence is strictly
+    monotonic per process and sorts lexicographically in creation order,
+    which keeps B-tree inserts on the right-most page. No repository access
+    is needed, so concurrent creates never collide.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_timestamp = -1
+        self._last_random = 0
+
+    def next_id(self, prefix: str = "") -> str:
+        """Return a new time-ordered identifier"""
+        with self._lock:
+            timestamp = time.time_ns() // 1_000_000
+            if timestamp <= self._last_timestamp:
+                # Same (or skewed back) millisecond: stay monotonic
+                timestamp = self._last_timestamp
+                random_part = self._last_random + 1
+                if random_part > _RANDOM_MAX:
+                    timestamp += 1
+                    random_part = self._random()
+            else:
+                random_part = self._random()
+
+            self._last_timestamp = timestamp
+            self._last_random = random_part
+
+        value = (timestamp << _RANDOM_BITS) | random_part
+        return f"{prefix}{self._encode(value)}"
+
+    def _random(self) -> int:
+        """Random part, leaving headroom for in-millisecond increments"""
+        return int.from_bytes(os.urandom(10), "big") >> 1
+
+    @staticmethod
+    def _encode(value: int) -> str:
+        """Encode a 128-bit integer as 26 Crockford base32 characters"""
+        chars = []
+        for _ in range(26):
+            chars.append(_CROCKFORD_ALPHABET[value & 0x1F])
+            value >>= 5
+        return "".join(reversed(chars))
+
+# Process-wide generator shared by the use cases
+default_id_generator = TimeOrderedIdGenerator()
@@ -0,0 +1,117 @@
+"""
+Resolution of license plates to fleet vehicles
+"""
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+from src.domain.entities.evento_cambio import EventoCambio, OperacionCambio, TipoEntidad
+from src.domain.repositories.interfaces import VehiculoRepository
+
+def normalizar_matricula(matricula: str) -> str:
+    """
+    Canonical form of a license plate for matching
+
+    Upper case without accents, spaces or separators, so "1234-abc",
+    "1234 ABC" and "1234ABC" all compare equal.
+    """
+    folded = unicodedata.normalize("NFKD", matricula or "")
+    return "".join(char for char in folded if char.isalnum()).upper()
+
+class UnresolvedMatriculaCache:
+    """
+    Plates recently looked up without a matching vehicle.
+
+    Plates from CMRs of third-party trucks never match the fleet, and
+    without this cache every reconciliation would query them again. Entries
+    expire after ``ttl`` seconds so vehicles added later are picked up, and
+    the cache is bounded to ``max_entries`` (least recently seen evicted).
+    Subscribed to the change bus through ``al_cambiar``, a plate is
+    forgotten as soon as a vehicle with it is saved.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._expiry: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def contains(self, matricula: str) -> bool:
+        """Whether a normalized plate is known not to match any vehicle"""
+        with self._lock:
+            expiry = self._expiry.get(matricula)
+            if expiry is None:
+                return False
+            if expiry <= self._clock():
+                del self._expiry[matricula]
+                return False
+            return True
+
+    def add(self, matriculas: Iterable[str]) -> None:
+        """Remember normalized plates that matched no vehicle"""
+        with self._lock:
+            expiry = self._clock() + self.ttl
+            for matricula in matriculas:
+                self._expiry[matricula] = expiry
+                self._expiry.move_to_end(matricula)
+            while len(self._expiry) > self.max_entries:
+                self._expiry.popitem(last=False)
+
+    def discard(self, matricula: str) -> None:
+        """Forget a plate, e.g. after a vehicle with it was registered"""
+        with self._lock:
+            self._expiry.pop(normalizar_matricula(matricula), None)
+
+    def al_cambiar(self, evento: EventoCambio) -> None:
+        """Change bus subscriber: forget the plate of every saved vehicle"""
+        if (evento.entidad == TipoEntidad.VEHICULO and evento.operacion == OperacionCambio.GUARDADO
+                and evento.datos):
+            self.discard(evento.datos.get("matricula", ""))
+
+    def clear(self) -> None:
+        """Forget every plate"""
+        with self._lock:
+            self._expiry.clear()
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+class MatriculaResolver:
+    """
+    Resolves batches of free-text plates to vehicle IDs.
+
+    Plates are normalized and deduplicated first, and all plates not known
+    to be unresolvable are fetched with a single ``find_by_matriculas``
+    call, so reconciling thousands of CMRs costs one repository lookup
+    instead of one per document.
+    """
+
+    def __init__(self, vehiculo_repository: VehiculoRepository,
+                 unresolved_cache: Optional[UnresolvedMatriculaCache] = None):
+        self.vehiculo_repository = vehiculo_repository
+        self.unresolved_cache = unresolved_cache if unresolved_cache is not None else UnresolvedMatriculaCache()
+
+    def resolve(self, matriculas: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Resolve plates to vehicle IDs
+
+        Returns:
+            Vehicle ID per plate as given, or None when no vehicle matches
+        """
+        originales: List[str] = list(dict.fromkeys(matriculas))
+        normalizadas = {matricula: normalizar_matricula(matricula) for matricula in originales}
+
+        pendientes = {
+            normalizada for normalizada in normalizadas.values()
+            if normalizada and not self.unresolved_cache.contains(normalizada)
+        }
+        encontrados: Dict[str, str] = {}
+        if pendientes:
+            vehiculos = self.vehiculo_repository.find_by_matriculas(pendientes)
+            encontrados = {normalizada: vehiculo.id for normalizada, vehiculo in vehiculos.items()}
+            self.unresolved_cache.add(pendientes - encontrados.keys())
+
+        return {matricula: encontrados.get(normalizadas[matricula]) for matricula in originales}
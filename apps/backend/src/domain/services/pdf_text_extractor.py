@@ -0,0 +1,676 @@
+"""
+Text-layer PDF extraction for CMR documents
+
+A small pure-Python PDF reader: it parses the object structure (including
+compressed object streams), walks the page tree, inflates Flate-encoded
+content streams and interprets the text-showing operators. Scanned PDFs
+without a text layer, encrypted files and fonts without a usable encoding
+yield no text.
+"""
+import re
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.domain.entities.cmr_document import RawCMRData, RawCMRPage
+from src.domain.services.cmr_normalizer import MANDATORY_FIELDS, CMRExtractor, DocumentData
+
+# Most bytes one stream may inflate to, and all streams of one document
+MAX_INFLATED_BYTES = 16 * 1024 * 1024
+MAX_DOCUMENT_INFLATED_BYTES = 64 * 1024 * 1024
+
+# Text-layer text is exact, unlike OCR output, so the mandatory fields found
+# in it are reported with full confidence
+TEXT_LAYER_CONFIDENCE = 1.0
+
+class PDFSyntaxError(ValueError):
+    """Raised when a document cannot be read as a PDF"""
+    pass
+
+class PDFInflateLimitError(PDFSyntaxError):
+    """Raised when a stream inflates beyond the limits; the whole document is rejected"""
+    pass
+
+class PDFName(str):
+    """PDF name object (``/Type`` is stored as ``PDFName("Type")``)"""
+    pass
+
+class PDFKeyword(str):
+    """Bare keyword or content-stream operator"""
+    pass
+
+class PDFRef:
+    """Indirect object reference"""
+
+    __slots__ = ("num", "gen")
+
+    def __init__(self, num: int, gen: int):
+        self.num = num
+        self.gen = gen
+
+class _InflateBudget:
+    """Bytes the streams of one document may still inflate to"""
+
+    def __init__(self, remaining: int):
+        self.remaining = remaining
+        self._lock = threading.Lock()
+
+    def take(self, size: int) -> None:
+        with self._lock:
+            if size > self.remaining:
+                self.remaining = 0
+                raise PDFInflateLimitError("Document inflates beyond the size limit")
+            self.remaining -= size
+
+class PDFStream:
+    """Stream object; the data is inflated on first access"""
+
+    def __init__(self, attrs: Dict[str, Any], raw: bytes, budget: Optional[_InflateBudget] = None):
+        self.attrs = attrs
+        self.raw = raw
+        self.budget = budget if budget is not None else _InflateBudget(MAX_DOCUMENT_INFLATED_BYTES)
+        self._data: Optional[bytes] = None
+
+    @property
+    def data(self) -> bytes:
+        if self._data is None:
+            self._data = _decode_stream(self.attrs, self.raw, self.budget)
+        return self._data
+
+# Lexical structure (ISO 32000-1, 7.2 and 7.3)
+_DELIM = rb"\x00\t\n\x0c\r ()<>\[\]{}/%"
+_TOKEN_RE = re.compile(
+    rb"(?P<ws>[\x00\t\n\x0c\r ]+|%[^\r\n]*)"
+    rb"|(?P<num>[+-]?(?:\d+\.?\d*|\.\d+))(?=[" + _DELIM + rb"]|$)"
+    rb"|(?P<name>/[^" + _DELIM + rb"]*)"
+    rb"|(?P<dict_open><<)|(?P<dict_close>>>)"
+    rb"|(?P<arr_open>\[)|(?P<arr_close>\])"
+    rb"|(?P<hex><[0-9A-Fa-f\x00\t\n\x0c\r ]*>)"
+    rb"|(?P<lit>\()"
+    rb"|(?P<kw>[^" + _DELIM + rb"]+)"
+    rb"|(?P<other>.)",
+    re.DOTALL
+)
+_NAME_ESCAPE_RE = re.compile(rb"#([0-9A-Fa-f]{2})")
+_HEADER_RE = re.compile(rb"%PDF-")
+_OBJ_RE = re.compile(rb"(\d+)\s+(\d+)\s+obj\b")
+_ENDSTREAM_RE = re.compile(rb"\r?\n?endstream\b")
+_TRAILER_RE = re.compile(rb"trailer\s*<<")
+_INLINE_IMAGE_END_RE = re.compile(rb"[\x00\t\n\x0c\r ]EI(?=[" + _DELIM + rb"]|$)")
+_LITERAL_ESCAPES = {
+    ord("n"): b"\n", ord("r"): b"\r", ord("t"): b"\t", ord("b"): b"\b", ord("f"): b"\x0c",
+    ord("("): b"(", ord(")"): b")", ord("\\"): b"\\",
+}
+
+# Cheap test on an inflated content stream: adjacent string fragments of a
+# TJ array are glued together before looking for a CMR heading
+_TJ_GAP_RE = re.compile(rb"\)\s*-?[\d.]+\s*\(")
+_TJ_HEX_GAP_RE = re.compile(rb">\s*(?:-?[\d.]+\s*)?<")
+_CMR_MARKERS = r"CMR|carta de porte|lettre de voiture|consignment note|frachtbrief"
+_CMR_MARKER_RE = re.compile(_CMR_MARKERS.encode("ascii"), re.IGNORECASE)
+_CMR_TEXT_RE = re.compile(_CMR_MARKERS, re.IGNORECASE)
+
+# Horizontal TJ displacement (thousandths of an em) treated as a word gap
+_TJ_SPACE_THRESHOLD = 200
+
+class _Lexer:
+    """Tokenizer over a bytes-like buffer"""
+
+    def __init__(self, data: DocumentData, pos: int = 0):
+        self.data = data
+        self.pos = pos
+
+    def next(self) -> Optional[Tuple[str, Any]]:
+        """Next (kind, value) token, or None at the end of the buffer"""
+        data = self.data
+        while True:
+            match = _TOKEN_RE.match(data, self.pos)
+            if match is None:
+                return None
+            kind = match.lastgroup
+            self.pos = match.end()
+            if kind == "ws":
+                continue
+            text = match.group(kind)
+            if kind == "num":
+                return kind, float(text) if b"." in text else int(text)
+            if kind == "name":
+                name = _NAME_ESCAPE_RE.sub(lambda m: bytes([int(m.group(1), 16)]), text[1:])
+                return kind, PDFName(name.decode("latin-1"))
+            if kind == "hex":
+                digits = re.sub(rb"[^0-9A-Fa-f]", b"", text[1:-1])
+                if len(digits) % 2:
+                    digits += b"0"
+                return kind, bytes.fromhex(digits.decode("ascii"))
+            if kind == "lit":
+                value, self.pos = _read_literal(data, self.pos)
+                return kind, value
+            if kind == "kw":
+                word = text.decode("latin-1")
+                if word == "true":
+                    return "value", True
+                if word == "false":
+                    return "value", False
+                if word == "null":
+                    return "value", None
+                return kind, PDFKeyword(word)
+            return kind, text
+
+    def read_object(self, first: Optional[Tuple[str, Any]] = None) -> Any:
+        """Read one complete object (arrays and dictionaries included)"""
+        token = first or self.next()
+        if token is None:
+            raise PDFSyntaxError("Unexpected end of data")
+        kind, value = token
+        if kind == "arr_open":
+            return self.read_sequence("arr_close")
+        if kind == "dict_open":
+            items = self.read_sequence("dict_close")
+            return {str(items[i]): items[i + 1] for i in range(0, len(items) - 1, 2)}
+        return value
+
+    def read_sequence(self, closing: str, stop_keywords: Tuple[str, ...] = ()) -> List[Any]:
+        """Read objects up to ``closing`` (or a stop keyword), folding ``n g R`` into refs"""
+        items: List[Any] = []
+        while True:
+            token = self.next()
+            if token is None or token[0] == closing:
+                return items
+            kind, value = token
+            if kind == "kw":
+                if value in stop_keywords:
+                    self.pos -= len(value)
+                    return items
+                if value == "R" and len(items) >= 2 and isinstance(items[-1], int) and isinstance(items[-2], int):
+                    gen = items.pop()
+                    items.append(PDFRef(items.pop(), gen))
+                    continue
+            items.append(self.read_object(token))
+
+def _read_literal(data: DocumentData, pos: int) -> Tuple[bytes, int]:
+    """Read a literal string body starting after its opening parenthesis"""
+    out = bytearray()
+    depth = 1
+    end = len(data)
+    while pos < end:
+        char = data[pos]
+        pos += 1
+        if char == 0x5C:  # backslash
+            if pos >= end:
+                break
+            char = data[pos]
+            pos += 1
+            if char in _LITERAL_ESCAPES:
+                out += _LITERAL_ESCAPES[char]
+            elif 0x30 <= char <= 0x37:  # octal escape, up to three digits
+                value = char - 0x30
+                for _ in range(2):
+                    if pos < end and 0x30 <= data[pos] <= 0x37:
+                        value = value * 8 + data[pos] - 0x30
+                        pos += 1
+                out.append(value & 0xFF)
+            elif char == 0x0D:  # escaped line break
+                if pos < end and data[pos] == 0x0A:
+                    pos += 1
+            elif char != 0x0A:
+                out.append(char)
+        elif char == 0x28:
+            depth += 1
+            out.append(char)
+        elif char == 0x29:
+            depth -= 1
+            if depth == 0:
+                break
+            out.append(char)
+        else:
+            out.append(char)
+    return bytes(out), pos
+
+def _decode_stream(attrs: Dict[str, Any], raw: bytes, budget: _InflateBudget) -> bytes:
+    """Apply the stream filters this reader understands, within the inflate limits"""
+    filters = attrs.get("Filter")
+    if filters is None:
+        return raw
+    if not isinstance(filters, list):
+        filters = [filters]
+    data = raw
+    for name in filters:
+        if name in ("FlateDecode", "Fl"):
+            limit = min(MAX_INFLATED_BYTES, budget.remaining)
+            decompressor = zlib.decompressobj()
+            # Tolerate truncated streams and trailing garbage
+            data = decompressor.decompress(data, limit + 1)
+            if decompressor.unconsumed_tail or len(data) > limit:
+                raise PDFInflateLimitError("Stream inflates beyond the size limit")
+            budget.take(len(data))
+        else:
+            raise PDFSyntaxError(f"Unsupported stream filter: {name}")
+    return data
+
+class PDFDocument:
+    """Parsed object table and page list of a PDF file"""
+
+    def __init__(self, data: DocumentData):
+        if not _starts_with_header(data):
+            raise PDFSyntaxError("Not a PDF document")
+        self.objects: Dict[int, Any] = {}
+        self.trailer: Dict[str, Any] = {}
+        self._budget = _InflateBudget(MAX_DOCUMENT_INFLATED_BYTES)
+        self._load_objects(data)
+        if "Encrypt" in self.trailer:
+            raise PDFSyntaxError("Encrypted PDFs are not supported")
+        self.pages = self._collect_pages()
+
+    def resolve(self, value: Any) -> Any:
+        """Follow indirect references"""
+        seen = 0
+        while isinstance(value, PDFRef) and seen < 32:
+            value = self.objects.get(value.num)
+            seen += 1
+        return value
+
+    def _load_objects(self, data: DocumentData) -> None:
+        """Scan every ``n g obj`` definition; later definitions win"""
+        skip_until = 0
+        object_streams: List[PDFStream] = []
+        for match in _OBJ_RE.finditer(data):
+            if match.start() < skip_until:
+                continue  # inside a stream body
+            num = int(match.group(1))
+            lexer = _Lexer(data, match.end())
+            items = lexer.read_sequence("eof", stop_keywords=("endobj", "stream", "obj"))
+            value = items[0] if items else None
+            token = lexer.next()
+            if token == ("kw", "stream") and isinstance(value, dict):
+                raw, skip_until = self._read_stream_body(data, lexer.pos, value)
+                value = PDFStream(value, raw, self._budget)
+                if value.attrs.get("Type") == "ObjStm":
+                    object_streams.append(value)
+                elif value.attrs.get("Type") == "XRef":
+                    self.trailer.update(value.attrs)
+            elif token == ("kw", "endobj"):
+                skip_until = lexer.pos
+            # Otherwise endobj is missing; resume the scan at the next definition
+            self.objects[num] = value
+
+        for stream in object_streams:
+            self._load_object_stream(stream)
+
+        for match in _TRAILER_RE.finditer(data):
+            self.trailer.update(_Lexer(data, match.end() - 2).read_object())
+
+    def _read_stream_body(self, data: DocumentData, pos: int, attrs: Dict[str, Any]) -> Tuple[bytes, int]:
+        """Return the raw stream bytes and the position after ``endstream``"""
+        if data[pos:pos + 2] == b"\r\n":
+            pos += 2
+        elif data[pos:pos + 1] in (b"\n", b"\r"):
+            pos += 1
+        length = attrs.get("Length")
+        if isinstance(length, int) and 0 <= length <= len(data) - pos:
+            end_match = _ENDSTREAM_RE.match(data, pos + length)
+            if end_match:
+                return bytes(data[pos:pos + length]), end_match.end()
+        # Indirect or wrong /Length: search for the terminator instead
+        end_match = _ENDSTREAM_RE.search(data, pos)
+        if end_match is None:
+            return bytes(data[pos:]), len(data)
+        return bytes(data[pos:end_match.start()]), end_match.end()
+
+    def _load_object_stream(self, stream: PDFStream) -> None:
+        """Add the objects compressed inside an object stream (PDF 1.5+)"""
+        try:
+            data = stream.data
+        except PDFInflateLimitError:
+            raise
+        except (PDFSyntaxError, zlib.error):
+            return
+        count = stream.attrs.get("N", 0)
+        first = stream.attrs.get("First", 0)
+        header = _Lexer(data)
+        offsets = []
+        for _ in range(count):
+            num, offset = header.read_object(), header.read_object()
+            offsets.append((num, offset))
+        for num, offset in offsets:
+            if num not in self.objects:
+                self.objects[num] = _Lexer(data, first + offset).read_object()
+
+    def _collect_pages(self) -> List[Dict[str, Any]]:
+        """Pages in reading order, with inherited resources resolved"""
+        root = self.resolve(self.trailer.get("Root"))
+        if not isinstance(root, dict):
+            root = next(
+                (obj for obj in self.objects.values() if isinstance(obj, dict) and obj.get("Type") == "Catalog"),
+                None
+            )
+        pages: List[Dict[str, Any]] = []
+        if isinstance(root, dict):
+            self._walk_pages(self.resolve(root.get("Pages")), None, pages, set())
+        if not pages:
+            # Broken page tree: fall back to file order
+            pages = [
+                obj for _, obj in sorted(self.objects.items())
+                if isinstance(obj, dict) and obj.get("Type") == "Page"
+            ]
+        return pages
+
+    def _walk_pages(self, node: Any, resources: Any, pages: List[Dict[str, Any]], seen: set) -> None:
+        if not isinstance(node, dict) or id(node) in seen:
+            return
+        seen.add(id(node))
+        resources = node.get("Resources", resources)
+        if node.get("Type") == "Pages" or "Kids" in node:
+            for kid in self.resolve(node.get("Kids")) or []:
+                self._walk_pages(self.resolve(kid), resources, pages, seen)
+        else:
+            page = dict(node)
+            page["Resources"] = resources
+            pages.append(page)
+
+    def page_content(self, page: Dict[str, Any]) -> bytes:
+        """Inflated content stream(s) of a page"""
+        contents = self.resolve(page.get("Contents"))
+        if not isinstance(contents, list):
+            contents = [contents]
+        parts = []
+        for item in contents:
+            stream = self.resolve(item)
+            if isinstance(stream, PDFStream):
+                try:
+                    parts.append(stream.data)
+                except PDFInflateLimitError:
+                    raise
+                except (PDFSyntaxError, zlib.error):
+                    continue
+        return b"\n".join(parts)
+
+    def page_fonts(self, page: Dict[str, Any]) -> Dict[str, Callable[[bytes], str]]:
+        """Text decoders for the fonts named in the page resources"""
+        resources = self.resolve(page.get("Resources")) or {}
+        fonts = self.resolve(resources.get("Font")) or {}
+        return {name: self._font_decoder(self.resolve(font)) for name, font in fonts.items()}
+
+    def _font_decoder(self, font: Any) -> Callable[[bytes], str]:
+        """Decoder from string bytes to text for one font"""
+        if not isinstance(font, dict):
+            return _decode_latin1
+        to_unicode = self.resolve(font.get("ToUnicode"))
+        if isinstance(to_unicode, PDFStream):
+            try:
+                return _CMap(to_unicode.data).decode
+            except PDFInflateLimitError:
+                raise
+            except (PDFSyntaxError, zlib.error):
+                pass
+        if font.get("Subtype") == "Type0":
+            # Composite font without a ToUnicode map: glyph IDs carry no text
+            return _decode_nothing
+        encoding = self.resolve(font.get("Encoding"))
+        if isinstance(encoding, dict):
+            encoding = encoding.get("BaseEncoding")
+        if encoding == "WinAnsiEncoding":
+            return _decode_cp1252
+        if encoding == "MacRomanEncoding":
+            return _decode_mac_roman
+        return _decode_latin1
+
+def _starts_with_header(data: DocumentData) -> bool:
+    """Whether the ``%PDF-`` header appears in the first kilobyte"""
+    return _HEADER_RE.search(data, 0, 1024) is not None
+
+def _decode_latin1(value: bytes) -> str:
+    return value.decode("latin-1")
+
+def _decode_cp1252(value: bytes) -> str:
+    return value.decode("cp1252", errors="replace")
+
+def _decode_mac_roman(value: bytes) -> str:
+    return value.decode("mac_roman")
+
+def _decode_nothing(value: bytes) -> str:
+    return ""
+
+# Decoders whose input bytes are readable text, so the raw-content scan works
+_TRANSPARENT_DECODERS = (_decode_latin1, _decode_cp1252, _decode_mac_roman)
+
+class _CMap:
+    """ToUnicode CMap (``bfchar`` and ``bfrange`` mappings)"""
+
+    _CODESPACE_RE = re.compile(rb"begincodespacerange(.*?)endcodespacerange", re.DOTALL)
+    _BFCHAR_RE = re.compile(rb"beginbfchar(.*?)endbfchar", re.DOTALL)
+    _BFRANGE_RE = re.compile(rb"beginbfrange(.*?)endbfrange", re.DOTALL)
+    _HEX_RE = re.compile(rb"<([0-9A-Fa-f]*)>")
+    _RANGE_RE = re.compile(rb"<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>\s*(<[0-9A-Fa-f]*>|\[[^\]]*\])")
+
+    def __init__(self, data: bytes):
+        self.mapping: Dict[int, str] = {}
+        self.code_length = 1
+        self._reverse: Optional[Dict[str, int]] = None
+        for block in self._CODESPACE_RE.findall(data):
+            for digits in self._HEX_RE.findall(block):
+                self.code_length = max(self.code_length, len(digits) // 2)
+        for block in self._BFCHAR_RE.findall(data):
+            codes = self._HEX_RE.findall(block)
+            for source, target in zip(codes[0::2], codes[1::2]):
+                self.code_length = max(self.code_length, len(source) // 2)
+                self.mapping[int(source, 16)] = _utf16(target)
+        for block in self._BFRANGE_RE.findall(data):
+            for low, high, target in self._RANGE_RE.findall(block):
+                self.code_length = max(self.code_length, len(low) // 2)
+                low, high = int(low, 16), int(high, 16)
+                if target.startswith(b"["):
+                    for offset, item in enumerate(self._HEX_RE.findall(target)):
+                        self.mapping[low + offset] = _utf16(item)
+                else:
+                    base = _utf16(target[1:-1])
+                    if not base:
+                        continue
+                    for offset in range(min(high - low, 0xFFFF) + 1):
+                        self.mapping[low + offset] = base[:-1] + chr(ord(base[-1]) + offset)
+
+    def encode(self, text: str) -> Optional[bytes]:
+        """Byte codes that render ``text`` in this font, or None if it cannot"""
+        if self._reverse is None:
+            self._reverse = {}
+            for code, target in self.mapping.items():
+                self._reverse.setdefault(target, code)
+        codes = [self._reverse.get(char) for char in text]
+        if None in codes:
+            return None
+        return b"".join(code.to_bytes(self.code_length, "big") for code in codes)
+
+    def decode(self, value: bytes) -> str:
+        size = self.code_length
+        mapping = self.mapping
+        out = []
+        for i in range(0, len(value) - size + 1, size):
+            code = int.from_bytes(value[i:i + size], "big")
+            out.append(mapping.get(code, chr(code) if size == 1 else ""))
+        return "".join(out)
+
+def _utf16(digits: bytes) -> str:
+    return bytes.fromhex(digits.decode("ascii")).decode("utf-16-be", errors="ignore")
+
+def _iter_operations(content: bytes) -> Iterator[Tuple[str, List[Any]]]:
+    """Yield (operator, operands) pairs from a content stream"""
+    lexer = _Lexer(content)
+    operands: List[Any] = []
+    while True:
+        token = lexer.next()
+        if token is None:
+            return
+        kind, value = token
+        if kind == "kw":
+            if value == "BI":
+                # Inline image: skip the binary data up to EI
+                end = _INLINE_IMAGE_END_RE.search(content, lexer.pos)
+                lexer.pos = end.end() if end else len(content)
+                operands = []
+                continue
+            yield value, operands
+            operands = []
+        elif kind in ("arr_close", "dict_close", "other"):
+            continue
+        else:
+            operands.append(lexer.read_object(token))
+
+def page_text(content: bytes, fonts: Dict[str, Callable[[bytes], str]]) -> str:
+    """Interpret the text operators of a content stream into lines of text"""
+    lines: List[str] = []
+    line: List[str] = []
+    decode = _decode_latin1
+    last_y: Optional[float] = None
+
+    def newline() -> None:
+        text = "".join(line).strip()
+        if text:
+            lines.append(text)
+        line.clear()
+
+    def show(value: Any) -> None:
+        if isinstance(value, bytes):
+            line.append(decode(value))
+
+    for operator, operands in _iter_operations(content):
+        if operator == "Tf" and operands:
+            decode = fonts.get(str(operands[0]), _decode_latin1)
+        elif operator == "Tj" and operands:
+            show(operands[-1])
+        elif operator == "TJ" and operands and isinstance(operands[-1], list):
+            for item in operands[-1]:
+                if isinstance(item, (int, float)):
+                    if -item > _TJ_SPACE_THRESHOLD:
+                        line.append(" ")
+                else:
+                    show(item)
+        elif operator in ("'", '"') and operands:
+            newline()
+            show(operands[-1])
+        elif operator == "T*":
+            newline()
+        elif operator in ("Td", "TD") and len(operands) >= 2:
+            if operands[1] != 0:
+                newline()
+            elif operands[0] > 0 and line and not line[-1].endswith(" "):
+                line.append(" ")
+        elif operator == "Tm" and len(operands) >= 6:
+            if last_y is not None and operands[5] != last_y:
+                newline()
+            last_y = operands[5]
+        elif operator == "ET":
+            newline()
+    newline()
+    return "\n".join(lines)
+
+def looks_like_cmr(content: bytes, fonts: Optional[Dict[str, Callable[[bytes], str]]] = None) -> bool:
+    """
+    Cheap test for a CMR heading in raw content stream bytes
+
+    For fonts with a ToUnicode map the heading is looked up in its encoded
+    form. Pages using fonts whose text cannot be predicted are reported as
+    candidates.
+    """
+    glued = _TJ_GAP_RE.sub(b"", content)
+    if _CMR_MARKER_RE.search(glued):
+        return True
+
+    hex_glued = None
+    for decoder in (fonts or {}).values():
+        if decoder in _TRANSPARENT_DECODERS:
+            continue
+        cmap = getattr(decoder, "__self__", None)
+        if not isinstance(cmap, _CMap):
+            return True
+        encoded = cmap.encode("CMR")
+        if encoded is None:
+            continue
+        if hex_glued is None:
+            hex_glued = _TJ_HEX_GAP_RE.sub(b"", content).lower()
+        if encoded in glued or encoded.hex().encode("ascii") in hex_glued:
+            return True
+    return False
+
+class PDFTextCMRExtractor(CMRExtractor):
+    """
+    CMR extractor for PDFs with a text layer.
+
+    Pages are handled in two passes. First every page's content stream is
+    inflated and scanned for a CMR heading, which is cheap. Only the pages
+    that match get their text operators interpreted; the rest of a bundle
+    (invoices, delivery notes, ...) is never decoded. Pages whose fonts hide
+    the text from the scan (composite fonts without a ToUnicode map) are
+    always decoded. If no page matches, every page is decoded.
+
+    Multi-page documents are processed page-parallel on a thread pool; zlib
+    releases the GIL while inflating.
+    """
+
+    version = "pdf-2"
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # The extractor is shared by concurrent requests; start one pool only
+        self._executor_lock = threading.Lock()
+
+    def extract_data(self, document_bytes: DocumentData) -> RawCMRData:
+        """Extract the text of the CMR pages of a document"""
+        pages = self.extract_pages(document_bytes)
+        cmr_pages = [page for page in pages if page.is_cmr] or [page for page in pages if page.text]
+        raw_text = "\n".join(page.text for page in cmr_pages if page.text)
+        return RawCMRData(
+            raw_text=raw_text,
+            confidence_scores={field: TEXT_LAYER_CONFIDENCE for field in MANDATORY_FIELDS} if raw_text else {},
+            pages=pages,
+            metadata={
+                "document_type": "CMR",
+                "extraction_method": "pdf_text_layer",
+                "page_count": len(pages),
+                "cmr_pages": [page.page_number for page in cmr_pages]
+            }
+        )
+
+    def extract_pages(self, document_bytes: DocumentData) -> List[RawCMRPage]:
+        """Per-page results; only CMR pages (or all, if none match) carry text"""
+        document = PDFDocument(document_bytes)
+
+        scanned = self._map(lambda page: self._scan_page(document, page), document.pages)
+        decode_all = not any(candidate for _, candidate, _ in scanned)
+
+        texts = self._map(
+            lambda item: page_text(item[0], item[2]) if decode_all or item[1] else None,
+            scanned
+        )
+        return [
+            RawCMRPage(
+                page_number=number,
+                text=text,
+                is_cmr=text is not None and _CMR_TEXT_RE.search(text) is not None
+            )
+            for number, text in enumerate(texts, start=1)
+        ]
+
+    def _scan_page(self, document: PDFDocument, page: Dict[str, Any]) -> Tuple[bytes, bool, Dict[str, Callable]]:
+        """Inflate a page and decide whether it is a candidate for a full decode"""
+        content = document.page_content(page)
+        fonts = document.page_fonts(page)
+        return content, looks_like_cmr(content, fonts), fonts
+
+    def close(self) -> None:
+        """Shut down the page thread pool; it is started again on demand"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _map(self, func: Callable, items: List[Any]) -> List[Any]:
+        """Map over pages, in parallel when there is more than one"""
+        if len(items) <= 1 or self.max_workers <= 1:
+            return [func(item) for item in items]
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pdf-page")
+            # Submit under the lock so close() cannot shut the pool down in between
+            futures = [self._executor.submit(func, item) for item in items]
+        return [future.result() for future in futures]
@@ -0,0 +1,330 @@
+"""
+Sequencing of the pickup and delivery stops of each vehicle
+"""
+import math
+import time
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.domain.entities.carga import Carga, EstadoCarga
+from src.domain.entities.ruta_reparto import ParadaRuta, PlanRutas, RutaVehiculo, TipoParada
+from src.domain.entities.vehiculo import Vehiculo
+from src.domain.services.distance_cache import DistanceCache
+from src.domain.services.geodesy import Punto, distance_matrix_km
+from src.domain.value_objects.direccion import Coordenadas
+from src.domain.value_objects.fecha import a_utc
+
+class _Problema:
+    """
+    Stops of one vehicle as matrix indices
+
+    Node 0 is the vehicle's position and nodes 1..k the stops. Each row of
+    ``dist`` has one more column, the end of the route: the distance back
+    to node 0 for closed routes, zero for open ones. That way a move at
+    the end of the sequence costs the same as anywhere else.
+    """
+
+    def __init__(self, vehiculo: Vehiculo, origen: Punto, cargas: Sequence[Carga], salida: datetime,
+                 segundos_por_km: float, servicio_s: float, volver_al_origen: bool,
+                 distancias: Optional[DistanceCache] = None):
+        self.vehiculo = vehiculo
+        self.salida = salida
+        self.segundos_por_km = segundos_por_km
+        self.servicio_s = servicio_s
+        self.sin_secuenciar: Dict[str, str] = {}
+        self.inicial = 0.0
+
+        # Per stop: load, type, point, weight change, window and pickup node
+        self.cargas: List[Carga] = [None]
+        self.tipos: List[TipoParada] = [None]
+        self.puntos: List[Punto] = [origen]
+        self.delta: List[float] = [0.0]
+        self.desde: List[float] = [-math.inf]
+        self.hasta: List[float] = [math.inf]
+        self.recogida: List[int] = [0]
+
+        for carga in cargas:
+            if carga.estado not in (EstadoCarga.PENDIENTE, EstadoCarga.EN_TRANSITO):
+                self.sin_secuenciar[carga.id] = "carga no pendiente ni en transito"
+                continue
+            destino = Coordenadas.desde_texto(carga.destino)
+            if destino is None:
+                self.sin_secuenciar[carga.id] = "destino sin coordenadas"
+                continue
+            recogida = 0
+            if carga.estado == EstadoCarga.PENDIENTE:
+                origen_carga = Coordenadas.desde_texto(carga.origen)
+                if origen_carga is None:
+                    self.sin_secuenciar[carga.id] = "origen sin coordenadas"
+                    continue
+                if carga.peso > vehiculo.capacidad_carga:
+                    self.sin_secuenciar[carga.id] = "supera la capacidad del vehiculo"
+                    continue
+                recogida = self._parada(carga, TipoParada.RECOGIDA, origen_carga, carga.peso, None, None, 0)
+            else:
+                self.inicial += carga.peso
+            self._parada(carga, TipoParada.ENTREGA, destino, -carga.peso,
+                         carga.entrega_desde, carga.entrega_hasta, recogida)
+
+        # Already overloaded at departure: sequence anyway, reported as infeasible
+        self.sobrecargado = self.inicial > vehiculo.capacidad_carga + 1e-9
+        self.capacidad = math.inf if self.sobrecargado else vehiculo.capacidad_carga + 1e-9
+        self.fin = len(self.puntos)
+        self.inicio = a_utc(salida).timestamp()
+        self.con_recogidas = any(self.recogida)
+        self.dist = distancias.matriz(self.puntos) if distancias is not None else distance_matrix_km(self.puntos)
+        for fila in self.dist:
+            fila.append(fila[0] if volver_al_origen else 0.0)
+
+    def _parada(self, carga: Carga, tipo: TipoParada, punto: Coordenadas, delta: float,
+                desde: Optional[datetime], hasta: Optional[datetime], recogida: int) -> int:
+        self.cargas.append(carga)
+        self.tipos.append(tipo)
+        self.puntos.append((punto.latitud, punto.longitud))
+        self.delta.append(delta)
+        self.desde.append(a_utc(desde).timestamp() if desde is not None else -math.inf)
+        self.hasta.append(a_utc(hasta).timestamp() if hasta is not None else math.inf)
+        self.recogida.append(recogida)
+        return len(self.puntos) - 1
+
+    def evaluar(self, orden: Sequence[int]) -> Optional[Tuple[float, float, List[int]]]:
+        """
+        Total delay in seconds, distance in km and the positions of the late
+        stops, or None if a pickup or capacity rule is broken
+        """
+        dist, delta, desde, hasta, recogida = self.dist, self.delta, self.desde, self.hasta, self.recogida
+        por_km, servicio, capacidad = self.segundos_por_km, self.servicio_s, self.capacidad
+        t = self.inicio
+        carga = self.inicial
+        visitado = [False] * self.fin if self.con_recogidas else None
+        previa = 0
+        km = retraso = 0.0
+        tarde: List[int] = []
+        for posicion, s in enumerate(orden):
+            if visitado is not None:
+                if recogida[s] and not visitado[recogida[s]]:
+                    return None
+                visitado[s] = True
+            d = dist[previa][s]
+            km += d
+            t += d * por_km
+            if t < desde[s]:
+                t = desde[s]
+            elif t > hasta[s]:
+                retraso += t - hasta[s]
+                tarde.append(posicion)
+            t += servicio
+            carga += delta[s]
+            if carga > capacidad:
+                return None
+            previa = s
+        return retraso, km + dist[previa][self.fin], tarde
+
+    def semilla(self) -> List[int]:
+        """
+        Nearest-neighbour order
+
+        "Nearest" is the earliest time service can start, so waiting for a
+        delivery window counts like driving; only stops allowed next
+        (pickup done, weight fits) are candidates.
+        """
+        restantes = set(range(1, self.fin))
+        orden: List[int] = []
+        t = self.inicio
+        carga = self.inicial
+        previa = 0
+        while restantes:
+            hechas = set(orden)
+            elegibles = [s for s in restantes
+                         if (not self.recogida[s] or self.recogida[s] in hechas)
+                         and carga + self.delta[s] <= self.capacidad]
+            fila = self.dist[previa]
+            s = min(elegibles or restantes,
+                    key=lambda s: max(t + fila[s] * self.segundos_por_km, self.desde[s]))
+            t = max(t + fila[s] * self.segundos_por_km, self.desde[s]) + self.servicio_s
+            carga += self.delta[s]
+            restantes.discard(s)
+            orden.append(s)
+            previa = s
+        return orden
+
+    def mejorar(self, orden: List[int], deadline: Optional[float]) -> Tuple[List[int], bool]:
+        """
+        2-opt and Or-opt until no move helps or the deadline passes
+
+        A move is kept if it lowers the total delay, or the distance at the
+        same delay. Only moves that shorten the route, which the O(1)
+        distance change decides, or that reorder positions including a
+        late stop are evaluated in full.
+
+        Returns:
+            Improved order and whether it is a local optimum
+        """
+        actual = self.evaluar(orden)
+        if actual is None:
+            return orden, True
+
+        def mejor(candidato: List[int]) -> bool:
+            nonlocal orden, actual
+            resultado = self.evaluar(candidato)
+            if resultado is None:
+                return False
+            if resultado[0] < actual[0] - 1e-6 or (resultado[0] <= actual[0] + 1e-6
+                                                    and resultado[1] < actual[1] - 1e-9):
+                orden, actual = candidato, resultado
+                return True
+            return False
+
+        def reordena_tarde(desde: int, hasta: int) -> bool:
+            tarde = actual[2]
+            k = bisect_left(tarde, desde)
+            return k < len(tarde) and tarde[k] <= hasta
+
+        dist, fin = self.dist, self.fin
+        n = len(orden)
+        while True:
+            cambio = False
+
+            # 2-opt: reverse orden[i..j]; after a change, retry the same i
+            i = 0
+            while i < n - 1:
+                if deadline is not None and time.perf_counter() > deadline:
+                    return orden, False
+                nodos = [0] + orden + [fin]
+                a, si = nodos[i], nodos[i + 1]
+                for j in range(i + 1, n):
+                    sj, b = nodos[j + 1], nodos[j + 2]
+                    if (dist[a][sj] + dist[si][b] - dist[a][si] - dist[sj][b] >= -1e-9
+                            and not reordena_tarde(i, j)):
+                        continue
+                    if mejor(orden[:i] + orden[i:j + 1][::-1] + orden[j + 1:]):
+                        cambio = True
+                        break
+                else:
+                    i += 1
+
+            # Or-opt: move a run of one to three stops elsewhere
+            for largo in (1, 2, 3):
+                i = 0
+                while i < n - largo + 1:
+                    if deadline is not None and time.perf_counter() > deadline:
+                        return orden, False
+                    s0, sl = orden[i], orden[i + largo - 1]
+                    a = orden[i - 1] if i > 0 else 0
+                    b = orden[i + largo] if i + largo < n else fin
+                    quitar = dist[a][s0] + dist[sl][b] - dist[a][b]
+                    resto = orden[:i] + orden[i + largo:]
+                    for g in range(len(resto) + 1):
+                        if g == i:
+                            continue
+                        c = resto[g - 1] if g > 0 else 0
+                        e = resto[g] if g < len(resto) else fin
+                        if (dist[c][s0] + dist[sl][e] - dist[c][e] - quitar >= -1e-9
+                                and not reordena_tarde(min(i, g), max(i, g) + largo - 1)):
+                            continue
+                        if mejor(resto[:g] + orden[i:i + largo] + resto[g:]):
+                            cambio = True
+                            break
+                    else:
+                        i += 1
+
+            if not cambio:
+                return orden, True
+
+    def _instante(self, t: float) -> datetime:
+        """A timestamp in the departure's timezone; naive (UTC) like the departure if it is naive"""
+        instante = datetime.fromtimestamp(t, tz=timezone.utc)
+        if self.salida.tzinfo is None:
+            return instante.replace(tzinfo=None)
+        return instante.astimezone(self.salida.tzinfo)
+
+    def ruta(self, orden: Sequence[int]) -> RutaVehiculo:
+        """The route entity for a stop order"""
+        t = self.inicio
+        carga = self.inicial
+        previa = 0
+        paradas: List[ParadaRuta] = []
+        for s in orden:
+            km = self.dist[previa][s]
+            t = max(t + km * self.segundos_por_km, self.desde[s])
+            carga += self.delta[s]
+            paradas.append(ParadaRuta(
+                carga_id=self.cargas[s].id,
+                tipo=self.tipos[s],
+                latitud=self.puntos[s][0],
+                longitud=self.puntos[s][1],
+                llegada=self._instante(t),
+                distancia_km=km,
+                carga_a_bordo_kg=carga,
+                retraso_min=max(0.0, t - self.hasta[s]) / 60
+            ))
+            t += self.servicio_s
+            previa = s
+
+        retraso = sum(parada.retraso_min for parada in paradas)
+        return RutaVehiculo(
+            vehiculo_id=self.vehiculo.id,
+            paradas=paradas,
+            distancia_km=sum(parada.distancia_km for parada in paradas) + self.dist[previa][self.fin],
+            retraso_total_min=retraso,
+            factible=not self.sobrecargado and retraso == 0,
+            sin_secuenciar=self.sin_secuenciar
+        )
+
+class SecuenciadorRutas:
+    """
+    Orders the pickups and deliveries of the loads each vehicle carries.
+
+    Pending loads are picked up at their origin before being delivered at
+    their destination; loads in transit are already on board and only
+    delivered. Origins and destinations must be "lat,lng" positions. The
+    weight on board never exceeds ``capacidad_carga``, and a delivery
+    reached before its window waits for it; arriving after the window is
+    allowed but reported as delay, which the improvement minimizes before
+    the distance. Naive departure and window times are taken as UTC.
+
+    Distances are great-circle, computed once per vehicle as a matrix, or
+    looked up in ``distancias`` so that depots and customer sites visited
+    again and again are a cache hit; times assume ``velocidad_media_kmh`` and ``tiempo_servicio_min`` at
+    every stop. A nearest-neighbour seed is improved with 2-opt and
+    Or-opt moves; when planning several vehicles, all seeds are built
+    first and then improved in turn until ``presupuesto_segundos`` runs
+    out.
+    """
+
+    def __init__(self, velocidad_media_kmh: float = 60.0, tiempo_servicio_min: float = 15.0,
+                 presupuesto_segundos: float = 5.0, volver_al_origen: bool = False,
+                 distancias: Optional[DistanceCache] = None):
+        if velocidad_media_kmh <= 0:
+            raise ValueError("velocidad_media_kmh must be positive")
+        self.velocidad_media_kmh = velocidad_media_kmh
+        self.tiempo_servicio_min = tiempo_servicio_min
+        self.presupuesto_segundos = presupuesto_segundos
+        self.volver_al_origen = volver_al_origen
+        self.distancias = distancias
+
+    def secuenciar(self, vehiculo: Vehiculo, origen: Punto, cargas: Sequence[Carga],
+                   salida: datetime) -> RutaVehiculo:
+        """Route of one vehicle leaving ``origen`` at ``salida``"""
+        return self.planificar([(vehiculo, origen, cargas)], salida).rutas[0]
+
+    def planificar(self, flota: Sequence[Tuple[Vehiculo, Punto, Sequence[Carga]]],
+                   salida: datetime) -> PlanRutas:
+        """Routes of several vehicles, each given with its position and loads"""
+        deadline = time.perf_counter() + self.presupuesto_segundos
+        problemas = [
+            _Problema(vehiculo, origen, cargas, salida, 3600.0 / self.velocidad_media_kmh,
+                      self.tiempo_servicio_min * 60, self.volver_al_origen, self.distancias)
+            for vehiculo, origen, cargas in flota
+        ]
+        ordenes = [problema.semilla() for problema in problemas]
+
+        completo = True
+        for k, problema in enumerate(problemas):
+            if not completo:
+                break
+            ordenes[k], completo = problema.mejorar(ordenes[k], deadline)
+
+        rutas = [problema.ruta(orden) for problema, orden in zip(problemas, ordenes)]
+        return PlanRutas(rutas=rutas, distancia_total_km=sum(ruta.distancia_km for ruta in rutas),
+                         completo=completo)
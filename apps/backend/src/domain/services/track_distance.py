@@ -0,0 +1,138 @@
+"""
+Distance, speed and stop analysis of GPS position histories
+"""
+import math
+from datetime import datetime, timezone
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+from src.domain.entities.posicion import Parada, ResumenRecorrido, SegmentoRecorrido
+from src.domain.services.geodesy import haversine_legs
+from src.domain.services.trajectory_compression import Posicion
+
+def _leg_speed_kmh(distancia_km: float, dt: float) -> float:
+    if dt > 0:
+        return distancia_km / dt * 3600.0
+    return math.inf if distancia_km > 0 else 0.0
+
+def _fecha(t: float) -> datetime:
+    return datetime.fromtimestamp(t, tz=timezone.utc)
+
+class AnalizadorRecorrido:
+    """
+    Computes driven distance, driving segments and stops from positions.
+
+    Legs implying more than ``velocidad_max_kmh`` are GPS jumps and are left
+    out of the distance. Consecutive legs slower than ``velocidad_parada_kmh``
+    that together last at least ``parada_min_segundos`` form a stop; the
+    stretches between stops are the driving segments.
+    """
+
+    def __init__(self, velocidad_parada_kmh: float = 3.0, parada_min_segundos: float = 300.0,
+                 velocidad_max_kmh: float = 200.0):
+        self.velocidad_parada_kmh = velocidad_parada_kmh
+        self.parada_min_segundos = parada_min_segundos
+        self.velocidad_max_kmh = velocidad_max_kmh
+
+    def analizar(self, posiciones: Sequence[Posicion]) -> ResumenRecorrido:
+        """Analyse a time-ordered position history"""
+        if not posiciones:
+            return ResumenRecorrido(puntos=0, distancia_km=0.0, duracion_segundos=0.0,
+                                    velocidad_media_kmh=0.0, velocidad_max_kmh=0.0,
+                                    tiempo_parado_segundos=0.0)
+
+        t, lats, lons = zip(*posiciones)
+        legs = haversine_legs(lats, lons)
+        speeds = [_leg_speed_kmh(d, t[i + 1] - t[i]) for i, d in enumerate(legs)]
+        valid = [speed <= self.velocidad_max_kmh for speed in speeds]
+
+        paradas = self._paradas(t, lats, lons, speeds, valid)
+
+        segmentos: List[SegmentoRecorrido] = []
+        start = 0
+        for stop_start, stop_end in [(s, e) for s, e, _ in paradas] + [(len(legs), len(legs))]:
+            if stop_start > start:
+                segmentos.append(self._segmento(t, legs, speeds, valid, start, stop_start))
+            start = stop_end
+
+        distancia = sum(d for d, ok in zip(legs, valid) if ok)
+        duracion = t[-1] - t[0]
+        return ResumenRecorrido(
+            puntos=len(posiciones),
+            distancia_km=distancia,
+            duracion_segundos=duracion,
+            velocidad_media_kmh=_leg_speed_kmh(distancia, duracion) if duracion > 0 else 0.0,
+            velocidad_max_kmh=max((s for s, ok in zip(speeds, valid) if ok), default=0.0),
+            tiempo_parado_segundos=sum(parada.duracion_segundos for _, _, parada in paradas),
+            saltos_descartados=valid.count(False),
+            segmentos=segmentos,
+            paradas=[parada for _, _, parada in paradas]
+        )
+
+    def distancias(self, recorridos: Dict[Hashable, Sequence[Posicion]]) -> Dict[Hashable, float]:
+        """
+        Driven distance per track for many tracks in one pass
+
+        All tracks are concatenated so the Haversine runs once over every
+        leg; legs joining the end of one track to the start of the next are
+        then discarded.
+        """
+        claves = list(recorridos)
+        t: List[float] = []
+        lats: List[float] = []
+        lons: List[float] = []
+        limites: List[int] = []
+        for clave in claves:
+            for ti, lat, lon in recorridos[clave]:
+                t.append(ti)
+                lats.append(lat)
+                lons.append(lon)
+            limites.append(len(t))
+
+        legs = haversine_legs(lats, lons)
+        resultado: Dict[Hashable, float] = {}
+        start = 0
+        for clave, end in zip(claves, limites):
+            total = 0.0
+            # Legs start..end-2 stay within this track
+            for i in range(start, end - 1):
+                if _leg_speed_kmh(legs[i], t[i + 1] - t[i]) <= self.velocidad_max_kmh:
+                    total += legs[i]
+            resultado[clave] = total
+            start = end
+        return resultado
+
+    def _paradas(self, t: Sequence[float], lats: Sequence[float], lons: Sequence[float],
+                 speeds: List[float], valid: List[bool]) -> List[Tuple[int, int, Parada]]:
+        """Stops as (first leg, leg after the stop, Parada)"""
+        paradas: List[Tuple[int, int, Parada]] = []
+        run_start: Optional[int] = None
+        for i in range(len(speeds) + 1):
+            slow = i < len(speeds) and valid[i] and speeds[i] < self.velocidad_parada_kmh
+            if slow and run_start is None:
+                run_start = i
+            elif not slow and run_start is not None:
+                # Legs run_start..i-1 join points run_start..i
+                duracion = t[i] - t[run_start]
+                if duracion >= self.parada_min_segundos:
+                    puntos = range(run_start, i + 1)
+                    paradas.append((run_start, i, Parada(
+                        inicio=_fecha(t[run_start]),
+                        fin=_fecha(t[i]),
+                        duracion_segundos=duracion,
+                        latitud=sum(lats[p] for p in puntos) / len(puntos),
+                        longitud=sum(lons[p] for p in puntos) / len(puntos)
+                    )))
+                run_start = None
+        return paradas
+
+    def _segmento(self, t: Sequence[float], legs: List[float], speeds: List[float],
+                  valid: List[bool], start: int, end: int) -> SegmentoRecorrido:
+        """Driving segment over legs start..end-1"""
+        distancia = sum(legs[i] for i in range(start, end) if valid[i])
+        duracion = t[end] - t[start]
+        return SegmentoRecorrido(
+            inicio=_fecha(t[start]),
+            fin=_fecha(t[end]),
+            distancia_km=distancia,
+            velocidad_media_kmh=_leg_speed_kmh(distancia, duracion) if duracion > 0 else 0.0,
+            velocidad_max_kmh=max((speeds[i] for i in range(start, end) if valid[i]), default=0.0)
+        )
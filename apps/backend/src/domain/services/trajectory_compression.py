@@ -0,0 +1,91 @@
+"""
+Streaming compression of GPS trajectories
+"""
+import math
+from typing import List, Optional, Tuple
+from src.domain.services.geodesy import METRES_PER_DEGREE
+
+# Position as stored by the position history: (epoch seconds, latitude, longitude)
+Posicion = Tuple[float, float, float]
+
+def synchronized_distance_m(anchor: Posicion, end: Posicion, point: Posicion) -> float:
+    """
+    Distance in metres between ``point`` and where a vehicle moving in a
+    straight line at constant speed from ``anchor`` to ``end`` would be
+    at the same time
+
+    Unlike the perpendicular distance of classic Douglas-Peucker, this also
+    bounds the error in time, so positions interpolated from the compressed
+    trace stay within tolerance and speeds derived from it stay meaningful.
+    Uses a local equirectangular projection, accurate at GPS-ping spacing.
+    """
+    t0, lat0, lon0 = anchor
+    t1, lat1, lon1 = end
+    t, lat, lon = point
+    fraction = (t - t0) / (t1 - t0) if t1 != t0 else 0.0
+    expected_lat = lat0 + (lat1 - lat0) * fraction
+    expected_lon = lon0 + (lon1 - lon0) * fraction
+    dy = (lat - expected_lat) * METRES_PER_DEGREE
+    dx = (lon - expected_lon) * METRES_PER_DEGREE * math.cos(math.radians(lat0))
+    return math.hypot(dx, dy)
+
+class TrajectoryCompressor:
+    """
+    Opening-window (streaming Douglas-Peucker) simplification of one track.
+
+    Points after the last kept point (the anchor) are buffered while the
+    straight line from the anchor to the newest point stays within
+    ``tolerance_m`` of every buffered point. When a new point breaks that,
+    the previous point is kept and becomes the new anchor. Every dropped
+    point is therefore within tolerance of the kept trace.
+
+    The newest point is never dropped until a later point arrives: callers
+    treat ``pending()`` as part of the trace. ``max_buffer`` bounds the work
+    per point on very long straight stretches.
+    """
+
+    def __init__(self, tolerance_m: float, max_buffer: int = 256):
+        if tolerance_m <= 0:
+            raise ValueError("tolerance_m must be positive")
+        self.tolerance_m = tolerance_m
+        self.max_buffer = max_buffer
+        self._anchor: Optional[Posicion] = None
+        self._buffer: List[Posicion] = []
+
+    def push(self, posicion: Posicion) -> List[Posicion]:
+        """Add the next point in time order and return the points to keep"""
+        if self._anchor is None:
+            self._anchor = posicion
+            return [posicion]
+
+        if all(synchronized_distance_m(self._anchor, posicion, point) <= self.tolerance_m
+               for point in self._buffer):
+            self._buffer.append(posicion)
+            if len(self._buffer) <= self.max_buffer:
+                return []
+            # Close the window at the newest point
+            self._anchor = posicion
+            self._buffer = []
+            return [posicion]
+
+        kept = self._buffer[-1]
+        self._anchor = kept
+        self._buffer = [posicion]
+        return [kept]
+
+    def pending(self) -> Optional[Posicion]:
+        """Newest point, if it has not been kept yet"""
+        return self._buffer[-1] if self._buffer else None
+
+    def last(self) -> Optional[Posicion]:
+        """Newest point seen"""
+        return self._buffer[-1] if self._buffer else self._anchor
+
+    def flush(self) -> List[Posicion]:
+        """Keep the pending point, e.g. when the track goes idle"""
+        pending = self.pending()
+        if pending is None:
+            return []
+        self._anchor = pending
+        self._buffer = []
+        return [pending]
@@ -1,8 +1,19 @@
 """
 Value objects for domain
 """
+from functools import lru_cache
 from pydantic import BaseModel, Field, validator
 from typing import Optional
+from ..services.geodesy import equirectangular_km, haversine_km
+
+@lru_cache(maxsize=4096)
+def _parsear_coordenadas(texto: str) -> Optional[tuple[float, float]]:
+    """Parse "lat,lng" once per distinct string"""
+    try:
+        lat, lng = texto.split(',')
+        return float(lat.strip()), float(lng.strip())
+    except (ValueError, AttributeError):
+        return None
 
 class Direccion(BaseModel):
     """Value object representing an address"""
@@ -31,11 +42,7 @@ class Direccion(BaseModel):
     def obtener_coordenadas(self) -> Optional[tuple[float, float]]:
         """Extract latitude and longitude from coordinates string"""
         if self.coordenadas:
-            try:
-                lat, lng = self.coordenadas.split(',')
-                return float(lat.strip()), float(lng.strip())
-            except (ValueError, AttributeError):
-                return None
+            return _parsear_coordenadas(self.coordenadas)
         return None
 
 class Coordenadas(BaseModel):
@@ -47,24 +54,27 @@ class Coordenadas(BaseModel):
         """String representation of coordinates"""
         return f"{self.latitud},{self.longitud}"
 
+    @classmethod
+    def desde_texto(cls, texto: str) -> Optional['Coordenadas']:
+        """Parse "lat,lng" text, or None if it is not a valid position"""
+        try:
+            lat, lng = texto.split(',')
+            return cls(latitud=float(lat.strip()), longitud=float(lng.strip()))
+        except (ValueError, AttributeError):
+            return None
+
     def calcular_distancia(self, otras: 'Coordenadas') -> float:
         """Calculate approximate distance in kilometers (Haversine formula)"""
-        import math
-
-        # Convert to radians
-        lat1, lon1 = math.radians(self.latitud), math.radians(self.longitud)
-        lat2, lon2 = math.radians(otras.latitud), math.radians(otras.longitud)
-
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
+        return haversine_km(self.latitud, self.longitud, otras.latitud, otras.longitud)
 
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+    def calcular_distancia_aproximada(self, otras: 'Coordenadas') -> float:
+        """
+        Cheaper equirectangular distance in kilometers
 
-        # Radius of Earth in kilometers
-        R = 6371
-        return R * c
+        Within 0.01% of ``calcular_distancia`` up to 100 km, so it suits
+        pre-filtering nearby candidates before ranking them exactly.
+        """
+        return equirectangular_km(self.latitud, self.longitud, otras.latitud, otras.longitud)
 
 class Ruta(BaseModel):
     """Value object representing a route"""
@@ -80,9 +90,7 @@ class Ruta(BaseModel):
             coord_destino = self.destino.obtener_coordenadas()
 
             if coord_origen and coord_destino:
-                origen_coords = Coordenadas(latitud=coord_origen[0], longitud=coord_origen[1])
-                destino_coords = Coordenadas(latitud=coord_destino[0], longitud=coord_destino[1])
-                return origen_coords.calcular_distancia(destino_coords)
+                return haversine_km(*coord_origen, *coord_destino)
 
         return None
 
@@ -0,0 +1,18 @@
+"""
+UTC normalization of timestamps
+"""
+from datetime import datetime, timezone
+from typing import Optional
+
+def a_utc(fecha: Optional[datetime]) -> Optional[datetime]:
+    """
+    The same instant as an aware UTC datetime
+
+    Naive values are taken to be in UTC already, so naive and aware
+    timestamps can be compared and sorted together.
+    """
+    if fecha is None:
+        return None
+    if fecha.tzinfo is None:
+        return fecha.replace(tzinfo=timezone.utc)
+    return fecha.astimezone(timezone.utc)
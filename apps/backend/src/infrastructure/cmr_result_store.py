@@ -0,0 +1,50 @@
+"""
+Disk-backed tier of the CMR extraction result cache
+"""
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from src.domain.services.cmr_cache import CMRResultStore
+
+class DiskCMRResultStore(CMRResultStore):
+    """
+    CMR results as JSON files in a directory.
+
+    Shared by every worker process and kept across restarts. Files are
+    fanned out into subdirectories by key prefix and written atomically.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def read(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored result for a key, or None if missing or unreadable"""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def write(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a result; a failed write only loses the cache entry"""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        # Write to a temporary file and rename so readers never see partial JSON
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def _path(self, key: str) -> Path:
+        # Fan out by hash prefix to keep directories small
+        return self.directory / key[:2] / f"{key}.json"
@@ -0,0 +1,132 @@
+"""
+Application-scoped dependency container
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from src.infrastructure.persistence.session import engine as default_engine
+from src.infrastructure.persistence.session import SessionLocal
+from src.application.use_cases.cmr_use_cases import create_cmr_extractor
+from src.domain.services.change_events import ChangeEventBus
+from src.domain.services.cmr_cache import CMRResultCache
+from src.domain.services.cmr_normalizer import CMRNormalizer
+from src.domain.services.distance_cache import DistanceCache
+from src.domain.services.geofence_engine import GeofenceEngine
+from src.domain.services.matricula_resolver import UnresolvedMatriculaCache
+from src.infrastructure.cmr_result_store import DiskCMRResultStore
+from src.infrastructure.job_queue import JobQueue
+from src.infrastructure.position_history import PositionHistoryStore
+from src.infrastructure.repositories.carga_repository import InMemoryCargaRepository
+from src.infrastructure.repositories.cmr_repository import InMemoryCMRRepository
+from src.infrastructure.repositories.flota_repository import InMemoryFlotaRepository
+
+class AppContainer:
+    """
+    Long-lived infrastructure shared by every request.
+
+    Built once in the application lifespan and stored on ``app.state`` so
+    that repositories, the database engine and caches stay warm between
+    requests instead of being rebuilt per call.
+    """
+
+    def __init__(self, engine: Engine, session_factory: sessionmaker,
+                 flota_repository: Optional[InMemoryFlotaRepository] = None,
+                 cmr_workers: Optional[int] = None, cmr_max_queued_jobs: int = 100,
+                 cmr_cache: Optional[CMRResultCache] = None,
+                 cmr_normalizer: Optional[CMRNormalizer] = None,
+                 cmr_repository: Optional[InMemoryCMRRepository] = None,
+                 position_history: Optional[PositionHistoryStore] = None):
+        self.engine = engine
+        self.session_factory = session_factory
+        # Saves and deletes of vehicles, loads and fleets, for streaming to other systems
+        self.change_events = ChangeEventBus()
+        self.flota_repository = flota_repository or InMemoryFlotaRepository(eventos=self.change_events)
+        self.carga_repository = InMemoryCargaRepository(eventos=self.change_events)
+        self.caches: Dict[str, Any] = {}
+        self.cmr_cache = cmr_cache if cmr_cache is not None else CMRResultCache()
+        # One extractor for every single-document request, so its thread pool is reused
+        self.cmr_normalizer = cmr_normalizer if cmr_normalizer is not None else CMRNormalizer(create_cmr_extractor())
+        self.cmr_repository = cmr_repository or InMemoryCMRRepository()
+        self.matricula_cache = UnresolvedMatriculaCache()
+        self.change_events.suscribir(self.matricula_cache.al_cambiar)
+        self.position_history = position_history if position_history is not None else PositionHistoryStore()
+        self.geofence_engine = GeofenceEngine()
+        # Route sequencing looks distances up here; the depot warm-up fills it ahead of time
+        self.distance_cache = DistanceCache()
+        self.cmr_workers = cmr_workers or os.cpu_count() or 1
+        self.cmr_max_queued_jobs = cmr_max_queued_jobs
+        self._cmr_executor: Optional[ProcessPoolExecutor] = None
+        self._cmr_jobs: Optional[JobQueue] = None
+
+    @property
+    def cmr_executor(self) -> ProcessPoolExecutor:
+        """
+        Process pool for CMR extraction, sized to the CPU cores
+
+        Created on first use so that applications which never process a batch
+        do not start worker processes. Workers are spawned rather than forked,
+        since the server process already runs threads.
+        """
+        if self._cmr_executor is None:
+            self._cmr_executor = ProcessPoolExecutor(
+                max_workers=self.cmr_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._cmr_executor
+
+    @property
+    def cmr_jobs(self) -> JobQueue:
+        """Background CMR job queue, one worker per process in the pool"""
+        if self._cmr_jobs is None:
+            self._cmr_jobs = JobQueue(
+                self.cmr_executor,
+                workers=self.cmr_workers,
+                max_queued=self.cmr_max_queued_jobs
+            )
+        return self._cmr_jobs
+
+    async def aclose(self) -> None:
+        """Stop background workers, then release pooled resources"""
+        if self._cmr_jobs is not None:
+            await self._cmr_jobs.stop()
+            self._cmr_jobs = None
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """Release pooled resources"""
+        if self._cmr_executor is not None:
+            self._cmr_executor.shutdown(wait=True, cancel_futures=True)
+            self._cmr_executor = None
+        self.cmr_normalizer.extractor.close()
+        self.caches.clear()
+        self.cmr_cache.clear()
+        self.matricula_cache.clear()
+        self.position_history.clear()
+        self.geofence_engine.clear()
+        self.distance_cache.clear()
+        self.change_events.clear()
+        self.engine.dispose()
+
+def build_container() -> AppContainer:
+    """
+    Create the container with the default infrastructure
+
+    Set ``CMR_CACHE_DIR`` to keep CMR extraction results on disk as well.
+    GPS traces are stored within ``POSITION_TOLERANCE_M`` metres (default
+    15, 0 stores every ping) and raw pings are kept for the last
+    ``POSITION_RAW_RETENTION_S`` seconds (default 300).
+    """
+    cache_dir = os.getenv("CMR_CACHE_DIR")
+    return AppContainer(
+        engine=default_engine,
+        session_factory=SessionLocal,
+        cmr_cache=CMRResultCache(store=DiskCMRResultStore(cache_dir) if cache_dir else None),
+        position_history=PositionHistoryStore(
+            tolerancia_m=float(os.getenv("POSITION_TOLERANCE_M", "15")) or None,
+            retener_crudo_segundos=float(os.getenv("POSITION_RAW_RETENTION_S", "300"))
+        )
+    )
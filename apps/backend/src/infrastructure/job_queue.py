@@ -0,0 +1,156 @@
+"""
+In-process background job queue
+"""
+import asyncio
+import inspect
+from collections import OrderedDict, deque
+from concurrent.futures import Executor
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from src.domain.services.id_generator import IdGenerator, default_id_generator
+
+class JobStatus(Enum):
+    """Job lifecycle status"""
+    PENDIENTE = "pendiente"
+    PROCESANDO = "procesando"
+    COMPLETADO = "completado"
+    ERROR = "error"
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+    pass
+
+class JobFailedError(Exception):
+    """Raised by a job whose work finished but failed, keeping the result for polling"""
+
+    def __init__(self, message: str, result: Any = None):
+        super().__init__(message)
+        self.result = result
+
+class Job:
+    """A unit of work queued for a background worker"""
+
+    def __init__(self, job_id: str, func: Callable[..., Any], args: tuple, filename: Optional[str] = None):
+        self.id = job_id
+        self.filename = filename
+        self.status = JobStatus.PENDIENTE
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.submitted_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._func = func
+        self._args = args
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready view of the job"""
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "status": self.status.value,
+            "submitted_at": self.submitted_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "result": self.result,
+            "error": self.error
+        }
+
+class JobQueue:
+    """
+    Bounded queue of jobs run on an executor by a fixed set of asyncio workers.
+
+    Submitting never waits: when ``max_queued`` jobs are already waiting,
+    ``submit`` raises ``QueueFullError`` so callers can push back on clients.
+    Finished jobs are kept for polling, up to ``max_retained`` of them.
+    """
+
+    def __init__(self, executor: Executor, workers: int = 1, max_queued: int = 100,
+                 max_retained: int = 1000, id_generator: Optional[IdGenerator] = None):
+        if max_queued < 1:
+            raise ValueError("max_queued must be at least 1")
+        self.executor = executor
+        self.workers = workers
+        self.max_retained = max_retained
+        self.id_generator = id_generator or default_id_generator
+        self._queue: "asyncio.Queue[Job]" = asyncio.Queue(maxsize=max_queued)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._finished: Deque[str] = deque()
+        self._tasks: List[asyncio.Task] = []
+
+    def submit(self, func: Callable[..., Any], *args: Any, filename: Optional[str] = None) -> Job:
+        """
+        Queue ``func(*args)`` to run on the executor
+
+        Coroutine functions are awaited on the event loop instead, for jobs
+        that dispatch their own work. Must be called from the event loop;
+        workers are started on first use.
+
+        Raises:
+            QueueFullError: If the queue is at capacity
+        """
+        self._start_workers()
+        job = Job(self.id_generator.next_id("JOB"), func, args, filename=filename)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError("Job queue is full, retry later")
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a queued, running or recently finished job"""
+        return self._jobs.get(job_id)
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs waiting for a worker"""
+        return self._queue.qsize()
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs still queued are dropped"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _start_workers(self) -> None:
+        """Start the worker tasks in the running loop if needed"""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def _worker(self) -> None:
+        """Run queued jobs one at a time"""
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status = JobStatus.PROCESANDO
+            job.started_at = datetime.now()
+            try:
+                if inspect.iscoroutinefunction(job._func):
+                    job.result = await job._func(*job._args)
+                else:
+                    job.result = await loop.run_in_executor(self.executor, job._func, *job._args)
+                job.status = JobStatus.COMPLETADO
+            except asyncio.CancelledError:
+                raise
+            except JobFailedError as e:
+                job.result = e.result
+                job.error = str(e)
+                job.status = JobStatus.ERROR
+            except Exception as e:
+                job.error = str(e)
+                job.status = JobStatus.ERROR
+            finally:
+                job.finished_at = datetime.now()
+                # Release the payload (document bytes) as soon as possible
+                job._args = ()
+                self._queue.task_done()
+            self._retain(job)
+
+    def _retain(self, job: Job) -> None:
+        """Remember a finished job, forgetting the oldest beyond the limit"""
+        self._finished.append(job.id)
+        while len(self._finished) > self.max_retained:
+            self._jobs.pop(self._finished.popleft(), None)
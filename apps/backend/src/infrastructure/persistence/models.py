@@ -1,20 +1,61 @@
 """
 SQLAlchemy models for the application
 """
-from sqlalchemy import Column, String, Float, Integer, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, Float, Integer, Boolean, DateTime, ForeignKey, Enum, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
+from src.domain.entities.carga import TipoCarga, EstadoCarga
 from src.domain.entities.vehiculo import TipoVehiculo, EstadoVehiculo
 
 Base = declarative_base()
 
+class FlotaModel(Base):
+    """SQLAlchemy model for Flota entity"""
+    __tablename__ = "flotas"
+
+    id = Column(String, primary_key=True, index=True)
+    nombre = Column(String, nullable=False)
+    descripcion = Column(String, nullable=True)
+    fecha_creacion = Column(DateTime, nullable=False, default=datetime.now)
+    activo = Column(Boolean, nullable=False, default=True)
+
+    # Relationships
+    vehiculos = relationship("VehiculoModel", back_populates="flota")
+    transportistas = relationship("TransportistaModel", back_populates="flota")
+
+    def __repr__(self):
+        return f"<FlotaModel(id={self.id}, nombre={self.nombre})>"
+
+class TransportistaModel(Base):
+    """SQLAlchemy model for Transportista entity"""
+    __tablename__ = "transportistas"
+
+    id = Column(String, primary_key=True, index=True)
+    nombre = Column(String, nullable=False)
+    email = Column(String, nullable=False)
+    telefono = Column(String, nullable=True)
+    licencia = Column(String, nullable=False)
+    fecha_nacimiento = Column(DateTime, nullable=True)
+    fecha_contratacion = Column(DateTime, nullable=False, default=datetime.now)
+    activo = Column(Boolean, nullable=False, default=True)
+    flota_id = Column(String, ForeignKey("flotas.id"), nullable=True)
+
+    # Relationships
+    flota = relationship("FlotaModel", back_populates="transportistas")
+    vehiculos = relationship("VehiculoModel", back_populates="transportista")
+
+    def __repr__(self):
+        return f"<TransportistaModel(id={self.id}, nombre={self.nombre})>"
+
 class VehiculoModel(Base):
     """SQLAlchemy model for Vehiculo entity"""
     __tablename__ = "vehiculos"
 
     id = Column(String, primary_key=True, index=True)
     matricula = Column(String, unique=True, index=True, nullable=False)
+    # normalizar_matricula(matricula), so plate lookups match exactly what Python matches
+    matricula_normalizada = Column(String, index=True, nullable=True)
     marca = Column(String, nullable=False)
     modelo = Column(String, nullable=False)
     tipo = Column(Enum(TipoVehiculo), nullable=False)
@@ -32,3 +73,50 @@ class VehiculoModel(Base):
 
     def __repr__(self):
         return f"<VehiculoModel(id={self.id}, matricula={self.matricula}, tipo={self.tipo.value})>"
+
+class CMRDocumentModel(Base):
+    """SQLAlchemy model for normalized CMR documents"""
+    __tablename__ = "cmr_documentos"
+
+    numero_cmr = Column(String, primary_key=True, index=True)
+    matricula_vehiculo = Column(String, index=True, nullable=False)
+    fecha_emision = Column(DateTime, index=True, nullable=False)
+    estado_procesamiento = Column(String, nullable=False)
+    # Full normalized document; the columns above are only for lookups
+    documento = Column(JSON, nullable=False)
+
+    __table_args__ = (
+        # Serves "documents for a plate within a date range" from the index alone
+        Index("ix_cmr_documentos_matricula_fecha", "matricula_vehiculo", "fecha_emision"),
+    )
+
+    def __repr__(self):
+        return f"<CMRDocumentModel(numero_cmr={self.numero_cmr}, matricula={self.matricula_vehiculo})>"
+
+class CargaModel(Base):
+    """SQLAlchemy model for Carga entity"""
+    __tablename__ = "cargas"
+
+    id = Column(String, primary_key=True, index=True)
+    descripcion = Column(String, nullable=False)
+    tipo = Column(Enum(TipoCarga), nullable=False)
+    peso = Column(Float, nullable=False)
+    volumen = Column(Float, nullable=True)
+    valor_declarado = Column(Float, nullable=True)
+    estado = Column(Enum(EstadoCarga), index=True, nullable=False, default=EstadoCarga.PENDIENTE)
+    origen = Column(String, nullable=False)
+    destino = Column(String, nullable=False)
+    fecha_creacion = Column(DateTime, nullable=False, default=datetime.now)
+    fecha_salida = Column(DateTime, nullable=True)
+    fecha_entrega = Column(DateTime, nullable=True)
+    entrega_desde = Column(DateTime, nullable=True)
+    entrega_hasta = Column(DateTime, nullable=True)
+    # Indexed like the in-memory repository, so listing by status or assignment reads only the matches
+    vehiculo_id = Column(String, index=True, nullable=True)
+    transportista_id = Column(String, index=True, nullable=True)
+    flota_id = Column(String, index=True, nullable=True)
+    coordenadas_actuales = Column(String, nullable=True)
+    ultima_actualizacion = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<CargaModel(id={self.id}, estado={self.estado.value})>"
@@ -0,0 +1,228 @@
+"""
+In-memory GPS position history for loads and vehicles
+"""
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+from src.domain.repositories.interfaces import PosicionRepository
+from src.domain.services.trajectory_compression import Posicion, TrajectoryCompressor
+
+class _Chunk:
+    """Fixed-capacity block of positions in parallel float arrays, sorted by time"""
+
+    __slots__ = ("t", "lat", "lon")
+
+    def __init__(self):
+        self.t = array("d")
+        self.lat = array("d")
+        self.lon = array("d")
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    def append(self, t: float, lat: float, lon: float) -> None:
+        self.t.append(t)
+        self.lat.append(lat)
+        self.lon.append(lon)
+
+    def insert(self, t: float, lat: float, lon: float) -> None:
+        index = bisect_right(self.t, t)
+        self.t.insert(index, t)
+        self.lat.insert(index, lat)
+        self.lon.insert(index, lon)
+
+class PositionTrack:
+    """
+    Position history of one load or vehicle.
+
+    Positions live in chunks of ``chunk_size`` points, each chunk holding
+    timestamps, latitudes and longitudes in ``array('d')`` columns (24 bytes
+    per point instead of a tuple of boxed floats). Chunks are ordered by
+    time, so a time window is a scan of chunk bounds plus two binary
+    searches. Once a track holds more than ``max_points``, its oldest
+    chunks are dropped, like a ring buffer with chunk granularity.
+
+    With ``tolerancia_m``, pings go through a ``TrajectoryCompressor`` and
+    only the points needed to keep the trace within that many metres are
+    stored; the newest ping is part of query results, but is only stored
+    once a later ping or ``close()`` settles it. With
+    ``retener_crudo_segundos``, the raw pings of that last stretch of time,
+    late ones included, are kept as well and can be read with ``crudo=True``.
+    """
+
+    def __init__(self, chunk_size: int = 1024, max_points: int = 100_000,
+                 tolerancia_m: Optional[float] = None, retener_crudo_segundos: float = 0.0):
+        self.chunk_size = chunk_size
+        self.max_points = max_points
+        self.retener_crudo_segundos = retener_crudo_segundos
+        self._compressor = TrajectoryCompressor(tolerancia_m) if tolerancia_m else None
+        self._raw: Deque[Posicion] = deque()
+        self._chunks: List[_Chunk] = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Stored positions, including the pending newest one"""
+        pending = self._compressor.pending() if self._compressor is not None else None
+        return self._size + (pending is not None)
+
+    def add(self, t: float, lat: float, lon: float) -> None:
+        """Add a ping; late pings are stored uncompressed at their place in time"""
+        if self.retener_crudo_segundos > 0:
+            self._retain_raw(t, lat, lon)
+
+        if self._compressor is None:
+            self._store(t, lat, lon)
+            return
+        last = self._compressor.last()
+        if last is not None and t < last[0]:
+            self._store(t, lat, lon)
+            return
+        for kept in self._compressor.push((t, lat, lon)):
+            self._store(*kept)
+
+    def close(self) -> None:
+        """Store the pending newest ping, e.g. when the vehicle stops reporting"""
+        if self._compressor is not None:
+            for kept in self._compressor.flush():
+                self._store(*kept)
+
+    def _retain_raw(self, t: float, lat: float, lon: float) -> None:
+        """Keep a raw ping, late ones at their place in time, for the retention window"""
+        if not self._raw or t >= self._raw[-1][0]:
+            self._raw.append((t, lat, lon))
+        elif t >= self._raw[-1][0] - self.retener_crudo_segundos:
+            self._raw.insert(bisect_right(self._raw, (t, lat, lon)), (t, lat, lon))
+        while self._raw[0][0] < self._raw[-1][0] - self.retener_crudo_segundos:
+            self._raw.popleft()
+
+    def _store(self, t: float, lat: float, lon: float) -> None:
+        """Write a position into the chunks"""
+        if not self._chunks or (self._chunks[-1].t and t >= self._chunks[-1].t[-1]):
+            if not self._chunks or len(self._chunks[-1]) >= self.chunk_size:
+                self._chunks.append(_Chunk())
+            self._chunks[-1].append(t, lat, lon)
+        else:
+            # First chunk whose last timestamp is after t; it may exceed
+            # chunk_size, which only costs a slower insert into it later
+            index = bisect_left([chunk.t[-1] for chunk in self._chunks], t)
+            self._chunks[min(index, len(self._chunks) - 1)].insert(t, lat, lon)
+        self._size += 1
+
+        while self._size - len(self._chunks[0]) >= self.max_points and len(self._chunks) > 1:
+            self._size -= len(self._chunks.pop(0))
+
+    def latest(self) -> Optional[Posicion]:
+        """Most recent position"""
+        if self._compressor is not None and self._compressor.pending() is not None:
+            return self._compressor.pending()
+        if not self._chunks:
+            return None
+        chunk = self._chunks[-1]
+        return chunk.t[-1], chunk.lat[-1], chunk.lon[-1]
+
+    def window(self, desde: Optional[float] = None, hasta: Optional[float] = None,
+               limit: Optional[int] = None, crudo: bool = False) -> List[Posicion]:
+        """
+        Positions with ``desde <= t < hasta``, oldest first
+
+        The pending newest ping is included without being stored, so reading
+        a track never changes how it is compressed. With ``crudo``, the raw
+        pings are returned instead, as far as they are still retained.
+        """
+        if crudo:
+            result = [p for p in self._raw if (desde is None or p[0] >= desde) and (hasta is None or p[0] < hasta)]
+            return result[:limit] if limit is not None else result
+
+        result: List[Posicion] = []
+        for chunk in self._chunks:
+            if desde is not None and chunk.t[-1] < desde:
+                continue
+            if hasta is not None and chunk.t[0] >= hasta:
+                break
+            start = bisect_left(chunk.t, desde) if desde is not None else 0
+            end = bisect_left(chunk.t, hasta) if hasta is not None else len(chunk)
+            if limit is not None:
+                end = min(end, start + limit - len(result))
+            result.extend(zip(chunk.t[start:end], chunk.lat[start:end], chunk.lon[start:end]))
+            if limit is not None and len(result) >= limit:
+                break
+
+        pending = self._compressor.pending() if self._compressor is not None else None
+        if (pending is not None and (limit is None or len(result) < limit)
+                and (desde is None or pending[0] >= desde) and (hasta is None or pending[0] < hasta)):
+            result.append(pending)
+        return result
+
+class PositionHistoryStore(PosicionRepository):
+    """
+    Position histories keyed by ``(tipo, id)``, e.g. ``("vehiculo", "VHC1")``.
+
+    Batches of pings are grouped per track and applied under one lock, so
+    a batch from a telematics gateway costs one lock round-trip.
+    ``tolerancia_m`` and ``retener_crudo_segundos`` are passed on to every
+    track to compress traces and keep recent raw pings.
+    """
+
+    def __init__(self, chunk_size: int = 1024, max_points_per_track: int = 100_000,
+                 tolerancia_m: Optional[float] = None, retener_crudo_segundos: float = 0.0):
+        self.chunk_size = chunk_size
+        self.max_points_per_track = max_points_per_track
+        self.tolerancia_m = tolerancia_m
+        self.retener_crudo_segundos = retener_crudo_segundos
+        self._tracks: Dict[Tuple[str, str], PositionTrack] = {}
+        self._lock = threading.Lock()
+
+    def ingest(self, pings: Iterable[Tuple[str, str, float, float, float]]) -> int:
+        """
+        Add ``(tipo, id, timestamp, latitud, longitud)`` pings
+
+        Returns:
+            Number of positions added
+        """
+        grouped: Dict[Tuple[str, str], List[Posicion]] = {}
+        for tipo, track_id, t, lat, lon in pings:
+            grouped.setdefault((tipo, track_id), []).append((t, lat, lon))
+
+        with self._lock:
+            for key, posiciones in grouped.items():
+                track = self._tracks.get(key)
+                if track is None:
+                    track = self._tracks[key] = PositionTrack(
+                        self.chunk_size, self.max_points_per_track,
+                        self.tolerancia_m, self.retener_crudo_segundos
+                    )
+                # Sorting first turns out-of-order batches into plain appends
+                for t, lat, lon in sorted(posiciones):
+                    track.add(t, lat, lon)
+        return sum(len(posiciones) for posiciones in grouped.values())
+
+    def window(self, tipo: str, track_id: str, desde: Optional[float] = None,
+               hasta: Optional[float] = None, limit: Optional[int] = None,
+               crudo: bool = False) -> List[Posicion]:
+        """Positions of a track with ``desde <= t < hasta``, oldest first"""
+        with self._lock:
+            track = self._tracks.get((tipo, track_id))
+            return track.window(desde, hasta, limit, crudo) if track is not None else []
+
+    def latest(self, tipo: str, track_id: str) -> Optional[Posicion]:
+        """Most recent position of a track"""
+        with self._lock:
+            track = self._tracks.get((tipo, track_id))
+            return track.latest() if track is not None else None
+
+    def close(self, tipo: str, track_id: str) -> None:
+        """Store the pending newest position of a track that stopped reporting"""
+        with self._lock:
+            track = self._tracks.get((tipo, track_id))
+            if track is not None:
+                track.close()
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def clear(self) -> None:
+        """Drop every track"""
+        with self._lock:
+            self._tracks.clear()
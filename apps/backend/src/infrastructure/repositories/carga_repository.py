@@ -0,0 +1,181 @@
+"""
+Load repository implementations
+"""
+from typing import Any, Dict, List, Optional, Tuple, Union
+from sqlalchemy.orm import Session
+from src.domain.entities.carga import Carga, EstadoCarga
+from src.domain.entities.evento_cambio import TipoEntidad
+from src.domain.repositories.interfaces import CargaRepository
+from src.domain.services.change_events import ChangeEventBus
+from src.domain.value_objects.direccion import Coordenadas
+from src.infrastructure.persistence.models import CargaModel
+
+# Fields with a hash index in the in-memory repository and a DB index in SQL
+_INDEXADOS = ("estado", "flota_id", "transportista_id", "vehiculo_id")
+
+class SQLAlchemyCargaRepository(CargaRepository):
+    """SQLAlchemy implementation of CargaRepository; saves and deletes are published to ``eventos``"""
+
+    def __init__(self, session: Session, eventos: Optional[ChangeEventBus] = None):
+        self.session = session
+        self.eventos = eventos
+
+    def save(self, carga: Carga) -> None:
+        """Save a load"""
+        self.session.merge(CargaModel(**carga.model_dump(exclude={"posicion_actual"})))
+        self.session.commit()
+        if self.eventos is not None:
+            self.eventos.guardado(TipoEntidad.CARGA, carga)
+
+    def find_by_id(self, carga_id: str) -> Optional[Carga]:
+        """Find a load by ID"""
+        model = self.session.get(CargaModel, carga_id)
+        if model:
+            return self._model_to_entity(model)
+        return None
+
+    def find_all(self) -> List[Carga]:
+        """Find all loads"""
+        return self._find()
+
+    def find_by_estado(self, estado: Union[EstadoCarga, str]) -> List[Carga]:
+        """Find loads by status"""
+        return self._find(CargaModel.estado == EstadoCarga(estado))
+
+    def find_by_flota(self, flota_id: str) -> List[Carga]:
+        """Find loads by fleet ID"""
+        return self._find(CargaModel.flota_id == flota_id)
+
+    def find_by_transportista(self, transportista_id: str) -> List[Carga]:
+        """Find loads by transporter ID"""
+        return self._find(CargaModel.transportista_id == transportista_id)
+
+    def find_by_vehiculo(self, vehiculo_id: str) -> List[Carga]:
+        """Find loads by vehicle ID"""
+        return self._find(CargaModel.vehiculo_id == vehiculo_id)
+
+    def find_en_transito(self) -> List[Carga]:
+        """Find loads currently in transit"""
+        return self.find_by_estado(EstadoCarga.EN_TRANSITO)
+
+    def delete(self, carga_id: str) -> None:
+        """Delete a load by ID"""
+        model = self.session.get(CargaModel, carga_id)
+        if model:
+            self.session.delete(model)
+            self.session.commit()
+            if self.eventos is not None:
+                self.eventos.eliminado(TipoEntidad.CARGA, carga_id)
+
+    def _find(self, *criteria) -> List[Carga]:
+        query = self.session.query(CargaModel).filter(*criteria).order_by(CargaModel.id)
+        return [self._model_to_entity(model) for model in query.all()]
+
+    def _model_to_entity(self, model: CargaModel) -> Carga:
+        """Convert SQLAlchemy model to domain entity"""
+        carga = Carga.model_validate({
+            column.name: getattr(model, column.name) for column in CargaModel.__table__.columns
+        })
+        if carga.coordenadas_actuales:
+            carga.posicion_actual = Coordenadas.desde_texto(carga.coordenadas_actuales)
+        return carga
+
+class InMemoryCargaRepository(CargaRepository):
+    """
+    In-memory implementation of CargaRepository
+
+    Keeps a hash index per status, fleet, transporter and vehicle, each
+    mapping a value to the loads with it, so listing e.g. the loads in
+    transit reads only those. Stored loads are observed: ``cambiar_estado``
+    and the ``asignar_*`` methods move a load between index entries without
+    saving it again. Fields set directly are picked up by the next save.
+    Saves and deletes are published to ``eventos``; changes made through
+    the observed methods are not, until the load is saved.
+    """
+
+    def __init__(self, eventos: Optional[ChangeEventBus] = None):
+        self.eventos = eventos
+        self._cargas: Dict[str, Carga] = {}
+        self._indices: Dict[str, Dict[Any, Dict[str, Carga]]] = {campo: {} for campo in _INDEXADOS}
+        # Indexed values per load as of its last (re)indexing
+        self._claves: Dict[str, Tuple[Any, ...]] = {}
+
+    def save(self, carga: Carga) -> None:
+        """Save a load"""
+        anterior = self._cargas.get(carga.id)
+        if anterior is not None and anterior is not carga:
+            anterior.dejar_de_observar(self._al_cambiar)
+        self._desindexar(carga.id)
+        self._cargas[carga.id] = carga
+        self._claves[carga.id] = tuple(getattr(carga, campo) for campo in _INDEXADOS)
+        for campo, valor in zip(_INDEXADOS, self._claves[carga.id]):
+            self._indices[campo].setdefault(valor, {})[carga.id] = carga
+        carga.observar(self._al_cambiar)
+        if self.eventos is not None:
+            self.eventos.guardado(TipoEntidad.CARGA, carga)
+
+    def find_by_id(self, carga_id: str) -> Optional[Carga]:
+        """Find a load by ID"""
+        return self._cargas.get(carga_id)
+
+    def find_all(self) -> List[Carga]:
+        """Find all loads"""
+        return list(self._cargas.values())
+
+    def find_by_estado(self, estado: Union[EstadoCarga, str]) -> List[Carga]:
+        """Find loads by status"""
+        return self._find("estado", EstadoCarga(estado))
+
+    def find_by_flota(self, flota_id: str) -> List[Carga]:
+        """Find loads by fleet ID"""
+        return self._find("flota_id", flota_id)
+
+    def find_by_transportista(self, transportista_id: str) -> List[Carga]:
+        """Find loads by transporter ID"""
+        return self._find("transportista_id", transportista_id)
+
+    def find_by_vehiculo(self, vehiculo_id: str) -> List[Carga]:
+        """Find loads by vehicle ID"""
+        return self._find("vehiculo_id", vehiculo_id)
+
+    def find_en_transito(self) -> List[Carga]:
+        """Find loads currently in transit"""
+        return self.find_by_estado(EstadoCarga.EN_TRANSITO)
+
+    def delete(self, carga_id: str) -> None:
+        """Delete a load by ID"""
+        carga = self._cargas.get(carga_id)
+        if carga is not None:
+            self._desindexar(carga_id)
+            del self._cargas[carga_id]
+            carga.dejar_de_observar(self._al_cambiar)
+            if self.eventos is not None:
+                self.eventos.eliminado(TipoEntidad.CARGA, carga_id)
+
+    def _find(self, campo: str, valor: Any) -> List[Carga]:
+        return list(self._indices[campo].get(valor, {}).values())
+
+    def _al_cambiar(self, carga: Carga, campo: str, anterior: Any) -> None:
+        """Observer of stored loads: move the load to the entry of its new value"""
+        if self._cargas.get(carga.id) is not carga:
+            # A copy, or a load replaced or deleted since it was saved
+            return
+        posicion = _INDEXADOS.index(campo)
+        claves = self._claves[carga.id]
+        nuevo = getattr(carga, campo)
+        self._quitar(campo, claves[posicion], carga.id)
+        self._indices[campo].setdefault(nuevo, {})[carga.id] = carga
+        self._claves[carga.id] = claves[:posicion] + (nuevo,) + claves[posicion + 1:]
+
+    def _desindexar(self, carga_id: str) -> None:
+        claves = self._claves.pop(carga_id, None)
+        if claves is not None:
+            for campo, valor in zip(_INDEXADOS, claves):
+                self._quitar(campo, valor, carga_id)
+
+    def _quitar(self, campo: str, valor: Any, carga_id: str) -> None:
+        entrada = self._indices[campo].get(valor)
+        if entrada is not None:
+            entrada.pop(carga_id, None)
+            if not entrada:
+                del self._indices[campo][valor]
@@ -0,0 +1,205 @@
+"""
+CMR document repository implementations
+"""
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Query, Session
+from src.domain.entities.cmr_document import CMRDocument
+from src.domain.repositories.interfaces import CMRRepository
+from src.domain.value_objects.fecha import a_utc
+from src.infrastructure.persistence.models import CMRDocumentModel
+
+# Index entry: issue date first so entries sort chronologically, number to break ties
+_IndexEntry = Tuple[datetime, str]
+
+def _utc_naive(fecha: Optional[datetime]) -> Optional[datetime]:
+    """UTC wall time, as the timezone-less DateTime column stores it"""
+    return a_utc(fecha).replace(tzinfo=None) if fecha is not None else None
+
+class SQLAlchemyCMRRepository(CMRRepository):
+    """SQLAlchemy implementation of CMRRepository"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def save(self, documento: CMRDocument) -> None:
+        """Save a CMR document, replacing any stored one with the same number"""
+        self.session.merge(CMRDocumentModel(
+            numero_cmr=documento.numero_cmr,
+            matricula_vehiculo=documento.matricula_vehiculo,
+            fecha_emision=_utc_naive(documento.fecha_emision),
+            estado_procesamiento=documento.estado_procesamiento.value,
+            documento=documento.model_dump(mode="json")
+        ))
+        self.session.commit()
+
+    def find_by_numero(self, numero_cmr: str) -> Optional[CMRDocument]:
+        """Find a CMR document by its number"""
+        model = self.session.get(CMRDocumentModel, numero_cmr)
+        if model:
+            return self._model_to_entity(model)
+        return None
+
+    def find_all(self) -> List[CMRDocument]:
+        """Find all CMR documents"""
+        return self.search()
+
+    def find_by_matricula(self, matricula: str) -> List[CMRDocument]:
+        """Find CMR documents by vehicle plate, oldest first"""
+        return self.search(matricula=matricula)
+
+    def search(
+        self,
+        matricula: Optional[str] = None,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> List[CMRDocument]:
+        """Find CMR documents by plate and issue date range, oldest first"""
+        query = self._filtered(matricula, desde, hasta).order_by(
+            CMRDocumentModel.fecha_emision, CMRDocumentModel.numero_cmr
+        )
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        return [self._model_to_entity(model) for model in query.all()]
+
+    def count(
+        self,
+        matricula: Optional[str] = None,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None
+    ) -> int:
+        """Count the CMR documents a search with the same filters would return"""
+        return self._filtered(matricula, desde, hasta).count()
+
+    def delete(self, numero_cmr: str) -> None:
+        """Delete a CMR document by number"""
+        model = self.session.get(CMRDocumentModel, numero_cmr)
+        if model:
+            self.session.delete(model)
+            self.session.commit()
+
+    def _filtered(
+        self,
+        matricula: Optional[str],
+        desde: Optional[datetime],
+        hasta: Optional[datetime]
+    ) -> Query:
+        """Query with the plate and date filters applied"""
+        query = self.session.query(CMRDocumentModel)
+        if matricula is not None:
+            query = query.filter(CMRDocumentModel.matricula_vehiculo == matricula)
+        if desde is not None:
+            query = query.filter(CMRDocumentModel.fecha_emision >= _utc_naive(desde))
+        if hasta is not None:
+            query = query.filter(CMRDocumentModel.fecha_emision < _utc_naive(hasta))
+        return query
+
+    def _model_to_entity(self, model: CMRDocumentModel) -> CMRDocument:
+        """Convert SQLAlchemy model to domain entity"""
+        return CMRDocument.model_validate(model.documento)
+
+class InMemoryCMRRepository(CMRRepository):
+    """
+    In-memory implementation of CMRRepository
+
+    Besides the documents keyed by number, it keeps sorted
+    ``(fecha_emision, numero_cmr)`` lists, one overall and one per plate.
+    Date ranges are then two binary searches plus a slice, and pagination
+    only touches the requested page. Dates are indexed in UTC, naive ones
+    taken as UTC.
+    """
+
+    def __init__(self):
+        self._documentos: Dict[str, CMRDocument] = {}
+        self._por_fecha: List[_IndexEntry] = []
+        self._por_matricula: Dict[str, List[_IndexEntry]] = {}
+
+    def save(self, documento: CMRDocument) -> None:
+        """Save a CMR document, replacing any stored one with the same number"""
+        self._unindex(documento.numero_cmr)
+        self._documentos[documento.numero_cmr] = documento
+        entry = (a_utc(documento.fecha_emision), documento.numero_cmr)
+        insort(self._por_fecha, entry)
+        insort(self._por_matricula.setdefault(documento.matricula_vehiculo, []), entry)
+
+    def find_by_numero(self, numero_cmr: str) -> Optional[CMRDocument]:
+        """Find a CMR document by its number"""
+        return self._documentos.get(numero_cmr)
+
+    def find_all(self) -> List[CMRDocument]:
+        """Find all CMR documents"""
+        return self.search()
+
+    def find_by_matricula(self, matricula: str) -> List[CMRDocument]:
+        """Find CMR documents by vehicle plate, oldest first"""
+        return self.search(matricula=matricula)
+
+    def search(
+        self,
+        matricula: Optional[str] = None,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> List[CMRDocument]:
+        """Find CMR documents by plate and issue date range, oldest first"""
+        entries, start, end = self._range(matricula, desde, hasta)
+        start = min(start + offset, end)
+        if limit is not None:
+            end = min(end, start + limit)
+        return [self._documentos[numero] for _, numero in entries[start:end]]
+
+    def count(
+        self,
+        matricula: Optional[str] = None,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None
+    ) -> int:
+        """Count the CMR documents a search with the same filters would return"""
+        _, start, end = self._range(matricula, desde, hasta)
+        return end - start
+
+    def delete(self, numero_cmr: str) -> None:
+        """Delete a CMR document by number"""
+        self._unindex(numero_cmr)
+        self._documentos.pop(numero_cmr, None)
+
+    def _range(
+        self,
+        matricula: Optional[str],
+        desde: Optional[datetime],
+        hasta: Optional[datetime]
+    ) -> Tuple[List[_IndexEntry], int, int]:
+        """Index list to read and the bounds of the matching entries in it"""
+        if matricula is None:
+            entries = self._por_fecha
+        else:
+            entries = self._por_matricula.get(matricula, [])
+        # A 1-tuple sorts before every entry with the same date
+        start = bisect_left(entries, (a_utc(desde),)) if desde is not None else 0
+        end = bisect_left(entries, (a_utc(hasta),)) if hasta is not None else len(entries)
+        return entries, start, max(start, end)
+
+    def _unindex(self, numero_cmr: str) -> None:
+        """Remove a stored document's entries from the sorted indexes"""
+        documento = self._documentos.get(numero_cmr)
+        if documento is None:
+            return
+        entry = (a_utc(documento.fecha_emision), numero_cmr)
+        self._remove_entry(self._por_fecha, entry)
+        por_matricula = self._por_matricula.get(documento.matricula_vehiculo)
+        if por_matricula is not None:
+            self._remove_entry(por_matricula, entry)
+            if not por_matricula:
+                del self._por_matricula[documento.matricula_vehiculo]
+
+    @staticmethod
+    def _remove_entry(entries: List[_IndexEntry], entry: _IndexEntry) -> None:
+        index = bisect_left(entries, entry)
+        if index < len(entries) and entries[index] == entry:
+            del entries[index]
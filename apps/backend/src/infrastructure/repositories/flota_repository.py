@@ -2,18 +2,23 @@
 In-memory repository implementations
 """
 from typing import List, Optional, Dict
+from src.domain.entities.evento_cambio import TipoEntidad
 from src.domain.entities.flota import Flota
 from src.domain.repositories.interfaces import FlotaRepository
+from src.domain.services.change_events import ChangeEventBus
 
 class InMemoryFlotaRepository(FlotaRepository):
-    """In-memory implementation of FlotaRepository"""
+    """In-memory implementation of FlotaRepository; saves and deletes are published to ``eventos``"""
 
-    def __init__(self):
+    def __init__(self, eventos: Optional[ChangeEventBus] = None):
         self._flotas: Dict[str, Flota] = {}
+        self.eventos = eventos
 
     def save(self, flota: Flota) -> None:
         """Save a fleet"""
         self._flotas[flota.id] = flota
+        if self.eventos is not None:
+            self.eventos.guardado(TipoEntidad.FLOTA, flota)
 
     def find_by_id(self, flota_id: str) -> Optional[Flota]:
         """Find a fleet by ID"""
@@ -30,4 +35,6 @@ class InMemoryFlotaRepository(FlotaRepository):
     def delete(self, flota_id: str) -> None:
         """Delete a fleet by ID"""
         if flota_id in self._flotas:
-            del self._flotas[flota_id]
\ No newline at end of file
+            del self._flotas[flota_id]
+            if self.eventos is not None:
+                self.eventos.eliminado(TipoEntidad.FLOTA, flota_id)
@@ -1,18 +1,25 @@
 """
 SQLAlchemy implementation of VehiculoRepository
 """
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
+from src.domain.entities.evento_cambio import TipoEntidad
 from src.domain.entities.vehiculo import Vehiculo, EstadoVehiculo
+from src.domain.services.change_events import ChangeEventBus
+from src.domain.services.matricula_resolver import normalizar_matricula
 from src.domain.repositories.interfaces import VehiculoRepository
 from src.infrastructure.persistence.models import VehiculoModel
 
+# Bound parameters per IN query, below SQLite's historical limit of 999
+_IN_CHUNK_SIZE = 500
+
 class SQLAlchemyVehiculoRepository(VehiculoRepository):
-    """SQLAlchemy implementation of VehiculoRepository"""
+    """SQLAlchemy implementation of VehiculoRepository; saves and deletes are published to ``eventos``"""
 
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, eventos: Optional[ChangeEventBus] = None):
         self.session = session
+        self.eventos = eventos
 
     def save(self, vehiculo: Vehiculo) -> None:
         """Save a vehicle"""
@@ -22,6 +29,7 @@ class SQLAlchemyVehiculoRepository(VehiculoRepository):
         if existing:
             # Update existing vehicle
             existing.matricula = vehiculo.matricula
+            existing.matricula_normalizada = normalizar_matricula(vehiculo.matricula)
             existing.marca = vehiculo.marca
             existing.modelo = vehiculo.modelo
             existing.tipo = vehiculo.tipo
@@ -37,6 +45,7 @@ class SQLAlchemyVehiculoRepository(VehiculoRepository):
             vehiculo_model = VehiculoModel(
                 id=vehiculo.id,
                 matricula=vehiculo.matricula,
+                matricula_normalizada=normalizar_matricula(vehiculo.matricula),
                 marca=vehiculo.marca,
                 modelo=vehiculo.modelo,
                 tipo=vehiculo.tipo,
@@ -51,6 +60,8 @@ class SQLAlchemyVehiculoRepository(VehiculoRepository):
             self.session.add(vehiculo_model)
 
         self.session.commit()
+        if self.eventos is not None:
+            self.eventos.guardado(TipoEntidad.VEHICULO, vehiculo)
 
     def find_by_id(self, vehiculo_id: str) -> Optional[Vehiculo]:
         """Find a vehicle by ID"""
@@ -83,12 +94,25 @@ class SQLAlchemyVehiculoRepository(VehiculoRepository):
         vehiculo_models = self.session.query(VehiculoModel).filter_by(estado=EstadoVehiculo.DISPONIBLE).all()
         return [self._model_to_entity(model) for model in vehiculo_models]
 
+    def find_by_matriculas(self, matriculas: Iterable[str]) -> Dict[str, Vehiculo]:
+        """Find the vehicles for many normalized plates in one lookup"""
+        pendientes = sorted(set(matriculas))
+        vehiculos: Dict[str, Vehiculo] = {}
+        for start in range(0, len(pendientes), _IN_CHUNK_SIZE):
+            chunk = pendientes[start:start + _IN_CHUNK_SIZE]
+            models = self.session.query(VehiculoModel).filter(VehiculoModel.matricula_normalizada.in_(chunk))
+            for model in models.order_by(VehiculoModel.id):
+                vehiculos.setdefault(model.matricula_normalizada, self._model_to_entity(model))
+        return vehiculos
+
     def delete(self, vehiculo_id: str) -> None:
         """Delete a vehicle by ID"""
         vehiculo_model = self.session.query(VehiculoModel).filter_by(id=vehiculo_id).first()
         if vehiculo_model:
             self.session.delete(vehiculo_model)
             self.session.commit()
+            if self.eventos is not None:
+                self.eventos.eliminado(TipoEntidad.VEHICULO, vehiculo_id)
 
     def _model_to_entity(self, model: VehiculoModel) -> Vehiculo:
         """Convert SQLAlchemy model to domain entity"""
@@ -0,0 +1,55 @@
+"""
+Shared FastAPI dependencies
+"""
+from typing import Generator
+from fastapi import Request
+from sqlalchemy.orm import Session
+
+from src.domain.services.change_events import ChangeEventBus
+from src.domain.services.distance_cache import DistanceCache
+from src.domain.services.geofence_engine import GeofenceEngine
+from src.infrastructure.container import AppContainer
+from src.infrastructure.position_history import PositionHistoryStore
+from src.infrastructure.repositories.carga_repository import InMemoryCargaRepository
+from src.infrastructure.repositories.cmr_repository import InMemoryCMRRepository
+from src.infrastructure.repositories.flota_repository import InMemoryFlotaRepository
+
+def get_container(request: Request) -> AppContainer:
+    """Get the application container created in the lifespan handler"""
+    return request.app.state.container
+
+def get_db_session(request: Request) -> Generator[Session, None, None]:
+    """Get a database session from the container's session factory"""
+    db = get_container(request).session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_flota_repository(request: Request) -> InMemoryFlotaRepository:
+    """Get the application-wide fleet repository"""
+    return get_container(request).flota_repository
+
+def get_carga_repository(request: Request) -> InMemoryCargaRepository:
+    """Get the application-wide load repository"""
+    return get_container(request).carga_repository
+
+def get_cmr_repository(request: Request) -> InMemoryCMRRepository:
+    """Get the application-wide CMR document repository"""
+    return get_container(request).cmr_repository
+
+def get_position_history(request: Request) -> PositionHistoryStore:
+    """Get the application-wide GPS position history"""
+    return get_container(request).position_history
+
+def get_geofence_engine(request: Request) -> GeofenceEngine:
+    """Get the application-wide geofence engine"""
+    return get_container(request).geofence_engine
+
+def get_distance_cache(request: Request) -> DistanceCache:
+    """Get the application-wide origin-destination distance cache"""
+    return get_container(request).distance_cache
+
+def get_change_events(request: Request) -> ChangeEventBus:
+    """Get the application-wide change event bus"""
+    return get_container(request).change_events
@@ -1,16 +1,30 @@
 """
 Main FastAPI application for Elfosoftware Demo Flota Transportistes
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.infrastructure.container import build_container
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create application-scoped resources once and release them on shutdown"""
+    container = build_container()
+    app.state.container = container
+    try:
+        yield
+    finally:
+        await container.aclose()
+
 # Create FastAPI application
 app = FastAPI(
     title="Elfosoftware Demo - Flota Transportistes API",
     description="API REST para gestión de flota de transportistas",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -41,8 +55,20 @@ async def api_root():
 from .routes.flota_routes import router as flota_router
 from .routes.vehiculo_routes import router as vehiculo_router
 from .routes.cmr_routes import router as cmr_router
+from .routes.tracking_routes import router as tracking_router
+from .routes.geocerca_routes import router as geocerca_router
+from .routes.asignacion_routes import router as asignacion_router
+from .routes.ruta_routes import router as ruta_router
+from .routes.evento_routes import router as evento_router
+from .routes.carga_routes import router as carga_router
 
 # Include routers
 app.include_router(flota_router)
 app.include_router(vehiculo_router)
 app.include_router(cmr_router)
+app.include_router(tracking_router)
+app.include_router(geocerca_router)
+app.include_router(asignacion_router)
+app.include_router(ruta_router)
+app.include_router(evento_router)
+app.include_router(carga_router)
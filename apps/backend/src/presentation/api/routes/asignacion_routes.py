@@ -0,0 +1,43 @@
+"""
+API routes for assigning pending loads to vehicles
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
+
+# Domain imports
+from src.domain.entities.asignacion import PlanAsignacion
+from src.domain.services.assignment_optimizer import OptimizadorAsignacion
+
+# Application imports
+from src.application.use_cases.asignacion_use_cases import AsignarCargasUseCase
+
+# Infrastructure imports
+from src.infrastructure.position_history import PositionHistoryStore
+from src.infrastructure.repositories.carga_repository import InMemoryCargaRepository
+from src.infrastructure.repositories.vehiculo_repository import SQLAlchemyVehiculoRepository
+
+# Presentation imports
+from src.presentation.api.dependencies import get_carga_repository, get_db_session, get_position_history
+
+# Pydantic models for API
+class OptimizarAsignacionRequest(BaseModel):
+    carga_ids: Optional[List[str]] = Field(None, max_length=5000,
+                                           description="Stored loads to assign; all pending ones if not given")
+    max_cargas_por_vehiculo: int = Field(1, ge=1, le=50, description="Loads a vehicle may pick up")
+    distancia_max_km: Optional[float] = Field(None, gt=0, description="Longest allowed vehicle-to-origin distance")
+
+# Create router
+router = APIRouter(prefix="/asignaciones", tags=["asignaciones"])
+
+@router.post("/optimizar", response_model=PlanAsignacion)
+def optimizar_asignacion(
+    request: OptimizarAsignacionRequest,
+    db = Depends(get_db_session),
+    store: PositionHistoryStore = Depends(get_position_history),
+    cargas: InMemoryCargaRepository = Depends(get_carga_repository)
+):
+    """Propose which available vehicle picks up each pending load, minimizing the total distance"""
+    optimizador = OptimizadorAsignacion(request.max_cargas_por_vehiculo, request.distancia_max_km)
+    use_case = AsignarCargasUseCase(cargas, SQLAlchemyVehiculoRepository(db), store, optimizador)
+    return use_case.execute(request.carga_ids)
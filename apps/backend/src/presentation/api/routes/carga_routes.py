@@ -0,0 +1,131 @@
+"""
+API routes for load management
+"""
+from fastapi import APIRouter, HTTPException, Depends
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+# Domain imports
+from src.domain.entities.carga import Carga, EstadoCarga, TipoCarga
+
+# Application imports
+from src.application.use_cases.carga_use_cases import (
+    CrearCargaUseCase,
+    ObtenerCargaUseCase,
+    ListarCargasUseCase,
+    CambiarEstadoCargaUseCase,
+    AsignarVehiculoCargaUseCase,
+    EliminarCargaUseCase
+)
+
+# Infrastructure imports
+from src.infrastructure.repositories.carga_repository import InMemoryCargaRepository
+
+# Presentation imports
+from src.presentation.api.dependencies import get_carga_repository
+
+# Dependency injection
+def get_crear_carga_use_case(repo: InMemoryCargaRepository = Depends(get_carga_repository)) -> CrearCargaUseCase:
+    return CrearCargaUseCase(repo)
+
+def get_obtener_carga_use_case(repo: InMemoryCargaRepository = Depends(get_carga_repository)) -> ObtenerCargaUseCase:
+    return ObtenerCargaUseCase(repo)
+
+def get_listar_cargas_use_case(repo: InMemoryCargaRepository = Depends(get_carga_repository)) -> ListarCargasUseCase:
+    return ListarCargasUseCase(repo)
+
+def get_cambiar_estado_carga_use_case(repo: InMemoryCargaRepository = Depends(get_carga_repository)) -> CambiarEstadoCargaUseCase:
+    return CambiarEstadoCargaUseCase(repo)
+
+def get_asignar_vehiculo_carga_use_case(repo: InMemoryCargaRepository = Depends(get_carga_repository)) -> AsignarVehiculoCargaUseCase:
+    return AsignarVehiculoCargaUseCase(repo)
+
+def get_eliminar_carga_use_case(repo: InMemoryCargaRepository = Depends(get_carga_repository)) -> EliminarCargaUseCase:
+    return EliminarCargaUseCase(repo)
+
+# Pydantic models for API
+class CrearCargaRequest(BaseModel):
+    descripcion: str = Field(..., description="Load description", min_length=1)
+    tipo: TipoCarga = Field(..., description="Load type")
+    peso: float = Field(..., description="Load weight in kg", gt=0)
+    origen: str = Field(..., description="Origin location, e.g. \"lat,lng\"", min_length=1)
+    destino: str = Field(..., description="Destination location, e.g. \"lat,lng\"", min_length=1)
+    volumen: Optional[float] = Field(None, description="Load volume in m³", gt=0)
+    valor_declarado: Optional[float] = Field(None, description="Declared value in currency", ge=0)
+    entrega_desde: Optional[datetime] = Field(None, description="Start of the delivery window")
+    entrega_hasta: Optional[datetime] = Field(None, description="End of the delivery window")
+
+class CambiarEstadoCargaRequest(BaseModel):
+    estado: EstadoCarga = Field(..., description="New load status")
+
+class AsignarVehiculoCargaRequest(BaseModel):
+    vehiculo_id: str = Field(..., description="Vehicle ID to assign the load to")
+
+# Router
+router = APIRouter(prefix="/api/v1/cargas", tags=["cargas"])
+
+@router.post("/", response_model=Carga, status_code=201)
+async def crear_carga(
+    request: CrearCargaRequest,
+    use_case: CrearCargaUseCase = Depends(get_crear_carga_use_case)
+):
+    """Register a new pending load"""
+    try:
+        return use_case.execute(**request.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@router.get("/{carga_id}", response_model=Carga)
+async def obtener_carga(
+    carga_id: str,
+    use_case: ObtenerCargaUseCase = Depends(get_obtener_carga_use_case)
+):
+    """Get a load by ID"""
+    carga = use_case.execute(carga_id)
+    if not carga:
+        raise HTTPException(status_code=404, detail="Load not found")
+    return carga
+
+@router.get("/", response_model=List[Carga])
+async def listar_cargas(
+    estado: Optional[EstadoCarga] = None,
+    vehiculo_id: Optional[str] = None,
+    flota_id: Optional[str] = None,
+    use_case: ListarCargasUseCase = Depends(get_listar_cargas_use_case)
+):
+    """List loads with optional filters"""
+    return use_case.execute(estado=estado, vehiculo_id=vehiculo_id, flota_id=flota_id)
+
+@router.patch("/{carga_id}/estado", response_model=Carga)
+async def cambiar_estado_carga(
+    carga_id: str,
+    request: CambiarEstadoCargaRequest,
+    use_case: CambiarEstadoCargaUseCase = Depends(get_cambiar_estado_carga_use_case)
+):
+    """Change load status"""
+    carga = use_case.execute(carga_id, request.estado)
+    if not carga:
+        raise HTTPException(status_code=404, detail="Load not found")
+    return carga
+
+@router.patch("/{carga_id}/vehiculo", response_model=Carga)
+async def asignar_vehiculo_carga(
+    carga_id: str,
+    request: AsignarVehiculoCargaRequest,
+    use_case: AsignarVehiculoCargaUseCase = Depends(get_asignar_vehiculo_carga_use_case)
+):
+    """Assign a load to a vehicle"""
+    carga = use_case.execute(carga_id, request.vehiculo_id)
+    if not carga:
+        raise HTTPException(status_code=404, detail="Load not found")
+    return carga
+
+@router.delete("/{carga_id}", status_code=204)
+async def eliminar_carga(
+    carga_id: str,
+    use_case: EliminarCargaUseCase = Depends(get_eliminar_carga_use_case)
+):
+    """Delete a load"""
+    if not use_case.execute(carga_id):
+        raise HTTPException(status_code=404, detail="Load not found")
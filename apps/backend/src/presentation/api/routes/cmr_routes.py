@@ -1,42 +1,155 @@
 """
 CMR document processing API routes
 """
-from typing import Dict, Any
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from fastapi.responses import JSONResponse
+import json
+import zipfile
+from datetime import datetime
+from typing import Dict, Any, AsyncIterator, BinaryIO, Iterator, List, Optional, Tuple
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 
-from application.use_cases.cmr_use_cases import ProcesarCMRUseCase, ValidarCMRUseCase
-from domain.services.cmr_normalizer import CMRNormalizer, MockCMRExtractor
-from domain.entities.cmr_document import CMRDocument
+from src.application.use_cases.cmr_use_cases import (
+    MAX_BATCH_SIZE,
+    MAX_DOCUMENT_SIZE,
+    CMRIncompleteError,
+    ConciliarCMRUseCase,
+    ListarCMRUseCase,
+    ObtenerCMRUseCase,
+    ProcesarCMRUseCase,
+    ProcesarLoteCMRUseCase,
+    ValidarCMRUseCase
+)
+from src.domain.services.cmr_normalizer import DEFAULT_MIN_CONFIDENCE, CMRNormalizer
+from src.domain.entities.cmr_document import CMRDocument
+from src.domain.repositories.interfaces import CMRRepository
+from src.domain.services.matricula_resolver import MatriculaResolver
+from src.infrastructure.container import AppContainer
+from src.infrastructure.job_queue import JobFailedError, JobQueue, QueueFullError
+from src.infrastructure.repositories.vehiculo_repository import SQLAlchemyVehiculoRepository
+from src.presentation.api.dependencies import get_cmr_repository, get_container, get_db_session
+from src.presentation.api.uploads import LimitedUploadRoute, max_upload_size
 
 # Dependency injection
-def get_cmr_normalizer() -> CMRNormalizer:
-    """Get CMR normalizer service"""
-    extractor = MockCMRExtractor()
-    return CMRNormalizer(extractor)
+def get_cmr_normalizer(container: AppContainer = Depends(get_container)) -> CMRNormalizer:
+    """Get the application-wide CMR normalizer service"""
+    return container.cmr_normalizer
 
-def get_procesar_cmr_use_case(normalizer: CMRNormalizer = Depends(get_cmr_normalizer)) -> ProcesarCMRUseCase:
+def get_procesar_cmr_use_case(
+    normalizer: CMRNormalizer = Depends(get_cmr_normalizer),
+    container: AppContainer = Depends(get_container),
+    early_exit: bool = Query(False, description="Reject documents with missing or low-confidence mandatory fields early"),
+    min_confidence: float = Query(DEFAULT_MIN_CONFIDENCE, ge=0.0, le=1.0, description="Minimum confidence for mandatory fields")
+) -> ProcesarCMRUseCase:
     """Get process CMR use case"""
-    return ProcesarCMRUseCase(normalizer)
+    return ProcesarCMRUseCase(
+        normalizer,
+        cache=container.cmr_cache,
+        early_exit=early_exit,
+        min_confidence=min_confidence
+    )
 
 def get_validar_cmr_use_case() -> ValidarCMRUseCase:
     """Get validate CMR use case"""
     return ValidarCMRUseCase()
 
+def get_procesar_lote_cmr_use_case(
+    normalizer: CMRNormalizer = Depends(get_cmr_normalizer),
+    container: AppContainer = Depends(get_container)
+) -> ProcesarLoteCMRUseCase:
+    """Get batch process CMR use case"""
+    # Keep every worker busy while the next document is being read
+    return ProcesarLoteCMRUseCase(
+        container.cmr_executor,
+        max_pending=2 * container.cmr_workers,
+        cache=container.cmr_cache,
+        version=normalizer.version
+    )
+
+def get_obtener_cmr_use_case(repo: CMRRepository = Depends(get_cmr_repository)) -> ObtenerCMRUseCase:
+    """Get stored CMR lookup use case"""
+    return ObtenerCMRUseCase(repo)
+
+def get_listar_cmr_use_case(repo: CMRRepository = Depends(get_cmr_repository)) -> ListarCMRUseCase:
+    """Get stored CMR listing use case"""
+    return ListarCMRUseCase(repo)
+
+def get_conciliar_cmr_use_case(
+    repo: CMRRepository = Depends(get_cmr_repository),
+    db = Depends(get_db_session),
+    container: AppContainer = Depends(get_container)
+) -> ConciliarCMRUseCase:
+    """Get CMR to vehicle reconciliation use case"""
+    # The unresolved-plate cache outlives the request, the vehicle session does not
+    resolver = MatriculaResolver(SQLAlchemyVehiculoRepository(db), container.matricula_cache)
+    return ConciliarCMRUseCase(repo, resolver)
+
+def get_cmr_job_queue(container: AppContainer = Depends(get_container)) -> JobQueue:
+    """Get the background CMR job queue"""
+    return container.cmr_jobs
+
+def _read_upload(upload: BinaryIO) -> bytes:
+    """Read a spooled upload, one byte past the limit so oversized ones are rejected"""
+    upload.seek(0)
+    return upload.read(MAX_DOCUMENT_SIZE + 1)
+
+def _iter_zip_documents(archive: zipfile.ZipFile) -> Iterator[Tuple[str, bytes]]:
+    """Read the PDF members of an archive one at a time"""
+    with archive:
+        for info in archive.infolist():
+            if info.is_dir() or not info.filename.lower().endswith('.pdf'):
+                continue
+            with archive.open(info) as member:
+                # Read one byte past the limit so oversized members are
+                # rejected by the use case without inflating them fully
+                yield info.filename, member.read(MAX_DOCUMENT_SIZE + 1)
+
+async def _store_result(repository: CMRRepository, result: Dict[str, Any]) -> None:
+    """Store the document of a valid batch result, off the event loop"""
+    if result["status"] == "ok":
+        await run_in_threadpool(repository.save, CMRDocument.model_validate(result["document"]))
+
+async def _process_job(use_case: ProcesarLoteCMRUseCase, repository: CMRRepository,
+                       filename: str, document_bytes: bytes) -> Dict[str, Any]:
+    """Process a queued document as a one-document batch; failures mark the job as failed"""
+    result = [result async for result in use_case.execute([(filename, document_bytes)])][0]
+    del result["index"]
+    await _store_result(repository, result)
+    if result["status"] == "error":
+        raise JobFailedError(result["error"], result)
+    if result["status"] == "invalid":
+        raise JobFailedError("Invalid CMR document data extracted", result)
+    return result
+
+# Pydantic models for API
+class CMRDocumentPage(BaseModel):
+    """One page of stored CMR documents"""
+    items: List[CMRDocument] = Field(..., description="Documents in this page, oldest first")
+    total: int = Field(..., description="Documents matching the filters")
+    offset: int = Field(..., description="Position of the first item")
+    limit: int = Field(..., description="Maximum items per page")
+
 # Create router
-router = APIRouter(prefix="/documents", tags=["documents"])
+router = APIRouter(prefix="/documents", tags=["documents"], route_class=LimitedUploadRoute)
+
+_TOO_LARGE_DETAIL = f"Document size exceeds maximum allowed size of {MAX_DOCUMENT_SIZE} bytes"
 
 @router.post("/cmr/extract", response_model=CMRDocument)
+@max_upload_size(MAX_DOCUMENT_SIZE, detail=_TOO_LARGE_DETAIL)
 async def extract_cmr_data(
     file: UploadFile = File(...),
     use_case: ProcesarCMRUseCase = Depends(get_procesar_cmr_use_case),
-    validar_use_case: ValidarCMRUseCase = Depends(get_validar_cmr_use_case)
+    validar_use_case: ValidarCMRUseCase = Depends(get_validar_cmr_use_case),
+    repository: CMRRepository = Depends(get_cmr_repository)
 ) -> CMRDocument:
     """
     Extract and normalize data from CMR document
 
     - **file**: PDF file containing the CMR document
-    - **returns**: Normalized CMR document data
+    - **early_exit**: Reject the document with 422 and the per-field results
+      as soon as a mandatory field is missing or below **min_confidence**
+    - **returns**: Normalized CMR document data, also stored for later lookups
     """
     try:
         # Validate file type
@@ -46,17 +159,15 @@ async def extract_cmr_data(
                 detail="Only PDF files are supported"
             )
 
-        # Read file content
-        file_content = await file.read()
-
-        if not file_content:
+        # The upload is already spooled; check its size without reading it
+        if file.size == 0:
             raise HTTPException(
                 status_code=400,
                 detail="Empty file provided"
             )
 
-        # Process document
-        cmr_document = use_case.execute(file_content)
+        # Process the spooled file off the event loop
+        cmr_document = await run_in_threadpool(use_case.execute_file, file.file)
 
         # Validate result
         if not validar_use_case.execute(cmr_document):
@@ -65,13 +176,122 @@ async def extract_cmr_data(
                 detail="Invalid CMR document data extracted"
             )
 
+        repository.save(cmr_document)
         return cmr_document
 
+    except HTTPException:
+        raise
+    except CMRIncompleteError as e:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "message": "Incomplete CMR document",
+                **e.result.model_dump(mode="json", exclude={"document"})
+            }
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing document: {str(e)}")
 
+@router.post("/cmr/extract/batch")
+@max_upload_size(MAX_BATCH_SIZE)
+async def extract_cmr_batch(
+    files: List[UploadFile] = File(...),
+    use_case: ProcesarLoteCMRUseCase = Depends(get_procesar_lote_cmr_use_case),
+    repository: CMRRepository = Depends(get_cmr_repository)
+) -> StreamingResponse:
+    """
+    Extract and normalize a batch of CMR documents in parallel
+
+    - **files**: PDF files and/or zip archives of PDF files
+    - **returns**: NDJSON stream with one result per document, in completion order;
+      documents with status "ok" are stored for later lookups
+    """
+    # Uploads stay spooled and are read one document at a time while streaming
+    documents: List[Tuple[str, BinaryIO]] = []
+    archives: List[zipfile.ZipFile] = []
+
+    for file in files:
+        filename = file.filename or ""
+
+        if filename.lower().endswith('.zip'):
+            try:
+                archives.append(await run_in_threadpool(zipfile.ZipFile, file.file))
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail=f"Invalid zip archive: {filename}")
+        elif filename.lower().endswith('.pdf'):
+            documents.append((filename, file.file))
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Only PDF files and zip archives are supported: {filename}"
+            )
+
+    def iter_documents() -> Iterator[Tuple[str, bytes]]:
+        for filename, upload in documents:
+            yield filename, _read_upload(upload)
+        for archive in archives:
+            yield from _iter_zip_documents(archive)
+
+    async def stream() -> AsyncIterator[str]:
+        async for result in use_case.execute(iter_documents()):
+            await _store_result(repository, result)
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@router.post("/cmr/jobs", status_code=202)
+@max_upload_size(MAX_DOCUMENT_SIZE, detail=_TOO_LARGE_DETAIL)
+async def submit_cmr_job(
+    file: UploadFile = File(...),
+    queue: JobQueue = Depends(get_cmr_job_queue),
+    use_case: ProcesarLoteCMRUseCase = Depends(get_procesar_lote_cmr_use_case),
+    repository: CMRRepository = Depends(get_cmr_repository)
+) -> JSONResponse:
+    """
+    Queue a CMR document for background extraction
+
+    - **file**: PDF file containing the CMR document
+    - **returns**: Job ID to poll at ``/documents/cmr/jobs/{job_id}``; 503 when the queue is full.
+      Jobs share the batch path: cached results are reused and valid documents
+      are stored; a document that fails or is invalid ends the job with status "error"
+    """
+    filename = file.filename or ""
+    if not filename:
+        raise HTTPException(status_code=422, detail="Uploaded file has no filename")
+    if not filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are supported")
+
+    file_content = await file.read()
+
+    if not file_content:
+        raise HTTPException(status_code=400, detail="Empty file provided")
+
+    try:
+        job = queue.submit(_process_job, use_case, repository, filename, file_content, filename=filename)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job.id, "status": job.status.value},
+        headers={"Location": f"/documents/cmr/jobs/{job.id}"}
+    )
+
+@router.get("/cmr/jobs/{job_id}")
+async def get_cmr_job(job_id: str, queue: JobQueue = Depends(get_cmr_job_queue)) -> Dict[str, Any]:
+    """
+    Get the status of a CMR extraction job
+
+    - **job_id**: ID returned when the job was submitted
+    - **returns**: Job status, with the extraction result once completed
+    """
+    job = queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
 @router.get("/cmr/health")
 async def cmr_health_check() -> Dict[str, Any]:
     """Health check for CMR processing service"""
@@ -86,3 +306,50 @@ async def cmr_health_check() -> Dict[str, Any]:
             "validation"
         ]
     }
+
+@router.get("/cmr", response_model=CMRDocumentPage)
+async def list_cmr_documents(
+    matricula: Optional[str] = Query(None, description="Vehicle license plate"),
+    desde: Optional[datetime] = Query(None, description="Issued on or after"),
+    hasta: Optional[datetime] = Query(None, description="Issued before"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    use_case: ListarCMRUseCase = Depends(get_listar_cmr_use_case)
+) -> CMRDocumentPage:
+    """
+    List stored CMR documents, oldest first
+
+    - **matricula**: Only documents for this plate
+    - **desde** / **hasta**: Issue date range, start inclusive and end exclusive
+    """
+    try:
+        documentos, total = use_case.execute(matricula, desde, hasta, offset=offset, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return CMRDocumentPage(items=documentos, total=total, offset=offset, limit=limit)
+
+@router.post("/cmr/conciliacion")
+async def reconcile_cmr_documents(
+    matricula: Optional[str] = Query(None, description="Vehicle license plate"),
+    desde: Optional[datetime] = Query(None, description="Issued on or after"),
+    hasta: Optional[datetime] = Query(None, description="Issued before"),
+    use_case: ConciliarCMRUseCase = Depends(get_conciliar_cmr_use_case)
+) -> Dict[str, Any]:
+    """
+    Link stored CMR documents to fleet vehicles by plate
+
+    All plates in the selection are resolved with one vehicle lookup.
+    - **returns**: Documents checked and linked, and plates without a vehicle
+    """
+    return await run_in_threadpool(use_case.execute, matricula, desde, hasta)
+
+@router.get("/cmr/{numero_cmr}", response_model=CMRDocument)
+async def get_cmr_document(
+    numero_cmr: str,
+    use_case: ObtenerCMRUseCase = Depends(get_obtener_cmr_use_case)
+) -> CMRDocument:
+    """Get a stored CMR document by number"""
+    documento = use_case.execute(numero_cmr)
+    if documento is None:
+        raise HTTPException(status_code=404, detail="CMR document not found")
+    return documento
@@ -0,0 +1,118 @@
+"""
+API routes for following changes to vehicles, loads and fleets
+"""
+import asyncio
+import json
+from typing import AsyncIterator, FrozenSet, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+# Domain imports
+from src.domain.entities.evento_cambio import EventoCambio, TipoEntidad
+from src.domain.services.change_events import ChangeEventBus
+
+# Application imports
+from src.application.use_cases.evento_use_cases import ConsultarEventosCambioUseCase
+
+# Presentation imports
+from src.presentation.api.dependencies import get_change_events
+
+# An idle stream sends a comment this often, so proxies do not close it
+KEEPALIVE_SECONDS = 15.0
+# Events read from the log per iteration of a stream
+_STREAM_BATCH = 500
+
+# Dependency injection
+def get_consultar_eventos_cambio_use_case(
+    bus: ChangeEventBus = Depends(get_change_events)
+) -> ConsultarEventosCambioUseCase:
+    return ConsultarEventosCambioUseCase(bus)
+
+# Create router
+router = APIRouter(prefix="/eventos", tags=["eventos"])
+
+@router.get("/", response_model=List[EventoCambio])
+async def consultar_eventos(
+    despues: int = Query(0, ge=0, description="Only events with a higher sequence number"),
+    limit: int = Query(1000, ge=1, le=10000),
+    entidad: Optional[List[TipoEntidad]] = Query(None, description="Only events about these entity kinds"),
+    use_case: ConsultarEventosCambioUseCase = Depends(get_consultar_eventos_cambio_use_case)
+):
+    """Get changes oldest first; pass the last seen 'secuencia' to poll for new ones"""
+    try:
+        return use_case.execute(despues, limit, entidad)
+    except LookupError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+
+def _sse(evento: str, data: str, event_id: Optional[int] = None) -> str:
+    lines = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{lines}event: {evento}\ndata: {data}\n\n"
+
+async def _stream(bus: ChangeEventBus, despues: int, entidades: Optional[FrozenSet[TipoEntidad]],
+                  limit: Optional[int]) -> AsyncIterator[str]:
+    loop = asyncio.get_running_loop()
+    nuevo = asyncio.Event()
+
+    def avisar(_evento: EventoCambio) -> None:
+        # Runs in the publishing thread, which may not be the event loop's
+        try:
+            loop.call_soon_threadsafe(nuevo.set)
+        except RuntimeError:
+            pass  # loop already closed
+
+    bus.suscribir(avisar)
+    try:
+        enviados = 0
+        while True:
+            nuevo.clear()
+            if bus.perdidos(despues):
+                yield _sse("desfase", json.dumps({"despues": despues}))
+                if despues > bus.ultima_secuencia:
+                    # Offset from before a restart: replay this process's log
+                    despues = 0
+            eventos = bus.eventos(despues, _STREAM_BATCH)
+            for evento in eventos:
+                despues = evento.secuencia
+                if entidades is not None and evento.entidad not in entidades:
+                    continue
+                yield _sse("cambio", evento.model_dump_json(), evento.secuencia)
+                enviados += 1
+                if limit is not None and enviados >= limit:
+                    return
+            if eventos:
+                continue
+            try:
+                await asyncio.wait_for(nuevo.wait(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+    finally:
+        bus.cancelar(avisar)
+
+@router.get("/stream")
+async def stream_eventos(
+    despues: Optional[int] = Query(None, ge=0, description="Resume after this sequence number"),
+    entidad: Optional[List[TipoEntidad]] = Query(None, description="Only events about these entity kinds"),
+    limit: Optional[int] = Query(None, ge=1, description="Close the stream after this many events"),
+    last_event_id: Optional[str] = Header(None),
+    bus: ChangeEventBus = Depends(get_change_events)
+):
+    """
+    Stream changes as Server-Sent Events
+
+    Each event's id is its sequence number, so a reconnecting EventSource
+    resumes through Last-Event-ID. Without it or 'despues' the stream
+    starts with the next change. A 'desfase' event means changes after the
+    offset were already dropped: reload the collections, then keep reading.
+    """
+    if last_event_id is not None:
+        try:
+            despues = int(last_event_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Last-Event-ID debe ser un número de secuencia")
+    if despues is None:
+        despues = bus.ultima_secuencia
+    return StreamingResponse(
+        _stream(bus, despues, frozenset(entidad) if entidad else None, limit),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -21,10 +21,10 @@ from src.application.use_cases.flota_use_cases import (
 # Infrastructure imports
 from src.infrastructure.repositories.flota_repository import InMemoryFlotaRepository
 
-# Dependency injection
-def get_flota_repository() -> InMemoryFlotaRepository:
-    return InMemoryFlotaRepository()
+# Presentation imports
+from src.presentation.api.dependencies import get_flota_repository
 
+# Dependency injection
 def get_crear_flota_use_case(repo: InMemoryFlotaRepository = Depends(get_flota_repository)) -> CrearFlotaUseCase:
     return CrearFlotaUseCase(repo)
 
@@ -34,6 +34,15 @@ def get_obtener_flota_use_case(repo: InMemoryFlotaRepository = Depends(get_flota
 def get_listar_flotas_use_case(repo: InMemoryFlotaRepository = Depends(get_flota_repository)) -> ListarFlotasUseCase:
     return ListarFlotasUseCase(repo)
 
+def get_agregar_transportista_use_case(repo: InMemoryFlotaRepository = Depends(get_flota_repository)) -> AgregarTransportistaAFlotaUseCase:
+    return AgregarTransportistaAFlotaUseCase(repo)
+
+def get_agregar_vehiculo_use_case(repo: InMemoryFlotaRepository = Depends(get_flota_repository)) -> AgregarVehiculoAFlotaUseCase:
+    return AgregarVehiculoAFlotaUseCase(repo)
+
+def get_estadisticas_flota_use_case(repo: InMemoryFlotaRepository = Depends(get_flota_repository)) -> ObtenerEstadisticasFlotaUseCase:
+    return ObtenerEstadisticasFlotaUseCase(repo)
+
 # Pydantic models for API
 class CrearFlotaRequest(BaseModel):
     nombre: str
@@ -79,7 +88,7 @@ async def listar_flotas(
 async def agregar_transportista_a_flota(
     flota_id: str,
     request: AgregarTransportistaRequest,
-    use_case: AgregarTransportistaAFlotaUseCase = Depends(lambda: AgregarTransportistaAFlotaUseCase(InMemoryFlotaRepository()))
+    use_case: AgregarTransportistaAFlotaUseCase = Depends(get_agregar_transportista_use_case)
 ):
     """Add a transporter to a fleet"""
     success = use_case.execute(flota_id, request.transportista_id)
@@ -91,7 +100,7 @@ async def agregar_transportista_a_flota(
 async def agregar_vehiculo_a_flota(
     flota_id: str,
     request: AgregarVehiculoRequest,
-    use_case: AgregarVehiculoAFlotaUseCase = Depends(lambda: AgregarVehiculoAFlotaUseCase(InMemoryFlotaRepository()))
+    use_case: AgregarVehiculoAFlotaUseCase = Depends(get_agregar_vehiculo_use_case)
 ):
     """Add a vehicle to a fleet"""
     success = use_case.execute(flota_id, request.vehiculo_id)
@@ -102,7 +111,7 @@ async def agregar_vehiculo_a_flota(
 @router.get("/{flota_id}/estadisticas")
 async def obtener_estadisticas_flota(
     flota_id: str,
-    use_case: ObtenerEstadisticasFlotaUseCase = Depends(lambda: ObtenerEstadisticasFlotaUseCase(InMemoryFlotaRepository()))
+    use_case: ObtenerEstadisticasFlotaUseCase = Depends(get_estadisticas_flota_use_case)
 ):
     """Get fleet statistics"""
     stats = use_case.execute(flota_id)
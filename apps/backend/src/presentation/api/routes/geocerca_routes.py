@@ -0,0 +1,118 @@
+"""
+API routes for geofences around depots and customer sites
+"""
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+
+# Domain imports
+from src.domain.entities.geocerca import EventoGeocerca, Geocerca
+from src.domain.services.distance_cache import DistanceCache
+from src.domain.services.geofence_engine import GeofenceEngine
+
+# Application imports
+from src.application.use_cases.geocerca_use_cases import (
+    ConsultarEventosGeocercaUseCase,
+    EliminarGeocercaUseCase,
+    ListarGeocercasUseCase,
+    ObtenerGeocercaUseCase,
+    PrecalentarDistanciasDepositosUseCase,
+    RegistrarGeocercaUseCase
+)
+
+# Presentation imports
+from src.presentation.api.dependencies import get_distance_cache, get_geofence_engine
+
+# Dependency injection
+def get_registrar_geocerca_use_case(engine: GeofenceEngine = Depends(get_geofence_engine)) -> RegistrarGeocercaUseCase:
+    return RegistrarGeocercaUseCase(engine)
+
+def get_obtener_geocerca_use_case(engine: GeofenceEngine = Depends(get_geofence_engine)) -> ObtenerGeocercaUseCase:
+    return ObtenerGeocercaUseCase(engine)
+
+def get_listar_geocercas_use_case(engine: GeofenceEngine = Depends(get_geofence_engine)) -> ListarGeocercasUseCase:
+    return ListarGeocercasUseCase(engine)
+
+def get_eliminar_geocerca_use_case(engine: GeofenceEngine = Depends(get_geofence_engine)) -> EliminarGeocercaUseCase:
+    return EliminarGeocercaUseCase(engine)
+
+def get_consultar_eventos_use_case(
+    engine: GeofenceEngine = Depends(get_geofence_engine)
+) -> ConsultarEventosGeocercaUseCase:
+    return ConsultarEventosGeocercaUseCase(engine)
+
+def get_precalentar_distancias_use_case(
+    engine: GeofenceEngine = Depends(get_geofence_engine),
+    cache: DistanceCache = Depends(get_distance_cache)
+) -> PrecalentarDistanciasDepositosUseCase:
+    return PrecalentarDistanciasDepositosUseCase(engine, cache)
+
+# Create router
+router = APIRouter(prefix="/geocercas", tags=["geocercas"])
+
+@router.put("/{geocerca_id}", response_model=Geocerca)
+async def registrar_geocerca(
+    geocerca_id: str,
+    geocerca: Geocerca,
+    use_case: RegistrarGeocercaUseCase = Depends(get_registrar_geocerca_use_case)
+):
+    """Create or replace a polygon or circle geofence"""
+    if geocerca.id != geocerca_id:
+        raise HTTPException(status_code=400, detail="El ID de la geocerca no coincide con la URL")
+    try:
+        return use_case.execute(geocerca)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/", response_model=List[Geocerca])
+async def listar_geocercas(
+    propietario_id: Optional[str] = Query(None, description="Only geofences of this depot or customer"),
+    use_case: ListarGeocercasUseCase = Depends(get_listar_geocercas_use_case)
+):
+    """List geofences"""
+    return use_case.execute(propietario_id)
+
+@router.get("/eventos", response_model=List[EventoGeocerca])
+async def consultar_eventos(
+    despues: int = Query(0, ge=0, description="Only events with a higher sequence number"),
+    limit: int = Query(1000, ge=1, le=10000),
+    use_case: ConsultarEventosGeocercaUseCase = Depends(get_consultar_eventos_use_case)
+):
+    """Get entry and exit events, oldest first; pass the last seen 'secuencia' to poll for new ones"""
+    try:
+        return use_case.execute(despues, limit)
+    except LookupError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+
+@router.post("/depositos/distancias")
+async def precalentar_distancias(
+    adicionales: List[Tuple[float, float]] = Body(default_factory=list, max_length=5000,
+                                                  description="Extra (latitud, longitud) points"),
+    use_case: PrecalentarDistanciasDepositosUseCase = Depends(get_precalentar_distancias_use_case)
+):
+    """Precompute the distances between all depots (and extra points) for route costing"""
+    try:
+        pares = await run_in_threadpool(use_case.execute, adicionales)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"pares": pares}
+
+@router.get("/{geocerca_id}", response_model=Geocerca)
+async def obtener_geocerca(
+    geocerca_id: str,
+    use_case: ObtenerGeocercaUseCase = Depends(get_obtener_geocerca_use_case)
+):
+    """Get a geofence by ID"""
+    geocerca = use_case.execute(geocerca_id)
+    if geocerca is None:
+        raise HTTPException(status_code=404, detail="Geocerca no encontrada")
+    return geocerca
+
+@router.delete("/{geocerca_id}", status_code=204)
+async def eliminar_geocerca(
+    geocerca_id: str,
+    use_case: EliminarGeocercaUseCase = Depends(get_eliminar_geocerca_use_case)
+):
+    """Delete a geofence"""
+    if not use_case.execute(geocerca_id):
+        raise HTTPException(status_code=404, detail="Geocerca no encontrada")
@@ -0,0 +1,48 @@
+"""
+API routes for sequencing vehicle routes
+"""
+from datetime import datetime, timezone
+from typing import List, Optional
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
+
+# Domain imports
+from src.domain.entities.carga import Carga
+from src.domain.entities.ruta_reparto import PlanRutas
+from src.domain.services.distance_cache import DistanceCache
+from src.domain.services.route_sequencer import SecuenciadorRutas
+
+# Application imports
+from src.application.use_cases.ruta_use_cases import SecuenciarRutasUseCase
+
+# Infrastructure imports
+from src.infrastructure.position_history import PositionHistoryStore
+from src.infrastructure.repositories.vehiculo_repository import SQLAlchemyVehiculoRepository
+
+# Presentation imports
+from src.presentation.api.dependencies import get_db_session, get_distance_cache, get_position_history
+
+# Pydantic models for API
+class SecuenciarRutasRequest(BaseModel):
+    cargas: List[Carga] = Field(..., max_length=20000, description="Loads, grouped into routes by their vehiculo_id")
+    salida: Optional[datetime] = Field(None, description="Departure time, UTC if naive; now if not given")
+    velocidad_media_kmh: float = Field(60.0, gt=0, le=150, description="Average driving speed")
+    tiempo_servicio_min: float = Field(15.0, ge=0, description="Time spent at every stop")
+    presupuesto_segundos: float = Field(5.0, gt=0, le=60, description="Time allowed for improving the routes")
+    volver_al_origen: bool = Field(False, description="Whether routes end back at the vehicle's position")
+
+# Create router
+router = APIRouter(prefix="/rutas", tags=["rutas"])
+
+@router.post("/secuenciar", response_model=PlanRutas)
+def secuenciar_rutas(
+    request: SecuenciarRutasRequest,
+    db = Depends(get_db_session),
+    store: PositionHistoryStore = Depends(get_position_history),
+    distancias: DistanceCache = Depends(get_distance_cache)
+):
+    """Order the pickups and deliveries of each vehicle, respecting capacity and delivery windows"""
+    secuenciador = SecuenciadorRutas(request.velocidad_media_kmh, request.tiempo_servicio_min,
+                                     request.presupuesto_segundos, request.volver_al_origen, distancias)
+    use_case = SecuenciarRutasUseCase(SQLAlchemyVehiculoRepository(db), store, secuenciador)
+    return use_case.execute(request.cargas, request.salida or datetime.now(timezone.utc))
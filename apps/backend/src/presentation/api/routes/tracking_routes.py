@@ -0,0 +1,128 @@
+"""
+API routes for GPS position tracking
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+
+# Domain imports
+from src.domain.entities.posicion import PosicionGPS, ResumenRecorrido, TipoSeguimiento
+from src.domain.services.geofence_engine import GeofenceEngine
+
+# Application imports
+from src.application.use_cases.tracking_use_cases import (
+    AnalizarRecorridoUseCase,
+    ConsultarPosicionesUseCase,
+    ContrastarKilometrajeUseCase,
+    RegistrarPosicionesUseCase
+)
+
+# Infrastructure imports
+from src.infrastructure.position_history import PositionHistoryStore
+from src.infrastructure.repositories.vehiculo_repository import SQLAlchemyVehiculoRepository
+
+# Presentation imports
+from src.presentation.api.dependencies import get_db_session, get_geofence_engine, get_position_history
+
+# Dependency injection
+def get_registrar_posiciones_use_case(
+    store: PositionHistoryStore = Depends(get_position_history),
+    geocercas: GeofenceEngine = Depends(get_geofence_engine)
+) -> RegistrarPosicionesUseCase:
+    return RegistrarPosicionesUseCase(store, geocercas)
+
+def get_consultar_posiciones_use_case(
+    store: PositionHistoryStore = Depends(get_position_history)
+) -> ConsultarPosicionesUseCase:
+    return ConsultarPosicionesUseCase(store)
+
+def get_analizar_recorrido_use_case(
+    store: PositionHistoryStore = Depends(get_position_history)
+) -> AnalizarRecorridoUseCase:
+    return AnalizarRecorridoUseCase(store)
+
+def get_contrastar_kilometraje_use_case(
+    store: PositionHistoryStore = Depends(get_position_history),
+    db = Depends(get_db_session)
+) -> ContrastarKilometrajeUseCase:
+    return ContrastarKilometrajeUseCase(store, SQLAlchemyVehiculoRepository(db))
+
+# Pydantic models for API
+class PingRequest(PosicionGPS):
+    tipo: TipoSeguimiento = Field(..., description="Tracked object kind")
+    id: str = Field(..., min_length=1, description="Load or vehicle ID")
+
+class RegistrarPosicionesRequest(BaseModel):
+    posiciones: List[PingRequest] = Field(..., max_length=10000, description="GPS pings, in any order")
+
+class ContrastarKilometrajeRequest(BaseModel):
+    desde: datetime = Field(..., description="Start of the GPS window, inclusive")
+    hasta: datetime = Field(..., description="End of the GPS window, exclusive")
+    kilometraje_inicial: Dict[str, float] = Field(default_factory=dict, description="Odometer per vehicle ID at 'desde'")
+    tolerancia: float = Field(0.05, ge=0, le=1, description="Relative difference still considered a match")
+
+# Create router
+router = APIRouter(prefix="/tracking", tags=["tracking"])
+
+@router.post("/posiciones", status_code=202)
+async def registrar_posiciones(
+    request: RegistrarPosicionesRequest,
+    use_case: RegistrarPosicionesUseCase = Depends(get_registrar_posiciones_use_case)
+):
+    """Ingest a batch of GPS pings for loads and vehicles"""
+    registradas = use_case.execute((ping.tipo, ping.id, ping) for ping in request.posiciones)
+    return {"registradas": registradas}
+
+@router.get("/{tipo}/{track_id}/posiciones", response_model=List[PosicionGPS])
+async def consultar_posiciones(
+    tipo: TipoSeguimiento,
+    track_id: str,
+    desde: Optional[datetime] = Query(None, description="From this time, inclusive"),
+    hasta: Optional[datetime] = Query(None, description="Until this time, exclusive"),
+    limit: int = Query(1000, ge=1, le=100000),
+    crudo: bool = Query(False, description="Recent pings as received instead of the compressed trace"),
+    use_case: ConsultarPosicionesUseCase = Depends(get_consultar_posiciones_use_case)
+):
+    """Get the position history of a load or vehicle within a time window"""
+    try:
+        return use_case.execute(tipo, track_id, desde, hasta, limit, crudo)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{tipo}/{track_id}/ultima", response_model=PosicionGPS)
+async def ultima_posicion(
+    tipo: TipoSeguimiento,
+    track_id: str,
+    use_case: ConsultarPosicionesUseCase = Depends(get_consultar_posiciones_use_case)
+):
+    """Get the latest position of a load or vehicle"""
+    posicion = use_case.ultima(tipo, track_id)
+    if posicion is None:
+        raise HTTPException(status_code=404, detail="Sin posiciones registradas")
+    return posicion
+
+@router.get("/{tipo}/{track_id}/recorrido", response_model=ResumenRecorrido)
+async def analizar_recorrido(
+    tipo: TipoSeguimiento,
+    track_id: str,
+    desde: Optional[datetime] = Query(None, description="From this time, inclusive"),
+    hasta: Optional[datetime] = Query(None, description="Until this time, exclusive"),
+    use_case: AnalizarRecorridoUseCase = Depends(get_analizar_recorrido_use_case)
+):
+    """Get driven distance, driving segments and stops within a time window"""
+    try:
+        return use_case.execute(tipo, track_id, desde, hasta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/kilometraje")
+async def contrastar_kilometraje(
+    request: ContrastarKilometrajeRequest,
+    use_case: ContrastarKilometrajeUseCase = Depends(get_contrastar_kilometraje_use_case)
+):
+    """Compare every vehicle's odometer advance with its GPS distance"""
+    try:
+        return use_case.execute(request.desde, request.hasta, request.kilometraje_inicial, request.tolerancia)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -23,11 +23,13 @@ from src.application.use_cases.vehiculo_use_cases import (
 
 # Infrastructure imports
 from src.infrastructure.repositories.vehiculo_repository import SQLAlchemyVehiculoRepository
-from src.infrastructure.persistence.session import get_db
+
+# Presentation imports
+from src.presentation.api.dependencies import get_change_events, get_db_session
 
 # Dependency injection
-def get_vehiculo_repository(db = Depends(get_db)) -> SQLAlchemyVehiculoRepository:
-    return SQLAlchemyVehiculoRepository(db)
+def get_vehiculo_repository(db = Depends(get_db_session), eventos = Depends(get_change_events)) -> SQLAlchemyVehiculoRepository:
+    return SQLAlchemyVehiculoRepository(db, eventos)
 
 def get_crear_vehiculo_use_case(repo = Depends(get_vehiculo_repository)) -> CrearVehiculoUseCase:
     return CrearVehiculoUseCase(repo)
@@ -0,0 +1,61 @@
+"""
+Request size limits for upload endpoints
+"""
+from typing import Any, Callable, Coroutine, Optional
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+
+# Allowance for multipart boundaries and part headers around the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+def max_upload_size(limit: int, detail: Optional[str] = None) -> Callable:
+    """
+    Mark an endpoint whose request body may not exceed ``limit`` bytes
+    (plus multipart overhead); enforced by ``LimitedUploadRoute``
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.max_upload_size = limit
+        endpoint.upload_too_large_detail = detail or f"Upload exceeds maximum allowed size of {limit} bytes"
+        return endpoint
+    return decorator
+
+class LimitedUploadRoute(APIRoute):
+    """
+    Route that rejects oversized uploads while they are being received.
+
+    FastAPI parses (and spools) the whole multipart body before the endpoint
+    runs, so a size check inside the endpoint only happens after the full
+    upload has been written. This route checks ``Content-Length`` up front and
+    counts the bytes of chunked bodies as they arrive, aborting as soon as
+    the limit set with ``max_upload_size`` is crossed.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        limit = getattr(self.endpoint, "max_upload_size", None)
+        if limit is None:
+            return handler
+
+        max_body = limit + MULTIPART_OVERHEAD
+        detail = self.endpoint.upload_too_large_detail
+
+        async def limited_handler(request: Request) -> Response:
+            content_length = request.headers.get("content-length")
+            if content_length and content_length.isdigit() and int(content_length) > max_body:
+                raise HTTPException(status_code=400, detail=detail)
+
+            receive = request.receive
+            received = 0
+
+            async def limited_receive():
+                nonlocal received
+                message = await receive()
+                if message["type"] == "http.request":
+                    received += len(message.get("body", b""))
+                    if received > max_body:
+                        raise HTTPException(status_code=400, detail=detail)
+                return message
+
+            return await handler(Request(request.scope, limited_receive))
+
+        return limited_handler
@@ -0,0 +1,68 @@
+"""
+Integration tests for load API endpoints
+"""
+from fastapi.testclient import TestClient
+
+CARGA = {
+    "descripcion": "Palets de fruta",
+    "tipo": "refrigerada",
+    "peso": 1200.0,
+    "origen": "41.38,2.17",
+    "destino": "40.42,-3.70"
+}
+
+class TestCargaAPI:
+    """Integration tests for load API"""
+
+    def test_crear_y_obtener_carga(self, client: TestClient):
+        """Test a created load is pending and visible to later requests"""
+        response = client.post("/api/v1/cargas/", json=CARGA)
+        assert response.status_code == 201
+        carga_id = response.json()["id"]
+        assert response.json()["estado"] == "pendiente"
+
+        response = client.get(f"/api/v1/cargas/{carga_id}")
+
+        assert response.status_code == 200
+        assert response.json()["descripcion"] == "Palets de fruta"
+
+    def test_listar_por_estado(self, client: TestClient):
+        """Test the status filter follows status changes"""
+        carga_id = client.post("/api/v1/cargas/", json=CARGA).json()["id"]
+        response = client.patch(f"/api/v1/cargas/{carga_id}/estado", json={"estado": "en_transito"})
+        assert response.status_code == 200
+        assert response.json()["fecha_salida"] is not None
+
+        pendientes = client.get("/api/v1/cargas/", params={"estado": "pendiente"}).json()
+        en_transito = client.get("/api/v1/cargas/", params={"estado": "en_transito"}).json()
+
+        assert carga_id not in [c["id"] for c in pendientes]
+        assert carga_id in [c["id"] for c in en_transito]
+
+    def test_asignar_vehiculo(self, client: TestClient):
+        """Test a load assigned to a vehicle is listed under it"""
+        carga_id = client.post("/api/v1/cargas/", json=CARGA).json()["id"]
+
+        response = client.patch(f"/api/v1/cargas/{carga_id}/vehiculo", json={"vehiculo_id": "VEH001"})
+        assert response.status_code == 200
+
+        cargas = client.get("/api/v1/cargas/", params={"vehiculo_id": "VEH001"}).json()
+        assert [c["id"] for c in cargas] == [carga_id]
+
+    def test_ventana_invertida(self, client: TestClient):
+        """Test a delivery window ending before it starts is rejected"""
+        carga = dict(CARGA, entrega_desde="2026-01-01T12:00:00", entrega_hasta="2026-01-01T10:00:00")
+
+        response = client.post("/api/v1/cargas/", json=carga)
+
+        assert response.status_code == 422
+
+    def test_eliminar_carga(self, client: TestClient):
+        """Test deleting a load and missing loads"""
+        carga_id = client.post("/api/v1/cargas/", json=CARGA).json()["id"]
+
+        assert client.delete(f"/api/v1/cargas/{carga_id}").status_code == 204
+        assert client.get(f"/api/v1/cargas/{carga_id}").status_code == 404
+        assert client.delete(f"/api/v1/cargas/{carga_id}").status_code == 404
+        response = client.patch("/api/v1/cargas/CRG-NOPE/estado", json={"estado": "entregada"})
+        assert response.status_code == 404
@@ -1,14 +1,35 @@
 """
 Integration tests for CMR API endpoints
 """
+import json
+import mmap
+import time
+import zipfile
 import pytest
 from io import BytesIO
+from tempfile import SpooledTemporaryFile
 from datetime import datetime
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 
-from application.use_cases.cmr_use_cases import ProcesarCMRUseCase, ValidarCMRUseCase
-from domain.services.cmr_normalizer import CMRNormalizer, MockCMRExtractor
+from src.application.use_cases.cmr_use_cases import (
+    MAX_BATCH_SIZE, CMRIncompleteError, ProcesarCMRUseCase, ProcesarLoteCMRUseCase, ValidarCMRUseCase
+)
+from src.domain.services.cmr_cache import CMRResultCache
+from src.domain.services.cmr_normalizer import CMRNormalizer, MockCMRExtractor
+from src.infrastructure.job_queue import JobQueue, QueueFullError
+from src.presentation.api.routes.cmr_routes import (
+    extract_cmr_batch, get_cmr_job_queue, get_procesar_lote_cmr_use_case
+)
+
+def wait_for_job(client: TestClient, job_id: str) -> dict:
+    """Poll a background job until it finishes"""
+    for _ in range(200):
+        job = client.get(f"/documents/cmr/jobs/{job_id}").json()
+        if job["status"] in ("completado", "error"):
+            break
+        time.sleep(0.05)
+    return job
 
 class TestCMRApi:
     """Test CMR API endpoints"""
@@ -46,6 +67,19 @@ class TestCMRApi:
         assert data["carga"]["peso_bruto"] == 2500.0
         assert data["estado_procesamiento"] == "procesado"
 
+    def test_extract_cmr_data_early_exit(self, client: TestClient):
+        """Test low-confidence mandatory fields are rejected with per-field results"""
+        files = {"file": ("test_cmr.pdf", BytesIO(b"%PDF-1.4 mock"), "application/pdf")}
+
+        response = client.post("/documents/cmr/extract?early_exit=true&min_confidence=0.9", files=files)
+
+        assert response.status_code == 422
+        detail = response.json()["detail"]
+        assert detail["complete"] is False
+        assert "document" not in detail
+        assert detail["fields"]["numero_cmr"]["accepted"] is True
+        assert detail["fields"]["peso_bruto"] == {"value": 2500.0, "confidence": 0.85, "accepted": False}
+
     def test_extract_cmr_data_invalid_file_type(self, client: TestClient):
         """Test CMR extraction with invalid file type"""
         # Create text file
@@ -80,6 +114,248 @@ class TestCMRApi:
         assert response.status_code == 400
         assert "exceeds maximum allowed size" in response.json()["detail"]
 
+    def test_extract_cmr_batch_streams_ndjson(self, client: TestClient):
+        """Test batch extraction returns one NDJSON line per document"""
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("zipped_1.pdf", b"%PDF-1.4 zipped one")
+            zf.writestr("zipped_2.pdf", b"%PDF-1.4 zipped two")
+            zf.writestr("notes.txt", b"ignored")
+        files = [
+            ("files", ("a.pdf", BytesIO(b"%PDF-1.4 a"), "application/pdf")),
+            ("files", ("empty.pdf", BytesIO(b""), "application/pdf")),
+            ("files", ("batch.zip", BytesIO(archive.getvalue()), "application/zip")),
+        ]
+
+        response = client.post("/documents/cmr/extract/batch", files=files)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        results = sorted(
+            (json.loads(line) for line in response.text.splitlines()),
+            key=lambda result: result["index"]
+        )
+        assert [result["filename"] for result in results] == ["a.pdf", "empty.pdf", "zipped_1.pdf", "zipped_2.pdf"]
+        assert [result["status"] for result in results] == ["ok", "error", "ok", "ok"]
+        assert results[0]["document"]["numero_cmr"] == "CMR-2024-001234"
+        assert "cannot be empty" in results[1]["error"]
+
+    def test_extract_cmr_batch_stores_and_caches(self, client: TestClient):
+        """Test valid batch documents are stored and a resubmitted document is answered from the cache"""
+        cache = client.app.state.container.cmr_cache
+        files = [("files", ("a.pdf", BytesIO(b"%PDF-1.4 cached"), "application/pdf"))]
+
+        client.post("/documents/cmr/extract/batch", files=files)
+        files = [("files", ("a.pdf", BytesIO(b"%PDF-1.4 cached"), "application/pdf"))]
+        hits = cache.hits
+        result = json.loads(client.post("/documents/cmr/extract/batch", files=files).text)
+
+        assert result["status"] == "ok"
+        assert cache.hits == hits + 1
+        assert client.get("/documents/cmr/CMR-2024-001234").status_code == 200
+
+    def test_extract_cmr_batch_total_size_limited(self):
+        """Test the batch endpoint caps its whole upload, not only each document"""
+        assert extract_cmr_batch.max_upload_size == MAX_BATCH_SIZE
+
+    def test_batch_cache_requires_version(self):
+        """Test the batch use case needs the normalizer version to key cached results"""
+        with pytest.raises(ValueError):
+            ProcesarLoteCMRUseCase(None, cache=CMRResultCache())
+
+    def test_extract_cmr_batch_rejects_unsupported_file(self, client: TestClient):
+        """Test batch extraction rejects files that are neither PDF nor zip"""
+        files = [("files", ("test.txt", BytesIO(b"not a pdf"), "text/plain"))]
+
+        response = client.post("/documents/cmr/extract/batch", files=files)
+
+        assert response.status_code == 400
+
+    def test_cmr_job_submit_and_poll(self, client: TestClient):
+        """Test a queued job is accepted immediately and completes in the background"""
+        files = {"file": ("test_cmr.pdf", BytesIO(b"%PDF-1.4 job"), "application/pdf")}
+
+        response = client.post("/documents/cmr/jobs", files=files)
+
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert response.headers["location"] == f"/documents/cmr/jobs/{job_id}"
+
+        job = wait_for_job(client, job_id)
+
+        assert job["status"] == "completado"
+        assert job["result"]["status"] == "ok"
+        assert job["result"]["document"]["numero_cmr"] == "CMR-2024-001234"
+        assert client.get("/documents/cmr/CMR-2024-001234").status_code == 200
+
+    def test_cmr_job_uses_result_cache(self, client: TestClient):
+        """Test a job for an already processed document is answered from the cache"""
+        cache = client.app.state.container.cmr_cache
+        files = {"file": ("test_cmr.pdf", BytesIO(b"%PDF-1.4 cached job"), "application/pdf")}
+        client.post("/documents/cmr/extract", files=files)
+        hits = cache.hits
+
+        files = {"file": ("test_cmr.pdf", BytesIO(b"%PDF-1.4 cached job"), "application/pdf")}
+        job = wait_for_job(client, client.post("/documents/cmr/jobs", files=files).json()["job_id"])
+
+        assert job["status"] == "completado"
+        assert cache.hits == hits + 1
+
+    def test_cmr_job_failure_reported(self, client: TestClient):
+        """Test a job whose document cannot be processed ends with status error"""
+        class FailingBatch(ProcesarLoteCMRUseCase):
+            async def execute(self, documents):
+                for index, (filename, _) in enumerate(documents):
+                    yield {"index": index, "filename": filename, "status": "error", "error": "OCR unavailable"}
+
+        client.app.dependency_overrides[get_procesar_lote_cmr_use_case] = lambda: FailingBatch(None)
+        files = {"file": ("test_cmr.pdf", BytesIO(b"%PDF-1.4 failing job"), "application/pdf")}
+        try:
+            job_id = client.post("/documents/cmr/jobs", files=files).json()["job_id"]
+        finally:
+            client.app.dependency_overrides.clear()
+
+        job = wait_for_job(client, job_id)
+
+        assert job["status"] == "error"
+        assert job["error"] == "OCR unavailable"
+        assert job["result"]["filename"] == "test_cmr.pdf"
+
+    def test_cmr_job_queue_full(self, client: TestClient):
+        """Test submissions are rejected with 503 when the queue is full"""
+        class FullJobQueue(JobQueue):
+            def submit(self, func, *args, filename=None):
+                raise QueueFullError("Job queue is full, retry later")
+
+        client.app.dependency_overrides[get_cmr_job_queue] = lambda: FullJobQueue(None)
+        files = {"file": ("test_cmr.pdf", BytesIO(b"%PDF-1.4 job"), "application/pdf")}
+
+        try:
+            response = client.post("/documents/cmr/jobs", files=files)
+        finally:
+            client.app.dependency_overrides.clear()
+
+        assert response.status_code == 503
+        assert "retry-after" in response.headers
+
+    def test_cmr_job_rejects_large_upload(self, client: TestClient):
+        """Test job submission rejects oversized uploads before queueing"""
+        files = {"file": ("large.pdf", BytesIO(b"x" * (11 * 1024 * 1024)), "application/pdf")}
+
+        response = client.post("/documents/cmr/jobs", files=files)
+
+        assert response.status_code == 400
+        assert "exceeds maximum allowed size" in response.json()["detail"]
+
+    def test_cmr_job_requires_filename(self, client: TestClient):
+        """Test job submission rejects uploads without a filename"""
+        body = (b'--boundary\r\nContent-Disposition: form-data; name="file"; filename=""\r\n'
+                b"Content-Type: application/pdf\r\n\r\n%PDF-1.4 mock\r\n--boundary--\r\n")
+
+        response = client.post("/documents/cmr/jobs", content=body,
+                               headers={"Content-Type": "multipart/form-data; boundary=boundary"})
+
+        assert response.status_code == 422
+        assert response.json()["detail"] == "Uploaded file has no filename"
+
+    def test_cmr_job_not_found(self, client: TestClient):
+        """Test polling an unknown job"""
+        response = client.get("/documents/cmr/jobs/JOB-UNKNOWN")
+
+        assert response.status_code == 404
+
+    def test_extracted_cmr_is_stored_and_listed(self, client: TestClient):
+        """Test extracted documents can be looked up by number and by plate and date"""
+        files = {"file": ("test_cmr.pdf", BytesIO(b"%PDF-1.4 mock"), "application/pdf")}
+        assert client.post("/documents/cmr/extract", files=files).status_code == 200
+
+        response = client.get("/documents/cmr/CMR-2024-001234")
+        assert response.status_code == 200
+        assert response.json()["matricula_vehiculo"] == "1234-ABC"
+
+        page = client.get(
+            "/documents/cmr",
+            params={"matricula": "1234-ABC", "desde": "2024-01-01T00:00:00", "hasta": "2025-01-01T00:00:00"}
+        ).json()
+        assert page["total"] == 1
+        assert page["items"][0]["numero_cmr"] == "CMR-2024-001234"
+
+        empty = client.get("/documents/cmr", params={"matricula": "0000-ZZZ"}).json()
+        assert empty == {"items": [], "total": 0, "offset": 0, "limit": 50}
+
+    def test_normalizer_shared_across_requests(self, client: TestClient):
+        """Test every request uses the extractor built once by the container"""
+        container = client.app.state.container
+        calls = []
+        extract_data = container.cmr_normalizer.extractor.extract_data
+        container.cmr_normalizer.extractor.extract_data = lambda data: calls.append(1) or extract_data(data)
+
+        for content in (b"%PDF-1.4 one", b"%PDF-1.4 two"):
+            files = {"file": ("test_cmr.pdf", BytesIO(content), "application/pdf")}
+            assert client.post("/documents/cmr/extract", files=files).status_code == 200
+
+        assert len(calls) == 2
+
+    def test_extract_cmr_chunked_upload_over_spool_threshold(self, client: TestClient):
+        """Test a chunked upload spooled to disk is memory-mapped for extraction"""
+        container = client.app.state.container
+        received = []
+        extract_data = container.cmr_normalizer.extractor.extract_data
+        container.cmr_normalizer.extractor.extract_data = (
+            lambda data: received.append((type(data), len(data))) or extract_data(data)
+        )
+        content = b"%PDF-1.4 " + b"x" * (3 * 1024 * 1024 // 2)
+
+        def body():
+            yield (b'--boundary\r\nContent-Disposition: form-data; name="file"; filename="big.pdf"\r\n'
+                   b"Content-Type: application/pdf\r\n\r\n")
+            for start in range(0, len(content), 64 * 1024):
+                yield content[start:start + 64 * 1024]
+            yield b"\r\n--boundary--\r\n"
+
+        response = client.post("/documents/cmr/extract", content=body(),
+                               headers={"Content-Type": "multipart/form-data; boundary=boundary"})
+
+        assert response.status_code == 200
+        assert received == [(mmap.mmap, len(content))]
+
+    def test_unnumbered_cmr_is_not_stored(self, client: TestClient):
+        """Test documents without a CMR number are rejected instead of stored under the placeholder"""
+        extractor = client.app.state.container.cmr_normalizer.extractor
+        extract_data = extractor.extract_data
+
+        def without_number(data):
+            raw = extract_data(data)
+            return raw.model_copy(update={"raw_text": raw.raw_text.replace("N° CMR: CMR-2024-001234", "")})
+
+        extractor.extract_data = without_number
+        files = {"file": ("test_cmr.pdf", BytesIO(b"%PDF-1.4 unnumbered"), "application/pdf")}
+
+        response = client.post("/documents/cmr/extract", files=files)
+
+        assert response.status_code == 422
+        assert client.get("/documents/cmr/CMR-UNKNOWN").status_code == 404
+
+    def test_stored_cmr_not_found(self, client: TestClient):
+        """Test looking up an unknown CMR number"""
+        assert client.get("/documents/cmr/CMR-MISSING").status_code == 404
+
+    def test_list_cmr_with_utc_bounds(self, client: TestClient):
+        """Test bounds with an offset are compared with the stored naive dates"""
+        files = {"file": ("test_cmr.pdf", BytesIO(b"%PDF-1.4 mock"), "application/pdf")}
+        client.post("/documents/cmr/extract", files=files)
+
+        response = client.get("/documents/cmr", params={"desde": "2024-01-01T00:00:00Z", "hasta": "2025-01-01"})
+
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+
+    def test_list_cmr_rejects_inverted_range(self, client: TestClient):
+        """Test a date range ending before it starts"""
+        response = client.get("/documents/cmr", params={"desde": "2024-02-01", "hasta": "2024-01-01"})
+
+        assert response.status_code == 400
+
     def test_cmr_health_check(self, client: TestClient):
         """Test CMR health check endpoint"""
         response = client.get("/documents/cmr/health")
@@ -128,12 +404,66 @@ class TestCMRUseCases:
         with pytest.raises(ValueError, match="exceeds maximum allowed size"):
             use_case.execute(large_bytes)
 
+    def test_procesar_cmr_use_case_from_spooled_file(self):
+        """Test an upload spooled to disk is mapped and a small one is read"""
+        received = []
+
+        class RecordingExtractor(MockCMRExtractor):
+            def extract_data(self, document_bytes):
+                received.append(type(document_bytes))
+                return super().extract_data(document_bytes)
+
+        use_case = ProcesarCMRUseCase(CMRNormalizer(RecordingExtractor()))
+
+        with SpooledTemporaryFile(max_size=16) as spooled:
+            spooled.write(b"%PDF-1.4 ")
+            for _ in range(2 * 1024):
+                spooled.write(b"x" * 1024)
+            result = use_case.execute_file(spooled)
+
+        with SpooledTemporaryFile(max_size=1024) as in_memory:
+            in_memory.write(b"%PDF-1.4 small")
+            use_case.execute_file(in_memory)
+
+        use_case.execute_file(BytesIO(b"%PDF-1.4 buffer"))
+
+        assert result.numero_cmr == "CMR-2024-001234"
+        assert received == [mmap.mmap, bytes, memoryview]
+
+    def test_procesar_cmr_use_case_from_file_too_large(self):
+        """Test oversized files are rejected before being read"""
+        use_case = ProcesarCMRUseCase(CMRNormalizer(MockCMRExtractor()))
+
+        with SpooledTemporaryFile(max_size=1024) as spooled:
+            spooled.seek(11 * 1024 * 1024)
+            spooled.write(b"x")
+            with pytest.raises(ValueError, match="exceeds maximum allowed size"):
+                use_case.execute_file(spooled)
+
+    def test_procesar_cmr_use_case_early_exit(self):
+        """Test early exit raises with the partial result, also for cached documents"""
+        from src.domain.services.cmr_cache import CMRResultCache
+
+        normalizer = CMRNormalizer(MockCMRExtractor())
+        cache = CMRResultCache()
+        ProcesarCMRUseCase(normalizer, cache=cache).execute(b"mock pdf content")
+
+        strict = ProcesarCMRUseCase(normalizer, cache=cache, early_exit=True, min_confidence=0.9)
+        with pytest.raises(CMRIncompleteError) as excinfo:
+            strict.execute(b"mock pdf content")
+        with pytest.raises(CMRIncompleteError):
+            ProcesarCMRUseCase(normalizer, early_exit=True, min_confidence=0.9).execute(b"mock pdf content")
+
+        assert excinfo.value.result.fields["peso_bruto"].confidence == 0.85
+        lenient = ProcesarCMRUseCase(normalizer, early_exit=True)
+        assert lenient.execute(b"mock pdf content").confianza_campos["carga"] == 0.85
+
     def test_validar_cmr_use_case_valid(self):
         """Test CMR validation with valid document"""
         use_case = ValidarCMRUseCase()
 
         # Create valid CMR document
-        from domain.entities.cmr_document import CMRDocument, Remitente, Destinatario, Carga, TipoCarga
+        from src.domain.entities.cmr_document import CMRDocument, Remitente, Destinatario, Carga, TipoCarga
 
         valid_doc = CMRDocument(
             numero_cmr="CMR-2024-001",
@@ -165,7 +495,7 @@ class TestCMRUseCases:
         use_case = ValidarCMRUseCase()
 
         # Create invalid CMR document
-        from domain.entities.cmr_document import CMRDocument, Remitente, Destinatario, Carga, TipoCarga
+        from src.domain.entities.cmr_document import CMRDocument, Remitente, Destinatario, Carga, TipoCarga
 
         invalid_doc = CMRDocument(
             numero_cmr="",  # Invalid: empty CMR number
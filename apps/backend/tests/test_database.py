@@ -0,0 +1,34 @@
+"""
+Tests for the SQLAlchemy models
+"""
+from datetime import datetime
+from sqlalchemy.orm import configure_mappers
+
+from src.infrastructure.persistence.models import Base, FlotaModel, TransportistaModel, VehiculoModel
+from src.domain.entities.vehiculo import TipoVehiculo
+
+class TestModels:
+    """Test the persistence models"""
+
+    def test_mappers_configure(self):
+        """Test every relationship resolves without test-only models"""
+        configure_mappers()
+
+        assert {"flotas", "transportistas", "vehiculos"} <= set(Base.metadata.tables)
+
+    def test_vehicle_fleet_relationship(self, db_session):
+        """Test vehicles are reachable from their fleet and transporter"""
+        flota = FlotaModel(id="FLT1", nombre="Norte")
+        transportista = TransportistaModel(id="TRP1", nombre="Ana", email="ana@example.com",
+                                           licencia="C-123", flota=flota)
+        vehiculo = VehiculoModel(id="VEH1", matricula="1234-ABC", marca="Volvo", modelo="FH",
+                                 tipo=TipoVehiculo.CAMION, capacidad_carga=24000.0,
+                                 fecha_matriculacion=datetime(2021, 1, 1),
+                                 flota=flota, transportista=transportista)
+        db_session.add(vehiculo)
+        db_session.commit()
+
+        flota = db_session.get(FlotaModel, "FLT1")
+        assert [v.id for v in flota.vehiculos] == ["VEH1"]
+        assert [t.id for t in flota.transportistas] == ["TRP1"]
+        assert db_session.get(TransportistaModel, "TRP1").vehiculos[0].matricula == "1234-ABC"
@@ -0,0 +1,76 @@
+"""
+Integration tests for change event API endpoints
+"""
+import json
+import threading
+from fastapi.testclient import TestClient
+from src.domain.entities.evento_cambio import TipoEntidad
+
+class TestEventosAPI:
+    """Integration tests for change event API"""
+
+    def test_poll_changes(self, client: TestClient):
+        """Test a created fleet shows up as a change after the last offset"""
+        flota_id = client.post("/api/v1/flota/", json={"nombre": "Flota Norte"}).json()["id"]
+
+        eventos = client.get("/eventos/", params={"entidad": "flota"}).json()
+        assert [(e["entidad_id"], e["operacion"]) for e in eventos] == [(flota_id, "guardado")]
+        assert eventos[0]["datos"]["nombre"] == "Flota Norte"
+
+        despues = eventos[-1]["secuencia"]
+        assert client.get("/eventos/", params={"despues": despues}).json() == []
+        assert client.get("/eventos/", params={"entidad": "carga"}).json() == []
+
+    def test_stream_resumes_from_last_event_id(self, client: TestClient):
+        """Test the SSE stream sends the changes after Last-Event-ID"""
+        client.post("/api/v1/flota/", json={"nombre": "Flota Norte"})
+        flota_id = client.post("/api/v1/flota/", json={"nombre": "Flota Sur"}).json()["id"]
+        primera = client.get("/eventos/").json()[0]["secuencia"]
+
+        response = client.get("/eventos/stream", params={"limit": 1}, headers={"Last-Event-ID": str(primera)})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        lineas = response.text.strip().split("\n")
+        assert lineas[:2] == [f"id: {primera + 1}", "event: cambio"]
+        assert json.loads(lineas[2][len("data: "):])["entidad_id"] == flota_id
+
+    def test_stream_waits_for_new_changes(self, client: TestClient):
+        """Test a stream without offset sends the next change once it happens"""
+        client.post("/api/v1/flota/", json={"nombre": "Flota Norte"})
+        bus = client.app.state.container.change_events
+        temporizador = threading.Timer(0.2, bus.eliminado, args=(TipoEntidad.FLOTA, "F9"))
+        temporizador.start()
+
+        response = client.get("/eventos/stream", params={"limit": 1})
+
+        temporizador.join()
+        assert json.loads(response.text.split("data: ")[1])["entidad_id"] == "F9"
+
+    def test_offset_from_before_restart(self, client: TestClient):
+        """Test an offset the restarted process never issued is reported as a gap"""
+        flota_id = client.post("/api/v1/flota/", json={"nombre": "Flota Norte"}).json()["id"]
+
+        assert client.get("/eventos/", params={"despues": 500}).status_code == 410
+
+        response = client.get("/eventos/stream", params={"limit": 1}, headers={"Last-Event-ID": "500"})
+        lineas = response.text.strip().split("\n")
+        assert lineas[0] == "event: desfase"
+        assert json.loads(response.text.split("event: cambio\ndata: ")[1])["entidad_id"] == flota_id
+
+    def test_load_changes_published(self, client: TestClient):
+        """Test loads created and updated through the API show up as changes"""
+        carga = {"descripcion": "Palets", "tipo": "general", "peso": 800.0,
+                 "origen": "41.38,2.17", "destino": "40.42,-3.70"}
+        carga_id = client.post("/api/v1/cargas/", json=carga).json()["id"]
+        client.patch(f"/api/v1/cargas/{carga_id}/estado", json={"estado": "en_transito"})
+
+        eventos = client.get("/eventos/", params={"entidad": "carga"}).json()
+
+        assert [e["entidad_id"] for e in eventos] == [carga_id, carga_id]
+        assert eventos[-1]["datos"]["estado"] == "en_transito"
+
+    def test_invalid_last_event_id(self, client: TestClient):
+        """Test a Last-Event-ID that is not a sequence number is rejected"""
+        response = client.get("/eventos/stream", headers={"Last-Event-ID": "abc"})
+        assert response.status_code == 400
@@ -0,0 +1,40 @@
+"""
+Integration tests for fleet API endpoints
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+class TestFlotaAPI:
+    """Integration tests for fleet API"""
+
+    def test_flota_persists_between_requests(self, client: TestClient):
+        """Test a created fleet is visible to later requests"""
+        response = client.post("/api/v1/flota/", json={"nombre": "Flota Norte"})
+        assert response.status_code == 200
+        flota_id = response.json()["id"]
+
+        response = client.get(f"/api/v1/flota/{flota_id}")
+
+        assert response.status_code == 200
+        assert response.json()["nombre"] == "Flota Norte"
+
+    def test_agregar_vehiculo_uses_shared_repository(self, client: TestClient):
+        """Test routes that previously built their own repository see shared state"""
+        flota_id = client.post("/api/v1/flota/", json={"nombre": "Flota Sur"}).json()["id"]
+
+        response = client.post(f"/api/v1/flota/{flota_id}/vehiculo", json={"vehiculo_id": "VHC001"})
+        assert response.status_code == 200
+
+        response = client.get(f"/api/v1/flota/{flota_id}/estadisticas")
+
+        assert response.status_code == 200
+        assert response.json()["total_vehiculos"] == 1
+
+    def test_container_is_reused(self, client: TestClient):
+        """Test the lifespan container is created once per application"""
+        container = client.app.state.container
+
+        client.post("/api/v1/flota/", json={"nombre": "Flota Este"})
+
+        assert client.app.state.container is container
+        assert len(container.flota_repository.find_all()) >= 1
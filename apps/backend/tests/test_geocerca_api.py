@@ -0,0 +1,77 @@
+"""
+Integration tests for geofence API endpoints
+"""
+from fastapi.testclient import TestClient
+
+DEPOSITO = {
+    "id": "DEP1",
+    "nombre": "Depósito Madrid",
+    "tipo": "deposito",
+    "propietario_id": "CLI1",
+    "centro": {"latitud": 40.0, "longitud": -3.7},
+    "radio_m": 500
+}
+
+class TestGeocercaAPI:
+    """Integration tests for geofence API"""
+
+    def test_crud(self, client: TestClient):
+        """Test registering, listing, reading and deleting a geofence"""
+        assert client.put("/geocercas/DEP1", json=DEPOSITO).status_code == 200
+
+        assert [g["id"] for g in client.get("/geocercas/", params={"propietario_id": "CLI1"}).json()] == ["DEP1"]
+        assert client.get("/geocercas/", params={"propietario_id": "OTRO"}).json() == []
+        assert client.get("/geocercas/DEP1").json()["radio_m"] == 500
+
+        assert client.delete("/geocercas/DEP1").status_code == 204
+        assert client.get("/geocercas/DEP1").status_code == 404
+        assert client.delete("/geocercas/DEP1").status_code == 404
+
+    def test_invalid_geofence(self, client: TestClient):
+        """Test mismatched IDs and shapeless geofences are rejected"""
+        assert client.put("/geocercas/OTRO", json=DEPOSITO).status_code == 400
+        sin_forma = {"id": "X", "nombre": "X", "tipo": "cliente"}
+        assert client.put("/geocercas/X", json=sin_forma).status_code == 400
+
+    def test_pings_produce_events(self, client: TestClient):
+        """Test ingested pings are evaluated against the geofences"""
+        client.put("/geocercas/DEP1", json=DEPOSITO)
+        pings = [
+            {"tipo": "vehiculo", "id": "VHC1", "timestamp": f"2024-03-01T10:0{minute}:00Z",
+             "latitud": latitud, "longitud": -3.7}
+            for minute, latitud in enumerate((39.9, 40.001, 40.002, 40.1))
+        ]
+
+        response = client.post("/tracking/posiciones", json={"posiciones": pings})
+        assert response.status_code == 202
+
+        eventos = client.get("/geocercas/eventos").json()
+        assert [(e["tipo"], e["geocerca_id"], e["track_id"]) for e in eventos] == [
+            ("entrada", "DEP1", "VHC1"),
+            ("salida", "DEP1", "VHC1"),
+        ]
+        assert eventos[0]["timestamp"].startswith("2024-03-01T10:01:00")
+        assert client.get("/geocercas/eventos", params={"despues": eventos[0]["secuencia"]}).json() == eventos[1:]
+
+    def test_lost_events_reported(self, client: TestClient):
+        """Test polling from a sequence number the log no longer covers is refused"""
+        response = client.get("/geocercas/eventos", params={"despues": 10 ** 9})
+
+        assert response.status_code == 410
+
+    def test_precalentar_distancias(self, client: TestClient):
+        """Test depot pairs and extra points are precomputed"""
+        client.put("/geocercas/DEP1", json=DEPOSITO)
+        client.put("/geocercas/DEP2", json={**DEPOSITO, "id": "DEP2", "centro": {"latitud": 41.39, "longitud": 2.17}})
+        client.put("/geocercas/CLI", json={**DEPOSITO, "id": "CLI", "tipo": "cliente"})
+
+        response = client.post("/geocercas/depositos/distancias", json=[[39.47, -0.38]])
+
+        assert response.status_code == 200
+        assert response.json() == {"pares": 3}
+
+    def test_precalentar_demasiados_puntos(self, client: TestClient):
+        """Test more points than the cache can hold the pairs of are rejected"""
+        puntos = [[36.0 + i * 0.01, -3.7] for i in range(1000)]
+
+        assert client.post("/geocercas/depositos/distancias", json=puntos).status_code == 422
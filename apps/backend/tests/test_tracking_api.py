@@ -0,0 +1,102 @@
+"""
+Integration tests for GPS tracking API endpoints
+"""
+import pytest
+from fastapi.testclient import TestClient
+from src.domain.services.track_distance import haversine_legs
+
+class TestTrackingAPI:
+    """Integration tests for tracking API"""
+
+    def test_ingest_and_query_window(self, client: TestClient):
+        """Test batched pings are queryable by time window"""
+        pings = [
+            {"tipo": "vehiculo", "id": "VHC1", "timestamp": f"2024-03-01T10:0{minute}:00Z",
+             "latitud": 40.0 + minute / 100, "longitud": -3.7 + minute % 2 / 100}
+            for minute in (3, 1, 2, 0)
+        ]
+        pings.append({"tipo": "carga", "id": "CRG1", "timestamp": "2024-03-01T10:00:00Z",
+                      "latitud": 41.0, "longitud": 2.0})
+
+        response = client.post("/tracking/posiciones", json={"posiciones": pings})
+        assert response.status_code == 202
+        assert response.json() == {"registradas": 5}
+
+        response = client.get(
+            "/tracking/vehiculo/VHC1/posiciones",
+            params={"desde": "2024-03-01T10:01:00Z", "hasta": "2024-03-01T10:03:00Z"}
+        )
+        assert response.status_code == 200
+        posiciones = response.json()
+        assert [p["latitud"] for p in posiciones] == [40.01, 40.02]
+        assert posiciones[0]["timestamp"].startswith("2024-03-01T10:01:00")
+
+        ultima = client.get("/tracking/vehiculo/VHC1/ultima").json()
+        assert ultima["latitud"] == 40.03
+
+    def test_naive_and_aware_range(self, client: TestClient):
+        """Test a window with one naive and one aware bound, naive taken as UTC"""
+        pings = [{"tipo": "vehiculo", "id": "VHC1", "timestamp": f"2024-03-01T10:0{minute}:00",
+                  "latitud": 40.0 + minute / 100, "longitud": -3.7 + minute % 2 / 100} for minute in range(4)]
+        client.post("/tracking/posiciones", json={"posiciones": pings})
+
+        response = client.get(
+            "/tracking/vehiculo/VHC1/posiciones",
+            params={"desde": "2024-03-01T11:01:00+01:00", "hasta": "2024-03-01T10:03:00"}
+        )
+        assert response.status_code == 200
+        assert [p["latitud"] for p in response.json()] == [40.01, 40.02]
+
+        response = client.get(
+            "/tracking/vehiculo/VHC1/posiciones",
+            params={"desde": "2024-03-01T10:03:00", "hasta": "2024-03-01T10:01:00Z"}
+        )
+        assert response.status_code == 400
+
+    def test_invalid_ping_rejected(self, client: TestClient):
+        """Test out-of-range coordinates are rejected"""
+        response = client.post("/tracking/posiciones", json={"posiciones": [
+            {"tipo": "vehiculo", "id": "VHC1", "timestamp": "2024-03-01T10:00:00Z", "latitud": 95.0, "longitud": 0.0}
+        ]})
+
+        assert response.status_code == 422
+
+    def test_unknown_track(self, client: TestClient):
+        """Test tracks without positions"""
+        assert client.get("/tracking/carga/NONE/ultima").status_code == 404
+        assert client.get("/tracking/carga/NONE/posiciones").json() == []
+        assert client.get("/tracking/barco/NONE/posiciones").status_code == 422
+
+    def test_recorrido(self, client: TestClient):
+        """Test the distance analysis of an ingested track"""
+        # Zigzag, so that compression keeps every point
+        pings = [
+            {"tipo": "vehiculo", "id": "VHC2", "timestamp": f"2024-03-01T10:{minute:02d}:00Z",
+             "latitud": 40.0 + minute * 0.01, "longitud": -3.7 + minute % 2 * 0.01}
+            for minute in range(11)
+        ]
+        esperado = sum(haversine_legs([p["latitud"] for p in pings[:5]], [p["longitud"] for p in pings[:5]]))
+        client.post("/tracking/posiciones", json={"posiciones": pings})
+
+        response = client.get("/tracking/vehiculo/VHC2/recorrido", params={"hasta": "2024-03-01T10:05:00Z"})
+
+        assert response.status_code == 200
+        resumen = response.json()
+        assert resumen["puntos"] == 5
+        assert resumen["distancia_km"] == pytest.approx(esperado)
+        assert len(resumen["segmentos"]) == 1
+
+    def test_raw_positions(self, client: TestClient):
+        """Test recent pings dropped by compression are available raw"""
+        pings = [
+            {"tipo": "vehiculo", "id": "VHC3", "timestamp": f"2024-03-01T10:00:{second:02d}Z",
+             "latitud": 40.0 + second * 0.0001, "longitud": -3.7}
+            for second in range(0, 60, 10)
+        ]
+        client.post("/tracking/posiciones", json={"posiciones": pings})
+
+        comprimidas = client.get("/tracking/vehiculo/VHC3/posiciones").json()
+        crudas = client.get("/tracking/vehiculo/VHC3/posiciones", params={"crudo": True}).json()
+
+        assert len(comprimidas) == 2
+        assert len(crudas) == 6
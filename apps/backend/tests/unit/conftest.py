@@ -0,0 +1,83 @@
+"""
+Shared fixtures for the unit tests
+"""
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.domain.entities.carga import Carga, TipoCarga
+from src.domain.entities.cmr_document import (
+    CMRDocument,
+    Remitente,
+    Destinatario,
+    Carga as CargaCMR,
+    TipoCarga as TipoCargaCMR,
+    EstadoCMR
+)
+from src.domain.entities.vehiculo import Vehiculo, TipoVehiculo
+from src.infrastructure.persistence.models import Base
+
+@pytest.fixture
+def sql_session():
+    """Session on a fresh in-memory SQLite database with every table"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+@pytest.fixture(params=["memory", "sql"])
+def repositorio(request):
+    """
+    Build a repository with the in-memory or the SQLAlchemy implementation
+
+    Each test using it runs once per implementation:
+    ``repositorio(InMemoryCargaRepository, SQLAlchemyCargaRepository)``.
+    """
+    if request.param == "memory":
+        return lambda memory_cls, sql_cls, **kwargs: memory_cls(**kwargs)
+    session = request.getfixturevalue("sql_session")
+    return lambda memory_cls, sql_cls, **kwargs: sql_cls(session, **kwargs)
+
+@pytest.fixture
+def make_carga():
+    """Factory of loads from Madrid to Barcelona"""
+    def make(carga_id: str, **kwargs) -> Carga:
+        return Carga(id=carga_id, descripcion="Palets", tipo=TipoCarga.GENERAL, peso=1000.0,
+                     origen="40.4168,-3.7038", destino="41.3874,2.1686", **kwargs)
+    return make
+
+@pytest.fixture
+def make_document():
+    """Factory of processed CMR documents with the indexed fields set"""
+    def make(numero: str, matricula: str, fecha: datetime, peso: float = 1000.0) -> CMRDocument:
+        parte = {"nombre": "Empresa", "direccion": "Calle 1", "ciudad": "Madrid", "pais": "España"}
+        return CMRDocument(
+            numero_cmr=numero,
+            fecha_emision=fecha,
+            remitente=Remitente(**parte),
+            destinatario=Destinatario(**parte),
+            matricula_vehiculo=matricula,
+            carga=CargaCMR(descripcion="General", tipo=TipoCargaCMR.GENERAL, peso_bruto=peso),
+            estado_procesamiento=EstadoCMR.PROCESADO
+        )
+    return make
+
+@pytest.fixture
+def make_vehiculo():
+    """Factory of trucks with a given plate"""
+    def make(vehiculo_id: str, matricula: str) -> Vehiculo:
+        return Vehiculo(
+            id=vehiculo_id,
+            matricula=matricula,
+            marca="Volvo",
+            modelo="FH",
+            tipo=TipoVehiculo.CAMION,
+            capacidad_carga=24000.0,
+            fecha_matriculacion=datetime(2021, 1, 1)
+        )
+    return make
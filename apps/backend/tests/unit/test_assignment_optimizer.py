@@ -0,0 +1,228 @@
+"""
+Unit tests for the load assignment optimizer
+"""
+import random
+from datetime import datetime
+from itertools import permutations
+import pytest
+from src.application.use_cases.asignacion_use_cases import AsignarCargasUseCase
+from src.domain.entities.carga import Carga, EstadoCarga, TipoCarga
+from src.domain.entities.vehiculo import TipoVehiculo, Vehiculo
+from src.domain.repositories.interfaces import VehiculoRepository
+from src.domain.services.assignment_optimizer import (
+    INFEASIBLE,
+    OptimizadorAsignacion,
+    auction,
+    greedy_local_search,
+    hungarian
+)
+from src.infrastructure.position_history import PositionHistoryStore
+from src.infrastructure.repositories.carga_repository import InMemoryCargaRepository
+
+def carga(carga_id: str, lat: float, lon: float, peso: float = 1000.0) -> Carga:
+    return Carga(id=carga_id, descripcion="Palets", tipo=TipoCarga.GENERAL, peso=peso,
+                 origen=f"{lat},{lon}", destino="Destino")
+
+def vehiculo(vehiculo_id: str, capacidad: float = 25000.0) -> Vehiculo:
+    return Vehiculo(id=vehiculo_id, matricula=vehiculo_id, marca="Mercedes", modelo="Actros",
+                    tipo=TipoVehiculo.CAMION, capacidad_carga=capacidad,
+                    fecha_matriculacion=datetime(2020, 1, 15))
+
+def coste(cost, columnas) -> float:
+    return sum(cost[i][j] for i, j in enumerate(columnas) if j is not None)
+
+def optimo(cost) -> float:
+    """Brute-force best total over assignments of as many rows as possible"""
+    n, m = len(cost), len(cost[0])
+    best = (0, 0.0)
+    for columnas in permutations(list(range(m)) + [None] * n, n):
+        factibles = [j for i, j in enumerate(columnas) if j is not None and cost[i][j] != INFEASIBLE]
+        if len(factibles) < sum(j is not None for j in columnas):
+            continue
+        candidato = (len(factibles), -coste(cost, columnas))
+        best = max(best, candidato)
+    return -best[1]
+
+def aleatoria(rnd: random.Random, n: int, m: int, infactibles: float = 0.0):
+    return [[INFEASIBLE if rnd.random() < infactibles else rnd.uniform(1, 100) for _ in range(m)]
+            for _ in range(n)]
+
+class TestHungarian:
+    """Test cases for the exact one-to-one assignment"""
+
+    @pytest.mark.parametrize("n,m", [(3, 3), (4, 3), (3, 5)])
+    def test_matches_brute_force(self, n, m):
+        """Test the total cost is optimal on small random instances"""
+        rnd = random.Random(n * 10 + m)
+        for _ in range(20):
+            cost = aleatoria(rnd, n, m, infactibles=0.3)
+            columnas = hungarian(cost)
+            assert all(j is None or cost[i][j] != INFEASIBLE for i, j in enumerate(columnas))
+            assert coste(cost, columnas) == pytest.approx(optimo(cost))
+
+    def test_columns_used_once(self):
+        """Test no column is given to two rows"""
+        columnas = hungarian(aleatoria(random.Random(1), 40, 25))
+        usadas = [j for j in columnas if j is not None]
+        assert len(usadas) == len(set(usadas)) == 25
+
+class TestAuction:
+    """Test cases for the auction heuristic"""
+
+    @pytest.mark.parametrize("n,m", [(60, 60), (80, 50), (50, 80)])
+    def test_close_to_hungarian(self, n, m):
+        """Test the auction is within 1% of the optimum"""
+        cost = aleatoria(random.Random(n + m), n, m)
+        exacto = coste(cost, hungarian(cost))
+        columnas = auction(cost)
+        usadas = [j for j in columnas if j is not None]
+        assert len(usadas) == len(set(usadas)) == min(n, m)
+        assert coste(cost, columnas) <= exacto * 1.01
+
+    def test_infeasible_cells(self):
+        """Test rows without a feasible column stay unassigned"""
+        cost = [[INFEASIBLE, INFEASIBLE], [5.0, INFEASIBLE], [1.0, 2.0]]
+        assert auction(cost) == [None, 0, 1]
+
+class TestGreedyLocalSearch:
+    """Test cases for the multi-load heuristic"""
+
+    def test_capacity_and_count_respected(self):
+        """Test no column exceeds its capacity or row count"""
+        rnd = random.Random(3)
+        cost = aleatoria(rnd, 120, 20)
+        pesos = [rnd.uniform(1, 10) for _ in range(120)]
+        capacidades = [rnd.uniform(10, 40) for _ in range(20)]
+
+        columnas = greedy_local_search(cost, pesos, capacidades, max_por_columna=4)
+
+        for j in range(20):
+            filas = [i for i, c in enumerate(columnas) if c == j]
+            assert len(filas) <= 4
+            assert sum(pesos[i] for i in filas) <= capacidades[j] + 1e-9
+
+    def test_constrained_rows_first(self):
+        """Test a row with a single option is not crowded out by a cheaper one"""
+        cost = [[1.0, 2.0], [1.5, INFEASIBLE]]
+        assert greedy_local_search(cost, [1, 1], [1, 1], max_por_columna=1) == [1, 0]
+
+class TestOptimizadorAsignacion:
+    """Test cases for OptimizadorAsignacion"""
+
+    def test_nearest_vehicles(self):
+        """Test each load goes to the vehicle that minimizes the total distance"""
+        cargas = [carga("C1", 40.0, -3.7), carga("C2", 41.4, 2.2)]
+        vehiculos = [(vehiculo("BCN"), (41.38, 2.17)), (vehiculo("MAD"), (40.42, -3.7))]
+
+        plan = OptimizadorAsignacion().optimizar(cargas, vehiculos)
+
+        assert plan.metodo == "hungaro"
+        assert {a.carga_id: a.vehiculo_id for a in plan.asignaciones} == {"C1": "MAD", "C2": "BCN"}
+        assert plan.distancia_total_km == pytest.approx(sum(a.distancia_km for a in plan.asignaciones))
+
+    def test_unassigned_reasons(self):
+        """Test loads that cannot be assigned report why"""
+        cargas = [
+            carga("SIN", 0, 0),
+            carga("PESADA", 40.0, -3.7, peso=30000),
+            carga("C1", 40.0, -3.7),
+            carga("C2", 40.01, -3.7),
+        ]
+        cargas[0].origen = "Calle Mayor 1, Madrid"
+
+        plan = OptimizadorAsignacion().optimizar(cargas, [(vehiculo("V1"), (40.0, -3.7))])
+
+        assert [a.carga_id for a in plan.asignaciones] == ["C1"]
+        assert plan.sin_asignar == {
+            "SIN": "origen sin coordenadas",
+            "PESADA": "ningun vehiculo con capacidad a distancia",
+            "C2": "vehiculos adecuados ya asignados",
+        }
+
+    def test_distance_limit(self):
+        """Test vehicles beyond the maximum distance are not used"""
+        plan = OptimizadorAsignacion(distancia_max_km=50).optimizar(
+            [carga("C1", 40.0, -3.7)], [(vehiculo("BCN"), (41.38, 2.17))]
+        )
+        assert plan.asignaciones == []
+        assert plan.sin_asignar == {"C1": "ningun vehiculo con capacidad a distancia"}
+
+    def test_multiple_loads_per_vehicle(self):
+        """Test a vehicle takes several loads within its capacity"""
+        cargas = [carga(f"C{i}", 40.0 + i * 0.01, -3.7, peso=10000) for i in range(3)]
+        plan = OptimizadorAsignacion(max_cargas_por_vehiculo=3).optimizar(
+            cargas, [(vehiculo("V1"), (40.0, -3.7)), (vehiculo("V2", capacidad=10000), (41.0, -3.7))]
+        )
+
+        por_vehiculo = {}
+        for a in plan.asignaciones:
+            por_vehiculo.setdefault(a.vehiculo_id, []).append(a.carga_id)
+        assert plan.metodo == "voraz_busqueda_local"
+        assert len(por_vehiculo["V1"]) == 2 and len(por_vehiculo["V2"]) == 1
+
+    @pytest.mark.parametrize("n,m,max_cargas", [(300, 300, 1), (800, 600, 1), (800, 200, 5)])
+    def test_hundreds_of_loads(self, n, m, max_cargas):
+        """Test hundreds of loads are all assigned while vehicles are left; timings are in benchmarks/"""
+        rnd = random.Random(n + m)
+        cargas = [carga(f"C{i}", rnd.uniform(36, 43), rnd.uniform(-9, 3), peso=rnd.uniform(500, 5000))
+                  for i in range(n)]
+        vehiculos = [(vehiculo(f"V{j}"), (rnd.uniform(36, 43), rnd.uniform(-9, 3))) for j in range(m)]
+
+        plan = OptimizadorAsignacion(max_cargas_por_vehiculo=max_cargas).optimizar(cargas, vehiculos)
+
+        assert len(plan.asignaciones) == min(n, m * max_cargas)
+
+class AvailableFleet(VehiculoRepository):
+    """Vehicle repository whose vehicles are all available"""
+
+    def __init__(self, vehiculos):
+        self.vehiculos = vehiculos
+
+    def find_disponibles(self): return self.vehiculos
+    def find_all(self): return self.vehiculos
+    def save(self, vehiculo): pass
+    def find_by_id(self, vehiculo_id): pass
+    def find_by_flota(self, flota_id): return []
+    def find_by_estado(self, estado): return []
+    def find_by_matriculas(self, matriculas): return {}
+    def delete(self, vehiculo_id): pass
+
+class TestAsignarCargasUseCase:
+    """Test the assignment use case over the stored loads"""
+
+    @pytest.fixture
+    def use_case(self):
+        repo = InMemoryCargaRepository()
+        repo.save(carga("C1", 40.0, -3.7))
+        repo.save(carga("C2", 41.0, -3.7))
+        asignada = carga("C3", 40.0, -3.7)
+        asignada.asignar_vehiculo("V9")
+        repo.save(asignada)
+        entregada = carga("C4", 40.0, -3.7)
+        entregada.cambiar_estado(EstadoCarga.ENTREGADA)
+        repo.save(entregada)
+
+        v1 = vehiculo("V1")
+        v1.flota_id = "F1"
+        v1.fecha_ultimo_mantenimiento = datetime.now()
+        store = PositionHistoryStore()
+        store.ingest([("vehiculo", "V1", 0.0, 40.0, -3.7)])
+        return AsignarCargasUseCase(repo, AvailableFleet([v1]), store, OptimizadorAsignacion())
+
+    def test_all_pending_loads(self, use_case):
+        """Test every stored pending load is planned and assigned ones are reported"""
+        plan = use_case.execute()
+
+        assert [a.carga_id for a in plan.asignaciones] == ["C1"]
+        assert plan.sin_asignar == {"C2": "vehiculos adecuados ya asignados", "C3": "ya asignada a un vehiculo"}
+
+    def test_selected_loads_reported(self, use_case):
+        """Test selected loads that cannot be planned are listed with the reason"""
+        plan = use_case.execute(["C2", "C3", "C4", "C5"])
+
+        assert [a.carga_id for a in plan.asignaciones] == ["C2"]
+        assert plan.sin_asignar == {
+            "C3": "ya asignada a un vehiculo",
+            "C4": "carga no pendiente",
+            "C5": "carga no encontrada"
+        }
@@ -88,8 +88,29 @@ class TestCarga:
         carga.actualizar_ubicacion(coordenadas)
 
         assert carga.coordenadas_actuales == coordenadas
+        assert carga.posicion_actual.latitud == 40.4168
+        assert carga.posicion_actual.longitud == -3.7038
         assert carga.ultima_actualizacion is not None
 
+    def test_actualizar_ubicacion_con_coordenadas(self):
+        """Test updating the location with typed coordinates"""
+        from src.domain.value_objects.direccion import Coordenadas
+        carga = self._crear_carga_basica()
+
+        carga.actualizar_ubicacion(Coordenadas(latitud=41.3874, longitud=2.1686))
+
+        assert carga.coordenadas_actuales == "41.3874,2.1686"
+        assert carga.posicion_actual.longitud == 2.1686
+
+    def test_actualizar_ubicacion_texto_invalido(self):
+        """Test unparsable text is kept without a typed position"""
+        carga = self._crear_carga_basica()
+
+        carga.actualizar_ubicacion("cerca de Madrid")
+
+        assert carga.coordenadas_actuales == "cerca de Madrid"
+        assert carga.posicion_actual is None
+
     def test_calcular_tiempo_transito(self):
         """Test calculating transit time"""
         carga = self._crear_carga_basica()
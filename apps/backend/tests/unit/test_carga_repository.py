@@ -0,0 +1,146 @@
+"""
+Unit tests for the load repositories
+"""
+import copy
+import gc
+import pickle
+import weakref
+import pytest
+from src.domain.entities.carga import Carga, EstadoCarga
+from src.infrastructure.repositories.carga_repository import InMemoryCargaRepository, SQLAlchemyCargaRepository
+
+def ids(cargas):
+    return sorted(carga.id for carga in cargas)
+
+@pytest.fixture
+def repository(repositorio):
+    """Each test runs against both implementations"""
+    return repositorio(InMemoryCargaRepository, SQLAlchemyCargaRepository)
+
+@pytest.fixture
+def populated(repository, make_carga):
+    """Repository holding loads in different states and assignments"""
+    repository.save(make_carga("C1", flota_id="F1", transportista_id="T1", vehiculo_id="V1"))
+    repository.save(make_carga("C2", flota_id="F1", estado=EstadoCarga.EN_TRANSITO, vehiculo_id="V2"))
+    repository.save(make_carga("C3", flota_id="F2", transportista_id="T1", estado=EstadoCarga.EN_TRANSITO))
+    repository.save(make_carga("C4", estado=EstadoCarga.ENTREGADA))
+    return repository
+
+class TestCargaRepository:
+    """Test cases shared by both CargaRepository implementations"""
+
+    def test_find_by_id(self, populated):
+        """Test a saved load is found with its fields"""
+        carga = populated.find_by_id("C2")
+        assert carga.estado == EstadoCarga.EN_TRANSITO
+        assert carga.vehiculo_id == "V2"
+        assert populated.find_by_id("NONE") is None
+
+    def test_finders(self, populated):
+        """Test every indexed lookup"""
+        assert ids(populated.find_all()) == ["C1", "C2", "C3", "C4"]
+        assert ids(populated.find_en_transito()) == ["C2", "C3"]
+        assert ids(populated.find_by_estado("pendiente")) == ["C1"]
+        assert ids(populated.find_by_estado(EstadoCarga.ENTREGADA)) == ["C4"]
+        assert ids(populated.find_by_flota("F1")) == ["C1", "C2"]
+        assert ids(populated.find_by_transportista("T1")) == ["C1", "C3"]
+        assert ids(populated.find_by_vehiculo("V2")) == ["C2"]
+        assert populated.find_by_flota("F9") == []
+
+    def test_save_replaces(self, populated):
+        """Test saving a changed load moves it between lookups"""
+        carga = populated.find_by_id("C1")
+        carga.cambiar_estado(EstadoCarga.EN_TRANSITO)
+        carga.asignar_flota("F2")
+        populated.save(carga)
+
+        assert ids(populated.find_en_transito()) == ["C1", "C2", "C3"]
+        assert ids(populated.find_by_flota("F2")) == ["C1", "C3"]
+        assert ids(populated.find_by_flota("F1")) == ["C2"]
+
+    def test_delete(self, populated):
+        """Test a deleted load disappears from every lookup"""
+        populated.delete("C2")
+        populated.delete("NONE")
+
+        assert populated.find_by_id("C2") is None
+        assert ids(populated.find_en_transito()) == ["C3"]
+        assert populated.find_by_vehiculo("V2") == []
+
+class TestInMemoryCargaIndexes:
+    """Test cases for the index maintenance of InMemoryCargaRepository"""
+
+    def test_mutators_update_indexes_without_save(self, make_carga):
+        """Test cambiar_estado and asignar_* keep the indexes current"""
+        repository = InMemoryCargaRepository()
+        carga = make_carga("C1")
+        repository.save(carga)
+
+        carga.cambiar_estado(EstadoCarga.EN_TRANSITO)
+        carga.asignar_vehiculo("V1")
+        carga.asignar_transportista("T1")
+        carga.asignar_flota("F1")
+
+        assert repository.find_en_transito() == [carga]
+        assert repository.find_by_estado(EstadoCarga.PENDIENTE) == []
+        assert repository.find_by_vehiculo("V1") == [carga]
+        assert repository.find_by_transportista("T1") == [carga]
+        assert repository.find_by_flota("F1") == [carga]
+
+    def test_direct_assignment_picked_up_on_save(self, make_carga):
+        """Test fields set directly are reindexed by the next save"""
+        repository = InMemoryCargaRepository()
+        carga = make_carga("C1")
+        repository.save(carga)
+
+        carga.flota_id = "F1"
+        assert repository.find_by_flota("F1") == []
+        repository.save(carga)
+
+        assert repository.find_by_flota("F1") == [carga]
+        assert ids(repository.find_all()) == ["C1"]
+
+    def test_replaced_and_deleted_loads_are_ignored(self, make_carga):
+        """Test loads no longer stored do not touch the indexes"""
+        repository = InMemoryCargaRepository()
+        original = make_carga("C1")
+        repository.save(original)
+        copia = original.model_copy()
+        repository.save(make_carga("C1", flota_id="F1"))
+
+        original.asignar_flota("F2")
+        copia.cambiar_estado(EstadoCarga.PERDIDA)
+        assert ids(repository.find_by_flota("F1")) == ["C1"]
+        assert repository.find_by_flota("F2") == []
+        assert repository.find_by_estado(EstadoCarga.PERDIDA) == []
+
+        repository.delete("C1")
+        original.asignar_flota("F3")
+        assert repository.find_by_flota("F3") == []
+        assert repository.find_all() == []
+
+    def test_stored_loads_stay_plain_values(self, make_carga):
+        """Test observing a load leaves equality, copies and pickling unchanged"""
+        repository = InMemoryCargaRepository()
+        carga = make_carga("C1")
+        repository.save(carga)
+        fresh = Carga(**carga.model_dump())
+
+        assert carga == fresh
+        assert copy.deepcopy(carga) == fresh
+        assert pickle.loads(pickle.dumps(carga)) == fresh
+        assert b"InMemoryCargaRepository" not in pickle.dumps(carga)
+
+    def test_loads_do_not_keep_repository_alive(self, make_carga):
+        """Test the observer is held weakly and dropped from replaced loads"""
+        repository = InMemoryCargaRepository()
+        original = make_carga("C1")
+        repository.save(original)
+        repository.save(make_carga("C1"))
+        referencia = weakref.ref(repository)
+
+        del repository
+        gc.collect()
+        original.asignar_flota("F1")
+
+        assert referencia() is None
@@ -0,0 +1,98 @@
+"""
+Unit tests for the change event bus
+"""
+from src.domain.entities.evento_cambio import OperacionCambio, TipoEntidad
+from src.domain.entities.flota import Flota
+from src.domain.services.change_events import ChangeEventBus
+from src.infrastructure.repositories.carga_repository import InMemoryCargaRepository
+from src.infrastructure.repositories.flota_repository import InMemoryFlotaRepository
+
+class TestChangeEventBus:
+    """Test cases for ChangeEventBus"""
+
+    def test_sequence_and_resume(self):
+        """Test events are numbered and read after an offset"""
+        bus = ChangeEventBus()
+        for i in range(5):
+            bus.eliminado(TipoEntidad.CARGA, f"C{i}")
+
+        assert [e.secuencia for e in bus.eventos()] == [1, 2, 3, 4, 5]
+        assert [e.entidad_id for e in bus.eventos(despues=3)] == ["C3", "C4"]
+        assert [e.secuencia for e in bus.eventos(despues=1, limit=2)] == [2, 3]
+        assert bus.eventos(despues=5) == []
+        assert bus.ultima_secuencia == 5
+
+    def test_filter_by_entity(self):
+        """Test reading only some entity kinds"""
+        bus = ChangeEventBus()
+        bus.eliminado(TipoEntidad.CARGA, "C1")
+        bus.eliminado(TipoEntidad.FLOTA, "F1")
+        bus.eliminado(TipoEntidad.VEHICULO, "V1")
+
+        eventos = bus.eventos(entidades=[TipoEntidad.FLOTA, TipoEntidad.VEHICULO], limit=1)
+        assert [e.entidad_id for e in eventos] == ["F1"]
+
+    def test_dropped_events_reported(self):
+        """Test a consumer behind the retained log is told to reload"""
+        bus = ChangeEventBus(max_eventos=3)
+        for i in range(5):
+            bus.eliminado(TipoEntidad.CARGA, f"C{i}")
+
+        assert bus.perdidos(0) and bus.perdidos(1)
+        assert not bus.perdidos(2) and not bus.perdidos(5)
+        assert [e.secuencia for e in bus.eventos(despues=0)] == [3, 4, 5]
+
+        bus.clear()
+        assert bus.perdidos(4) and not bus.perdidos(5)
+        assert bus.eliminado(TipoEntidad.CARGA, "C5").secuencia == 6
+
+    def test_offset_from_before_restart_reported(self):
+        """Test an offset past the latest event counts as lost, since the sequence restarted"""
+        bus = ChangeEventBus()
+        bus.eliminado(TipoEntidad.CARGA, "C1")
+
+        assert bus.perdidos(7)
+        assert not bus.perdidos(1)
+
+    def test_subscribers(self):
+        """Test subscribers get each event until they cancel"""
+        bus = ChangeEventBus()
+        recibidos = []
+        bus.suscribir(recibidos.append)
+        bus.eliminado(TipoEntidad.FLOTA, "F1")
+        bus.cancelar(recibidos.append)
+        bus.eliminado(TipoEntidad.FLOTA, "F2")
+
+        assert [e.entidad_id for e in recibidos] == ["F1"]
+
+class TestRepositoryEvents:
+    """Test cases for the events published by the repositories"""
+
+    def test_flota_repository(self):
+        """Test fleet saves carry the fleet and deletes only its ID"""
+        bus = ChangeEventBus()
+        repository = InMemoryFlotaRepository(eventos=bus)
+        repository.save(Flota(id="F1", nombre="Flota Norte"))
+        repository.delete("F1")
+
+        guardado, eliminado = bus.eventos()
+        assert (guardado.entidad, guardado.operacion) == (TipoEntidad.FLOTA, OperacionCambio.GUARDADO)
+        assert guardado.datos["nombre"] == "Flota Norte"
+        assert (eliminado.entidad_id, eliminado.operacion, eliminado.datos) == ("F1", OperacionCambio.ELIMINADO, None)
+
+    def test_carga_repository(self, make_carga):
+        """Test load events are published on save, not on observed changes"""
+        bus = ChangeEventBus()
+        repository = InMemoryCargaRepository(eventos=bus)
+        carga = make_carga("C1")
+        repository.save(carga)
+        carga.asignar_vehiculo("V1")
+        assert bus.ultima_secuencia == 1
+
+        repository.save(carga)
+        repository.delete("C1")
+        repository.delete("C1")
+
+        eventos = bus.eventos()
+        assert [e.operacion for e in eventos] == [OperacionCambio.GUARDADO] * 2 + [OperacionCambio.ELIMINADO]
+        assert eventos[1].datos["vehiculo_id"] == "V1"
@@ -0,0 +1,85 @@
+"""
+Unit tests for the CMR extraction result cache
+"""
+import pytest
+from src.domain.entities.cmr_document import RawCMRData
+from src.domain.services.cmr_cache import CMRResultCache
+from src.domain.services.cmr_normalizer import CMRNormalizer, MockCMRExtractor
+from src.application.use_cases.cmr_use_cases import ProcesarCMRUseCase
+from src.infrastructure.cmr_result_store import DiskCMRResultStore
+
+class CountingExtractor(MockCMRExtractor):
+    """Mock extractor that counts extractions"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def extract_data(self, document_bytes: bytes) -> RawCMRData:
+        self.calls += 1
+        return super().extract_data(document_bytes)
+
+class FailingExtractor(CountingExtractor):
+    """Extractor that always fails"""
+
+    def extract_data(self, document_bytes: bytes) -> RawCMRData:
+        self.calls += 1
+        raise RuntimeError("OCR unavailable")
+
+class TestCMRResultCache:
+    """Test cases for CMRResultCache"""
+
+    def test_key_depends_on_content_and_version(self):
+        """Test keys change with the bytes and with the extractor version"""
+        key = CMRResultCache.key(b"pdf", "1")
+
+        assert key == CMRResultCache.key(b"pdf", "1")
+        assert key != CMRResultCache.key(b"pdf2", "1")
+        assert key != CMRResultCache.key(b"pdf", "2")
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first"""
+        cache = CMRResultCache(max_entries=2)
+        cache.put("a", {"n": 1})
+        cache.put("b", {"n": 2})
+        cache.get("a")
+        cache.put("c", {"n": 3})
+
+        assert cache.get("a") == {"n": 1}
+        assert cache.get("b") is None
+        assert cache.get("c") == {"n": 3}
+        assert len(cache) == 2
+
+    def test_disk_tier_survives_new_instance(self, tmp_path):
+        """Test entries written to disk are found by another cache"""
+        CMRResultCache(store=DiskCMRResultStore(tmp_path)).put("abcdef", {"n": 1})
+
+        cache = CMRResultCache(store=DiskCMRResultStore(tmp_path))
+
+        assert cache.get("abcdef") == {"n": 1}
+        assert cache.get("missing") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert len(cache) == 1
+
+class TestProcesarCMRUseCaseCache:
+    """Test result caching in ProcesarCMRUseCase"""
+
+    def test_duplicate_upload_skips_extraction(self):
+        """Test the second upload of the same bytes is served from cache"""
+        extractor = CountingExtractor()
+        use_case = ProcesarCMRUseCase(CMRNormalizer(extractor), cache=CMRResultCache())
+
+        first = use_case.execute(b"same pdf")
+        second = use_case.execute(b"same pdf")
+
+        assert extractor.calls == 1
+        assert second == first
+
+    def test_failed_extraction_is_not_cached(self):
+        """Test error results are retried on the next upload"""
+        extractor = FailingExtractor()
+        use_case = ProcesarCMRUseCase(CMRNormalizer(extractor), cache=CMRResultCache())
+
+        use_case.execute(b"bad pdf")
+        use_case.execute(b"bad pdf")
+
+        assert extractor.calls == 2
@@ -0,0 +1,36 @@
+"""
+Unit tests for the synthetic CMR benchmark corpus
+"""
+import pytest
+from benchmarks.cmr_corpus import build_text_pdf, generate_corpus
+from benchmarks.bench_cmr import summarize
+from src.domain.services.cmr_normalizer import CMRNormalizer
+from src.domain.services.pdf_text_extractor import PDFTextCMRExtractor
+
+class TestCMRCorpus:
+    """Test cases for the benchmark corpus"""
+
+    def test_corpus_is_deterministic(self):
+        """Test the same seed produces the same corpus"""
+        assert generate_corpus(20, seed=7) == generate_corpus(20, seed=7)
+        assert generate_corpus(20, seed=7) != generate_corpus(20, seed=8)
+
+    def test_corpus_matches_normalizer_output(self):
+        """Test the ground truth agrees with what the pipeline extracts"""
+        normalizer = CMRNormalizer(PDFTextCMRExtractor())
+
+        for text, expected in generate_corpus(60):
+            document = normalizer.normalize_document(build_text_pdf(text, ["Albarán"]))
+
+            assert document.numero_cmr == expected["numero_cmr"]
+            assert document.matricula_vehiculo == expected["matricula_vehiculo"]
+            assert document.carga.peso_bruto == expected["peso_bruto"]
+
+    def test_summarize_percentiles(self):
+        """Test throughput and percentile reporting"""
+        result = summarize([i / 1000 for i in range(1, 101)], elapsed=2.0)
+
+        assert result["docs"] == 100
+        assert result["docs_per_sec"] == 50.0
+        assert result["p50_ms"] == pytest.approx(50.5)
+        assert result["p99_ms"] == pytest.approx(99.01)
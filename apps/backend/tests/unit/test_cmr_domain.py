@@ -1,9 +1,10 @@
 """
 Unit tests for CMR domain entities and services
 """
+import time
 import pytest
 from datetime import datetime
-from domain.entities.cmr_document import (
+from src.domain.entities.cmr_document import (
     CMRDocument,
     Remitente,
     Destinatario,
@@ -12,7 +13,7 @@ from domain.entities.cmr_document import (
     EstadoCMR,
     RawCMRData
 )
-from domain.services.cmr_normalizer import CMRNormalizer, MockCMRExtractor
+from src.domain.services.cmr_normalizer import CMRNormalizer, MockCMRExtractor, _FIELD_LABELS, _scan_mandatory
 
 class TestCMRDocument:
     """Test CMR document entity"""
@@ -175,3 +176,185 @@ class TestCMRNormalizer:
         assert carga.volumen == 8.0
         assert carga.unidades == 30
         assert carga.valor_mercancia == 5000.0
+
+    def test_parse_multilingual_labels(self):
+        """Test French and English labels map to the same fields"""
+        normalizer = CMRNormalizer(MockCMRExtractor())
+
+        text = """
+        No CMR: CMR-2024-009999
+        DATES
+        Date of issue: 02/03/2024
+        Date de livraison: 05/03/2024
+        VEHICLE
+        Immatriculation: 9876-XYZ
+        Driver: Anne Martin
+        LOAD
+        Description: Palettes
+        Gross weight: 800 kg
+        """
+
+        data = normalizer._parse_raw_data(text)
+
+        assert data["numero_cmr"] == "CMR-2024-009999"
+        assert data["fecha_emision"] == datetime(2024, 3, 2)
+        assert data["fecha_entrega"] == datetime(2024, 3, 5)
+        assert data["matricula_vehiculo"] == "9876-XYZ"
+        assert data["conductor"] == "Anne Martin"
+        assert data["carga"].peso_bruto == 800.0
+
+    def test_parse_party_ignores_labelled_lines(self):
+        """Test contact lines do not leak into the party address"""
+        normalizer = CMRNormalizer(MockCMRExtractor())
+
+        data = normalizer._parse_raw_data(MockCMRExtractor().extract_data(b"").raw_text)
+
+        assert data["remitente"].ciudad == "Madrid"
+        assert data["remitente"].pais == "España"
+
+    def test_parse_headers_match_whole_lines(self):
+        """Test a party name starting with a section keyword is not a header"""
+        normalizer = CMRNormalizer(MockCMRExtractor())
+
+        text = """
+        SENDER 1:
+        SENDER LOGISTICS SL
+        Calle Mayor 1
+        Madrid, España
+        RECIPIENT / DESTINATAIRE
+        LOAD MASTERS LTD
+        High Street 2
+        London, UK
+        """
+
+        data = normalizer._parse_raw_data(text)
+
+        assert data["remitente"].nombre == "SENDER LOGISTICS SL"
+        assert data["remitente"].ciudad == "Madrid"
+        assert data["destinatario"].nombre == "LOAD MASTERS LTD"
+        assert data["destinatario"].pais == "UK"
+
+    def test_parse_mixed_case_headers(self):
+        """Test headers are recognized whatever their case"""
+        normalizer = CMRNormalizer(MockCMRExtractor())
+
+        text = """
+        Remitente / Sender
+        Transportes Norte S.L.
+        Calle Real 1
+        Bilbao, España
+        Destinatario:
+        Frío Sur S.A.
+        Avenida 2
+        Sevilla, España
+        """
+
+        data = normalizer._parse_raw_data(text)
+
+        assert data["remitente"].nombre == "Transportes Norte S.L."
+        assert data["destinatario"].ciudad == "Sevilla"
+
+    def test_parse_adversarial_text_is_linear(self):
+        """Test repeated section headers without content parse quickly"""
+        normalizer = CMRNormalizer(MockCMRExtractor())
+        text = "REMITENTE / x\n" * 20000
+
+        start = time.perf_counter()
+        data = normalizer._parse_raw_data(text)
+        elapsed = time.perf_counter() - start
+
+        assert data["numero_cmr"] == "CMR-UNKNOWN"
+        assert elapsed < 2.0
+
+class TestEarlyExitNormalization:
+    """Test mandatory-field checks before full parsing"""
+
+    class TextExtractor(MockCMRExtractor):
+        def __init__(self, text, scores=None):
+            self.text = text
+            self.scores = scores or {}
+
+        def extract_data(self, document_bytes):
+            return RawCMRData(raw_text=self.text, confidence_scores=self.scores)
+
+    def test_complete_document(self):
+        """Test a valid document is fully parsed and keeps its confidences"""
+        normalizer = CMRNormalizer(MockCMRExtractor())
+
+        result = normalizer.normalize_with_early_exit(b"mock pdf content")
+
+        assert result.complete
+        assert result.errors == []
+        assert result.document.numero_cmr == "CMR-2024-001234"
+        assert result.document.confianza_campos["matricula"] == 0.98
+        assert result.fields["peso_bruto"].value == 2500.0
+        assert result.fields["peso_bruto"].confidence == 0.85
+
+    def test_missing_fields_reject_with_partial_result(self):
+        """Test a document without plate or weight is rejected with what was found"""
+        text = "Fecha de emisión: 01/02/2024\nN° CMR: CMR-2024-000042\nruido " * 3
+        normalizer = CMRNormalizer(self.TextExtractor(text, {"numero_cmr": 0.9}))
+
+        result = normalizer.normalize_with_early_exit(b"x")
+
+        assert not result.complete
+        assert result.document is None
+        assert result.fields["numero_cmr"].value == "CMR-2024-000042"
+        assert result.fields["numero_cmr"].accepted
+        assert not result.fields["matricula_vehiculo"].accepted
+        assert "Missing mandatory field: peso_bruto" in result.errors
+
+    def test_low_confidence_rejects(self):
+        """Test a mandatory field below the threshold rejects the document"""
+        text = "CMR: CMR-2024-000001\nMatrícula: 1234-ABC\nPoids brut: 900 kg"
+        normalizer = CMRNormalizer(self.TextExtractor(text, {"numero_cmr": 0.9, "matricula": 0.3, "carga": 0.9}))
+
+        rejected = normalizer.normalize_with_early_exit(b"x", min_confidence=0.5)
+        accepted = normalizer.normalize_with_early_exit(b"x", min_confidence=0.2)
+
+        assert not rejected.complete
+        assert rejected.fields["matricula_vehiculo"].value == "1234-ABC"
+        assert rejected.fields["matricula_vehiculo"].confidence == 0.3
+        assert accepted.complete
+        assert accepted.document.carga.peso_bruto == 900.0
+
+    def test_missing_confidence_rejects(self):
+        """Test a mandatory field the extractor reports no confidence for is not accepted"""
+        text = "CMR: CMR-2024-000001\nMatrícula: 1234-ABC\nPoids brut: 900 kg"
+        normalizer = CMRNormalizer(self.TextExtractor(text, {"numero_cmr": 0.9, "matricula": 0.9}))
+
+        result = normalizer.normalize_with_early_exit(b"x", min_confidence=0.0)
+
+        assert not result.complete
+        assert result.fields["peso_bruto"].value == 900.0
+        assert result.fields["peso_bruto"].confidence is None
+        assert not result.fields["peso_bruto"].accepted
+        assert result.errors == ["No confidence reported for peso_bruto"]
+
+    def test_mandatory_pattern_covers_labels(self):
+        """Test every label of a mandatory field is found by the single-pass scan"""
+        values = {"numero_cmr": "CMR-1", "matricula_vehiculo": "1234-ABC", "peso_bruto": "12 kg"}
+        expected = {"numero_cmr": "CMR-1", "matricula_vehiculo": "1234-ABC", "peso_bruto": 12.0}
+        for label, field in _FIELD_LABELS.items():
+            field = "matricula_vehiculo" if field == "matricula" else field
+            if field in expected:
+                assert _scan_mandatory(f"{label.title()}: {values[field]}")[field] == expected[field], label
+
+    def test_extractor_failure(self):
+        """Test extractor errors are reported instead of raised"""
+        class FailingExtractor(MockCMRExtractor):
+            def extract_data(self, document_bytes):
+                raise Exception("OCR processing failed")
+
+        result = CMRNormalizer(FailingExtractor()).normalize_with_early_exit(b"x")
+
+        assert not result.complete
+        assert result.errors == ["Extraction failed: OCR processing failed"]
+
+    def test_check_document(self):
+        """Test cached documents are checked against the same rules"""
+        normalizer = CMRNormalizer(MockCMRExtractor())
+        document = normalizer.normalize_document(b"mock pdf content")
+
+        assert normalizer.check_document(document).complete
+        assert not normalizer.check_document(document, min_confidence=0.9).complete
@@ -0,0 +1,103 @@
+"""
+Unit tests for the CMR document repositories
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from src.infrastructure.repositories.cmr_repository import InMemoryCMRRepository, SQLAlchemyCMRRepository
+
+@pytest.fixture
+def repository(repositorio):
+    """Each test runs against both implementations"""
+    return repositorio(InMemoryCMRRepository, SQLAlchemyCMRRepository)
+
+@pytest.fixture
+def populated(repository, make_document):
+    """Repository holding documents for two plates across two months"""
+    documents = [
+        make_document("CMR-2024-000003", "1234-ABC", datetime(2024, 3, 15)),
+        make_document("CMR-2024-000001", "1234-ABC", datetime(2024, 3, 1)),
+        make_document("CMR-2024-000002", "9876-XYZ", datetime(2024, 3, 1)),
+        make_document("CMR-2024-000004", "1234-ABC", datetime(2024, 4, 1)),
+        make_document("CMR-2024-000005", "1234-ABC", datetime(2024, 2, 29, 23, 59)),
+    ]
+    for document in documents:
+        repository.save(document)
+    return repository
+
+def numeros(documents):
+    return [document.numero_cmr for document in documents]
+
+class TestCMRRepository:
+    """Test cases shared by the CMR repositories"""
+
+    def test_find_by_numero(self, populated):
+        """Test lookup by CMR number returns the stored document"""
+        document = populated.find_by_numero("CMR-2024-000002")
+
+        assert document.matricula_vehiculo == "9876-XYZ"
+        assert document.carga.peso_bruto == 1000.0
+        assert populated.find_by_numero("CMR-MISSING") is None
+
+    def test_find_all_is_ordered_by_issue_date(self, populated):
+        """Test documents come oldest first, ties broken by number"""
+        assert numeros(populated.find_all()) == [
+            "CMR-2024-000005", "CMR-2024-000001", "CMR-2024-000002", "CMR-2024-000003", "CMR-2024-000004"
+        ]
+
+    def test_plate_within_month(self, populated):
+        """Test the month range includes its first instant and excludes the next month"""
+        result = populated.search("1234-ABC", datetime(2024, 3, 1), datetime(2024, 4, 1))
+
+        assert numeros(result) == ["CMR-2024-000001", "CMR-2024-000003"]
+        assert populated.count("1234-ABC", datetime(2024, 3, 1), datetime(2024, 4, 1)) == 2
+
+    def test_open_ranges(self, populated):
+        """Test ranges with only one bound"""
+        assert numeros(populated.search(desde=datetime(2024, 3, 15))) == ["CMR-2024-000003", "CMR-2024-000004"]
+        assert numeros(populated.search(hasta=datetime(2024, 3, 1))) == ["CMR-2024-000005"]
+        assert populated.find_by_matricula("UNKNOWN") == []
+
+    def test_pagination(self, populated):
+        """Test offset and limit select a page of the ordered results"""
+        first = populated.search(matricula="1234-ABC", limit=2)
+        second = populated.search(matricula="1234-ABC", offset=2, limit=2)
+        beyond = populated.search(matricula="1234-ABC", offset=10, limit=2)
+
+        assert numeros(first) == ["CMR-2024-000005", "CMR-2024-000001"]
+        assert numeros(second) == ["CMR-2024-000003", "CMR-2024-000004"]
+        assert beyond == []
+        assert populated.count(matricula="1234-ABC") == 4
+
+    def test_save_replaces_and_reindexes(self, populated, make_document):
+        """Test saving an existing number moves it in the plate and date indexes"""
+        populated.save(make_document("CMR-2024-000001", "9876-XYZ", datetime(2024, 5, 1), peso=2000.0))
+
+        assert numeros(populated.find_by_matricula("1234-ABC")) == [
+            "CMR-2024-000005", "CMR-2024-000003", "CMR-2024-000004"
+        ]
+        assert numeros(populated.find_by_matricula("9876-XYZ")) == ["CMR-2024-000002", "CMR-2024-000001"]
+        assert populated.find_by_numero("CMR-2024-000001").carga.peso_bruto == 2000.0
+        assert populated.count() == 5
+
+    def test_delete(self, populated):
+        """Test deleted documents disappear from every index"""
+        populated.delete("CMR-2024-000002")
+        populated.delete("CMR-MISSING")
+
+        assert populated.find_by_numero("CMR-2024-000002") is None
+        assert populated.find_by_matricula("9876-XYZ") == []
+        assert populated.count() == 4
+
+    def test_naive_and_aware_dates(self, populated, make_document):
+        """Test aware dates are stored and queried alongside naive ones, naive taken as UTC"""
+        madrid = timezone(timedelta(hours=2))
+        populated.save(make_document("CMR-2024-000006", "1234-ABC", datetime(2024, 3, 15, 14, 0, tzinfo=madrid)))
+        populated.save(make_document("CMR-2024-000007", "1234-ABC", datetime(2024, 3, 20, tzinfo=timezone.utc)))
+
+        desde = datetime(2024, 3, 15, 12, 0, tzinfo=timezone.utc)
+        assert numeros(populated.search("1234-ABC", desde, datetime(2024, 3, 20))) == ["CMR-2024-000006"]
+        assert numeros(populated.search("1234-ABC", hasta=datetime(2024, 3, 15, 12, 1))) == [
+            "CMR-2024-000005", "CMR-2024-000001", "CMR-2024-000003", "CMR-2024-000006"
+        ]
+        populated.delete("CMR-2024-000006")
+        assert populated.count(desde=desde) == 2
@@ -0,0 +1,101 @@
+"""
+Unit tests for the origin-destination distance cache
+"""
+import pytest
+from src.domain.services.distance_cache import DistanceCache
+from src.domain.value_objects.direccion import Coordenadas, Direccion, Ruta
+
+MADRID = (40.4168, -3.7038)
+BARCELONA = (41.3874, 2.1686)
+
+def direccion(coordenadas: str) -> Direccion:
+    return Direccion(calle="Calle 1", ciudad="Ciudad", codigo_postal="28001", coordenadas=coordenadas)
+
+class TestDistanceCache:
+    """Test cases for DistanceCache"""
+
+    def test_symmetric_and_quantized(self):
+        """Test both directions and equivalent spellings share one entry"""
+        cache = DistanceCache()
+
+        first = cache.distancia(MADRID, BARCELONA)
+        back = cache.distancia(BARCELONA, MADRID)
+        spelled = cache.distancia((40.41680001, -3.70380), (41.38740, 2.16860002))
+
+        assert first == back == spelled
+        assert len(cache) == 1
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_matches_exact_distance(self):
+        """Test quantization stays within its documented error"""
+        cache = DistanceCache()
+        exact = Coordenadas(latitud=40.41684, longitud=-3.70376).calcular_distancia(
+            Coordenadas(latitud=41.38736, longitud=2.16864))
+
+        assert cache.distancia((40.41684, -3.70376), (41.38736, 2.16864)) == pytest.approx(exact, abs=0.016)
+
+    def test_lru_eviction(self):
+        """Test the least recently used pair is evicted first"""
+        cache = DistanceCache(max_entries=2)
+        cache.distancia(MADRID, BARCELONA)
+        cache.distancia(MADRID, (39.4699, -0.3763))
+        cache.distancia(BARCELONA, MADRID)
+        cache.distancia(MADRID, (37.3891, -5.9845))
+
+        assert cache.key(MADRID, BARCELONA) in cache._entries
+        assert cache.key(MADRID, (39.4699, -0.3763)) not in cache._entries
+
+    def test_matrix(self):
+        """Test the matrix is symmetric, zero on the diagonal and served from warmed-up pairs"""
+        cache = DistanceCache()
+        puntos = [MADRID, BARCELONA, (39.4699, -0.3763)]
+        cache.precalentar(puntos)
+
+        matriz = cache.matriz(puntos)
+
+        assert [matriz[i][i] for i in range(3)] == [0.0, 0.0, 0.0]
+        assert matriz[0][1] == matriz[1][0] == cache.distancia(MADRID, BARCELONA)
+        assert (cache.hits, cache.misses) == (4, 0)
+
+    def test_warm_up(self):
+        """Test warming up computes each distinct pair once and later lookups hit"""
+        cache = DistanceCache()
+        depositos = [MADRID, BARCELONA, (39.4699, -0.3763), (37.3891, -5.9845), MADRID]
+
+        assert cache.precalentar(depositos) == 6
+        cache.distancia((39.4699, -0.3763), BARCELONA)
+        assert (cache.hits, cache.misses) == (1, 0)
+
+    def test_warm_up_limited_to_what_fits(self):
+        """Test more points than max_entries can pair up are rejected"""
+        cache = DistanceCache(max_entries=10)
+        assert cache.max_puntos_precalentar == 5
+
+        assert cache.precalentar([(40.0 + i, -3.7) for i in range(5)]) == 10
+        with pytest.raises(ValueError):
+            cache.precalentar([(40.0 + i, -3.7) for i in range(6)])
+
+class TestRutaDistancia:
+    """Test route distances, exact on the route and cached through the cache"""
+
+    def test_route_distance_is_exact(self):
+        ruta = Ruta(origen=direccion("40.41684,-3.70376"), destino=direccion("41.38736, 2.16864"))
+        exact = Coordenadas(latitud=40.41684, longitud=-3.70376).calcular_distancia(
+            Coordenadas(latitud=41.38736, longitud=2.16864))
+
+        assert ruta.calcular_distancia_total() == exact
+
+    def test_route_uses_cache(self):
+        cache = DistanceCache()
+        ruta = Ruta(origen=direccion("40.4168,-3.7038"), destino=direccion("41.3874, 2.1686"))
+
+        distancia = cache.distancia_ruta(ruta)
+        assert cache.distancia_ruta(ruta) == distancia
+        assert distancia == pytest.approx(ruta.calcular_distancia_total(), abs=0.016)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_route_without_coordinates(self):
+        ruta = Ruta(origen=direccion("40.4168,-3.7038"), destino=direccion("no es una posición"))
+
+        assert ruta.calcular_distancia_total() is None
+        assert DistanceCache().distancia_ruta(ruta) is None
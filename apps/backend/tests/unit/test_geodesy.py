@@ -0,0 +1,108 @@
+"""
+Unit tests for the geodesy module
+"""
+import math
+import random
+from itertools import combinations
+import pytest
+from src.domain.services import geodesy
+from src.domain.services.geodesy import (
+    distance_matrix_km,
+    equirectangular_km,
+    haversine_km,
+    haversine_km_batch,
+    haversine_legs,
+    pairwise_distances_km
+)
+from src.domain.value_objects.direccion import Coordenadas
+
+MADRID = (40.4168, -3.7038)
+BARCELONA = (41.3851, 2.1734)
+
+def destino(lat: float, lon: float, distancia_km: float, rumbo: float):
+    """Point roughly distancia_km away from (lat, lon) in direction rumbo (radians)"""
+    angulo = distancia_km / geodesy.EARTH_RADIUS_KM
+    return (lat + math.degrees(angulo * math.cos(rumbo)),
+            lon + math.degrees(angulo * math.sin(rumbo) / math.cos(math.radians(lat))))
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Run a test with numpy (when installed) and with the pure-Python path"""
+    if request.param == "numpy":
+        if geodesy.np is None:
+            pytest.skip("numpy is not installed")
+    else:
+        monkeypatch.setattr(geodesy, "np", None)
+    return request.param
+
+class TestHaversine:
+    """Test the exact distance"""
+
+    def test_known_distances(self):
+        assert haversine_km(*MADRID, *BARCELONA) == pytest.approx(505.44, abs=0.01)
+        assert haversine_km(*MADRID, *MADRID) == 0.0
+        assert haversine_km(0, 0, 0, 180) == pytest.approx(math.pi * geodesy.EARTH_RADIUS_KM)
+
+    def test_coordenadas_delegates(self):
+        madrid = Coordenadas(latitud=MADRID[0], longitud=MADRID[1])
+        barcelona = Coordenadas(latitud=BARCELONA[0], longitud=BARCELONA[1])
+
+        assert madrid.calcular_distancia(barcelona) == haversine_km(*MADRID, *BARCELONA)
+        assert madrid.calcular_distancia_aproximada(barcelona) == pytest.approx(505.44, rel=0.01)
+
+class TestBatch:
+    """Test the batched modes against the scalar distance"""
+
+    def test_batch_and_legs(self, backend):
+        rnd = random.Random(1)
+        lats = [rnd.uniform(-60, 60) for _ in range(50)]
+        lons = [rnd.uniform(-180, 180) for _ in range(50)]
+
+        expected = [haversine_km(lats[i], lons[i], lats[i + 1], lons[i + 1]) for i in range(49)]
+
+        assert haversine_legs(lats, lons) == pytest.approx(expected, rel=1e-9)
+        assert haversine_km_batch(lats[:-1], lons[:-1], lats[1:], lons[1:]) == pytest.approx(expected, rel=1e-9)
+        assert haversine_legs(lats[:1], lons[:1]) == []
+
+    def test_matrix(self, backend):
+        rnd = random.Random(2)
+        puntos = [(rnd.uniform(36, 43), rnd.uniform(-9, 3)) for _ in range(20)] + [(40.0, -3.7), (40.000009, -3.7)]
+        otros = puntos[:5]
+
+        matriz = distance_matrix_km(puntos)
+        rectangular = distance_matrix_km(puntos, otros)
+
+        for i, a in enumerate(puntos):
+            assert matriz[i][i] == pytest.approx(0.0, abs=1e-9)
+            for j, b in enumerate(puntos):
+                assert matriz[i][j] == pytest.approx(haversine_km(*a, *b), rel=1e-9, abs=1e-12)
+            assert len(rectangular[i]) == 5
+        # About one metre apart: no loss of precision for nearby points
+        assert matriz[-2][-1] * 1000 == pytest.approx(1.0, rel=1e-3)
+        assert distance_matrix_km([]) == []
+
+    def test_pairwise(self, backend):
+        rnd = random.Random(3)
+        puntos = [(rnd.uniform(36, 43), rnd.uniform(-9, 3)) for _ in range(15)]
+
+        distancias = pairwise_distances_km(puntos)
+
+        assert distancias == pytest.approx(
+            [haversine_km(*a, *b) for a, b in combinations(puntos, 2)], rel=1e-9
+        )
+        assert pairwise_distances_km(puntos[:1]) == []
+
+class TestEquirectangular:
+    """Test the documented error bounds of the approximation"""
+
+    @pytest.mark.parametrize("max_km, max_error", [(10, 1e-6), (100, 1e-4), (1000, 1e-2)])
+    def test_error_bounds(self, max_km, max_error):
+        rnd = random.Random(max_km)
+        for _ in range(2000):
+            lat, lon = rnd.uniform(-65, 65), rnd.uniform(-180, 180)
+            lat2, lon2 = destino(lat, lon, rnd.uniform(0.01, max_km), rnd.uniform(0, 2 * math.pi))
+            exact = haversine_km(lat, lon, lat2, lon2)
+            assert abs(equirectangular_km(lat, lon, lat2, lon2) - exact) <= max_error * exact
+
+    def test_antimeridian(self):
+        assert equirectangular_km(0, 179.9, 0, -179.9) == pytest.approx(haversine_km(0, 179.9, 0, -179.9), rel=1e-6)
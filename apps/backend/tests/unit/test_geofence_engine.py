@@ -0,0 +1,137 @@
+"""
+Unit tests for the geofence engine
+"""
+import random
+import pytest
+from src.domain.entities.geocerca import Geocerca, TipoEventoGeocerca, TipoGeocerca
+from src.domain.services.geofence_engine import GeofenceEngine, GeofenceIndex
+from src.domain.value_objects.direccion import Coordenadas
+
+def cuadrado(geocerca_id: str, lat: float, lon: float, lado: float = 0.01) -> Geocerca:
+    return Geocerca(
+        id=geocerca_id,
+        nombre=f"Zona {geocerca_id}",
+        tipo=TipoGeocerca.CLIENTE,
+        poligono=[Coordenadas(latitud=lat + dy, longitud=lon + dx)
+                  for dy, dx in ((0, 0), (0, lado), (lado, lado), (lado, 0))]
+    )
+
+def circulo(geocerca_id: str, lat: float, lon: float, radio_m: float) -> Geocerca:
+    return Geocerca(id=geocerca_id, nombre=f"Deposito {geocerca_id}", tipo=TipoGeocerca.DEPOSITO,
+                    centro=Coordenadas(latitud=lat, longitud=lon), radio_m=radio_m)
+
+class TestGeofenceEngine:
+    """Test cases for GeofenceEngine"""
+
+    def test_enter_and_exit_events(self):
+        """Test a vehicle driving through a zone produces one entry and one exit"""
+        engine = GeofenceEngine()
+        engine.registrar(cuadrado("Z1", 40.0, -3.7))
+
+        eventos = engine.evaluar([
+            ("vehiculo", "VHC1", 0.0, 39.99, -3.695),
+            ("vehiculo", "VHC1", 120.0, 40.015, -3.695),
+            ("vehiculo", "VHC1", 60.0, 40.005, -3.695),
+        ])
+
+        assert [(e.tipo, e.geocerca_id, e.timestamp.timestamp()) for e in eventos] == [
+            (TipoEventoGeocerca.ENTRADA, "Z1", 60.0),
+            (TipoEventoGeocerca.SALIDA, "Z1", 120.0),
+        ]
+        assert [e.secuencia for e in eventos] == [1, 2]
+        assert engine.dentro("vehiculo", "VHC1") == frozenset()
+
+    def test_state_carries_across_batches(self):
+        """Test staying inside over several batches emits nothing after the entry"""
+        engine = GeofenceEngine()
+        engine.registrar(circulo("D1", 40.0, -3.7, 500))
+
+        first = engine.evaluar([("carga", "CRG1", 0.0, 40.001, -3.7)])
+        second = engine.evaluar([("carga", "CRG1", 60.0, 40.002, -3.701)])
+        late = engine.evaluar([("carga", "CRG1", 30.0, 41.0, -3.0)])
+
+        assert [e.tipo for e in first] == [TipoEventoGeocerca.ENTRADA]
+        assert second == [] and late == []
+        assert engine.dentro("carga", "CRG1") == frozenset({"D1"})
+
+    def test_circle_boundary(self):
+        """Test circle containment uses the radius in metres"""
+        engine = GeofenceEngine()
+        engine.registrar(circulo("D1", 40.0, -3.7, 1000))
+
+        # 0.0089 degrees of latitude is about 990 m, 0.0091 about 1012 m
+        assert engine.index.containing(40.0089, -3.7) == frozenset({"D1"})
+        assert engine.index.containing(40.0091, -3.7) == frozenset()
+
+    def test_concave_polygon(self):
+        """Test points in the notch of an L-shaped zone are outside"""
+        engine = GeofenceEngine()
+        engine.registrar(Geocerca(id="L", nombre="L", tipo=TipoGeocerca.CLIENTE, poligono=[
+            Coordenadas(latitud=lat, longitud=lon)
+            for lat, lon in ((0, 0), (0, 2), (1, 2), (1, 1), (2, 1), (2, 0))
+        ]))
+
+        assert engine.index.containing(0.5, 1.5) == frozenset({"L"})
+        assert engine.index.containing(1.5, 0.5) == frozenset({"L"})
+        assert engine.index.containing(1.5, 1.5) == frozenset()
+
+    def test_remove_and_replace(self):
+        """Test removed zones stop matching and re-registering replaces the shape"""
+        engine = GeofenceEngine()
+        engine.registrar(cuadrado("Z1", 40.0, -3.7))
+        engine.evaluar([("vehiculo", "VHC1", 0.0, 40.005, -3.695)])
+
+        assert engine.eliminar("Z1")
+        assert not engine.eliminar("Z1")
+        assert engine.dentro("vehiculo", "VHC1") == frozenset()
+
+        engine.registrar(cuadrado("Z2", 40.0, -3.7))
+        engine.registrar(cuadrado("Z2", 41.0, -3.7))
+        assert engine.index.containing(40.005, -3.695) == frozenset()
+        assert len(engine.index) == 1
+
+    def test_invalid_shapes(self):
+        engine = GeofenceEngine()
+        with pytest.raises(ValueError):
+            engine.registrar(Geocerca(id="X", nombre="X", tipo=TipoGeocerca.CLIENTE))
+        with pytest.raises(ValueError):
+            engine.registrar(Geocerca(id="X", nombre="X", tipo=TipoGeocerca.CLIENTE, poligono=[
+                Coordenadas(latitud=0, longitud=0), Coordenadas(latitud=1, longitud=1)
+            ]))
+
+    def test_event_log_paging(self):
+        """Test events are read after a sequence number and the log is bounded"""
+        engine = GeofenceEngine(max_eventos=3)
+        engine.registrar(cuadrado("Z1", 40.0, -3.7))
+        for i in range(3):
+            engine.evaluar([("vehiculo", "VHC1", i * 2.0, 40.005, -3.695),
+                            ("vehiculo", "VHC1", i * 2.0 + 1, 40.5, -3.695)])
+
+        assert [e.secuencia for e in engine.eventos()] == [4, 5, 6]
+        assert [e.secuencia for e in engine.eventos(despues=4, limit=1)] == [5]
+        assert engine.eventos(despues=6) == []
+        assert engine.perdidos(0) and engine.perdidos(2)
+        assert not engine.perdidos(3) and not engine.perdidos(6)
+        assert engine.perdidos(7) and engine.ultima_secuencia == 6
+
+class TestGeofenceIndex:
+    """Test cases for GeofenceIndex"""
+
+    def test_matches_brute_force(self):
+        """Test the grid finds exactly the zones a linear scan finds"""
+        rnd = random.Random(3)
+        index = GeofenceIndex(cell_deg=0.05, max_cells=20)
+        zonas = []
+        for i in range(300):
+            lado = rnd.choice([0.01, 0.02, 0.5])
+            geocerca = cuadrado(f"Z{i}", rnd.uniform(39, 41), rnd.uniform(-4.5, -2.5), lado)
+            zonas.append(geocerca)
+            GeofenceEngine(index).registrar(geocerca)
+
+        brute = GeofenceIndex(cell_deg=1000)
+        for geocerca in zonas:
+            GeofenceEngine(brute).registrar(geocerca)
+
+        for _ in range(2000):
+            lat, lon = rnd.uniform(39, 41.5), rnd.uniform(-4.5, -2)
+            assert index.containing(lat, lon) == brute.containing(lat, lon)
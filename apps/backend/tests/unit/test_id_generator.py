@@ -0,0 +1,54 @@
+"""
+Unit tests for identifier generation
+"""
+import threading
+from src.domain.services.id_generator import TimeOrderedIdGenerator
+from src.application.use_cases.flota_use_cases import CrearFlotaUseCase
+from src.infrastructure.repositories.flota_repository import InMemoryFlotaRepository
+
+class TestTimeOrderedIdGenerator:
+    """Test cases for TimeOrderedIdGenerator"""
+
+    def test_id_format(self):
+        """Test generated IDs carry the prefix and a 26-char body"""
+        generator = TimeOrderedIdGenerator()
+        new_id = generator.next_id("FLT")
+
+        assert new_id.startswith("FLT")
+        assert len(new_id) == 3 + 26
+
+    def test_ids_are_monotonic(self):
+        """Test IDs sort in generation order"""
+        generator = TimeOrderedIdGenerator()
+        ids = [generator.next_id() for _ in range(5000)]
+
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+
+    def test_ids_unique_across_threads(self):
+        """Test concurrent generation never collides"""
+        generator = TimeOrderedIdGenerator()
+        results = []
+
+        def worker():
+            results.extend(generator.next_id() for _ in range(1000))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(results)) == 8000
+
+    def test_crear_flota_uses_generator(self):
+        """Test fleet creation does not depend on repository size"""
+        repo = InMemoryFlotaRepository()
+        use_case = CrearFlotaUseCase(repo)
+
+        primera = use_case.execute("Flota Norte")
+        segunda = use_case.execute("Flota Sur")
+
+        assert primera.id != segunda.id
+        assert primera.id < segunda.id
+        assert primera.id.startswith("FLT")
@@ -0,0 +1,103 @@
+"""
+Unit tests for the background job queue
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.infrastructure.job_queue import JobFailedError, JobQueue, JobStatus, QueueFullError
+
+def _double(value: int) -> int:
+    return value * 2
+
+def _fail() -> None:
+    raise ValueError("boom")
+
+async def _reject(value: int) -> int:
+    raise JobFailedError("rejected", {"value": value})
+
+class TestJobQueue:
+    """Test cases for JobQueue"""
+
+    def test_job_completes_with_result(self):
+        """Test a submitted job runs and keeps its result"""
+        async def scenario():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                queue = JobQueue(executor, workers=1)
+                job = queue.submit(_double, 21)
+                assert job.status == JobStatus.PENDIENTE
+
+                await queue._queue.join()
+                await queue.stop()
+                return queue.get(job.id)
+
+        job = asyncio.run(scenario())
+
+        assert job.status == JobStatus.COMPLETADO
+        assert job.result == 42
+        assert job.to_dict()["finished_at"] is not None
+
+    def test_failed_job_records_error(self):
+        """Test exceptions are captured on the job"""
+        async def scenario():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                queue = JobQueue(executor, workers=1)
+                job = queue.submit(_fail)
+                await queue._queue.join()
+                await queue.stop()
+                return job
+
+        job = asyncio.run(scenario())
+
+        assert job.status == JobStatus.ERROR
+        assert job.error == "boom"
+
+    def test_coroutine_job_failure_keeps_result(self):
+        """Test a coroutine job is awaited and a failed result stays available"""
+        async def scenario():
+            queue = JobQueue(None, workers=1)
+            job = queue.submit(_reject, 7)
+            await queue._queue.join()
+            await queue.stop()
+            return job
+
+        job = asyncio.run(scenario())
+
+        assert job.status == JobStatus.ERROR
+        assert (job.error, job.result) == ("rejected", {"value": 7})
+
+    def test_submit_rejects_when_full(self):
+        """Test backpressure once the queue is at capacity"""
+        release = threading.Event()
+
+        async def scenario():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                queue = JobQueue(executor, workers=1, max_queued=1)
+                queue.submit(release.wait)
+                await asyncio.sleep(0.05)  # the worker picks up the first job
+                queue.submit(_double, 1)
+
+                with pytest.raises(QueueFullError):
+                    queue.submit(_double, 2)
+
+                release.set()
+                await queue._queue.join()
+                await queue.stop()
+
+        asyncio.run(scenario())
+
+    def test_finished_jobs_are_bounded(self):
+        """Test only the most recent finished jobs are retained"""
+        async def scenario():
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                queue = JobQueue(executor, workers=2, max_retained=3)
+                jobs = [queue.submit(_double, i) for i in range(10)]
+                await queue._queue.join()
+                await asyncio.sleep(0)
+                await queue.stop()
+                return queue, jobs
+
+        queue, jobs = asyncio.run(scenario())
+
+        retained = [job for job in jobs if queue.get(job.id) is not None]
+        assert len(retained) == 3
@@ -0,0 +1,151 @@
+"""
+Unit tests for license plate resolution
+"""
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.application.use_cases.cmr_use_cases import ConciliarCMRUseCase
+from src.domain.entities.evento_cambio import TipoEntidad
+from src.domain.repositories.interfaces import VehiculoRepository
+from src.domain.services.matricula_resolver import (
+    MatriculaResolver,
+    UnresolvedMatriculaCache,
+    normalizar_matricula
+)
+from src.infrastructure.container import AppContainer
+from src.infrastructure.repositories.cmr_repository import InMemoryCMRRepository
+from src.infrastructure.repositories.vehiculo_repository import SQLAlchemyVehiculoRepository
+
+class RecordingVehiculoRepository(VehiculoRepository):
+    """Vehicle repository that records the bulk lookups it receives"""
+
+    def __init__(self, vehiculos):
+        self.vehiculos = {normalizar_matricula(v.matricula): v for v in vehiculos}
+        self.lookups = []
+
+    def find_by_matriculas(self, matriculas):
+        matriculas = set(matriculas)
+        self.lookups.append(matriculas)
+        return {m: v for m, v in self.vehiculos.items() if m in matriculas}
+
+    def save(self, vehiculo): pass
+    def find_by_id(self, vehiculo_id): pass
+    def find_all(self): return list(self.vehiculos.values())
+    def find_by_flota(self, flota_id): return []
+    def find_by_estado(self, estado): return []
+    def find_disponibles(self): return []
+    def delete(self, vehiculo_id): pass
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestNormalizarMatricula:
+    """Test plate normalization"""
+
+    @pytest.mark.parametrize("matricula", ["1234-ABC", "1234 abc", " 1234abc ", "1234.ABC", "1234–ÀBC"])
+    def test_equivalent_spellings(self, matricula):
+        """Test separators, case and accents are ignored"""
+        assert normalizar_matricula(matricula) == "1234ABC"
+
+    def test_empty(self):
+        assert normalizar_matricula("") == ""
+        assert normalizar_matricula(" - ") == ""
+
+class TestMatriculaResolver:
+    """Test batched plate resolution"""
+
+    def test_resolves_batch_in_one_lookup(self, make_vehiculo):
+        """Test duplicates and spellings collapse into one repository call"""
+        repo = RecordingVehiculoRepository([make_vehiculo("VHC1", "1234-ABC"), make_vehiculo("VHC2", "5678-DEF")])
+        resolver = MatriculaResolver(repo)
+
+        result = resolver.resolve(["1234-ABC", "1234 abc", "5678DEF", "9999-ZZZ", "1234-ABC", ""])
+
+        assert result == {"1234-ABC": "VHC1", "1234 abc": "VHC1", "5678DEF": "VHC2", "9999-ZZZ": None, "": None}
+        assert repo.lookups == [{"1234ABC", "5678DEF", "9999ZZZ"}]
+
+    def test_unresolved_plates_are_cached(self, make_vehiculo):
+        """Test plates without a vehicle are not looked up again until they expire"""
+        clock = FakeClock()
+        repo = RecordingVehiculoRepository([make_vehiculo("VHC1", "1234-ABC")])
+        resolver = MatriculaResolver(repo, UnresolvedMatriculaCache(ttl=60, clock=clock))
+
+        resolver.resolve(["9999-ZZZ", "1234-ABC"])
+        second = resolver.resolve(["9999-ZZZ"])
+        clock.now = 61
+        resolver.resolve(["9999-ZZZ"])
+
+        assert second == {"9999-ZZZ": None}
+        assert repo.lookups == [{"9999ZZZ", "1234ABC"}, {"9999ZZZ"}]
+
+    def test_cache_is_bounded_and_discardable(self):
+        """Test the oldest unresolved plates are evicted and plates can be forgotten"""
+        cache = UnresolvedMatriculaCache(max_entries=2)
+        cache.add(["A1", "B2", "C3"])
+        cache.discard("c-3")
+
+        assert not cache.contains("A1")
+        assert cache.contains("B2")
+        assert not cache.contains("C3")
+
+    def test_saved_vehicle_forgets_plate(self, make_vehiculo):
+        """Test the container forgets an unresolved plate once a vehicle with it is saved"""
+        engine = create_engine("sqlite://")
+        container = AppContainer(engine, sessionmaker(bind=engine))
+        container.matricula_cache.add(["1234ABC", "5678DEF"])
+
+        container.change_events.guardado(TipoEntidad.VEHICULO, make_vehiculo("VHC1", "1234-abc"))
+        container.change_events.eliminado(TipoEntidad.VEHICULO, "VHC2")
+
+        assert not container.matricula_cache.contains("1234ABC")
+        assert container.matricula_cache.contains("5678DEF")
+        container.shutdown()
+
+class TestConciliarCMRUseCase:
+    """Test reconciliation of stored CMRs against the fleet"""
+
+    def test_links_documents(self, make_vehiculo, make_document):
+        """Test every stored CMR is linked and only changed documents are written"""
+        cmr_repo = InMemoryCMRRepository()
+        for index, matricula in enumerate(["1234-ABC", "1234 ABC", "9999-ZZZ"]):
+            cmr_repo.save(make_document(f"CMR-{index}", matricula, datetime(2024, 3, index + 1)))
+        vehiculo_repo = RecordingVehiculoRepository([make_vehiculo("VHC1", "1234ABC")])
+        use_case = ConciliarCMRUseCase(cmr_repo, MatriculaResolver(vehiculo_repo))
+
+        result = use_case.execute()
+        again = use_case.execute(hasta=datetime(2024, 3, 2))
+
+        assert result == {"total": 3, "vinculados": 2, "sin_vehiculo": ["9999-ZZZ"]}
+        assert again == {"total": 1, "vinculados": 1, "sin_vehiculo": []}
+        assert cmr_repo.find_by_numero("CMR-1").vehiculo_id == "VHC1"
+        assert cmr_repo.find_by_numero("CMR-2").vehiculo_id is None
+        assert len(vehiculo_repo.lookups) == 2
+
+class TestSQLAlchemyFindByMatriculas:
+    """Test the bulk plate lookup of the SQL vehicle repository"""
+
+    def test_bulk_lookup(self, sql_session, make_vehiculo):
+        repo = SQLAlchemyVehiculoRepository(sql_session)
+        repo.save(make_vehiculo("VHC1", "1234-abc"))
+        repo.save(make_vehiculo("VHC2", "5678 DEF"))
+        repo.save(make_vehiculo("VHC3", "9012–ÀBC"))
+
+        result = repo.find_by_matriculas(["1234ABC", "5678DEF", "9012ABC", "0000XXX"])
+
+        assert {m: v.id for m, v in result.items()} == {"1234ABC": "VHC1", "5678DEF": "VHC2", "9012ABC": "VHC3"}
+
+    def test_lookup_follows_plate_changes(self, sql_session, make_vehiculo):
+        """Test a vehicle is found by its current plate after an update"""
+        repo = SQLAlchemyVehiculoRepository(sql_session)
+        vehiculo = make_vehiculo("VHC1", "1234-ABC")
+        repo.save(vehiculo)
+        vehiculo.matricula = "5678/DEF"
+        repo.save(vehiculo)
+
+        assert repo.find_by_matriculas(["1234ABC"]) == {}
+        assert repo.find_by_matriculas(["5678DEF"])["5678DEF"].id == "VHC1"
@@ -0,0 +1,220 @@
+"""
+Unit tests for the text-layer PDF extractor
+"""
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.domain.services.cmr_normalizer import CMRNormalizer
+from src.domain.services import pdf_text_extractor
+from src.domain.services.pdf_text_extractor import (
+    PDFInflateLimitError,
+    PDFSyntaxError,
+    PDFTextCMRExtractor,
+    looks_like_cmr,
+    page_text
+)
+
+CMR_PAGE = b"""BT /F1 10 Tf 1 0 0 1 50 800 Tm (CMR - Carta de Porte Internacional) Tj
+0 -14 Td (N\\260 CMR: CMR-2024-000777) Tj
+0 -28 Td (REMITENTE / SENDER) Tj
+0 -14 Td (Transportes Norte S.L.) Tj
+0 -14 Td (Calle Real 1) Tj
+0 -14 Td (Bilbao, Espa\\361a) Tj
+0 -28 Td (DESTINATARIO / RECIPIENT) Tj
+0 -14 Td (Frigor\\355ficos Sur S.A.) Tj
+0 -14 Td (Avenida del Puerto 9) Tj
+0 -14 Td (Sevilla, Espa\\361a) Tj
+0 -28 Td (FECHAS / DATES) Tj
+0 -14 Td (Fecha de emisi\\363n: 03/02/2024) Tj
+0 -28 Td (VEH\\315CULO / VEHICLE) Tj
+0 -14 Td [(Matr\\355cula: 4321)-50(-XYZ)] TJ
+0 -28 Td (CARGA / LOAD) Tj
+0 -14 Td (Peso bruto: 1800 kg) Tj
+ET"""
+
+INVOICE_PAGE = b"BT /F1 10 Tf 50 800 Td (FACTURA 2024/118) Tj ET"
+
+def build_pdf(pages, compress=True, fonts=None):
+    """Build a minimal PDF with one content stream per page"""
+    fonts = fonts or {b"F1": b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"}
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    font_refs = {name: add(body) for name, body in fonts.items()}
+    font_dict = b" ".join(b"/%s %d 0 R" % (name, ref) for name, ref in font_refs.items())
+    pages_ref = len(objects) + 1 + 2 * len(pages)
+    page_refs = []
+    for content in pages:
+        data = zlib.compress(content) if compress else content
+        filter_entry = b" /Filter /FlateDecode" if compress else b""
+        content_ref = add(b"<< /Length %d%s >>\nstream\n%s\nendstream" % (len(data), filter_entry, data))
+        page_refs.append(add(
+            b"<< /Type /Page /Parent %d 0 R /Contents %d 0 R >>" % (pages_ref, content_ref)
+        ))
+    kids = b" ".join(b"%d 0 R" % ref for ref in page_refs)
+    add(b"<< /Type /Pages /Kids [%s] /Count %d /Resources << /Font << %s >> >> >>" % (kids, len(pages), font_dict))
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_ref)
+
+    out = bytearray(b"%PDF-1.4\n")
+    for number, body in enumerate(objects, start=1):
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\n%%%%EOF" % (len(objects) + 1, catalog)
+    return bytes(out)
+
+class TestPageText:
+    """Test content stream interpretation"""
+
+    def test_text_operators(self):
+        """Test Tj, TJ, T* and line breaks from Td"""
+        content = b"BT (Hello) Tj [(W)20(orld)] TJ T* (next) Tj 0 -12 Td (line) Tj ET"
+
+        assert page_text(content, {}) == "HelloWorld\nnext\nline"
+
+    def test_tj_gap_becomes_space(self):
+        """Test a large TJ displacement is read as a word gap"""
+        assert page_text(b"BT [(Peso)-400(bruto)] TJ ET", {}) == "Peso bruto"
+
+    def test_escapes_and_hex_strings(self):
+        """Test literal escapes, nested parentheses and hex strings"""
+        content = b"BT (a\\(b\\) (c) \\101) Tj <20 4B4D> Tj ET"
+
+        assert page_text(content, {}) == "a(b) (c) A KM"
+
+    def test_looks_like_cmr_across_tj_fragments(self):
+        """Test the cheap scan sees headings split by kerning"""
+        assert looks_like_cmr(b"BT [(C)-20(MR)] TJ ET")
+        assert not looks_like_cmr(INVOICE_PAGE)
+
+class TestPDFTextCMRExtractor:
+    """Test cases for PDFTextCMRExtractor"""
+
+    def test_only_cmr_pages_are_decoded(self):
+        """Test pages without a CMR heading are skipped in a bundle"""
+        extractor = PDFTextCMRExtractor()
+
+        pages = extractor.extract_pages(build_pdf([INVOICE_PAGE, CMR_PAGE, INVOICE_PAGE]))
+
+        assert [page.page_number for page in pages] == [1, 2, 3]
+        assert [page.is_cmr for page in pages] == [False, True, False]
+        assert pages[0].text is None
+        assert "Transportes Norte S.L." in pages[1].text
+
+    def test_all_pages_decoded_when_none_match(self):
+        """Test documents without a CMR heading still yield their text"""
+        raw = PDFTextCMRExtractor().extract_data(build_pdf([INVOICE_PAGE], compress=False))
+
+        assert raw.raw_text == "FACTURA 2024/118"
+        assert raw.pages[0].is_cmr is False
+
+    def test_normalizes_real_text(self):
+        """Test extracted text goes through the normalizer"""
+        normalizer = CMRNormalizer(PDFTextCMRExtractor())
+
+        document = normalizer.normalize_document(build_pdf([INVOICE_PAGE, CMR_PAGE]))
+
+        assert document.numero_cmr == "CMR-2024-000777"
+        assert document.remitente.nombre == "Transportes Norte S.L."
+        assert document.remitente.pais == "España"
+        assert document.destinatario.ciudad == "Sevilla"
+        assert document.matricula_vehiculo == "4321-XYZ"
+        assert document.carga.peso_bruto == 1800.0
+
+    def test_text_layer_passes_early_exit(self):
+        """Test text-layer fields carry full confidence for the mandatory check"""
+        normalizer = CMRNormalizer(PDFTextCMRExtractor())
+
+        result = normalizer.normalize_with_early_exit(build_pdf([CMR_PAGE]), min_confidence=0.9)
+
+        assert result.complete
+        assert result.fields["peso_bruto"].confidence == 1.0
+
+    def test_to_unicode_font(self):
+        """Test composite fonts are decoded through their ToUnicode map"""
+        cmap = (b"begincmap 1 begincodespacerange <0000> <FFFF> endcodespacerange "
+                b"2 beginbfchar <0001> <0043> <0002> <004D> endbfchar "
+                b"1 beginbfrange <0003> <0003> <0052> endbfrange endcmap")
+        fonts = {
+            b"F1": b"<< /Type /Font /Subtype /Type0 /BaseFont /Custom /Encoding /Identity-H /ToUnicode 99 0 R >>"
+        }
+        pdf = build_pdf([b"BT /F1 10 Tf <000100020003> Tj ET"], fonts=fonts)
+        pdf = pdf.replace(b"trailer", b"99 0 obj\n<< /Length %d >>\nstream\n%s\nendstream\nendobj\ntrailer" % (len(cmap), cmap))
+
+        pages = PDFTextCMRExtractor().extract_pages(pdf)
+
+        assert pages[0].text == "CMR"
+        assert pages[0].is_cmr is True
+
+    def test_to_unicode_pages_are_scanned_encoded(self):
+        """Test ToUnicode pages without the encoded heading are skipped"""
+        cmap = (b"begincmap 1 begincodespacerange <0000> <FFFF> endcodespacerange "
+                b"1 beginbfrange <0041> <005A> <0041> endbfrange endcmap")
+        fonts = {
+            b"F1": b"<< /Type /Font /Subtype /Type0 /BaseFont /Custom /Encoding /Identity-H /ToUnicode 99 0 R >>"
+        }
+        pdf = build_pdf([b"BT /F1 10 Tf <0046004100430054> Tj ET", b"BT /F1 10 Tf [<0043>-10<004D0052>] TJ ET"], fonts=fonts)
+        pdf = pdf.replace(b"trailer", b"99 0 obj\n<< /Length %d >>\nstream\n%s\nendstream\nendobj\ntrailer" % (len(cmap), cmap))
+
+        pages = PDFTextCMRExtractor().extract_pages(pdf)
+
+        assert pages[0].text is None
+        assert pages[1].text == "CMR"
+
+    def test_accepts_memoryview(self):
+        """Test a zero-copy view of the document can be parsed"""
+        pages = PDFTextCMRExtractor().extract_pages(memoryview(build_pdf([CMR_PAGE])))
+
+        assert pages[0].is_cmr is True
+
+    def test_rejects_non_pdf(self):
+        """Test non-PDF input raises a syntax error"""
+        with pytest.raises(PDFSyntaxError):
+            PDFTextCMRExtractor().extract_pages(b"not a pdf")
+
+    def test_close_stops_page_pool(self):
+        """Test closing shuts the page threads down and later calls start them again"""
+        extractor = PDFTextCMRExtractor()
+        extractor.extract_pages(build_pdf([INVOICE_PAGE, CMR_PAGE]))
+        executor = extractor._executor
+
+        extractor.close()
+
+        assert executor._shutdown and extractor._executor is None
+        assert extractor.extract_pages(build_pdf([INVOICE_PAGE, CMR_PAGE]))[1].is_cmr
+        extractor.close()
+
+    def test_concurrent_calls_share_one_pool(self):
+        """Test requests decoding at the same time start a single page pool"""
+        extractor = PDFTextCMRExtractor()
+        pdf = build_pdf([INVOICE_PAGE, CMR_PAGE])
+        pools = set()
+
+        def extract(_):
+            pages = extractor.extract_pages(pdf)
+            pools.add(id(extractor._executor))
+            return pages[1].is_cmr
+
+        with ThreadPoolExecutor(max_workers=8) as requests:
+            assert all(requests.map(extract, range(32)))
+
+        assert len(pools) == 1
+        extractor.close()
+
+    def test_rejects_decompression_bomb(self):
+        """Test a stream inflating beyond the limit is not inflated in full"""
+        bomb = build_pdf([b"\0" * pdf_text_extractor.MAX_INFLATED_BYTES * 2])
+
+        assert len(bomb) < 64 * 1024
+        with pytest.raises(PDFInflateLimitError):
+            PDFTextCMRExtractor().extract_pages(bomb)
+
+    def test_document_inflate_budget(self, monkeypatch):
+        """Test the streams of one document share an inflate budget"""
+        monkeypatch.setattr(pdf_text_extractor, "MAX_DOCUMENT_INFLATED_BYTES", 1024 * 1024)
+        page = CMR_PAGE + b" " * (400 * 1024)
+
+        assert PDFTextCMRExtractor().extract_pages(build_pdf([page, page]))[0].is_cmr
+        with pytest.raises(PDFInflateLimitError):
+            PDFTextCMRExtractor(max_workers=1).extract_pages(build_pdf([page, page, page]))
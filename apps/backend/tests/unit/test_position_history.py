@@ -0,0 +1,80 @@
+"""
+Unit tests for the GPS position history store
+"""
+from array import array
+from src.infrastructure.position_history import PositionHistoryStore, PositionTrack
+
+class TestPositionTrack:
+    """Test cases for PositionTrack"""
+
+    def test_window_across_chunks(self):
+        """Test windows spanning several chunks, start inclusive and end exclusive"""
+        track = PositionTrack(chunk_size=4)
+        for t in range(20):
+            track.add(float(t), 40.0 + t / 100, -3.0)
+
+        result = track.window(5.0, 11.0)
+
+        assert [p[0] for p in result] == [5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+        assert result[0] == (5.0, 40.05, -3.0)
+        assert track.window(100.0) == []
+        assert len(track.window()) == 20
+
+    def test_window_limit(self):
+        """Test the limit stops the scan at the requested size"""
+        track = PositionTrack(chunk_size=3)
+        for t in range(10):
+            track.add(float(t), 0.0, 0.0)
+
+        assert [p[0] for p in track.window(2.0, limit=5)] == [2.0, 3.0, 4.0, 5.0, 6.0]
+
+    def test_late_pings_keep_order(self):
+        """Test pings older than the latest one are inserted in time order"""
+        track = PositionTrack(chunk_size=2)
+        for t in (1.0, 2.0, 3.0, 4.0, 6.0):
+            track.add(t, 0.0, 0.0)
+        track.add(5.0, 1.0, 1.0)
+        track.add(0.5, 1.0, 1.0)
+
+        assert [p[0] for p in track.window()] == [0.5, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+        assert track.latest() == (6.0, 0.0, 0.0)
+
+    def test_retention_drops_oldest_chunks(self):
+        """Test the track keeps at least max_points, dropping whole chunks"""
+        track = PositionTrack(chunk_size=10, max_points=25)
+        for t in range(100):
+            track.add(float(t), 0.0, 0.0)
+
+        positions = track.window()
+        assert 25 <= len(track) < 35
+        assert len(positions) == len(track)
+        assert positions[-1][0] == 99.0
+
+    def test_columns_are_float_arrays(self):
+        """Test positions are stored unboxed"""
+        track = PositionTrack()
+        track.add(1.0, 2.0, 3.0)
+
+        chunk = track._chunks[0]
+        assert isinstance(chunk.t, array) and chunk.t.typecode == "d"
+
+class TestPositionHistoryStore:
+    """Test cases for PositionHistoryStore"""
+
+    def test_batched_ingest(self):
+        """Test an unordered batch for several tracks"""
+        store = PositionHistoryStore()
+
+        added = store.ingest([
+            ("vehiculo", "VHC1", 3.0, 40.3, -3.3),
+            ("carga", "CRG1", 1.0, 41.0, 2.0),
+            ("vehiculo", "VHC1", 1.0, 40.1, -3.1),
+            ("vehiculo", "VHC1", 2.0, 40.2, -3.2),
+        ])
+
+        assert added == 4
+        assert len(store) == 2
+        assert store.window("vehiculo", "VHC1", 2.0) == [(2.0, 40.2, -3.2), (3.0, 40.3, -3.3)]
+        assert store.latest("carga", "CRG1") == (1.0, 41.0, 2.0)
+        assert store.latest("carga", "VHC1") is None
+        assert store.window("vehiculo", "OTHER") == []
@@ -0,0 +1,147 @@
+"""
+Unit tests for the route sequencer
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from itertools import permutations
+import pytest
+from src.domain.entities.carga import Carga, EstadoCarga, TipoCarga
+from src.domain.entities.ruta_reparto import TipoParada
+from src.domain.entities.vehiculo import TipoVehiculo, Vehiculo
+from src.domain.services.distance_cache import DistanceCache
+from src.domain.services.route_sequencer import SecuenciadorRutas, _Problema
+
+SALIDA = datetime(2024, 3, 1, 8, 0)
+
+def vehiculo(vehiculo_id: str = "V1", capacidad: float = 25000.0) -> Vehiculo:
+    return Vehiculo(id=vehiculo_id, matricula=vehiculo_id, marca="Mercedes", modelo="Actros",
+                    tipo=TipoVehiculo.CAMION, capacidad_carga=capacidad,
+                    fecha_matriculacion=datetime(2020, 1, 15))
+
+def carga(carga_id: str, destino, origen=(40.0, -3.7), peso: float = 1000.0,
+          estado: EstadoCarga = EstadoCarga.EN_TRANSITO, **kwargs) -> Carga:
+    return Carga(id=carga_id, descripcion="Palets", tipo=TipoCarga.GENERAL, peso=peso, estado=estado,
+                 origen=f"{origen[0]},{origen[1]}", destino=f"{destino[0]},{destino[1]}", **kwargs)
+
+class TestSecuenciadorRutas:
+    """Test cases for SecuenciadorRutas"""
+
+    def test_deliveries_in_line(self):
+        """Test deliveries along a line are visited in order"""
+        cargas = [carga(f"C{i}", (40.0 + i * 0.1, -3.7)) for i in (3, 1, 4, 2)]
+
+        ruta = SecuenciadorRutas().secuenciar(vehiculo(), (40.0, -3.7), cargas, SALIDA)
+
+        assert [p.carga_id for p in ruta.paradas] == ["C1", "C2", "C3", "C4"]
+        assert ruta.factible
+        assert ruta.distancia_km == pytest.approx(sum(p.distancia_km for p in ruta.paradas))
+        assert ruta.paradas[-1].carga_a_bordo_kg == pytest.approx(0.0)
+
+    def test_distances_through_cache(self):
+        """Test a shared cache serves the distances of stops planned again"""
+        cargas = [carga(f"C{i}", (40.0 + i * 0.1, -3.7)) for i in (3, 1, 4, 2)]
+        cache = DistanceCache()
+        secuenciador = SecuenciadorRutas(distancias=cache)
+
+        ruta = secuenciador.secuenciar(vehiculo(), (40.0, -3.7), cargas, SALIDA)
+        assert (cache.hits, cache.misses) == (0, 10)
+        secuenciador.secuenciar(vehiculo(), (40.0, -3.7), cargas, SALIDA)
+
+        assert (cache.hits, cache.misses) == (10, 10)
+        assert [p.carga_id for p in ruta.paradas] == ["C1", "C2", "C3", "C4"]
+        exacta = SecuenciadorRutas().secuenciar(vehiculo(), (40.0, -3.7), cargas, SALIDA)
+        assert ruta.distancia_km == pytest.approx(exacta.distancia_km, abs=0.05)
+
+    def test_pickup_before_delivery_within_capacity(self):
+        """Test pending loads are picked up first and never overload the vehicle"""
+        cargas = [
+            carga("A", (40.5, -3.7), origen=(40.1, -3.7), peso=8000, estado=EstadoCarga.PENDIENTE),
+            carga("B", (40.4, -3.7), origen=(40.2, -3.7), peso=8000, estado=EstadoCarga.PENDIENTE),
+        ]
+
+        ruta = SecuenciadorRutas().secuenciar(vehiculo(capacidad=10000), (40.0, -3.7), cargas, SALIDA)
+
+        assert [(p.carga_id, p.tipo) for p in ruta.paradas] == [
+            ("A", TipoParada.RECOGIDA), ("A", TipoParada.ENTREGA),
+            ("B", TipoParada.RECOGIDA), ("B", TipoParada.ENTREGA),
+        ]
+        assert max(p.carga_a_bordo_kg for p in ruta.paradas) <= 10000
+
+    def test_delivery_window(self):
+        """Test a closing window is served first and an early arrival waits"""
+        cerca, lejos = (40.1, -3.7), (40.5, -3.7)
+        cargas = [
+            carga("CERCA", cerca, entrega_desde=SALIDA + timedelta(hours=3)),
+            carga("LEJOS", lejos, entrega_hasta=SALIDA + timedelta(hours=1)),
+        ]
+
+        ruta = SecuenciadorRutas().secuenciar(vehiculo(), (40.0, -3.7), cargas, SALIDA)
+
+        assert [p.carga_id for p in ruta.paradas] == ["LEJOS", "CERCA"]
+        assert ruta.paradas[1].llegada == SALIDA + timedelta(hours=3)
+        assert ruta.factible and ruta.retraso_total_min == 0
+
+    def test_naive_windows_are_utc(self):
+        """Test naive windows compare as UTC against an aware departure, whatever the local timezone"""
+        salida = datetime(2024, 3, 1, 8, 0, tzinfo=timezone(timedelta(hours=2)))
+        cargas = [carga("C", (40.01, -3.7), entrega_desde=datetime(2024, 3, 1, 10, 0))]
+
+        ruta = SecuenciadorRutas().secuenciar(vehiculo(), (40.0, -3.7), cargas, salida)
+
+        assert ruta.paradas[0].llegada == datetime(2024, 3, 1, 10, 0, tzinfo=timezone.utc)
+        assert ruta.paradas[0].llegada.utcoffset() == timedelta(hours=2)
+
+    def test_unreachable_window_reported(self):
+        """Test a window that cannot be met is reported as delay"""
+        cargas = [carga("C1", (41.0, -3.7), entrega_hasta=SALIDA + timedelta(minutes=30))]
+
+        ruta = SecuenciadorRutas().secuenciar(vehiculo(), (40.0, -3.7), cargas, SALIDA)
+
+        assert not ruta.factible
+        assert ruta.retraso_total_min == pytest.approx(111.2 - 30, abs=1)
+
+    def test_loads_left_out(self):
+        """Test loads that cannot be sequenced report why"""
+        cargas = [
+            carga("ENTREGADA", (40.1, -3.7), estado=EstadoCarga.ENTREGADA),
+            carga("PESADA", (40.1, -3.7), peso=30000, estado=EstadoCarga.PENDIENTE),
+            carga("SIN", (40.1, -3.7)),
+        ]
+        cargas[2].destino = "Calle Mayor 1, Madrid"
+
+        ruta = SecuenciadorRutas().secuenciar(vehiculo(), (40.0, -3.7), cargas, SALIDA)
+
+        assert ruta.paradas == []
+        assert ruta.sin_secuenciar == {
+            "ENTREGADA": "carga no pendiente ni en transito",
+            "PESADA": "supera la capacidad del vehiculo",
+            "SIN": "destino sin coordenadas",
+        }
+
+    @pytest.mark.parametrize("volver_al_origen", [False, True])
+    def test_close_to_brute_force(self, volver_al_origen):
+        """Test delivery tours stay close to the shortest order"""
+        rnd = random.Random(7)
+        for _ in range(10):
+            cargas = [carga(f"C{i}", (rnd.uniform(40, 41), rnd.uniform(-4, -3))) for i in range(6)]
+            problema = _Problema(vehiculo(), (40.5, -3.5), cargas, SALIDA, 60.0, 900.0, volver_al_origen)
+            optimo = min(problema.evaluar(orden)[1] for orden in permutations(range(1, problema.fin)))
+
+            ruta = SecuenciadorRutas(volver_al_origen=volver_al_origen).secuenciar(
+                vehiculo(), (40.5, -3.5), cargas, SALIDA)
+
+            assert ruta.distancia_km <= optimo * 1.05
+
+    def test_time_budget(self):
+        """Test a tiny budget returns the seeded routes, marked incomplete"""
+        rnd = random.Random(3)
+        flota = [
+            (vehiculo(f"V{v}"), (40.0, -3.7), [carga(f"C{v}_{c}", (rnd.uniform(40, 41), rnd.uniform(-4, -3)))
+                                              for c in range(20)])
+            for v in range(50)
+        ]
+
+        plan = SecuenciadorRutas(presupuesto_segundos=0.001).planificar(flota, SALIDA)
+
+        assert not plan.completo
+        assert all(len(ruta.paradas) == 20 for ruta in plan.rutas)
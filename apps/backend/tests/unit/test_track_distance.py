@@ -0,0 +1,136 @@
+"""
+Unit tests for track distance analysis
+"""
+import math
+import pytest
+from datetime import datetime, timezone
+from src.application.use_cases.tracking_use_cases import ContrastarKilometrajeUseCase
+from src.domain.entities.vehiculo import Vehiculo, TipoVehiculo
+from src.domain.repositories.interfaces import VehiculoRepository
+from src.domain.services.track_distance import AnalizadorRecorrido, haversine_legs
+from src.domain.value_objects.direccion import Coordenadas
+from src.infrastructure.position_history import PositionHistoryStore
+
+KM_PER_DEGREE_LON_AT_40 = 2 * math.pi * 6371.0 * math.cos(math.radians(40.0)) / 360
+
+def drive(t0, lon0, seconds, kmh, step=10):
+    """Positions along the 40° parallel at constant speed, one fix per step"""
+    return [
+        (t0 + i * step, 40.0, lon0 + kmh * i * step / 3600 / KM_PER_DEGREE_LON_AT_40)
+        for i in range(seconds // step + 1)
+    ]
+
+def trip():
+    """10 min at 60 km/h, 10 min stopped, 10 min at 90 km/h"""
+    first = drive(0, -3.0, 600, 60)
+    t_stop, lon_stop = first[-1][0], first[-1][2]
+    stopped = [(t_stop + i * 30, 40.0, lon_stop) for i in range(1, 21)]
+    second = drive(stopped[-1][0], lon_stop, 600, 90)[1:]
+    return first + stopped + second
+
+class TestHaversineLegs:
+    """Test the batched Haversine"""
+
+    def test_matches_scalar_formula(self):
+        """Test legs agree with the pairwise Coordenadas distance"""
+        lats = [40.4168, 41.3851, 39.4699]
+        lons = [-3.7038, 2.1734, -0.3763]
+
+        legs = haversine_legs(lats, lons)
+
+        for i, leg in enumerate(legs):
+            expected = Coordenadas(latitud=lats[i], longitud=lons[i]).calcular_distancia(
+                Coordenadas(latitud=lats[i + 1], longitud=lons[i + 1])
+            )
+            assert leg == pytest.approx(expected, rel=1e-9)
+        assert legs[0] == pytest.approx(505.4, abs=0.5)
+
+    def test_short_inputs(self):
+        assert haversine_legs([], []) == []
+        assert haversine_legs([1.0], [2.0]) == []
+
+class TestAnalizadorRecorrido:
+    """Test distance, segment and stop detection"""
+
+    def test_trip_with_stop(self):
+        """Test a drive-stop-drive trip"""
+        resumen = AnalizadorRecorrido().analizar(trip())
+
+        assert resumen.distancia_km == pytest.approx(10 + 15, rel=1e-3)
+        assert resumen.duracion_segundos == 1800
+        assert len(resumen.paradas) == 1
+        assert resumen.paradas[0].duracion_segundos == 600
+        assert resumen.paradas[0].inicio == datetime(1970, 1, 1, 0, 10, tzinfo=timezone.utc)
+        assert resumen.tiempo_parado_segundos == 600
+        assert [round(s.velocidad_media_kmh) for s in resumen.segmentos] == [60, 90]
+        assert resumen.velocidad_max_kmh == pytest.approx(90, rel=1e-3)
+
+    def test_short_stop_is_not_a_stop(self):
+        """Test slow legs shorter than the minimum stop time stay in the segment"""
+        resumen = AnalizadorRecorrido(parada_min_segundos=900).analizar(trip())
+
+        assert resumen.paradas == []
+        assert len(resumen.segmentos) == 1
+
+    def test_gps_jump_is_discarded(self):
+        """Test a fix far off the route does not add distance"""
+        posiciones = drive(0, -3.0, 600, 60)
+        posiciones[30] = (posiciones[30][0], 45.0, 10.0)
+
+        resumen = AnalizadorRecorrido().analizar(posiciones)
+
+        assert resumen.saltos_descartados == 2
+        assert resumen.distancia_km == pytest.approx(10 - 2 * 60 * 10 / 3600, rel=1e-3)
+
+    def test_empty(self):
+        assert AnalizadorRecorrido().analizar([]).distancia_km == 0.0
+
+    def test_batch_matches_single(self):
+        """Test the batched distances equal the per-track analysis"""
+        analizador = AnalizadorRecorrido()
+        recorridos = {"A": trip(), "B": drive(0, 10.0, 300, 80), "C": [], "D": [(0, 40.0, 0.0)]}
+
+        distancias = analizador.distancias(recorridos)
+
+        for clave, posiciones in recorridos.items():
+            assert distancias[clave] == pytest.approx(analizador.analizar(posiciones).distancia_km)
+
+class FleetRepository(VehiculoRepository):
+    """Vehicle repository holding a fixed fleet"""
+
+    def __init__(self, vehiculos):
+        self.vehiculos = vehiculos
+
+    def find_all(self): return self.vehiculos
+    def save(self, vehiculo): pass
+    def find_by_id(self, vehiculo_id): pass
+    def find_by_flota(self, flota_id): return []
+    def find_by_estado(self, estado): return []
+    def find_disponibles(self): return []
+    def find_by_matriculas(self, matriculas): return {}
+    def delete(self, vehiculo_id): pass
+
+class TestContrastarKilometraje:
+    """Test the fleet-wide odometer check"""
+
+    def test_compares_every_vehicle(self):
+        store = PositionHistoryStore()
+        store.ingest(("vehiculo", "VHC1", t, lat, lon) for t, lat, lon in trip())
+        vehiculos = [
+            Vehiculo(id=vid, matricula=f"000{n}-AAA", marca="Volvo", modelo="FH", tipo=TipoVehiculo.CAMION,
+                     capacidad_carga=1.0, fecha_matriculacion=datetime(2020, 1, 1), kilometraje=km)
+            for n, (vid, km) in enumerate([("VHC1", 1025), ("VHC2", 500)])
+        ]
+        use_case = ContrastarKilometrajeUseCase(store, FleetRepository(vehiculos))
+
+        result = use_case.execute(
+            datetime.fromtimestamp(0, tz=timezone.utc),
+            datetime.fromtimestamp(3600, tz=timezone.utc),
+            {"VHC1": 1000, "VHC2": 400}
+        )
+
+        assert result[0]["distancia_gps_km"] == pytest.approx(25, rel=1e-3)
+        assert result[0]["coincide"] is True
+        assert result[1]["distancia_gps_km"] == 0
+        assert result[1]["diferencia_km"] == 100
+        assert result[1]["coincide"] is False
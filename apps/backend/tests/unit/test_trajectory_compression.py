@@ -0,0 +1,174 @@
+"""
+Unit tests for GPS trajectory compression
+"""
+import math
+import random
+import pytest
+from src.domain.services.trajectory_compression import TrajectoryCompressor, synchronized_distance_m
+from src.infrastructure.position_history import PositionHistoryStore, PositionTrack
+
+METRES_PER_DEGREE = 111195.0
+
+def drive(seed: int = 7):
+    """
+    A day of pings every 5 seconds with 3 m GPS noise: gently curving
+    stretches at 80 km/h, corners at 30 km/h and a stop every few legs
+    """
+    rnd = random.Random(seed)
+    lat, lon, heading, t = 40.0, -3.7, 0.0, 0.0
+    noise = 3 / METRES_PER_DEGREE
+    pings = []
+
+    def move(speed_kmh, turn):
+        nonlocal lat, lon, heading, t
+        heading += turn
+        step = speed_kmh / 3.6 * 5
+        lat += step * math.cos(math.radians(heading)) / METRES_PER_DEGREE
+        lon += step * math.sin(math.radians(heading)) / (METRES_PER_DEGREE * math.cos(math.radians(lat)))
+        t += 5
+        pings.append((t, lat + rnd.gauss(0, noise), lon + rnd.gauss(0, noise)))
+
+    for leg in range(40):
+        curve = rnd.uniform(-0.3, 0.3)
+        for _ in range(rnd.randint(60, 240)):
+            move(80, curve)
+        corner = rnd.choice([-90, -45, 45, 90])
+        for _ in range(6):
+            move(30, corner / 6)
+        if leg % 8 == 7:
+            for _ in range(120):
+                move(0, 0)
+    return pings
+
+def max_error_m(raw, kept):
+    """Largest distance between a raw ping and the kept trace at the same time"""
+    error = 0.0
+    segment = 0
+    for point in raw:
+        while segment < len(kept) - 2 and kept[segment + 1][0] < point[0]:
+            segment += 1
+        error = max(error, synchronized_distance_m(kept[segment], kept[segment + 1], point))
+    return error
+
+class TestTrajectoryCompressor:
+    """Test cases for TrajectoryCompressor"""
+
+    def test_straight_line_keeps_endpoints(self):
+        """Test constant speed in a straight line needs only its first and newest point"""
+        compressor = TrajectoryCompressor(tolerance_m=5)
+        kept = []
+        for minute in range(30):
+            kept += compressor.push((minute * 60.0, 40.0 + minute * 0.01, -3.7))
+
+        assert kept == [(0.0, 40.0, -3.7)]
+        assert compressor.pending() == (29 * 60.0, 40.29, -3.7)
+        assert compressor.flush() == [compressor.last()]
+        assert compressor.pending() is None
+
+    def test_corner_is_kept(self):
+        """Test the point where the direction changes is kept"""
+        compressor = TrajectoryCompressor(tolerance_m=5)
+        kept = []
+        for t, lat, lon in [(0, 40.0, -3.7), (60, 40.01, -3.7), (120, 40.02, -3.7), (180, 40.02, -3.69)]:
+            kept += compressor.push((float(t), lat, lon))
+
+        assert kept == [(0.0, 40.0, -3.7), (120.0, 40.02, -3.7)]
+
+    def test_speed_change_is_kept(self):
+        """Test a stop on a straight road is kept, since the error is measured in time too"""
+        compressor = TrajectoryCompressor(tolerance_m=5)
+        kept = []
+        for t, lat in [(0, 40.0), (60, 40.01), (120, 40.01), (180, 40.01), (240, 40.02)]:
+            kept += compressor.push((float(t), lat, -3.7))
+
+        assert (60.0, 40.01, -3.7) in kept
+
+    def test_invalid_tolerance(self):
+        with pytest.raises(ValueError):
+            TrajectoryCompressor(tolerance_m=0)
+
+class TestCompressedTrack:
+    """Test cases for PositionTrack with compression"""
+
+    def test_order_of_magnitude_within_tolerance(self):
+        """Test a realistic track shrinks at least tenfold and stays within tolerance"""
+        pings = drive()
+        track = PositionTrack(tolerancia_m=15)
+        for ping in pings:
+            track.add(*ping)
+
+        kept = track.window()
+
+        assert len(pings) / len(kept) >= 10
+        assert kept[0] == pings[0] and kept[-1] == pings[-1]
+        assert max_error_m(pings, kept) <= 15
+
+    def test_latest_and_window_include_pending(self):
+        """Test the newest ping is visible as soon as it arrives"""
+        track = PositionTrack(tolerancia_m=5)
+        for minute in range(5):
+            track.add(minute * 60.0, 40.0 + minute * 0.01, -3.7)
+
+        assert track.latest() == (240.0, 40.04, -3.7)
+        assert [p[0] for p in track.window()] == [0.0, 240.0]
+        assert [p[0] for p in track.window(hasta=240.0)] == [0.0]
+        assert len(track) == 2
+
+    def test_queries_do_not_change_compression(self):
+        """Test reading a track between pings stores nothing"""
+        track = PositionTrack(tolerancia_m=5)
+        for minute in range(10):
+            track.add(minute * 60.0, 40.0 + minute * 0.01, -3.7)
+            assert track.window()[-1][0] == minute * 60.0
+
+        assert [p[0] for p in track.window()] == [0.0, 540.0]
+        assert [t for chunk in track._chunks for t in chunk.t] == [0.0]
+
+    def test_close_stores_pending(self):
+        """Test closing a track writes its newest ping into the history"""
+        store = PositionHistoryStore(tolerancia_m=5)
+        store.ingest(("vehiculo", "VHC1", minute * 60.0, 40.0 + minute * 0.01, -3.7) for minute in range(5))
+        track = store._tracks[("vehiculo", "VHC1")]
+
+        store.close("vehiculo", "VHC1")
+        store.close("vehiculo", "VHC2")
+
+        assert track._compressor.pending() is None
+        assert [t for chunk in track._chunks for t in chunk.t] == [0.0, 240.0]
+
+    def test_late_ping_stored_uncompressed(self):
+        """Test pings older than the newest one bypass the compressor"""
+        track = PositionTrack(tolerancia_m=5)
+        for minute in range(5):
+            track.add(minute * 60.0, 40.0 + minute * 0.01, -3.7)
+        track.add(90.0, 41.0, -3.0)
+
+        assert [p[0] for p in track.window()] == [0.0, 90.0, 240.0]
+
+    def test_raw_retention(self):
+        """Test raw pings are kept for the retention window only"""
+        track = PositionTrack(tolerancia_m=5, retener_crudo_segundos=120)
+        for minute in range(10):
+            track.add(minute * 60.0, 40.0 + minute * 0.01, -3.7)
+
+        assert [p[0] for p in track.window(crudo=True)] == [420.0, 480.0, 540.0]
+        assert [p[0] for p in track.window(450.0, crudo=True, limit=1)] == [480.0]
+        assert len(track.window()) == 2
+
+    def test_late_ping_retained_raw(self):
+        """Test late pings inside the retention window are kept in time order"""
+        track = PositionTrack(tolerancia_m=5, retener_crudo_segundos=120)
+        for minute in range(10):
+            track.add(minute * 60.0, 40.0 + minute * 0.01, -3.7)
+        track.add(450.0, 40.075, -3.7)
+        track.add(60.0, 40.01, -3.7)
+
+        assert [p[0] for p in track.window(crudo=True)] == [420.0, 450.0, 480.0, 540.0]
+
+    def test_store_passes_settings(self):
+        """Test the store compresses every track it creates"""
+        store = PositionHistoryStore(tolerancia_m=5, retener_crudo_segundos=60)
+        store.ingest(("vehiculo", "VHC1", minute * 60.0, 40.0 + minute * 0.01, -3.7) for minute in range(10))
+
+        assert len(store.window("vehiculo", "VHC1")) == 2
+        assert len(store.window("vehiculo", "VHC1", crudo=True)) == 2
@@ -2,40 +2,145 @@
 
 Funciones de dependencia para inyección de dependencias.
 Permite cambiar fácilmente entre implementaciones de repositorios.
+
+Los repositorios se crean y se cargan con datos una sola vez durante el
+arranque de la aplicación (``inicializar_repositorios``, invocado desde el
+lifespan de FastAPI), de modo que ninguna petición paga el coste de la
+inicialización.
+
+Si se define la variable de entorno ``FLOTA_SNAPSHOT_DIR``, los repositorios
+en memoria se restauran desde su snapshot y WAL en ese directorio y escriben
+un snapshot nuevo al apagar la aplicación.
+
+Con ``FLOTA_REPOSITORY_BACKEND=sqlite`` el repositorio de vehículos se guarda
+en un fichero SQLite compartido (``FLOTA_SQLITE_PATH``), de modo que varios
+workers de ``uvicorn`` ven los mismos datos.
 """
 
+import asyncio
+import os
+from pathlib import Path
 from typing import Optional
 
 from elfosoftware_flota.domain.repositories.i_vehiculo_repository import IVehiculoRepository
 from elfosoftware_flota.domain.repositories.i_transportista_repository import ITransportistaRepository
+from elfosoftware_flota.domain.entities.transportista import Transportista
+from elfosoftware_flota.domain.entities.vehiculo import Vehiculo
+from elfosoftware_flota.infrastructure.persistence.snapshot_store import SnapshotStore
 from elfosoftware_flota.infrastructure.repositories.inmemory_vehicle_repository import InMemoryVehiculoRepository
 from elfosoftware_flota.infrastructure.repositories.inmemory_transportista_repository import InMemoryTransportistaRepository
+from elfosoftware_flota.infrastructure.repositories.sqlite_vehicle_repository import SQLiteVehiculoRepository
 
 
 # Instancias globales de repositorios (en producción usaríamos un contenedor de DI)
 _vehiculo_repository: Optional[IVehiculoRepository] = None
 _transportista_repository: Optional[ITransportistaRepository] = None
 
+# Estado del warm-up
+_inicializacion_lock = asyncio.Lock()
+_repositorios_listos = False
+
+
+def _directorio_snapshots() -> Optional[Path]:
+    """Directorio de snapshots configurado, o None si la persistencia está desactivada."""
+    directorio = os.getenv("FLOTA_SNAPSHOT_DIR")
+    return Path(directorio) if directorio else None
+
+
+def _usar_sqlite() -> bool:
+    """Indica si el repositorio de vehículos debe compartirse vía SQLite."""
+    return os.getenv("FLOTA_REPOSITORY_BACKEND", "memory").lower() == "sqlite"
+
+
+async def _crear_vehiculo_repository(directorio: Optional[Path]) -> IVehiculoRepository:
+    """Crea y carga el repositorio de vehículos según la configuración."""
+    if _usar_sqlite():
+        repositorio = SQLiteVehiculoRepository(os.getenv("FLOTA_SQLITE_PATH", "flota.db"))
+        await repositorio._initialize_test_data()
+        return repositorio
+
+    if directorio is None:
+        repositorio = InMemoryVehiculoRepository()
+        await repositorio._initialize_test_data()
+        return repositorio
+
+    repositorio = InMemoryVehiculoRepository(SnapshotStore(directorio, "vehiculos", Vehiculo))
+    if await repositorio.restore() == 0:
+        await repositorio._initialize_test_data()
+    return repositorio
+
+
+async def inicializar_repositorios() -> None:
+    """Crea los repositorios, carga los datos de prueba y construye los índices.
+
+    Es idempotente y está protegida por un lock, por lo que varias llamadas
+    concurrentes inicializan los repositorios una única vez.
+    """
+    global _vehiculo_repository, _transportista_repository, _repositorios_listos
+
+    if _repositorios_listos:
+        return
+
+    async with _inicializacion_lock:
+        if _repositorios_listos:
+            return
+
+        directorio = _directorio_snapshots()
+        vehiculo_repository = await _crear_vehiculo_repository(directorio)
+
+        if directorio is None:
+            transportista_repository = InMemoryTransportistaRepository()
+            await transportista_repository._initialize_test_data()
+        else:
+            transportista_repository = InMemoryTransportistaRepository(
+                SnapshotStore(directorio, "transportistas", Transportista)
+            )
+            if await transportista_repository.restore() == 0:
+                await transportista_repository._initialize_test_data()
+
+        _vehiculo_repository = vehiculo_repository
+        _transportista_repository = transportista_repository
+        _repositorios_listos = True
+
+
+async def cerrar_repositorios() -> None:
+    """Libera los repositorios al apagar la aplicación.
+
+    Con persistencia activada, escribe antes un snapshot de cada repositorio.
+    """
+    global _vehiculo_repository, _transportista_repository, _repositorios_listos
+
+    async with _inicializacion_lock:
+        if _repositorios_listos:
+            for repositorio in (_vehiculo_repository, _transportista_repository):
+                if getattr(repositorio, "_snapshot_store", None) is not None:
+                    await repositorio.snapshot()
+                    repositorio._snapshot_store.close()
+            if isinstance(_vehiculo_repository, SQLiteVehiculoRepository):
+                _vehiculo_repository.close()
+        _vehiculo_repository = None
+        _transportista_repository = None
+        _repositorios_listos = False
+
+
+def repositorios_listos() -> bool:
+    """Indica si el warm-up de los repositorios ha terminado."""
+    return _repositorios_listos
+
 
 async def get_vehiculo_repository() -> IVehiculoRepository:
     """Obtiene la instancia del repositorio de vehículos."""
-    global _vehiculo_repository
-
-    if _vehiculo_repository is None:
-        _vehiculo_repository = InMemoryVehiculoRepository()
-        # Inicializar con datos de prueba
-        await _vehiculo_repository._initialize_test_data()
+    if not _repositorios_listos:
+        # Sólo ocurre si la app no ejecutó el lifespan (p. ej. routers de test)
+        await inicializar_repositorios()
 
     return _vehiculo_repository
 
 
 async def get_transportista_repository() -> ITransportistaRepository:
     """Obtiene la instancia del repositorio de transportistas."""
-    global _transportista_repository
-
-    if _transportista_repository is None:
-        _transportista_repository = InMemoryTransportistaRepository()
-        # Inicializar con datos de prueba
-        await _transportista_repository._initialize_test_data()
+    if not _repositorios_listos:
+        # Sólo ocurre si la app no ejecutó el lifespan (p. ej. routers de test)
+        await inicializar_repositorios()
 
     return _transportista_repository
@@ -0,0 +1,229 @@
+"""Snapshot Store
+
+Persistencia en disco para repositorios en memoria.
+Arquitectura DELFOS - Infrastructure Layer.
+
+Combina dos ficheros por repositorio:
+
+- ``<nombre>.snapshot``: volcado completo en formato columnar (una lista por
+  campo del modelo) serializado con pickle protocolo 5. Se escribe en un
+  fichero temporal y se sustituye de forma atómica.
+- ``<nombre>.wal``: log append-only con los cambios posteriores al último
+  snapshot. Cada registro va prefijado con su longitud, de modo que un
+  registro truncado por una caída se detecta y se descarta al restaurar.
+
+Las columnas de tipo ``UUID`` se guardan como enteros y los value objects
+Pydantic anidados como tuplas de sus campos, que pickle serializa y carga
+mucho más rápido que los objetos originales. La restauración reconstruye las
+entidades con el mismo mecanismo que usa Pydantic al deserializar con pickle,
+sin volver a validar datos que ya se validaron al guardarlos, lo que permite
+recargar almacenes de millones de entidades en pocos segundos.
+"""
+
+import gc
+import os
+import pickle
+import struct
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Tuple, Type, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel
+
+ModeloT = TypeVar("ModeloT", bound=BaseModel)
+
+_FORMATO_VERSION = 1
+_PICKLE_PROTOCOL = 5
+_CABECERA_REGISTRO = struct.Struct("<I")
+_OP_GUARDAR = "S"
+_OP_ELIMINAR = "D"
+
+
+def _construir_sin_validar(modelo: Type[BaseModel], campos: List[str], valores: Iterable[Any]) -> Any:
+    """Crea una instancia restaurando su estado como lo hace pickle en Pydantic."""
+    instancia = modelo.__new__(modelo)
+    instancia.__setstate__({
+        "__dict__": dict(zip(campos, valores)),
+        "__pydantic_fields_set__": set(campos),
+        "__pydantic_extra__": None,
+        "__pydantic_private__": None,
+    })
+    return instancia
+
+
+def _codec(anotacion: Any) -> Tuple[Callable[[Any], Any], Callable[[Any], Any]]:
+    """Devuelve (codificar, decodificar) para una columna según su tipo."""
+    if anotacion is UUID:
+        return (lambda valor: valor.int), (lambda valor: UUID(int=valor))
+    if isinstance(anotacion, type) and issubclass(anotacion, BaseModel):
+        campos = list(anotacion.model_fields)
+        return (
+            lambda valor: tuple(getattr(valor, campo) for campo in campos),
+            lambda valor: _construir_sin_validar(anotacion, campos, valor),
+        )
+    return (lambda valor: valor), (lambda valor: valor)
+
+
+class SnapshotStore(Generic[ModeloT]):
+    """Snapshot columnar más write-ahead log para un tipo de entidad."""
+
+    def __init__(
+        self,
+        directorio: Path,
+        nombre: str,
+        modelo: Type[ModeloT],
+        sincronizar: bool = False
+    ):
+        """Inicializa el store.
+
+        Args:
+            directorio: Directorio donde se guardan snapshot y WAL
+            nombre: Nombre base de los ficheros (p. ej. "vehiculos")
+            modelo: Clase Pydantic de la entidad almacenada
+            sincronizar: Si es True, hace fsync tras cada registro del WAL
+        """
+        self._directorio = Path(directorio)
+        self._directorio.mkdir(parents=True, exist_ok=True)
+        self._modelo = modelo
+        self._campos: List[str] = list(modelo.model_fields)
+        codecs = [_codec(info.annotation) for info in modelo.model_fields.values()]
+        self._codificadores = [codificar for codificar, _ in codecs]
+        self._decodificadores = [decodificar for _, decodificar in codecs]
+        self._sincronizar = sincronizar
+        self.ruta_snapshot = self._directorio / f"{nombre}.snapshot"
+        self.ruta_wal = self._directorio / f"{nombre}.wal"
+        self._wal: Optional[Any] = None
+
+    def write_snapshot(self, entidades: Iterable[ModeloT]) -> None:
+        """Escribe un snapshot completo y vacía el WAL."""
+        entidades = list(entidades)
+        columnas = [
+            [codificar(getattr(entidad, campo)) for entidad in entidades]
+            for campo, codificar in zip(self._campos, self._codificadores)
+        ]
+        contenido = {
+            "version": _FORMATO_VERSION,
+            "campos": self._campos,
+            "total": len(entidades),
+            "columnas": columnas,
+        }
+
+        temporal = self.ruta_snapshot.with_suffix(".snapshot.tmp")
+        with open(temporal, "wb") as fichero:
+            pickle.dump(contenido, fichero, protocol=_PICKLE_PROTOCOL)
+            fichero.flush()
+            os.fsync(fichero.fileno())
+        os.replace(temporal, self.ruta_snapshot)
+
+        # Los cambios del WAL ya están incluidos en el snapshot
+        self.close()
+        with open(self.ruta_wal, "wb"):
+            pass
+
+    def append_save(self, entidad: ModeloT) -> None:
+        """Registra en el WAL el guardado de una entidad."""
+        self._escribir_registro((_OP_GUARDAR, self._a_fila(entidad)))
+
+    def append_delete(self, entidad_id: Any) -> None:
+        """Registra en el WAL la eliminación de una entidad."""
+        self._escribir_registro((_OP_ELIMINAR, entidad_id.int if isinstance(entidad_id, UUID) else entidad_id))
+
+    def load(self) -> Dict[Any, ModeloT]:
+        """Reconstruye las entidades a partir del snapshot y del WAL.
+
+        Returns:
+            Dict[Any, ModeloT]: Entidades indexadas por su ``id``
+        """
+        # Crear millones de objetos dispara el GC cíclico una y otra vez sin
+        # liberar nada; se pausa durante la carga
+        gc_activo = gc.isenabled()
+        gc.disable()
+        try:
+            return self._cargar()
+        finally:
+            if gc_activo:
+                gc.enable()
+
+    def close(self) -> None:
+        """Cierra el fichero del WAL si está abierto."""
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+
+    def _cargar(self) -> Dict[Any, ModeloT]:
+        """Aplica el snapshot y después los registros del WAL."""
+        entidades: Dict[Any, ModeloT] = {}
+
+        if self.ruta_snapshot.exists():
+            with open(self.ruta_snapshot, "rb") as fichero:
+                contenido = pickle.load(fichero)
+            if contenido.get("version") != _FORMATO_VERSION:
+                raise ValueError(f"Versión de snapshot no soportada: {contenido.get('version')}")
+            if contenido["campos"] != self._campos:
+                raise ValueError("El snapshot no coincide con los campos del modelo")
+            columnas = [
+                list(map(decodificar, columna))
+                for columna, decodificar in zip(contenido["columnas"], self._decodificadores)
+            ]
+            for fila in zip(*columnas):
+                entidad = _construir_sin_validar(self._modelo, self._campos, fila)
+                entidades[entidad.id] = entidad
+
+        for operacion, datos in self._leer_wal():
+            if operacion == _OP_GUARDAR:
+                entidad = self._de_fila(datos)
+                entidades[entidad.id] = entidad
+            elif operacion == _OP_ELIMINAR:
+                entidades.pop(UUID(int=datos) if isinstance(datos, int) else datos, None)
+
+        return entidades
+
+    def _a_fila(self, entidad: ModeloT) -> tuple:
+        """Convierte una entidad en una tupla con sus campos codificados."""
+        return tuple(
+            codificar(getattr(entidad, campo))
+            for campo, codificar in zip(self._campos, self._codificadores)
+        )
+
+    def _de_fila(self, fila: Iterable[Any]) -> ModeloT:
+        """Reconstruye una entidad a partir de una fila codificada."""
+        valores = [decodificar(valor) for valor, decodificar in zip(fila, self._decodificadores)]
+        return _construir_sin_validar(self._modelo, self._campos, valores)
+
+    def _escribir_registro(self, registro: tuple) -> None:
+        """Añade un registro prefijado con su longitud al WAL."""
+        if self._wal is None:
+            self._wal = open(self.ruta_wal, "ab")
+        datos = pickle.dumps(registro, protocol=_PICKLE_PROTOCOL)
+        self._wal.write(_CABECERA_REGISTRO.pack(len(datos)) + datos)
+        self._wal.flush()
+        if self._sincronizar:
+            os.fsync(self._wal.fileno())
+
+    def _leer_wal(self) -> List[tuple]:
+        """Lee los registros completos del WAL y recorta una cola truncada."""
+        if not self.ruta_wal.exists():
+            return []
+        with open(self.ruta_wal, "rb") as fichero:
+            contenido = fichero.read()
+
+        registros = []
+        posicion = 0
+        tamano_cabecera = _CABECERA_REGISTRO.size
+        while posicion + tamano_cabecera <= len(contenido):
+            (longitud,) = _CABECERA_REGISTRO.unpack_from(contenido, posicion)
+            inicio = posicion + tamano_cabecera
+            fin = inicio + longitud
+            if fin > len(contenido):
+                break
+            registros.append(pickle.loads(contenido[inicio:fin]))
+            posicion = fin
+
+        if posicion < len(contenido):
+            # Registro a medias tras una caída: se descarta para que los
+            # siguientes registros queden a continuación del último válido
+            self.close()
+            with open(self.ruta_wal, "r+b") as fichero:
+                fichero.truncate(posicion)
+
+        return registros
@@ -10,18 +10,28 @@ from uuid import UUID
 
 from elfosoftware_flota.domain.entities.transportista import Transportista
 from elfosoftware_flota.domain.repositories.i_transportista_repository import ITransportistaRepository
+from elfosoftware_flota.infrastructure.persistence.snapshot_store import SnapshotStore
 
 
 class InMemoryTransportistaRepository(ITransportistaRepository):
     """Implementación en memoria del repositorio de Transportista."""
     
-    def __init__(self):
+    def __init__(self, snapshot_store: Optional[SnapshotStore[Transportista]] = None):
         """Inicializar el repositorio con almacenamiento en memoria."""
         self._transportistas: dict[UUID, Transportista] = {}
+        # Índices secundarios: clave indexada -> ID, y claves vigentes por ID
+        self._ids_por_email: dict[str, UUID] = {}
+        self._ids_por_licencia: dict[str, UUID] = {}
+        self._claves_indexadas: dict[UUID, tuple[str, str]] = {}
+        self._snapshot_store = snapshot_store
     
     async def save(self, transportista: Transportista) -> None:
         """Guarda un transportista en el repositorio."""
+        self._desindexar(transportista.id)
         self._transportistas[transportista.id] = transportista
+        self._indexar(transportista)
+        if self._snapshot_store is not None:
+            self._snapshot_store.append_save(transportista)
     
     async def find_by_id(self, transportista_id: UUID) -> Optional[Transportista]:
         """Busca un transportista por su ID."""
@@ -29,17 +39,17 @@ class InMemoryTransportistaRepository(ITransportistaRepository):
     
     async def find_by_email(self, email: str) -> Optional[Transportista]:
         """Busca un transportista por su email."""
-        for transportista in self._transportistas.values():
-            if transportista.email == email:
-                return transportista
-        return None
+        transportista_id = self._ids_por_email.get(email)
+        if transportista_id is None:
+            return None
+        return self._transportistas.get(transportista_id)
     
     async def find_by_numero_licencia(self, numero_licencia: str) -> Optional[Transportista]:
         """Busca un transportista por su número de licencia."""
-        for transportista in self._transportistas.values():
-            if transportista.numero_licencia == numero_licencia:
-                return transportista
-        return None
+        transportista_id = self._ids_por_licencia.get(numero_licencia)
+        if transportista_id is None:
+            return None
+        return self._transportistas.get(transportista_id)
     
     async def find_all_activos(self) -> List[Transportista]:
         """Retorna todos los transportistas activos."""
@@ -66,7 +76,10 @@ class InMemoryTransportistaRepository(ITransportistaRepository):
     async def delete(self, transportista_id: UUID) -> None:
         """Elimina un transportista del repositorio."""
         if transportista_id in self._transportistas:
+            self._desindexar(transportista_id)
             del self._transportistas[transportista_id]
+            if self._snapshot_store is not None:
+                self._snapshot_store.append_delete(transportista_id)
     
     async def exists(self, transportista_id: UUID) -> bool:
         """Verifica si existe un transportista con el ID dado."""
@@ -76,6 +89,50 @@ class InMemoryTransportistaRepository(ITransportistaRepository):
         """Cuenta el número de transportistas activos."""
         return len([t for t in self._transportistas.values() if t.activo])
     
+    async def snapshot(self) -> None:
+        """Escribe un snapshot completo y vacía el WAL."""
+        if self._snapshot_store is None:
+            raise RuntimeError("El repositorio no tiene snapshot store configurado")
+        self._snapshot_store.write_snapshot(self._transportistas.values())
+    
+    async def restore(self) -> int:
+        """Recarga los transportistas desde el snapshot y el WAL.
+        
+        Returns:
+            int: Número de transportistas restaurados
+        """
+        if self._snapshot_store is None:
+            raise RuntimeError("El repositorio no tiene snapshot store configurado")
+        self._transportistas = self._snapshot_store.load()
+        self._ids_por_email.clear()
+        self._ids_por_licencia.clear()
+        self._claves_indexadas.clear()
+        for transportista in self._transportistas.values():
+            self._indexar(transportista)
+        return len(self._transportistas)
+    
+    def _indexar(self, transportista: Transportista) -> None:
+        """Registra las claves de búsqueda de un transportista."""
+        email = str(transportista.email)
+        self._ids_por_email[email] = transportista.id
+        self._ids_por_licencia[transportista.numero_licencia] = transportista.id
+        self._claves_indexadas[transportista.id] = (email, transportista.numero_licencia)
+    
+    def _desindexar(self, transportista_id: UUID) -> None:
+        """Elimina las claves indexadas previamente para un transportista.
+        
+        Se usan las claves guardadas y no las de la entidad, porque la entidad
+        puede haberse modificado en memoria antes de volver a guardarse.
+        """
+        claves = self._claves_indexadas.pop(transportista_id, None)
+        if claves is None:
+            return
+        email, licencia = claves
+        if self._ids_por_email.get(email) == transportista_id:
+            del self._ids_por_email[email]
+        if self._ids_por_licencia.get(licencia) == transportista_id:
+            del self._ids_por_licencia[licencia]
+    
     async def _initialize_test_data(self) -> None:
         """Inicializa el repositorio con datos de prueba."""
         test_transportistas = [
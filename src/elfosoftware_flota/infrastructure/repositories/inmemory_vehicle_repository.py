@@ -9,20 +9,24 @@ from uuid import UUID
 from elfosoftware_flota.domain.entities.vehiculo import Vehiculo
 from elfosoftware_flota.domain.repositories.i_vehiculo_repository import IVehiculoRepository
 from elfosoftware_flota.domain.value_objects.matricula import Matricula
+from elfosoftware_flota.infrastructure.persistence.snapshot_store import SnapshotStore
 
 
 class InMemoryVehiculoRepository(IVehiculoRepository):
     """Repositorio en memoria para Vehiculo."""
 
-    def __init__(self):
-        """Inicializa el repositorio con datos de ejemplo."""
+    def __init__(self, snapshot_store: Optional[SnapshotStore[Vehiculo]] = None):
+        """Inicializa el repositorio, opcionalmente persistido en disco."""
         self._vehiculos: Dict[UUID, Vehiculo] = {}
         self._vehiculos_por_matricula: Dict[str, UUID] = {}
+        self._snapshot_store = snapshot_store
 
     async def save(self, vehiculo: Vehiculo) -> None:
         """Guarda un vehículo en el repositorio."""
         self._vehiculos[vehiculo.id] = vehiculo
         self._vehiculos_por_matricula[str(vehiculo.matricula)] = vehiculo.id
+        if self._snapshot_store is not None:
+            self._snapshot_store.append_save(vehiculo)
 
     async def find_by_id(self, vehiculo_id: UUID) -> Optional[Vehiculo]:
         """Busca un vehículo por su ID."""
@@ -65,6 +69,8 @@ class InMemoryVehiculoRepository(IVehiculoRepository):
         if vehiculo:
             del self._vehiculos[vehiculo_id]
             del self._vehiculos_por_matricula[str(vehiculo.matricula)]
+            if self._snapshot_store is not None:
+                self._snapshot_store.append_delete(vehiculo_id)
 
     async def exists(self, vehiculo_id: UUID) -> bool:
         """Verifica si existe un vehículo con el ID dado."""
@@ -78,48 +84,72 @@ class InMemoryVehiculoRepository(IVehiculoRepository):
         """Cuenta el número de vehículos activos."""
         return len([v for v in self._vehiculos.values() if v.activo])
 
+    async def snapshot(self) -> None:
+        """Escribe un snapshot completo y vacía el WAL."""
+        if self._snapshot_store is None:
+            raise RuntimeError("El repositorio no tiene snapshot store configurado")
+        self._snapshot_store.write_snapshot(self._vehiculos.values())
+
+    async def restore(self) -> int:
+        """Recarga los vehículos desde el snapshot y el WAL.
+
+        Returns:
+            int: Número de vehículos restaurados
+        """
+        if self._snapshot_store is None:
+            raise RuntimeError("El repositorio no tiene snapshot store configurado")
+        self._vehiculos = self._snapshot_store.load()
+        self._vehiculos_por_matricula = {
+            str(v.matricula): v.id for v in self._vehiculos.values()
+        }
+        return len(self._vehiculos)
+
     # Método auxiliar para inicializar datos de prueba
     async def _initialize_test_data(self) -> None:
         """Inicializa datos de prueba."""
-        from datetime import date
-
-        # Crear algunos vehículos de ejemplo
-        vehiculo1 = Vehiculo(
-            matricula=Matricula("ABC123"),
-            marca="Mercedes-Benz",
-            modelo="Actros",
-            anio=2020,
-            capacidad_carga_kg=25000.0,
-            tipo_vehiculo="Camión",
-            fecha_matriculacion=date(2020, 1, 15),
-            fecha_ultima_revision=date(2023, 6, 15),
-            kilometraje_actual=150000.0
-        )
-
-        vehiculo2 = Vehiculo(
-            matricula=Matricula("XYZ789"),
-            marca="Volvo",
-            modelo="FH16",
-            anio=2019,
-            capacidad_carga_kg=30000.0,
-            tipo_vehiculo="Camión",
-            fecha_matriculacion=date(2019, 3, 20),
-            fecha_ultima_revision=date(2023, 8, 10),
-            kilometraje_actual=180000.0
-        )
-
-        vehiculo3 = Vehiculo(
-            matricula=Matricula("DEF456"),
-            marca="Iveco",
-            modelo="Stralis",
-            anio=2021,
-            capacidad_carga_kg=20000.0,
-            tipo_vehiculo="Camión",
-            fecha_matriculacion=date(2021, 5, 10),
-            fecha_ultima_revision=date(2023, 4, 5),
-            kilometraje_actual=120000.0
-        )
-
-        await self.save(vehiculo1)
-        await self.save(vehiculo2)
-        await self.save(vehiculo3)
+        for vehiculo in vehiculos_de_prueba():
+            await self.save(vehiculo)
+
+
+def vehiculos_de_prueba() -> List[Vehiculo]:
+    """Vehículos de ejemplo usados para inicializar los repositorios."""
+    from datetime import date
+
+    # Crear algunos vehículos de ejemplo
+    vehiculo1 = Vehiculo(
+        matricula=Matricula(valor="1234ABC"),
+        marca="Mercedes-Benz",
+        modelo="Actros",
+        anio=2020,
+        capacidad_carga_kg=25000.0,
+        tipo_vehiculo="Camión",
+        fecha_matriculacion=date(2020, 1, 15),
+        fecha_ultima_revision=date(2023, 6, 15),
+        kilometraje_actual=150000.0
+    )
+
+    vehiculo2 = Vehiculo(
+        matricula=Matricula(valor="5678XYZ"),
+        marca="Volvo",
+        modelo="FH16",
+        anio=2019,
+        capacidad_carga_kg=30000.0,
+        tipo_vehiculo="Camión",
+        fecha_matriculacion=date(2019, 3, 20),
+        fecha_ultima_revision=date(2023, 8, 10),
+        kilometraje_actual=180000.0
+    )
+
+    vehiculo3 = Vehiculo(
+        matricula=Matricula(valor="9012DEF"),
+        marca="Iveco",
+        modelo="Stralis",
+        anio=2021,
+        capacidad_carga_kg=20000.0,
+        tipo_vehiculo="Camión",
+        fecha_matriculacion=date(2021, 5, 10),
+        fecha_ultima_revision=date(2023, 4, 5),
+        kilometraje_actual=120000.0
+    )
+
+    return [vehiculo1, vehiculo2, vehiculo3]
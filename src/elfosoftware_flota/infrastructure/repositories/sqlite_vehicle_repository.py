@@ -0,0 +1,308 @@
+"""SQLite Vehiculo Repository Implementation.
+
+Repositorio de Vehiculo compartido entre procesos sobre SQLite en modo WAL.
+Arquitectura DELFOS - Infrastructure Layer.
+
+Pensado para ejecutar ``uvicorn`` con varios workers: todos los procesos leen
+y escriben el mismo fichero, de modo que las instancias no divergen.
+
+- Cada proceso mantiene una caché local de lecturas por ID y por matrícula.
+- Cada escritura registra el ID modificado en la tabla ``cambios`` dentro de
+  la misma transacción. Es el canal de invalidación entre procesos.
+- Antes de servir desde caché se consulta ``PRAGMA data_version``, que sólo
+  cambia cuando otra conexión ha confirmado una transacción. Si ha cambiado,
+  se leen los registros de ``cambios`` pendientes y se invalidan esas
+  entradas. Si no, la lectura no toca las tablas.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from uuid import UUID
+
+from elfosoftware_flota.domain.entities.vehiculo import Vehiculo
+from elfosoftware_flota.domain.repositories.i_vehiculo_repository import IVehiculoRepository
+from elfosoftware_flota.domain.value_objects.matricula import Matricula
+from elfosoftware_flota.infrastructure.repositories.inmemory_vehicle_repository import vehiculos_de_prueba
+
+# Registros de invalidación que se conservan antes de purgar los antiguos
+_CAMBIOS_RETENIDOS = 10_000
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS vehiculos (
+    id TEXT PRIMARY KEY,
+    matricula TEXT NOT NULL UNIQUE,
+    marca TEXT NOT NULL,
+    tipo_vehiculo TEXT NOT NULL,
+    anio INTEGER NOT NULL,
+    capacidad_carga_kg REAL NOT NULL,
+    activo INTEGER NOT NULL,
+    datos TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_vehiculos_marca ON vehiculos (lower(marca));
+CREATE INDEX IF NOT EXISTS ix_vehiculos_tipo ON vehiculos (lower(tipo_vehiculo));
+CREATE INDEX IF NOT EXISTS ix_vehiculos_activo ON vehiculos (activo);
+CREATE TABLE IF NOT EXISTS cambios (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    vehiculo_id TEXT NOT NULL
+);
+"""
+
+
+class SQLiteVehiculoRepository(IVehiculoRepository):
+    """Repositorio de Vehiculo sobre SQLite con caché local por proceso."""
+
+    def __init__(self, ruta: Union[str, Path]):
+        """Abre (o crea) la base de datos en modo WAL.
+
+        Args:
+            ruta: Fichero SQLite compartido por todos los workers
+        """
+        self._conexion = sqlite3.connect(
+            str(ruta),
+            check_same_thread=False,
+            isolation_level=None,  # Transacciones explícitas
+            timeout=30.0,
+        )
+        self._lock = threading.RLock()
+        with self._lock:
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            self._conexion.executescript(_ESQUEMA)
+
+        self._cache: Dict[UUID, Vehiculo] = {}
+        self._cache_por_matricula: Dict[str, UUID] = {}
+        self._data_version = self._leer_data_version()
+        self._ultimo_cambio = self._leer_ultimo_cambio()
+
+    async def save(self, vehiculo: Vehiculo) -> None:
+        """Guarda un vehículo en el repositorio."""
+        with self._lock:
+            self._conexion.execute("BEGIN IMMEDIATE")
+            try:
+                self._conexion.execute(
+                    """
+                    INSERT INTO vehiculos
+                        (id, matricula, marca, tipo_vehiculo, anio, capacidad_carga_kg, activo, datos)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        matricula = excluded.matricula,
+                        marca = excluded.marca,
+                        tipo_vehiculo = excluded.tipo_vehiculo,
+                        anio = excluded.anio,
+                        capacidad_carga_kg = excluded.capacidad_carga_kg,
+                        activo = excluded.activo,
+                        datos = excluded.datos
+                    """,
+                    (
+                        str(vehiculo.id),
+                        str(vehiculo.matricula),
+                        vehiculo.marca,
+                        vehiculo.tipo_vehiculo,
+                        vehiculo.anio,
+                        vehiculo.capacidad_carga_kg,
+                        int(vehiculo.activo),
+                        vehiculo.model_dump_json(),
+                    ),
+                )
+                self._registrar_cambio(vehiculo.id)
+                self._conexion.execute("COMMIT")
+            except Exception:
+                self._conexion.execute("ROLLBACK")
+                raise
+
+            self._invalidar(vehiculo.id)
+
+    async def find_by_id(self, vehiculo_id: UUID) -> Optional[Vehiculo]:
+        """Busca un vehículo por su ID."""
+        with self._lock:
+            self._sincronizar_cache()
+            vehiculo = self._cache.get(vehiculo_id)
+            if vehiculo is None:
+                fila = self._conexion.execute(
+                    "SELECT datos FROM vehiculos WHERE id = ?", (str(vehiculo_id),)
+                ).fetchone()
+                if fila is None:
+                    return None
+                vehiculo = self._cachear(fila[0])
+            return vehiculo.model_copy()
+
+    async def find_by_matricula(self, matricula: Matricula) -> Optional[Vehiculo]:
+        """Busca un vehículo por su matrícula."""
+        with self._lock:
+            self._sincronizar_cache()
+            vehiculo_id = self._cache_por_matricula.get(str(matricula))
+            if vehiculo_id is not None and vehiculo_id in self._cache:
+                return self._cache[vehiculo_id].model_copy()
+            fila = self._conexion.execute(
+                "SELECT datos FROM vehiculos WHERE matricula = ?", (str(matricula),)
+            ).fetchone()
+            if fila is None:
+                return None
+            return self._cachear(fila[0]).model_copy()
+
+    async def find_all_activos(self) -> List[Vehiculo]:
+        """Retorna todos los vehículos activos."""
+        return self._consultar("SELECT datos FROM vehiculos WHERE activo = 1")
+
+    async def find_by_marca(self, marca: str) -> List[Vehiculo]:
+        """Busca vehículos por marca."""
+        return self._consultar(
+            "SELECT datos FROM vehiculos WHERE lower(marca) = lower(?)", (marca,)
+        )
+
+    async def find_by_tipo(self, tipo_vehiculo: str) -> List[Vehiculo]:
+        """Busca vehículos por tipo."""
+        return self._consultar(
+            "SELECT datos FROM vehiculos WHERE lower(tipo_vehiculo) = lower(?)", (tipo_vehiculo,)
+        )
+
+    async def find_necesitan_revision(self) -> List[Vehiculo]:
+        """Busca vehículos que necesitan revisión."""
+        # Depende de la fecha actual, por lo que se evalúa en Python
+        return [v for v in self._consultar("SELECT datos FROM vehiculos") if v.necesita_revision]
+
+    async def find_by_capacidad_minima(self, capacidad_minima: float) -> List[Vehiculo]:
+        """Busca vehículos con capacidad de carga mínima."""
+        return self._consultar(
+            "SELECT datos FROM vehiculos WHERE capacidad_carga_kg >= ?", (capacidad_minima,)
+        )
+
+    async def find_by_anio_rango(self, anio_min: int, anio_max: int) -> List[Vehiculo]:
+        """Busca vehículos dentro de un rango de años."""
+        return self._consultar(
+            "SELECT datos FROM vehiculos WHERE anio BETWEEN ? AND ?", (anio_min, anio_max)
+        )
+
+    async def delete(self, vehiculo_id: UUID) -> None:
+        """Elimina un vehículo del repositorio."""
+        with self._lock:
+            self._conexion.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._conexion.execute(
+                    "DELETE FROM vehiculos WHERE id = ?", (str(vehiculo_id),)
+                )
+                if cursor.rowcount:
+                    self._registrar_cambio(vehiculo_id)
+                self._conexion.execute("COMMIT")
+            except Exception:
+                self._conexion.execute("ROLLBACK")
+                raise
+
+            self._invalidar(vehiculo_id)
+
+    async def exists(self, vehiculo_id: UUID) -> bool:
+        """Verifica si existe un vehículo con el ID dado."""
+        return await self.find_by_id(vehiculo_id) is not None
+
+    async def exists_by_matricula(self, matricula: Matricula) -> bool:
+        """Verifica si existe un vehículo con la matrícula dada."""
+        return await self.find_by_matricula(matricula) is not None
+
+    async def count_activos(self) -> int:
+        """Cuenta el número de vehículos activos."""
+        with self._lock:
+            return self._conexion.execute(
+                "SELECT COUNT(*) FROM vehiculos WHERE activo = 1"
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        """Cierra la conexión con la base de datos."""
+        with self._lock:
+            self._conexion.close()
+
+    async def _initialize_test_data(self) -> None:
+        """Inicializa datos de prueba si la base de datos está vacía.
+
+        La comprobación y la inserción van en la misma transacción para que
+        varios workers arrancando a la vez no inserten los datos dos veces.
+        """
+        with self._lock:
+            self._conexion.execute("BEGIN IMMEDIATE")
+            try:
+                if self._conexion.execute("SELECT COUNT(*) FROM vehiculos").fetchone()[0]:
+                    self._conexion.execute("COMMIT")
+                    return
+                for vehiculo in vehiculos_de_prueba():
+                    self._conexion.execute(
+                        """
+                        INSERT INTO vehiculos
+                            (id, matricula, marca, tipo_vehiculo, anio, capacidad_carga_kg, activo, datos)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        (
+                            str(vehiculo.id),
+                            str(vehiculo.matricula),
+                            vehiculo.marca,
+                            vehiculo.tipo_vehiculo,
+                            vehiculo.anio,
+                            vehiculo.capacidad_carga_kg,
+                            int(vehiculo.activo),
+                            vehiculo.model_dump_json(),
+                        ),
+                    )
+                    self._registrar_cambio(vehiculo.id)
+                self._conexion.execute("COMMIT")
+            except Exception:
+                self._conexion.execute("ROLLBACK")
+                raise
+
+    def _consultar(self, sql: str, parametros: tuple = ()) -> List[Vehiculo]:
+        """Ejecuta una consulta de lista y deserializa los vehículos."""
+        with self._lock:
+            filas = self._conexion.execute(sql, parametros).fetchall()
+        return [Vehiculo.model_validate_json(fila[0]) for fila in filas]
+
+    def _cachear(self, datos: str) -> Vehiculo:
+        """Deserializa un vehículo y lo guarda en la caché local."""
+        vehiculo = Vehiculo.model_validate_json(datos)
+        self._cache[vehiculo.id] = vehiculo
+        self._cache_por_matricula[str(vehiculo.matricula)] = vehiculo.id
+        return vehiculo
+
+    def _invalidar(self, vehiculo_id: UUID) -> None:
+        """Elimina un vehículo de la caché local."""
+        vehiculo = self._cache.pop(vehiculo_id, None)
+        if vehiculo is not None:
+            self._cache_por_matricula.pop(str(vehiculo.matricula), None)
+
+    def _registrar_cambio(self, vehiculo_id: UUID) -> None:
+        """Publica la invalidación para el resto de procesos (dentro de la transacción)."""
+        cursor = self._conexion.execute(
+            "INSERT INTO cambios (vehiculo_id) VALUES (?)", (str(vehiculo_id),)
+        )
+        if cursor.lastrowid % _CAMBIOS_RETENIDOS == 0:
+            self._conexion.execute(
+                "DELETE FROM cambios WHERE seq <= ?", (cursor.lastrowid - _CAMBIOS_RETENIDOS,)
+            )
+
+    def _sincronizar_cache(self) -> None:
+        """Aplica las invalidaciones publicadas por otros procesos."""
+        data_version = self._leer_data_version()
+        if data_version == self._data_version:
+            return
+        self._data_version = data_version
+
+        filas = self._conexion.execute(
+            "SELECT seq, vehiculo_id FROM cambios WHERE seq > ? ORDER BY seq",
+            (self._ultimo_cambio,),
+        ).fetchall()
+        minimo = self._conexion.execute("SELECT MIN(seq) FROM cambios").fetchone()[0]
+        if minimo is not None and minimo > self._ultimo_cambio + 1:
+            # Los cambios pendientes ya se purgaron: no se sabe qué invalidar
+            self._cache.clear()
+            self._cache_por_matricula.clear()
+        else:
+            for _, vehiculo_id in filas:
+                self._invalidar(UUID(vehiculo_id))
+        if filas:
+            self._ultimo_cambio = filas[-1][0]
+
+    def _leer_data_version(self) -> int:
+        """Contador que SQLite incrementa cuando otra conexión confirma cambios."""
+        return self._conexion.execute("PRAGMA data_version").fetchone()[0]
+
+    def _leer_ultimo_cambio(self) -> int:
+        """Último número de secuencia de invalidación publicado."""
+        return self._conexion.execute("SELECT COALESCE(MAX(seq), 0) FROM cambios").fetchone()[0]
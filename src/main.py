@@ -4,12 +4,41 @@ Punto de entrada principal de la aplicación Elfosoftware Flota Transportistes.
 Configura FastAPI con todas las rutas y middlewares necesarios.
 """
 
+from contextlib import asynccontextmanager
+
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from elfosoftware_flota.infrastructure.dependencies import (
+    cerrar_repositorios,
+    inicializar_repositorios,
+    repositorios_listos,
+)
+from elfosoftware_flota.infrastructure.persistence.database import (
+    abrir_conexion_db,
+    cerrar_conexiones_db,
+)
 from elfosoftware_flota.presentation.api import flota_router, transportista_router, vehiculo_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm-up de la aplicación antes de aceptar tráfico.
+
+    Carga repositorios e índices y abre la conexión a la base de datos, de
+    modo que la primera petición real tenga la latencia del estado estable.
+    """
+    await inicializar_repositorios()
+    await abrir_conexion_db()
+    try:
+        yield
+    finally:
+        await cerrar_repositorios()
+        await cerrar_conexiones_db()
+
+
 # Crear aplicación FastAPI
 app = FastAPI(
     title="Elfosoftware Flota Transportistes API",
@@ -17,6 +46,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Configurar CORS
@@ -51,6 +81,17 @@ async def health_check():
     return {"status": "healthy", "service": "flota-transportistes-api"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Endpoint de readiness: sólo responde 200 cuando el warm-up ha terminado."""
+    if not repositorios_listos():
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "starting"}
+        )
+    return {"status": "ready"}
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
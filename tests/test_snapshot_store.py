@@ -0,0 +1,122 @@
+"""Tests para la persistencia por snapshot de los repositorios en memoria.
+
+Verifica el snapshot columnar, el WAL y la restauración de los repositorios.
+"""
+
+import asyncio
+from datetime import date
+
+import pytest
+
+from elfosoftware_flota.domain.entities.transportista import Transportista
+from elfosoftware_flota.domain.entities.vehiculo import Vehiculo
+from elfosoftware_flota.domain.value_objects.matricula import Matricula
+from elfosoftware_flota.infrastructure.persistence.snapshot_store import SnapshotStore
+from elfosoftware_flota.infrastructure.repositories.inmemory_transportista_repository import (
+    InMemoryTransportistaRepository,
+)
+from elfosoftware_flota.infrastructure.repositories.inmemory_vehicle_repository import (
+    InMemoryVehiculoRepository,
+)
+
+
+def crear_vehiculo(matricula: str) -> Vehiculo:
+    """Crea un vehículo de prueba."""
+    return Vehiculo(
+        matricula=Matricula(valor=matricula),
+        marca="Volvo",
+        modelo="FH16",
+        anio=2020,
+        capacidad_carga_kg=25000.0,
+        tipo_vehiculo="Camión",
+        fecha_matriculacion=date(2020, 1, 15),
+    )
+
+
+class TestSnapshotStore:
+    """Tests para SnapshotStore."""
+
+    def test_restaurar_snapshot_y_wal(self, tmp_path):
+        """Los cambios posteriores al snapshot se recuperan desde el WAL."""
+        store = SnapshotStore(tmp_path, "vehiculos", Vehiculo)
+        repositorio = InMemoryVehiculoRepository(store)
+
+        async def escenario():
+            primero = crear_vehiculo("1234ABC")
+            segundo = crear_vehiculo("5678XYZ")
+            await repositorio.save(primero)
+            await repositorio.snapshot()
+            await repositorio.save(segundo)
+            await repositorio.delete(primero.id)
+            store.close()
+
+            restaurado = InMemoryVehiculoRepository(SnapshotStore(tmp_path, "vehiculos", Vehiculo))
+            total = await restaurado.restore()
+            return restaurado, total, primero, segundo
+
+        restaurado, total, primero, segundo = asyncio.run(escenario())
+
+        assert total == 1
+        assert asyncio.run(restaurado.exists(primero.id)) is False
+        encontrado = asyncio.run(restaurado.find_by_matricula(Matricula(valor="5678XYZ")))
+        assert encontrado.id == segundo.id
+        assert encontrado.marca == "Volvo"
+
+    def test_wal_truncado_se_descarta(self, tmp_path):
+        """Un registro a medias al final del WAL no impide restaurar."""
+        store = SnapshotStore(tmp_path, "vehiculos", Vehiculo)
+        vehiculo = crear_vehiculo("1234ABC")
+        store.append_save(vehiculo)
+        store.close()
+
+        with open(store.ruta_wal, "ab") as fichero:
+            fichero.write(b"\x40\x00\x00\x00parcial")
+
+        entidades = SnapshotStore(tmp_path, "vehiculos", Vehiculo).load()
+
+        assert list(entidades) == [vehiculo.id]
+
+    def test_snapshot_vacia_el_wal(self, tmp_path):
+        """Escribir un snapshot deja el WAL vacío."""
+        store = SnapshotStore(tmp_path, "vehiculos", Vehiculo)
+        store.append_save(crear_vehiculo("1234ABC"))
+
+        store.write_snapshot([crear_vehiculo("5678XYZ")])
+
+        assert store.ruta_wal.stat().st_size == 0
+        assert len(store.load()) == 1
+
+    def test_restaurar_transportistas_reconstruye_indices(self, tmp_path):
+        """Los índices por email se reconstruyen al restaurar."""
+        store = SnapshotStore(tmp_path, "transportistas", Transportista)
+        repositorio = InMemoryTransportistaRepository(store)
+        transportista = Transportista(
+            nombre="Ana",
+            apellido="Martín",
+            email="ana.martin@example.com",
+            telefono="+34611223355",
+            fecha_nacimiento=date(1990, 5, 15),
+            numero_licencia="LIC111222333",
+            fecha_expiracion_licencia=date(2031, 5, 15),
+        )
+
+        async def escenario():
+            await repositorio.save(transportista)
+            store.close()
+            restaurado = InMemoryTransportistaRepository(
+                SnapshotStore(tmp_path, "transportistas", Transportista)
+            )
+            await restaurado.restore()
+            return await restaurado.find_by_email("ana.martin@example.com")
+
+        encontrado = asyncio.run(escenario())
+
+        assert encontrado is not None
+        assert encontrado.id == transportista.id
+
+    def test_repositorio_sin_store(self):
+        """Sin snapshot store configurado, snapshot() falla explícitamente."""
+        repositorio = InMemoryVehiculoRepository()
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(repositorio.snapshot())
@@ -0,0 +1,126 @@
+"""Tests para el repositorio de vehículos sobre SQLite.
+
+Simula varios workers abriendo el mismo fichero con conexiones distintas.
+"""
+
+import asyncio
+import multiprocessing
+from datetime import date
+
+from elfosoftware_flota.domain.entities.vehiculo import Vehiculo
+from elfosoftware_flota.domain.value_objects.matricula import Matricula
+from elfosoftware_flota.infrastructure.repositories.sqlite_vehicle_repository import (
+    SQLiteVehiculoRepository,
+)
+
+
+def crear_vehiculo(matricula: str = "1234ABC") -> Vehiculo:
+    """Crea un vehículo de prueba."""
+    return Vehiculo(
+        matricula=Matricula(valor=matricula),
+        marca="Volvo",
+        modelo="FH16",
+        anio=2020,
+        capacidad_carga_kg=25000.0,
+        tipo_vehiculo="Camión",
+        fecha_matriculacion=date(2020, 1, 15),
+    )
+
+
+def _actualizar_en_otro_proceso(ruta: str, vehiculo_id: str) -> None:
+    """Worker que modifica un vehículo desde otro proceso."""
+    from uuid import UUID
+
+    async def escenario():
+        repositorio = SQLiteVehiculoRepository(ruta)
+        vehiculo = await repositorio.find_by_id(UUID(vehiculo_id))
+        vehiculo.actualizar_kilometraje(99999.0)
+        await repositorio.save(vehiculo)
+        repositorio.close()
+
+    asyncio.run(escenario())
+
+
+class TestSQLiteVehiculoRepository:
+    """Tests para SQLiteVehiculoRepository."""
+
+    def test_guardar_y_buscar(self, tmp_path):
+        """Un vehículo guardado se recupera por ID y por matrícula."""
+        repositorio = SQLiteVehiculoRepository(tmp_path / "flota.db")
+        vehiculo = crear_vehiculo()
+
+        async def escenario():
+            await repositorio.save(vehiculo)
+            por_id = await repositorio.find_by_id(vehiculo.id)
+            por_matricula = await repositorio.find_by_matricula(Matricula(valor="1234ABC"))
+            marca = await repositorio.find_by_marca("volvo")
+            return por_id, por_matricula, marca
+
+        por_id, por_matricula, marca = asyncio.run(escenario())
+
+        assert por_id == vehiculo
+        assert por_matricula.id == vehiculo.id
+        assert [v.id for v in marca] == [vehiculo.id]
+
+    def test_invalidacion_entre_conexiones(self, tmp_path):
+        """Una escritura de otro worker invalida la caché local."""
+        ruta = tmp_path / "flota.db"
+        worker_a = SQLiteVehiculoRepository(ruta)
+        worker_b = SQLiteVehiculoRepository(ruta)
+        vehiculo = crear_vehiculo()
+
+        async def escenario():
+            await worker_a.save(vehiculo)
+            cacheado = await worker_b.find_by_id(vehiculo.id)
+            assert cacheado.kilometraje_actual == 0
+
+            cambiado = await worker_a.find_by_id(vehiculo.id)
+            cambiado.actualizar_kilometraje(5000.0)
+            await worker_a.save(cambiado)
+
+            return await worker_b.find_by_id(vehiculo.id)
+
+        assert asyncio.run(escenario()).kilometraje_actual == 5000.0
+
+    def test_invalidacion_entre_procesos(self, tmp_path):
+        """La caché de un proceso ve los cambios confirmados por otro proceso."""
+        ruta = tmp_path / "flota.db"
+        repositorio = SQLiteVehiculoRepository(ruta)
+        vehiculo = crear_vehiculo()
+        asyncio.run(repositorio.save(vehiculo))
+        asyncio.run(repositorio.find_by_id(vehiculo.id))
+
+        proceso = multiprocessing.get_context("spawn").Process(
+            target=_actualizar_en_otro_proceso, args=(str(ruta), str(vehiculo.id))
+        )
+        proceso.start()
+        proceso.join(timeout=30)
+
+        assert proceso.exitcode == 0
+        assert asyncio.run(repositorio.find_by_id(vehiculo.id)).kilometraje_actual == 99999.0
+
+    def test_eliminar(self, tmp_path):
+        """Eliminar un vehículo lo borra también de la caché del otro worker."""
+        ruta = tmp_path / "flota.db"
+        worker_a = SQLiteVehiculoRepository(ruta)
+        worker_b = SQLiteVehiculoRepository(ruta)
+        vehiculo = crear_vehiculo()
+
+        async def escenario():
+            await worker_a.save(vehiculo)
+            await worker_b.find_by_id(vehiculo.id)
+            await worker_a.delete(vehiculo.id)
+            return await worker_b.exists(vehiculo.id), await worker_b.count_activos()
+
+        assert asyncio.run(escenario()) == (False, 0)
+
+    def test_datos_de_prueba_una_sola_vez(self, tmp_path):
+        """Varios workers arrancando sobre la misma base no duplican los datos."""
+        ruta = tmp_path / "flota.db"
+
+        async def escenario():
+            for _ in range(3):
+                await SQLiteVehiculoRepository(ruta)._initialize_test_data()
+            return await SQLiteVehiculoRepository(ruta).count_activos()
+
+        assert asyncio.run(escenario()) == 3
@@ -0,0 +1,52 @@
+"""Tests para el warm-up de la aplicación.
+
+Verifica que los repositorios se inicializan en el lifespan y que el
+endpoint de readiness refleja el estado del warm-up.
+"""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from elfosoftware_flota.infrastructure import dependencies
+from main import app
+
+
+class TestWarmup:
+    """Tests para la inicialización en el lifespan."""
+
+    def test_ready_tras_lifespan(self):
+        """El endpoint /ready responde 200 cuando el warm-up ha terminado."""
+        with TestClient(app) as client:
+            response = client.get("/ready")
+
+            assert response.status_code == 200
+            assert response.json() == {"status": "ready"}
+
+    def test_no_ready_sin_lifespan(self):
+        """Sin lifespan el endpoint /ready responde 503."""
+        asyncio.run(dependencies.cerrar_repositorios())
+        client = TestClient(app)
+
+        response = client.get("/ready")
+
+        assert response.status_code == 503
+
+    def test_repositorios_precargados(self):
+        """Los repositorios quedan cargados con datos tras el warm-up."""
+        with TestClient(app):
+            assert dependencies.repositorios_listos()
+            vehiculos = asyncio.run(dependencies._vehiculo_repository.count_activos())
+            assert vehiculos == 3
+
+    def test_inicializacion_concurrente_unica(self):
+        """Varias inicializaciones concurrentes crean los repositorios una sola vez."""
+        async def escenario():
+            await dependencies.cerrar_repositorios()
+            await asyncio.gather(*(dependencies.inicializar_repositorios() for _ in range(10)))
+            return await dependencies.get_transportista_repository()
+
+        repositorio = asyncio.run(escenario())
+
+        assert repositorio is dependencies._transportista_repository
+        assert len(asyncio.run(repositorio.find_all_activos())) == 3